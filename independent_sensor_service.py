@@ -18,7 +18,6 @@ USAGE NOTES:
 @date: 2025-01-07
 """
 
-import json
 import signal
 import sys
 import time
@@ -30,6 +29,7 @@ project_root = Path(__file__).resolve().parent
 sys.path.insert(0, str(project_root / "src"))
 
 from mower.hardware.sensor_interface import EnhancedSensorInterface
+from mower.hardware.shared_sensor_data import get_shared_sensor_manager
 from mower.utilities.logger_config import LoggerConfigInfo
 
 # Initialize logger
@@ -49,7 +49,7 @@ class IndependentSensorService:
         """Initialize the independent sensor service."""
         self.sensor_interface: Optional[EnhancedSensorInterface] = None
         self.running = False
-        self.shared_data_file = Path("/tmp/mower_sensor_data.json")
+        self.shared_manager = get_shared_sensor_manager()
         
         # Set up signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -127,7 +127,7 @@ class IndependentSensorService:
         """
         Main data collection loop.
         
-        Collects sensor data and writes to shared file for web UI.
+        Collects sensor data and publishes it to shared memory for web UI.
         """
         if not self.sensor_interface:
             logger.error("Sensor interface not initialized")
@@ -142,14 +142,8 @@ class IndependentSensorService:
                 sensor_data = self.sensor_interface.get_sensor_data()
                 
                 if sensor_data:
-                    # Add timestamp
-                    sensor_data['timestamp'] = time.time()
-                    
-                    # Write to shared file atomically
-                    temp_file = self.shared_data_file.with_suffix('.tmp')
-                    with temp_file.open('w') as f:
-                        json.dump(sensor_data, f, indent=2)
-                    temp_file.replace(self.shared_data_file)
+                    # Publish to the shared memory snapshot ring
+                    self.shared_manager.write_sensor_data(sensor_data)
                     
                     logger.debug(f"Updated sensor data: {len(sensor_data)} keys")
                 else:
@@ -174,6 +168,7 @@ class IndependentSensorService:
             except Exception as e:
                 logger.error(f"Error cleaning up sensor interface: {e}")
                 
+        self.shared_manager.close()
         logger.info("Independent sensor service cleanup complete")
         
     def run(self) -> int:
@@ -45,6 +45,7 @@ from mower.config_management.constants import (
     ENV_PREFIX,
     HOME_LOCATION_PATH,
     MOWING_SCHEDULE_PATH,
+    NO_GO_ZONES_PATH,
     PATTERN_PLANNER_PATH,
     USER_POLYGON_PATH,
 )
@@ -88,6 +89,7 @@ __all__ = [
     "BASE_DIR",
     "CONFIG_DIR",
     "USER_POLYGON_PATH",
+    "NO_GO_ZONES_PATH",
     "HOME_LOCATION_PATH",
     "MOWING_SCHEDULE_PATH",
     "PATTERN_PLANNER_PATH",
@@ -15,6 +15,7 @@ CONFIG_DIR = BASE_DIR / "config"
 
 # Standard configuration files
 USER_POLYGON_PATH = CONFIG_DIR / "user_polygon.json"
+NO_GO_ZONES_PATH = CONFIG_DIR / "no_go_zones.json"
 HOME_LOCATION_PATH = CONFIG_DIR / "home_location.json"
 MOWING_SCHEDULE_PATH = CONFIG_DIR / "mowing_schedule.json"
 PATTERN_PLANNER_PATH = CONFIG_DIR / "models" / "pattern_planner.json"
@@ -98,6 +98,21 @@ MIN_DISTANCE_THRESHOLD: int = 30
 
 AVOIDANCE_DELAY: float = 0.1  # Delay for obstacle avoidance in seconds
 
+# For navigation/occupancy_grid.py and obstacle_mapper.py
+OBSTACLE_GRID_PATH: Path = BASE_DIR / "data" / "obstacle_grid.npy"
+OCCUPANCY_GRID_RESOLUTION: float = 0.1  # Grid cell size in meters
+TOF_MAX_RANGE_M: float = 2.0  # Readings at or beyond this only clear free space
+# Camera detections are placed on the ground plane (Pi Camera v2 field of view)
+CAMERA_HFOV_DEG: float = 62.2
+CAMERA_VFOV_DEG: float = 48.8
+CAMERA_HEIGHT_M: float = 0.3  # Lens height above the ground
+CAMERA_PITCH_DEG: float = 15.0  # Downward tilt of the optical axis
+CAMERA_MAX_RANGE_M: float = 5.0  # Detections estimated beyond this only clear free space
+
+# For navigation/coverage_map.py
+COVERAGE_SNAPSHOT_DIR: Path = BASE_DIR / "data" / "coverage"
+CUTTING_WIDTH_M: float = 0.5  # Width of the cut; pattern spacing leaves 10% overlap
+
 # For RoboHATController
 MM1_MAX_FORWARD: int = 2000
 MM1_MAX_REVERSE: int = 1000
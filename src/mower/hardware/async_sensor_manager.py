@@ -3,6 +3,12 @@ Async Sensor Manager - Refactored sensor pipeline for improved reliability.
 
 This module implements the async sensor stack refactor to address critical failures
 and correctly manage all attached sensor modules.
+
+Each sensor is sampled by its own task at its own rate, with a per-read
+timeout and a circuit breaker (see ``mower.hardware.sensor_sampling``).
+Reads of the I2C sensors are serialized through one bus arbiter thread; the
+UART IMU has its own worker. Readings go into a timestamped latest-value
+cache, so ``get_sensor_data()`` returns immediately from any thread.
 """
 
 import asyncio
@@ -32,6 +38,8 @@ else:
 from mower.hardware.bme280 import BME280Sensor
 from mower.hardware.ina3221 import INA3221Sensor
 from mower.hardware.imu import BNO085Sensor
+from mower.error_handling.circuit_breaker import get_circuit_breaker_manager
+from mower.hardware.sensor_sampling import BusArbiter, LatestValueCache, SensorSampler
 from mower.hardware.tof import VL53L0XSensors
 from mower.utilities.logger_config import LoggerConfigInfo
 
@@ -39,10 +47,16 @@ logger = LoggerConfigInfo.get_logger(__name__)
 
 # --- Configuration ---
 SENSOR_CONFIG = {
-    "imu_update_rate": 20.0,  # Hz, higher for better obstacle/tilt detection
-    "i2c_update_rate": 2.0,   # Hz, for less critical sensors
-    "timeout_seconds": 2.0,
-    "max_consecutive_errors": 5,
+    # Per-sensor sampling rate (Hz) and read timeout (s)
+    "sensors": {
+        "imu": {"rate_hz": 20.0, "timeout_s": 0.5},  # higher for better tilt detection
+        "tof": {"rate_hz": 10.0, "timeout_s": 0.5},  # obstacle distances
+        "power": {"rate_hz": 1.0, "timeout_s": 1.0},
+        "environment": {"rate_hz": 0.5, "timeout_s": 1.0},
+    },
+    "max_consecutive_errors": 5,  # failures within the window that open a sensor's circuit breaker
+    "breaker_failure_window": 30.0,  # seconds
+    "breaker_reset_seconds": 10.0,  # pause before retrying a failed sensor
 }
 
 class SensorState(Enum):
@@ -71,7 +85,6 @@ class AsyncSensorManager:
     def __init__(self, simulate: bool = False):
         self.simulate = simulate or not (platform.system() == "Linux")
         self._running = False
-        self._lock = asyncio.Lock()
         
         self._sensors: Dict[str, Any] = {}
         self._sensor_status: Dict[str, SensorStatus] = {
@@ -79,8 +92,10 @@ class AsyncSensorManager:
             for name in ["imu", "environment", "power", "tof"]
         }
         
-        self._sensor_data: Dict[str, Any] = {}
-        self._last_update: Optional[float] = None
+        self._cache = LatestValueCache()
+        self._samplers: Dict[str, SensorSampler] = {}
+        self._i2c_arbiter: Optional[BusArbiter] = None
+        self._imu_worker: Optional[BusArbiter] = None
         self._tasks: Dict[str, asyncio.Task] = {}
         self._config = SENSOR_CONFIG
 
@@ -96,6 +111,8 @@ class AsyncSensorManager:
             return
         logger.info("Starting AsyncSensorManager...")
         self._running = True
+        self._i2c_arbiter = BusArbiter("i2c-bus")
+        self._imu_worker = BusArbiter("imu-uart")
         await self._initialize_sensors()
         await self._start_tasks()
         logger.info("AsyncSensorManager started successfully")
@@ -108,11 +125,17 @@ class AsyncSensorManager:
         for task in self._tasks.values():
             task.cancel()
         await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        self._samplers.clear()
         await self._cleanup_sensors()
+        for worker in (self._i2c_arbiter, self._imu_worker):
+            if worker is not None:
+                worker.shutdown()
+        self._cache.clear()
         logger.info("AsyncSensorManager stopped")
 
     async def _run_in_executor(self, func, *args):
-        """Helper to run blocking I/O in a thread pool."""
+        """Helper to run blocking I/O (initialization, cleanup) in a thread pool."""
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, func, *args)
 
@@ -216,6 +239,7 @@ class AsyncSensorManager:
             # Pass the I2C bus to the ToF sensor constructor
             sensor = await self._run_in_executor(lambda: VL53L0XSensors(i2c_bus=i2c_bus, simulate=self.simulate))
             if sensor.is_hardware_available:
+                sensor.start_ranging()
                 self._sensors["tof"] = sensor
                 status.state = SensorState.OPERATIONAL
                 status.is_hardware_available = True
@@ -228,100 +252,70 @@ class AsyncSensorManager:
             logger.error(f"ToF sensors initialization failed: {e}")
 
     async def _start_tasks(self):
-        """Start async sensor reading tasks."""
-        self._tasks["imu_task"] = asyncio.create_task(self._sensor_reading_loop("imu", self._read_imu, self._config["imu_update_rate"]))
-        self._tasks["i2c_task"] = asyncio.create_task(self._i2c_sensors_loop(self._config["i2c_update_rate"]))
-
-    async def _sensor_reading_loop(self, name, read_func, rate):
-        """Generic loop for reading a sensor at a given rate."""
-        interval = 1.0 / rate
-        while self._running:
-            try:
-                start_time = time.monotonic()
-                await read_func()
-                elapsed = time.monotonic() - start_time
-                await asyncio.sleep(max(0, interval - elapsed))
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in {name} reading loop: {e}")
-                self._sensor_status[name].state = SensorState.DEGRADED
-                self._sensor_status[name].consecutive_errors += 1
-                await asyncio.sleep(1.0) # Backoff on error
-    
-    async def _i2c_sensors_loop(self, rate):
-        """A single loop to read all I2C sensors."""
-        interval = 1.0 / rate
-        while self._running:
-            try:
-                start_time = time.monotonic()
-                # Read all I2C sensors sequentially in one go
-                await self._read_bme280()
-                await self._read_ina3221()
-                await self._read_tof()
-                elapsed = time.monotonic() - start_time
-                await asyncio.sleep(max(0, interval - elapsed))
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in I2C sensors loop: {e}")
-                await asyncio.sleep(1.0)
+        """Start one sampling task per available sensor."""
+        readers = {
+            "imu": ("imu", self._read_imu),
+            "environment": ("bme280", self._read_bme280),
+            "power": ("ina3221", self._read_ina3221),
+            "tof": ("tof", self._read_tof),
+        }
+        for key, (sensor_name, read) in readers.items():
+            if self._sensor_status[key].state != SensorState.OPERATIONAL or sensor_name not in self._sensors:
+                continue
+            settings = self._config["sensors"][key]
+            sampler = SensorSampler(
+                key,
+                read,
+                self._cache,
+                rate_hz=settings["rate_hz"],
+                timeout=settings["timeout_s"],
+                breaker=get_circuit_breaker_manager().create_breaker(
+                    f"sensor.{key}",
+                    failure_threshold=self._config["max_consecutive_errors"],
+                    timeout=self._config["breaker_reset_seconds"],
+                    failure_window=self._config["breaker_failure_window"],
+                ),
+            )
+            self._samplers[key] = sampler
+            self._tasks[key] = asyncio.create_task(sampler.run(), name=f"sample-{key}")
+        logger.info("Sampling sensors: %s", ", ".join(self._samplers) or "none")
 
     # --- Data Reading Methods ---
+    # Each returns one reading or raises; the sampler handles timeouts,
+    # error counting and the circuit breaker.
 
     async def _read_imu(self):
-        key, sensor_name = "imu", "imu"
-        if self._sensor_status[key].state != SensorState.OPERATIONAL: return
-        try:
-            data = await self._run_in_executor(self._sensors[sensor_name].get_sensor_data)
-            async with self._lock: self._sensor_data[key] = data
-            self._sensor_status[key].consecutive_errors = 0
-        except Exception as e:
-            self._sensor_status[key].consecutive_errors += 1
-            logger.warning(f"Failed to read IMU: {e}")
+        return await self._imu_worker.run(self._sensors["imu"].get_sensor_data)
 
     async def _read_bme280(self):
-        key, sensor_name = "environment", "bme280"
-        if self._sensor_status[key].state != SensorState.OPERATIONAL: return
-        try:
-            data = await self._run_in_executor(BME280Sensor.read_bme280, self._sensors[sensor_name])
-            async with self._lock: self._sensor_data[key] = data
-            self._sensor_status[key].consecutive_errors = 0
-        except Exception as e:
-            self._sensor_status[key].consecutive_errors += 1
-            logger.warning(f"Failed to read Environment (BME280): {e}")
+        return await self._i2c_arbiter.run(BME280Sensor.read_bme280, self._sensors["bme280"])
 
     async def _read_ina3221(self):
-        key, sensor_name = "power", "ina3221"
-        if self._sensor_status[key].state != SensorState.OPERATIONAL: return
-        try:
-            # Read all 3 channels
-            all_channels = {}
-            for i in range(1, 4):
-                channel_data = await self._run_in_executor(INA3221Sensor.read_ina3221, self._sensors[sensor_name], i)
-                all_channels[f"channel_{i}"] = channel_data
-            async with self._lock: self._sensor_data[key] = all_channels
-            self._sensor_status[key].consecutive_errors = 0
-        except Exception as e:
-            self._sensor_status[key].consecutive_errors += 1
-            logger.warning(f"Failed to read Power (INA3221): {e}")
-            
+        sensor = self._sensors["ina3221"]
+
+        def read_all_channels():
+            return {f"channel_{i}": INA3221Sensor.read_ina3221(sensor, i) for i in range(1, 4)}
+
+        # One bus slot for all three channels keeps the set consistent
+        return await self._i2c_arbiter.run(read_all_channels)
+
     async def _read_tof(self):
-        key, sensor_name = "tof", "tof"
-        if self._sensor_status[key].state != SensorState.OPERATIONAL: return
-        try:
-            data = await self._run_in_executor(self._sensors[sensor_name].get_distances)
-            async with self._lock: self._sensor_data[key] = data
-            self._sensor_status[key].consecutive_errors = 0
-        except Exception as e:
-            self._sensor_status[key].consecutive_errors += 1
-            logger.warning(f"Failed to read ToF: {e}")
+        # Filtered values from the ToF ranging thread; no bus access here
+        return self._sensors["tof"].get_distances()
 
-    async def get_sensor_data(self) -> Dict[str, Any]:
-        """Get current sensor data with status and fallbacks."""
-        async with self._lock:
-            # Start with a copy of the latest data
-            final_data = self._sensor_data.copy()
+    def get_cached_sensor_data(self) -> Dict[str, Any]:
+        """
+        Latest readings with fallbacks for sensors that have none yet.
+
+        Safe to call from any thread; never waits on hardware.
+
+        Returns:
+            dict: ``imu``, ``environment``, ``power`` and ``tof`` readings,
+                  ``timestamp``, and per-sensor ``status`` including the age
+                  of the cached reading and the circuit breaker state
+        """
+        readings = self._cache.snapshot()
+        final_data = {name: reading.value for name, reading in readings.items()}
 
         # Provide fallbacks for any missing sensor data
         if 'imu' not in final_data: final_data['imu'] = self._get_fallback_imu()
@@ -331,9 +325,19 @@ class AsyncSensorManager:
 
         # Add timestamps and status
         final_data["timestamp"] = time.time()
-        final_data["status"] = {name: status.__dict__ for name, status in self._sensor_status.items()}
+        status = {}
+        for name, sensor_status in self._sensor_status.items():
+            status[name] = dict(sensor_status.__dict__)
+            sampler = self._samplers.get(name)
+            if sampler is not None:
+                status[name]["sampling"] = sampler.status()
+        final_data["status"] = status
         return final_data
 
+    async def get_sensor_data(self) -> Dict[str, Any]:
+        """Get current sensor data with status and fallbacks."""
+        return self.get_cached_sensor_data()
+
     async def _cleanup_sensors(self):
         """Cleanup sensor resources."""
         logger.debug("Cleaning up sensor resources...")
@@ -392,14 +396,8 @@ class AsyncSensorInterface:
         return self._thread and self._thread.is_alive()
 
     def get_sensor_data(self) -> Dict[str, Any]:
-        """Gets sensor data from the manager in a thread-safe way."""
+        """Gets the latest cached sensor data; never blocks on the event loop or hardware."""
         if not self._running:
             logger.warning("Sensor interface not running, returning empty data.")
             return {}
-        
-        future = asyncio.run_coroutine_threadsafe(self._manager.get_sensor_data(), self._loop)
-        try:
-            return future.result(timeout=2.0)
-        except Exception as e:
-            logger.error(f"Failed to get sensor data from async manager: {e}")
-            return {}
\ No newline at end of file
+        return self._manager.get_cached_sensor_data()
\ No newline at end of file
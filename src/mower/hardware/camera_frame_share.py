@@ -4,192 +4,606 @@ Camera frame sharing mechanism between main and web processes.
 This module provides a way for the main process to share camera frames
 with the web process without both processes trying to access the camera
 hardware directly.
+
+Frames live in a small shared-memory pool (triple buffered by default).
+Each slot holds the raw pixel data plus a header with the sequence number,
+timestamp, shape and dtype. The writer never encodes anything; readers wait
+on a futex-style "new frame" word instead of polling the filesystem, and JPEG
+encoding happens lazily in the reader, at most once per frame, only when a
+client actually asks for JPEG bytes.
 """
 
 import os
-import time
 import threading
-import json
-from typing import Optional, Dict, Any
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from mower.ipc.shared_memory import (
+    SharedWordEvent,
+    attach_shared_memory,
+    create_shared_memory,
+    new_generation,
+    segment_replaced,
+    unlink_shared_memory,
+)
 from mower.utilities.logger_config import LoggerConfigInfo
 
 logger = LoggerConfigInfo.get_logger(__name__)
 
+FRAME_POOL_NAME = os.getenv("MOWER_FRAME_SHM_NAME", "mower_camera_frames")
+FRAME_POOL_SLOTS = int(os.getenv("FRAME_POOL_SLOTS", 3))
+_STREAM_WIDTH, _STREAM_HEIGHT = map(int, os.getenv("STREAMING_RESOLUTION", "1280x960").split("x"))
+FRAME_POOL_MAX_BYTES = int(os.getenv("FRAME_POOL_MAX_BYTES", _STREAM_WIDTH * _STREAM_HEIGHT * 3))
+JPEG_QUALITY = int(os.getenv("JPEG_QUALITY", 95))
+FRAME_MAX_AGE = 5.0  # seconds - frames older than this are not served
+
+POOL_MAGIC = 0x4D4F5746  # "MOWF"
+POOL_VERSION = 1
+MAX_READ_RETRIES = 4
+ATTACH_RETRY_INTERVAL = 0.25  # seconds between attempts to attach to a missing pool
+
+POOL_HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "<u4"),
+        ("version", "<u4"),
+        ("slot_count", "<u4"),
+        ("notify", "<u4"),  # futex word, bumped once per published frame
+        ("max_frame_bytes", "<u8"),
+        ("latest_seq", "<u8"),
+        ("writer_pid", "<u4"),
+        ("generation", "<u4"),  # random per created pool, detects writer restarts
+    ]
+)
+NOTIFY_OFFSET = POOL_HEADER_DTYPE.fields["notify"][1]
+
+SLOT_HEADER_DTYPE = np.dtype(
+    [
+        ("seq", "<u8"),
+        ("timestamp", "<f8"),
+        ("monotonic", "<f8"),
+        ("height", "<u4"),
+        ("width", "<u4"),
+        ("channels", "<u4"),
+        ("dtype", "S4"),
+        ("nbytes", "<u8"),
+    ]
+)
+
+
+@dataclass
+class FrameInfo:
+    """Header of a shared frame."""
+
+    sequence: int
+    timestamp: float
+    monotonic: float
+    shape: Tuple[int, ...]
+    dtype: np.dtype
+
+    @property
+    def age(self) -> float:
+        """Seconds since the frame was published."""
+        return max(0.0, time.monotonic() - self.monotonic)
+
+
+class SharedFramePool:
+    """
+    Fixed-size pool of raw frame slots in shared memory.
+
+    One process creates the pool and writes frames; any number of processes
+    attach and read. Slots are reused round-robin, so with three slots a reader
+    can work on the newest frame while the writer fills the next one.
+    """
+
+    def __init__(
+        self,
+        name: str = FRAME_POOL_NAME,
+        create: bool = False,
+        slot_count: int = FRAME_POOL_SLOTS,
+        max_frame_bytes: int = FRAME_POOL_MAX_BYTES,
+    ):
+        """
+        Initialize the frame pool.
+
+        Args:
+            name: Name of the shared memory segment
+            create: True in the writer process, False in reader processes
+            slot_count: Number of frame slots (writer only)
+            max_frame_bytes: Largest raw frame a slot can hold (writer only)
+
+        Raises:
+            FileNotFoundError: If attaching and the pool does not exist yet
+            ValueError: If an attached segment is not a compatible frame pool
+        """
+        if slot_count < 2:
+            raise ValueError("Frame pool needs at least 2 slots")
+
+        self.name = name
+        self.is_writer = create
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._warned_oversize = False
+
+        if create:
+            self._slot_stride = self._aligned_stride(max_frame_bytes)
+            size = POOL_HEADER_DTYPE.itemsize + self._slot_stride * slot_count
+            self._shm = create_shared_memory(name, size)
+        else:
+            self._shm = attach_shared_memory(name)
+
+        self._header = np.ndarray((1,), dtype=POOL_HEADER_DTYPE, buffer=self._shm.buf, offset=0)
+        if create:
+            self._header["magic"] = POOL_MAGIC
+            self._header["version"] = POOL_VERSION
+            self._header["slot_count"] = slot_count
+            self._header["max_frame_bytes"] = max_frame_bytes
+            self._header["latest_seq"] = 0
+            self._header["writer_pid"] = os.getpid()
+            self._header["generation"] = new_generation()
+        elif int(self._header["magic"][0]) != POOL_MAGIC or int(self._header["version"][0]) != POOL_VERSION:
+            self._header = None
+            self._shm.close()
+            raise ValueError(f"Shared memory segment '{name}' is not a compatible frame pool")
+
+        self.generation = int(self._header["generation"][0])
+        self.slot_count = int(self._header["slot_count"][0])
+        self.max_frame_bytes = int(self._header["max_frame_bytes"][0])
+        self._slot_stride = self._aligned_stride(self.max_frame_bytes)
+        self._latest_seq = self._header["latest_seq"]
+        self._event = SharedWordEvent(self._shm.buf, NOTIFY_OFFSET)
+
+        self._slot_headers = []
+        self._slot_data = []
+        for index in range(self.slot_count):
+            offset = POOL_HEADER_DTYPE.itemsize + index * self._slot_stride
+            slot_header = np.ndarray((1,), dtype=SLOT_HEADER_DTYPE, buffer=self._shm.buf, offset=offset)
+            slot_data = np.ndarray(
+                (self.max_frame_bytes,),
+                dtype=np.uint8,
+                buffer=self._shm.buf,
+                offset=offset + SLOT_HEADER_DTYPE.itemsize,
+            )
+            if create:
+                slot_header["seq"] = 0
+            self._slot_headers.append(slot_header)
+            self._slot_data.append(slot_data)
+
+    @staticmethod
+    def _aligned_stride(max_frame_bytes: int) -> int:
+        """Slot size rounded up to a cache line."""
+        return (SLOT_HEADER_DTYPE.itemsize + max_frame_bytes + 63) // 64 * 64
+
+    @property
+    def latest_sequence(self) -> int:
+        """Sequence number of the newest published frame (0 if none)."""
+        return int(self._latest_seq[0])
+
+    def is_replaced(self) -> bool:
+        """True if the writer has since removed or recreated the pool (readers only)."""
+        return not self.is_writer and segment_replaced(self.name, POOL_HEADER_DTYPE, self.generation)
+
+    def _fit_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale frames that do not fit into a slot."""
+        if frame.nbytes <= self.max_frame_bytes:
+            return frame
+        scale = (self.max_frame_bytes / frame.nbytes) ** 0.5
+        width = max(1, int(frame.shape[1] * scale))
+        height = max(1, int(frame.shape[0] * scale))
+        if not self._warned_oversize:
+            logger.warning(
+                f"Frame {frame.shape} exceeds shared slot size ({self.max_frame_bytes} bytes); "
+                f"downscaling to {width}x{height}. Raise FRAME_POOL_MAX_BYTES to avoid this."
+            )
+            self._warned_oversize = True
+        return cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """
+        Copy a raw frame into the next slot and wake waiting readers.
+
+        Args:
+            frame: Image array (H x W or H x W x C)
+            timestamp: Wall clock capture time (defaults to now)
+
+        Returns:
+            int: Sequence number assigned to the frame
+        """
+        if not self.is_writer:
+            raise RuntimeError("Only the process that created the frame pool may write to it")
+
+        frame = np.ascontiguousarray(self._fit_frame(frame))
+        with self._write_lock:
+            sequence = self.latest_sequence + 1
+            index = sequence % self.slot_count
+            header = self._slot_headers[index]
+            header["seq"] = (sequence << 1) | 1  # odd: write in progress
+            header["timestamp"] = time.time() if timestamp is None else timestamp
+            header["monotonic"] = time.monotonic()
+            header["height"] = frame.shape[0]
+            header["width"] = frame.shape[1] if frame.ndim > 1 else 1
+            header["channels"] = frame.shape[2] if frame.ndim > 2 else 0
+            header["dtype"] = frame.dtype.str.encode("ascii")
+            header["nbytes"] = frame.nbytes
+            self._slot_data[index][: frame.nbytes] = frame.reshape(-1).view(np.uint8)
+            header["seq"] = sequence << 1  # even: frame complete
+            self._latest_seq[0] = sequence
+            self._event.notify()
+            return sequence
+
+    def _slot_info(self, index: int, sequence: int) -> FrameInfo:
+        header = self._slot_headers[index][0]
+        channels = int(header["channels"])
+        shape = (int(header["height"]), int(header["width"])) + ((channels,) if channels else ())
+        return FrameInfo(
+            sequence=sequence,
+            timestamp=float(header["timestamp"]),
+            monotonic=float(header["monotonic"]),
+            shape=shape,
+            dtype=np.dtype(header["dtype"].decode("ascii")),
+        )
+
+    def _slot_is(self, index: int, sequence: int) -> bool:
+        return int(self._slot_headers[index]["seq"][0]) == sequence << 1
+
+    def process_latest(self, func, max_age: Optional[float] = FRAME_MAX_AGE) -> Optional[Tuple[FrameInfo, Any]]:
+        """
+        Run ``func(frame_view, info)`` directly on the newest slot without copying it.
+
+        The view is only valid for the duration of the call; the result is
+        discarded and the call repeated if the writer recycled the slot meanwhile.
+
+        Args:
+            func: Callable receiving a read-only view of the frame and its FrameInfo
+            max_age: Ignore frames older than this many seconds (None to disable)
+
+        Returns:
+            tuple: (FrameInfo, result of ``func``) or None if no valid frame exists
+        """
+        for _ in range(MAX_READ_RETRIES):
+            sequence = self.latest_sequence
+            if sequence == 0:
+                return None
+            index = sequence % self.slot_count
+            if not self._slot_is(index, sequence):
+                continue
+            info = self._slot_info(index, sequence)
+            if max_age is not None and info.age > max_age:
+                return None
+            nbytes = int(np.prod(info.shape)) * info.dtype.itemsize
+            view = self._slot_data[index][:nbytes].view(info.dtype).reshape(info.shape)
+            view.flags.writeable = False
+            result = func(view, info)
+            if self._slot_is(index, sequence):
+                return info, result
+        return None
+
+    def read_latest(self, max_age: Optional[float] = FRAME_MAX_AGE) -> Optional[Tuple[FrameInfo, np.ndarray]]:
+        """
+        Copy out the newest frame.
+
+        Returns:
+            tuple: (FrameInfo, private copy of the frame) or None if unavailable
+        """
+        return self.process_latest(lambda view, info: view.copy(), max_age=max_age)
+
+    def wait_for_frame(self, after_sequence: int, timeout: float) -> bool:
+        """
+        Block until a frame other than ``after_sequence`` is published.
+
+        Args:
+            after_sequence: Last sequence number the caller has handled
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            bool: True if a different frame is available
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            seen = self._event.value
+            # A lower sequence than the caller's means the writer restarted
+            if self.latest_sequence not in (0, after_sequence):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._event.wait(seen, remaining)
+
+    def close(self, unlink: Optional[bool] = None):
+        """
+        Detach from the pool.
+
+        Args:
+            unlink: Remove the segment from the system. Defaults to True for the
+                    writer and False for readers.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._event.close()
+        self._header = None
+        self._latest_seq = None
+        self._slot_headers = []
+        self._slot_data = []
+        if self.is_writer if unlink is None else unlink:
+            unlink_shared_memory(self._shm)
+        else:
+            self._shm.close()
+
 
 class CameraFrameSharer:
     """
-    Manages sharing of camera frames between processes via the filesystem.
-    
-    The main process writes frames to a shared location, and the web process
-    reads them. This avoids camera hardware conflicts.
+    Manages sharing of camera frames between processes via shared memory.
+
+    The main process publishes raw frames into a shared frame pool, and the
+    web process reads them. This avoids camera hardware conflicts and keeps
+    JPEG encoding out of the main process entirely.
     """
-    
-    def __init__(self, share_dir: str = "/tmp/mower_camera_share"):
+
+    def __init__(self, pool_name: str = FRAME_POOL_NAME, jpeg_quality: int = JPEG_QUALITY):
         """
         Initialize the frame sharer.
-        
+
         Args:
-            share_dir: Directory to use for sharing frames
-        """
-        self.share_dir = share_dir
-        self.frame_path = os.path.join(share_dir, "current_frame.jpg")
-        self.metadata_path = os.path.join(share_dir, "frame_metadata.json")
-        self.lock_path = os.path.join(share_dir, "frame.lock")
-        
-        # Ensure share directory exists
-        os.makedirs(share_dir, exist_ok=True)
-        
-        # Initialize metadata
-        self.frame_count = 0
-        self.last_update = 0
-        
-        logger.info(f"CameraFrameSharer initialized with share_dir: {share_dir}")
-    
-    def write_frame(self, frame_bytes: bytes) -> bool:
-        """
-        Write a frame to the shared location (called by main process).
-        
+            pool_name: Name of the shared memory frame pool
+            jpeg_quality: Quality used when a reader asks for JPEG bytes
+        """
+        self.pool_name = pool_name
+        self.jpeg_quality = jpeg_quality
+        self._pool: Optional[SharedFramePool] = None
+        self._pool_lock = threading.Lock()
+        self._last_attach_attempt = 0.0
+        self._last_replaced_check = 0.0
+
+        # JPEG cache so concurrent viewers share one encode per frame
+        self._jpeg_lock = threading.Lock()
+        self._jpeg_sequence = 0
+        self._jpeg_key: Optional[Tuple[int, int, float]] = None
+        self._jpeg_bytes: Optional[bytes] = None
+        self.jpeg_encode_count = 0
+
+        logger.info(f"CameraFrameSharer initialized with shared frame pool: {pool_name}")
+
+    @property
+    def frame_count(self) -> int:
+        """Number of frames published so far."""
+        pool = self._get_reader()
+        return pool.latest_sequence if pool else 0
+
+    def _get_writer(self) -> SharedFramePool:
+        with self._pool_lock:
+            if self._pool is None or not self._pool.is_writer:
+                if self._pool is not None:
+                    self._pool.close()
+                self._pool = SharedFramePool(self.pool_name, create=True)
+                logger.info(
+                    f"Created shared frame pool '{self.pool_name}' "
+                    f"({self._pool.slot_count} slots x {self._pool.max_frame_bytes} bytes)"
+                )
+            return self._pool
+
+    def _get_reader(self) -> Optional[SharedFramePool]:
+        with self._pool_lock:
+            if self._pool is not None and not self._pool.is_writer:
+                self._drop_replaced_pool()
+            if self._pool is None:
+                now = time.monotonic()
+                if now - self._last_attach_attempt < ATTACH_RETRY_INTERVAL:
+                    return None
+                self._last_attach_attempt = now
+                try:
+                    self._pool = SharedFramePool(self.pool_name)
+                    logger.info(f"Attached to shared frame pool '{self.pool_name}'")
+                except FileNotFoundError:
+                    logger.debug("Shared frame pool not created yet")
+                except ValueError as e:
+                    logger.warning(f"Incompatible shared frame pool: {e}")
+            return self._pool
+
+    def _drop_replaced_pool(self):
+        """Forget a pool the writer has recreated, checking at most once per second while idle."""
+        pool = self._pool
+        now = time.monotonic()
+        if now - self._last_replaced_check < 1.0:
+            return
+        latest = pool.process_latest(lambda view, info: None, max_age=None)
+        if latest is not None and latest[0].age < 1.0:
+            return  # frames are flowing, nothing to check
+        self._last_replaced_check = now
+        if pool.is_replaced():
+            logger.info("Writer recreated the shared frame pool, reattaching")
+            pool.close()
+            self._pool = None
+            self._last_attach_attempt = 0.0
+            with self._jpeg_lock:
+                # Sequence numbers restart with the new pool
+                self._jpeg_sequence = 0
+                self._jpeg_key = None
+                self._jpeg_bytes = None
+
+    def write_frame(self, frame: Union[np.ndarray, bytes]) -> bool:
+        """
+        Publish a frame to the shared pool (called by main process).
+
         Args:
-            frame_bytes: JPEG encoded frame data
-            
+            frame: Raw image array. JPEG bytes are accepted for backward
+                   compatibility and decoded before sharing.
+
         Returns:
             bool: True if frame was written successfully
         """
         try:
-            # Use a lock file to prevent reading while writing
-            with open(self.lock_path, 'w') as lock_file:
-                lock_file.write(str(os.getpid()))
-                
-                # Write the frame
-                with open(self.frame_path, 'wb') as f:
-                    f.write(frame_bytes)
-                
-                # Update metadata
-                self.frame_count += 1
-                self.last_update = time.time()
-                
-                metadata = {
-                    'frame_count': self.frame_count,
-                    'timestamp': self.last_update,
-                    'size': len(frame_bytes),
-                    'writer_pid': os.getpid()
-                }
-                
-                with open(self.metadata_path, 'w') as f:
-                    json.dump(metadata, f)
-            
-            # Remove lock file
-            if os.path.exists(self.lock_path):
-                os.remove(self.lock_path)
-                
+            if isinstance(frame, (bytes, bytearray)):
+                frame = cv2.imdecode(np.frombuffer(frame, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if frame is None:
+                    logger.debug("Could not decode JPEG frame for sharing")
+                    return False
+            if not isinstance(frame, np.ndarray) or frame.size == 0:
+                return False
+            self._get_writer().write(frame)
             return True
-            
         except Exception as e:
             logger.error(f"Failed to write frame: {e}")
-            # Clean up lock file on error
-            if os.path.exists(self.lock_path):
-                try:
-                    os.remove(self.lock_path)
-                except:
-                    pass
             return False
-    
+
+    def wait_for_frame(self, after_sequence: int = 0, timeout: float = 1.0) -> int:
+        """
+        Block until a frame newer than ``after_sequence`` exists.
+
+        Args:
+            after_sequence: Last sequence number the caller has handled
+            timeout: Maximum time to wait
+
+        Returns:
+            int: Newest sequence number, or ``after_sequence`` on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            pool = self._get_reader()
+            remaining = deadline - time.monotonic()
+            if pool is None:
+                # Writer has not created the pool yet; retry attaching until the deadline
+                if remaining <= 0:
+                    return after_sequence
+                time.sleep(min(remaining, ATTACH_RETRY_INTERVAL))
+                continue
+            # Wake up at least once a second so a restarted writer is noticed
+            if pool.wait_for_frame(after_sequence, max(0.0, min(remaining, 1.0))):
+                return pool.latest_sequence
+            if remaining <= 1.0:
+                return after_sequence
+
+    def read_raw_frame(self, timeout: float = 1.0, after_sequence: int = 0) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Read the newest raw frame.
+
+        Args:
+            timeout: Maximum time to wait for a frame newer than ``after_sequence``
+            after_sequence: Last sequence number the caller has handled
+
+        Returns:
+            tuple: (sequence, frame copy) or None if no fresh frame is available
+        """
+        self.wait_for_frame(after_sequence, timeout)
+        pool = self._get_reader()
+        if pool is None:
+            return None
+        latest = pool.read_latest()
+        if latest is None:
+            return None
+        info, frame = latest
+        return info.sequence, frame
+
+    def read_jpeg(
+        self,
+        timeout: float = 1.0,
+        after_sequence: int = 0,
+        quality: Optional[int] = None,
+        scale: float = 1.0,
+    ) -> Tuple[int, Optional[bytes]]:
+        """
+        Read the newest frame as JPEG, encoding each frame at most once.
+
+        The encode runs directly on the shared slot, so the raw frame is
+        never copied out of shared memory.
+
+        Args:
+            timeout: Maximum time to wait for a frame newer than ``after_sequence``
+            after_sequence: Last sequence number the caller has handled
+            quality: JPEG quality; defaults to ``jpeg_quality``
+            scale: Downscale factor applied before encoding
+
+        Returns:
+            tuple: (sequence, JPEG bytes) or (after_sequence, None) if unavailable
+        """
+        self.wait_for_frame(after_sequence, timeout)
+        pool = self._get_reader()
+        if pool is None:
+            return after_sequence, None
+
+        quality = self.jpeg_quality if quality is None else int(quality)
+        with self._jpeg_lock:
+            cache_key = (pool.latest_sequence, quality, scale)
+            if self._jpeg_bytes is not None and self._jpeg_key == cache_key:
+                return self._jpeg_sequence, self._jpeg_bytes
+
+            def encode(view, info):
+                if scale < 1.0:
+                    size = (max(1, int(view.shape[1] * scale)), max(1, int(view.shape[0] * scale)))
+                    view = cv2.resize(view, size, interpolation=cv2.INTER_AREA)
+                ok, buffer = cv2.imencode(".jpg", view, [cv2.IMWRITE_JPEG_QUALITY, quality])
+                return buffer.tobytes() if ok else None
+
+            result = pool.process_latest(encode)
+            if result is None or result[1] is None:
+                return after_sequence, None
+            info, jpeg_bytes = result
+            self.jpeg_encode_count += 1
+            self._jpeg_sequence = info.sequence
+            self._jpeg_key = (info.sequence, quality, scale)
+            self._jpeg_bytes = jpeg_bytes
+            return info.sequence, jpeg_bytes
+
     def read_frame(self, timeout: float = 1.0) -> Optional[bytes]:
         """
-        Read the latest frame from the shared location (called by web process).
-        
+        Read the latest frame as JPEG bytes (called by web process).
+
         Args:
             timeout: Maximum time to wait for a frame
-            
+
         Returns:
             Optional[bytes]: JPEG encoded frame data or None if not available
         """
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            try:
-                # Check if lock file exists (main process is writing)
-                if os.path.exists(self.lock_path):
-                    time.sleep(0.01)  # Wait a bit and try again
-                    continue
-                
-                # Check if frame file exists
-                if not os.path.exists(self.frame_path):
-                    time.sleep(0.1)
-                    continue
-                
-                # Read metadata to check if frame is fresh
-                if os.path.exists(self.metadata_path):
-                    try:
-                        with open(self.metadata_path, 'r') as f:
-                            metadata = json.load(f)
-                        
-                        # Check if frame is too old (more than 5 seconds)
-                        if time.time() - metadata.get('timestamp', 0) > 5.0:
-                            logger.debug("Shared frame is too old, skipping")
-                            time.sleep(0.1)
-                            continue
-                            
-                    except (json.JSONDecodeError, IOError):
-                        # If metadata is corrupted, still try to read the frame
-                        pass
-                
-                # Read the frame
-                with open(self.frame_path, 'rb') as f:
-                    frame_data = f.read()
-                
-                if len(frame_data) > 0:
-                    logger.debug(f"Read shared frame: {len(frame_data)} bytes")
-                    return frame_data
-                    
-            except Exception as e:
-                logger.debug(f"Error reading shared frame: {e}")
-                
-            time.sleep(0.05)  # Small delay before retry
-        
-        logger.debug("No valid shared frame available within timeout")
-        return None
-    
+        _, jpeg_bytes = self.read_jpeg(timeout=timeout)
+        return jpeg_bytes
+
     def get_metadata(self) -> Optional[Dict[str, Any]]:
         """
         Get metadata about the current shared frame.
-        
+
         Returns:
             Optional[Dict]: Metadata dictionary or None if not available
         """
-        try:
-            if os.path.exists(self.metadata_path):
-                with open(self.metadata_path, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            logger.debug(f"Error reading metadata: {e}")
-        
-        return None
-    
+        pool = self._get_reader()
+        if pool is None:
+            return None
+        result = pool.process_latest(lambda view, info: view.nbytes, max_age=None)
+        if result is None:
+            return None
+        info, size = result
+        return {
+            "frame_count": info.sequence,
+            "timestamp": info.timestamp,
+            "age": info.age,
+            "shape": list(info.shape),
+            "dtype": info.dtype.str,
+            "size": size,
+            "writer_pid": int(pool._header["writer_pid"][0]),
+        }
+
     def is_frame_available(self) -> bool:
         """
         Check if a current frame is available.
-        
+
         Returns:
             bool: True if a frame is available and recent
         """
         metadata = self.get_metadata()
-        if not metadata:
-            return False
-        
-        # Check if frame is recent (within last 2 seconds)
-        age = time.time() - metadata.get('timestamp', 0)
-        return age < 2.0 and os.path.exists(self.frame_path)
-    
+        return bool(metadata) and metadata["age"] < 2.0
+
     def cleanup(self):
-        """Clean up shared files."""
-        try:
-            for path in [self.frame_path, self.metadata_path, self.lock_path]:
-                if os.path.exists(path):
-                    os.remove(path)
-            logger.info("Cleaned up shared camera files")
-        except Exception as e:
-            logger.error(f"Error cleaning up shared files: {e}")
+        """Release the shared frame pool (the writer also removes it)."""
+        with self._pool_lock:
+            if self._pool is not None:
+                try:
+                    self._pool.close()
+                    logger.info("Released shared camera frame pool")
+                except Exception as e:
+                    logger.error(f"Error releasing shared frame pool: {e}")
+                self._pool = None
 
 
 # Global instance for sharing frames
@@ -200,7 +614,7 @@ _frame_sharer_lock = threading.Lock()
 def get_frame_sharer() -> CameraFrameSharer:
     """
     Get the global frame sharer instance.
-    
+
     Returns:
         CameraFrameSharer: The global frame sharer instance
     """
@@ -0,0 +1,195 @@
+"""
+Building blocks for per-sensor asynchronous sampling.
+
+``AsyncSensorManager`` runs one ``SensorSampler`` per sensor. Each sampler
+has its own rate, read timeout and circuit breaker (the shared
+``mower.error_handling.circuit_breaker`` implementation); every blocking read
+that touches the I2C bus goes through the shared ``BusArbiter`` so only one
+transaction is on the bus at a time. Results land in a ``LatestValueCache``
+that callers on any thread read without waiting for hardware.
+
+Nothing in this module imports hardware libraries, so it can be used and
+tested on any platform.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from mower.error_handling.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedReading:
+    """Latest value of one sensor with the time it was read."""
+
+    value: Any
+    monotonic: float  # time.monotonic() at the read, for age checks
+    timestamp: float  # time.time() at the read, for display
+
+    @property
+    def age(self) -> float:
+        """Seconds since the reading was taken."""
+        return time.monotonic() - self.monotonic
+
+
+class LatestValueCache:
+    """Thread-safe map of sensor name to its most recent ``CachedReading``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._readings: Dict[str, CachedReading] = {}
+
+    def update(self, name: str, value: Any):
+        reading = CachedReading(value, time.monotonic(), time.time())
+        with self._lock:
+            self._readings[name] = reading
+
+    def get(self, name: str) -> Optional[CachedReading]:
+        with self._lock:
+            return self._readings.get(name)
+
+    def snapshot(self) -> Dict[str, CachedReading]:
+        """Copy of every cached reading; never waits on hardware."""
+        with self._lock:
+            return dict(self._readings)
+
+    def clear(self):
+        with self._lock:
+            self._readings.clear()
+
+
+class BusArbiter:
+    """
+    Serializes blocking calls onto one worker thread.
+
+    All sensors on a shared bus submit their reads here, so bus transactions
+    never interleave. A call that exceeds its timeout is abandoned by the
+    caller, but the worker stays busy until the driver returns; later calls
+    queue behind it, and the sensors' circuit breakers back off meanwhile.
+    """
+
+    def __init__(self, name: str = "i2c-bus"):
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self.calls = 0
+        self.timeouts = 0
+
+    async def run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run ``func(*args)`` on the bus thread.
+
+        Raises:
+            asyncio.TimeoutError: If the call takes longer than ``timeout``
+        """
+        self.calls += 1
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SensorSampler:
+    """
+    Reads one sensor at a fixed rate into the cache.
+
+    Deadlines are kept on an absolute monotonic schedule; when a read
+    overruns, missed samples are skipped rather than read back to back.
+    While the circuit breaker is open the sensor is not touched and the
+    cache keeps its last (ageing) reading.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        read: Callable[[], Awaitable[Any]],
+        cache: LatestValueCache,
+        rate_hz: float,
+        timeout: float,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            name: Cache key for this sensor
+            read: Coroutine function returning one reading
+            cache: Cache receiving successful readings
+            rate_hz: Sampling frequency
+            timeout: Maximum seconds a single read may take
+            breaker: Circuit breaker for this sensor
+        """
+        if rate_hz <= 0:
+            raise ValueError(f"Sensor '{name}' needs a positive rate, got {rate_hz}")
+        self.name = name
+        self.read = read
+        self.cache = cache
+        self.period = 1.0 / rate_hz
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker(f"sensor.{name}", failure_threshold=5, timeout=10.0)
+        self.reads = 0
+        self.errors = 0
+        self.skipped = 0
+        self.last_error: Optional[str] = None
+
+    async def _read_with_timeout(self):
+        return await asyncio.wait_for(self.read(), self.timeout)
+
+    async def sample_once(self) -> bool:
+        """
+        Take one reading unless the breaker is open.
+
+        Returns:
+            bool: True if a reading was cached
+        """
+        try:
+            value = await self.breaker.call_async(self._read_with_timeout)
+        except asyncio.CancelledError:
+            raise
+        except CircuitBreakerOpenError:
+            self.skipped += 1
+            return False
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e) or type(e).__name__
+            logger.debug("Sensor '%s' read failed: %s", self.name, self.last_error)
+            return False
+        self.reads += 1
+        self.cache.update(self.name, value)
+        return True
+
+    async def run(self):
+        """Sample until cancelled."""
+        deadline = time.monotonic()
+        while True:
+            await self.sample_once()
+            deadline += self.period
+            now = time.monotonic()
+            if deadline <= now:
+                deadline += ((now - deadline) // self.period + 1) * self.period
+            await asyncio.sleep(deadline - now)
+
+    def status(self) -> Dict[str, Any]:
+        """Counters and breaker state for status reports."""
+        reading = self.cache.get(self.name)
+        return {
+            "rate_hz": round(1.0 / self.period, 3),
+            "reads": self.reads,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "last_error": self.last_error,
+            "breaker": self.breaker.state.value,
+            "age_s": round(reading.age, 3) if reading else None,
+            "timestamp": reading.timestamp if reading else None,
+        }
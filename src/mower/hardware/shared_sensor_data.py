@@ -6,138 +6,600 @@ the main controller process and the web UI process, avoiding the
 multiprocessing limitations that prevent direct resource sharing.
 
 Key features:
-- Atomic file writes to prevent corruption
-- Timestamp-based staleness detection  
+- Shared-memory seqlock ring buffer with a fixed binary snapshot layout
+- Lock-free, parse-free reads in the web process
+- Staleness reported per read from the snapshot sequence counter
+- Optional JSON debug mirror on disk (off by default)
 - Fallback to safe defaults
-- Minimal latency impact on main process
 """
 import json
-import time
-import threading
-import tempfile
+import math
 import os
-from typing import Dict, Any, Optional
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Dict, Optional
 
+import numpy as np
+
+from mower.ipc.shared_memory import SeqlockRingBuffer
 from mower.utilities.logger_config import LoggerConfigInfo
 
 logger = LoggerConfigInfo.get_logger(__name__)
 
-# Shared data file location
-SHARED_DATA_PATH = Path("/tmp/mower_sensor_data.json")
+# Shared memory segment holding the snapshot ring
+SHARED_DATA_SEGMENT = os.environ.get("MOWER_SENSOR_SHM_NAME", "mower_sensor_snapshots")
+SHARED_DATA_RING_SLOTS = 16
 SHARED_DATA_MAX_AGE = 10.0  # seconds - consider data stale after this
 
+# Optional JSON mirror of the latest snapshot for debugging only
+SHARED_DATA_PATH = Path("/tmp/mower_sensor_data.json")
+SHARED_DATA_DEBUG_MIRROR = os.environ.get("MOWER_SENSOR_JSON_MIRROR", "false").lower() in ("1", "true", "yes")
+
+# Value used by the web UI for readings that are not available
+UNAVAILABLE = "N/A"
+
+# Section presence bits
+SECTION_IMU = 1 << 0
+SECTION_ENVIRONMENT = 1 << 1
+SECTION_TOF = 1 << 2
+SECTION_POWER = 1 << 3
+SECTION_GPS = 1 << 4
+
+# Ordered sensor states so they can be stored as a single byte
+SENSOR_STATE_NAMES = ("unknown", "uninitialized", "initializing", "operational", "degraded", "failed")
+SENSOR_STATE_KEYS = ("imu", "environment", "power", "tof")
+
+_XYZ = [("x", "<f8"), ("y", "<f8"), ("z", "<f8")]
+_POWER_CHANNEL = [("bus_voltage", "<f8"), ("shunt_voltage", "<f8"), ("current", "<f8")]
+
+SENSOR_SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),  # wall clock, for display
+        ("monotonic", "<f8"),  # publish time on the shared monotonic clock
+        ("sections", "<u4"),
+        ("sensor_states", "u1", (len(SENSOR_STATE_KEYS),)),
+        ("imu_is_safe", "i1"),
+        ("tof_left_working", "i1"),
+        ("tof_right_working", "i1"),
+        ("tof_working", "i1"),  # combined flag from sources that report only one
+        ("power_charging", "i1"),
+        ("gps_fix_quality", "<i4"),
+        ("gps_satellites", "<i4"),
+        ("gps_utm_zone", "<i4"),
+        ("gps_utm_letter", "S1"),
+        ("_pad", "V2"),
+        (
+            "imu",
+            [
+                ("heading", "<f8"),
+                ("roll", "<f8"),
+                ("pitch", "<f8"),
+                ("quaternion", [("w", "<f8"), ("x", "<f8"), ("y", "<f8"), ("z", "<f8")]),
+                ("acceleration", _XYZ),
+                ("linear_acceleration", _XYZ),
+                ("gyroscope", _XYZ),
+                ("magnetometer", _XYZ),
+                ("calibration", [("system", "<f8"), ("gyro", "<f8"), ("accel", "<f8"), ("mag", "<f8")]),
+            ],
+        ),
+        (
+            "environment",
+            [("temperature_c", "<f8"), ("temperature_f", "<f8"), ("humidity", "<f8"), ("pressure", "<f8")],
+        ),
+        ("tof", [("left", "<f8"), ("right", "<f8")]),
+        (
+            "power",
+            [
+                ("voltage", "<f8"),
+                ("current", "<f8"),
+                ("power", "<f8"),
+                ("percentage", "<f8"),
+                ("solar_voltage", "<f8"),
+                ("solar_current", "<f8"),
+                ("solar_power", "<f8"),
+                ("channel_1", _POWER_CHANNEL),
+                ("channel_2", _POWER_CHANNEL),
+                ("channel_3", _POWER_CHANNEL),
+            ],
+        ),
+        (
+            "gps",
+            [
+                ("latitude", "<f8"),
+                ("longitude", "<f8"),
+                ("altitude", "<f8"),
+                ("speed", "<f8"),
+                ("hdop", "<f8"),
+                ("timestamp", "<f8"),
+                ("utm_easting", "<f8"),
+                ("utm_northing", "<f8"),
+            ],
+        ),
+    ]
+)
+
+
+# Keys the encoder handles outside the generic struct copy, per section
+_HANDLED_KEYS = {
+    "": ("timestamp", "status", "distance"),
+    "imu": ("safety_status",),
+    "environment": ("temperature",),
+    "tof": ("working", "left_working", "right_working"),
+    "distance": ("front_left", "front_right", "left_working", "right_working"),
+    "power": ("bus_voltage", "charging"),
+    "gps": ("fix_quality", "satellites", "utm_zone", "status"),
+}
+
+# Field paths already reported as dropped by the fixed layout
+_reported_dropped_fields = set()
+
+
+def _to_float(value: Any) -> float:
+    """Convert a reading to float, mapping anything non-numeric to NaN."""
+    if isinstance(value, bool) or value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_flag(value: Any) -> int:
+    """Encode an optional boolean as -1 (unknown), 0 or 1."""
+    if value is None or value == UNAVAILABLE:
+        return -1
+    return 1 if value else 0
+
+
+def _from_float(value: float) -> Any:
+    """Decode a stored float, mapping NaN back to the UI's unavailable marker."""
+    value = float(value)
+    return UNAVAILABLE if math.isnan(value) else value
+
+
+def _fill_struct(target: np.ndarray, source: Any):
+    """Copy numeric values from a (possibly nested) dict into a structured record."""
+    source = source if isinstance(source, dict) else {}
+    for name in target.dtype.names:
+        if target.dtype[name].names:
+            _fill_struct(target[name], source.get(name))
+        else:
+            target[name] = _to_float(source.get(name))
+
+
+def _read_struct(source: np.void) -> Dict[str, Any]:
+    """Convert a structured record back into a nested dict."""
+    result = {}
+    for name in source.dtype.names:
+        if source.dtype[name].names:
+            result[name] = _read_struct(source[name])
+        else:
+            result[name] = _from_float(source[name])
+    return result
+
+
+def _unmapped_fields(dtype: np.dtype, source: Dict[str, Any], path: str = "") -> list:
+    """Paths of the fields in ``source`` that have no place in ``dtype``."""
+    handled = _HANDLED_KEYS.get(path, ())
+    unmapped = []
+    for key, value in source.items():
+        field_path = f"{path}.{key}" if path else str(key)
+        if key in handled:
+            continue
+        if key not in (dtype.names or ()):
+            unmapped.append(field_path)
+        elif dtype[key].names:
+            if isinstance(value, dict):
+                unmapped.extend(_unmapped_fields(dtype[key], value, field_path))
+            elif value is not None and value != UNAVAILABLE:
+                unmapped.append(field_path)
+    return unmapped
+
+
+def _report_dropped_fields(sensor_data: Dict[str, Any]):
+    """Log each field the snapshot layout cannot carry, once per process."""
+    new_fields = [
+        field for field in _unmapped_fields(SENSOR_SNAPSHOT_DTYPE, sensor_data) if field not in _reported_dropped_fields
+    ]
+    if new_fields:
+        _reported_dropped_fields.update(new_fields)
+        logger.warning(f"Sensor snapshot layout drops fields: {', '.join(sorted(new_fields))}")
+
+
+def encode_sensor_snapshot(sensor_data: Dict[str, Any], timestamp: Optional[float] = None) -> np.ndarray:
+    """
+    Pack a sensor data dict into a fixed-layout binary snapshot record.
+
+    Fields the layout has no slot for are dropped; each one is logged the
+    first time it is seen.
+
+    Args:
+        sensor_data: Dictionary in the format produced by the sensor interface
+        timestamp: Wall clock time of the snapshot (defaults to now)
+
+    Returns:
+        np.ndarray: A zero-dimensional ``SENSOR_SNAPSHOT_DTYPE`` record
+    """
+    _report_dropped_fields(sensor_data)
+    record = np.zeros((), dtype=SENSOR_SNAPSHOT_DTYPE)
+    record["timestamp"] = time.time() if timestamp is None else timestamp
+    record["monotonic"] = time.monotonic()
+    sections = 0
+
+    imu = sensor_data.get("imu")
+    if isinstance(imu, dict):
+        sections |= SECTION_IMU
+        _fill_struct(record["imu"], imu)
+        safety = imu.get("safety_status")
+        record["imu_is_safe"] = _to_flag(safety.get("is_safe") if isinstance(safety, dict) else None)
+
+    environment = sensor_data.get("environment")
+    if isinstance(environment, dict):
+        sections |= SECTION_ENVIRONMENT
+        _fill_struct(record["environment"], environment)
+        if "temperature_c" not in environment and "temperature" in environment:
+            record["environment"]["temperature_c"] = _to_float(environment["temperature"])
+
+    # Hardware reports "tof" with left/right, older paths use "distance" with front_left/front_right
+    tof = sensor_data.get("tof")
+    distance = sensor_data.get("distance")
+    if isinstance(tof, dict):
+        sections |= SECTION_TOF
+        _fill_struct(record["tof"], tof)
+        record["tof_left_working"] = _to_flag(tof.get("left_working"))
+        record["tof_right_working"] = _to_flag(tof.get("right_working"))
+        record["tof_working"] = _to_flag(tof.get("working"))
+    elif isinstance(distance, dict):
+        sections |= SECTION_TOF
+        record["tof"]["left"] = _to_float(distance.get("front_left"))
+        record["tof"]["right"] = _to_float(distance.get("front_right"))
+        record["tof_left_working"] = _to_flag(distance.get("left_working"))
+        record["tof_right_working"] = _to_flag(distance.get("right_working"))
+        record["tof_working"] = -1
+
+    power = sensor_data.get("power")
+    if isinstance(power, dict):
+        sections |= SECTION_POWER
+        _fill_struct(record["power"], power)
+        if "voltage" not in power and "bus_voltage" in power:
+            record["power"]["voltage"] = _to_float(power["bus_voltage"])
+        record["power_charging"] = _to_flag(power.get("charging"))
+
+    gps = sensor_data.get("gps")
+    if isinstance(gps, dict):
+        sections |= SECTION_GPS
+        _fill_struct(record["gps"], gps)
+        fix_quality = gps.get("fix_quality", 0)
+        record["gps_fix_quality"] = fix_quality if isinstance(fix_quality, int) else 0
+        satellites = gps.get("satellites", 0)
+        record["gps_satellites"] = satellites if isinstance(satellites, int) else 0
+        zone = gps.get("utm_zone")
+        if isinstance(zone, (list, tuple)) and len(zone) == 2:
+            record["gps_utm_zone"] = int(zone[0])
+            record["gps_utm_letter"] = str(zone[1]).encode("ascii")[:1]
+        elif isinstance(zone, int):
+            record["gps_utm_zone"] = zone
+
+    status = sensor_data.get("status")
+    if isinstance(status, dict):
+        for index, key in enumerate(SENSOR_STATE_KEYS):
+            state = status.get(key, {})
+            state = state.get("state") if isinstance(state, dict) else state
+            state = getattr(state, "value", state)
+            record["sensor_states"][index] = (
+                SENSOR_STATE_NAMES.index(state) if state in SENSOR_STATE_NAMES else 0
+            )
+
+    record["sections"] = sections
+    return record
+
+
+def decode_sensor_snapshot(record: np.void) -> Dict[str, Any]:
+    """
+    Unpack a binary snapshot record into the dict format used by the web UI.
+
+    Sections that were absent when the snapshot was written are omitted, and
+    missing readings are reported as ``"N/A"``.
+
+    Args:
+        record: A ``SENSOR_SNAPSHOT_DTYPE`` record
+
+    Returns:
+        dict: Sensor data keyed by section
+    """
+    sections = int(record["sections"])
+    data: Dict[str, Any] = {"timestamp": float(record["timestamp"])}
+
+    if sections & SECTION_IMU:
+        imu = _read_struct(record["imu"])
+        calibration = {key: int(value) for key, value in imu["calibration"].items() if value != UNAVAILABLE}
+        imu["calibration"] = calibration or UNAVAILABLE
+        is_safe = int(record["imu_is_safe"])
+        imu["safety_status"] = (
+            {"is_safe": bool(is_safe), "status": "ok" if is_safe else "tilt_exceeded"}
+            if is_safe >= 0
+            else {"is_safe": False, "status": "sensor_unavailable"}
+        )
+        data["imu"] = imu
+
+    if sections & SECTION_ENVIRONMENT:
+        environment = _read_struct(record["environment"])
+        environment["temperature"] = environment["temperature_c"]
+        data["environment"] = environment
+
+    if sections & SECTION_TOF:
+        tof = _read_struct(record["tof"])
+        flags = {
+            key: int(record[field])
+            for key, field in (("left_working", "tof_left_working"), ("right_working", "tof_right_working"))
+        }
+        for key, flag in flags.items():
+            if flag >= 0:
+                tof[key] = bool(flag)
+        working = int(record["tof_working"])
+        if working >= 0:
+            tof["working"] = bool(working)
+        elif any(flag >= 0 for flag in flags.values()):
+            tof["working"] = all(flag != 0 for flag in flags.values())
+        data["tof"] = tof
+
+    if sections & SECTION_POWER:
+        power = _read_struct(record["power"])
+        charging = int(record["power_charging"])
+        if charging >= 0:
+            power["charging"] = bool(charging)
+        data["power"] = power
+
+    if sections & SECTION_GPS:
+        gps = _read_struct(record["gps"])
+        fix_quality = int(record["gps_fix_quality"])
+        gps["fix_quality"] = fix_quality
+        gps["satellites"] = int(record["gps_satellites"])
+        gps["status"] = "valid" if fix_quality >= 1 else "no_fix"
+        for key in ("latitude", "longitude", "timestamp", "utm_easting", "utm_northing"):
+            if gps[key] == UNAVAILABLE:
+                gps[key] = None
+        zone = int(record["gps_utm_zone"])
+        letter = bytes(record["gps_utm_letter"]).decode("ascii", errors="ignore")
+        gps["utm_zone"] = [zone, letter] if zone and letter else (zone or None)
+        data["gps"] = gps
+
+    states = record["sensor_states"]
+    if any(states):
+        data["status"] = {
+            key: {"state": SENSOR_STATE_NAMES[int(states[index])]}
+            for index, key in enumerate(SENSOR_STATE_KEYS)
+        }
+
+    return data
+
+
+@dataclass
+class SensorSnapshotRead:
+    """A decoded snapshot together with its freshness information."""
+
+    sequence: int
+    age: float
+    is_new: bool
+    missed: int
+    data: Dict[str, Any]
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the snapshot is older than ``SHARED_DATA_MAX_AGE``."""
+        return self.age > SHARED_DATA_MAX_AGE
+
+
 class SharedSensorDataManager:
     """
     Manages shared sensor data between processes.
-    
-    The main process writes real sensor data to a shared file,
-    and the web process reads from it to display real data
-    instead of dummy/random values.
+
+    The main process publishes real sensor data into a shared-memory
+    ring buffer, and the web process reads the newest snapshot from it
+    to display real data instead of dummy/random values.
     """
-    
-    def __init__(self):
+
+    def __init__(
+        self,
+        segment_name: str = SHARED_DATA_SEGMENT,
+        capacity: int = SHARED_DATA_RING_SLOTS,
+        debug_mirror: Optional[bool] = None,
+        mirror_path: Path = SHARED_DATA_PATH,
+    ):
+        """
+        Initialize the shared sensor data manager.
+
+        Args:
+            segment_name: Name of the shared memory segment
+            capacity: Number of snapshots kept in the ring (writer only)
+            debug_mirror: Also write each snapshot to ``mirror_path`` as JSON.
+                          Defaults to the MOWER_SENSOR_JSON_MIRROR environment flag.
+            mirror_path: Location of the JSON debug mirror
+        """
         self.logger = LoggerConfigInfo.get_logger(__name__)
+        self.segment_name = segment_name
+        self.capacity = capacity
+        self.debug_mirror = SHARED_DATA_DEBUG_MIRROR if debug_mirror is None else debug_mirror
+        self.mirror_path = Path(mirror_path)
         self._write_lock = threading.Lock()
-        
+        self._writer: Optional[SeqlockRingBuffer] = None
+        self._reader: Optional[SeqlockRingBuffer] = None
+        self._last_attach_attempt = 0.0
+        self._last_replaced_check = 0.0
+        self._last_sequence = 0
+
+    def _get_writer(self) -> SeqlockRingBuffer:
+        """Create the ring buffer on first write."""
+        if self._writer is None:
+            self._writer = SeqlockRingBuffer(
+                self.segment_name, SENSOR_SNAPSHOT_DTYPE, capacity=self.capacity, create=True
+            )
+            self.logger.info(
+                f"SharedSensorData: Created shared memory ring '{self.segment_name}' with {self.capacity} slots"
+            )
+        return self._writer
+
+    def _get_reader(self) -> Optional[SeqlockRingBuffer]:
+        """Attach to the writer's ring buffer, retrying at most once per second."""
+        if self._writer is not None:
+            return self._writer
+        if self._reader is None:
+            now = time.monotonic()
+            if now - self._last_attach_attempt < 1.0:
+                return None
+            self._last_attach_attempt = now
+            try:
+                self._reader = SeqlockRingBuffer(self.segment_name, SENSOR_SNAPSHOT_DTYPE)
+                self.logger.info(f"SharedSensorData: Attached to shared memory ring '{self.segment_name}'")
+            except FileNotFoundError:
+                self.logger.debug("SharedSensorData: Shared memory ring not created yet.")
+            except ValueError as e:
+                self.logger.warning(f"SharedSensorData: Incompatible shared memory ring: {e}")
+        return self._reader
+
+    def _check_writer_restarted(self):
+        """Drop a reader mapping that a restarted writer has replaced, at most once per second."""
+        if self._reader is None:
+            return
+        now = time.monotonic()
+        if now - self._last_replaced_check < 1.0:
+            return
+        self._last_replaced_check = now
+        if self._reader.is_replaced():
+            self.logger.info("SharedSensorData: Writer recreated the shared memory ring, reattaching.")
+            self._reader.close()
+            self._reader = None
+            self._last_sequence = 0
+            self._last_attach_attempt = 0.0
+
     def write_sensor_data(self, sensor_data: Dict[str, Any]) -> bool:
         """
         Write sensor data to shared storage (main process).
-        
+
         Args:
             sensor_data: Dictionary containing sensor readings
-            
+
         Returns:
             bool: True if write was successful
         """
         try:
             current_timestamp = time.time()
-            # Add timestamp for staleness detection
-            data_with_timestamp = {
-                "timestamp": current_timestamp,
-                "data": sensor_data
-            }
-            
-            # Atomic write using temporary file + rename
+            record = encode_sensor_snapshot(sensor_data, current_timestamp)
             with self._write_lock:
-                # Write to temporary file first
-                temp_path = SHARED_DATA_PATH.with_suffix('.tmp')
-                with open(temp_path, 'w') as f:
-                    json.dump(data_with_timestamp, f, indent=2)
-                
-                # Atomic rename to final location
-                temp_path.rename(SHARED_DATA_PATH)
-
-            self.logger.debug(f"SharedSensorData: Successfully wrote sensor data. Timestamp: {current_timestamp}, Data keys: {list(sensor_data.keys())}")
+                sequence = self._get_writer().write(record)
+                if self.debug_mirror:
+                    self._write_debug_mirror(sensor_data, current_timestamp, sequence)
             return True
-            
+
         except Exception as e:
             self.logger.error(f"SharedSensorData: Failed to write shared sensor data: {e}")
             return False
-    
+
+    def _write_debug_mirror(self, sensor_data: Dict[str, Any], timestamp: float, sequence: int):
+        """Mirror the snapshot to a JSON file for inspection; never used for transport."""
+        try:
+            temp_path = self.mirror_path.with_suffix(".tmp")
+            with open(temp_path, "w") as f:
+                json.dump({"timestamp": timestamp, "sequence": sequence, "data": sensor_data}, f, default=str)
+            temp_path.replace(self.mirror_path)
+        except Exception as e:
+            self.logger.debug(f"SharedSensorData: Failed to write JSON debug mirror: {e}")
+
+    def read_snapshot(self) -> Optional[SensorSnapshotRead]:
+        """
+        Read the newest snapshot together with its staleness.
+
+        Returns:
+            SensorSnapshotRead: Decoded data plus sequence, age and how many
+                                snapshots were skipped since the previous read,
+                                or None if nothing has been published yet
+        """
+        ring = self._get_reader()
+        if ring is None:
+            return None
+        latest = ring.read_latest()
+        if latest is None or time.monotonic() - float(latest.record["monotonic"]) > SHARED_DATA_MAX_AGE:
+            # Nothing fresh: the writer may have restarted and recreated the segment
+            self._check_writer_restarted()
+            ring = self._get_reader()
+            latest = ring.read_latest() if ring is not None else latest
+        if latest is None:
+            return None
+
+        age = max(0.0, time.monotonic() - float(latest.record["monotonic"]))
+        is_new = latest.sequence != self._last_sequence
+        missed = max(0, latest.sequence - self._last_sequence - 1) if self._last_sequence else 0
+        self._last_sequence = latest.sequence
+        return SensorSnapshotRead(
+            sequence=latest.sequence,
+            age=age,
+            is_new=is_new,
+            missed=missed,
+            data=decode_sensor_snapshot(latest.record),
+        )
+
     def read_sensor_data(self) -> Optional[Dict[str, Any]]:
         """
         Read sensor data from shared storage (web process).
-        
+
         Returns:
             dict: Sensor data if available and fresh, None otherwise
         """
         try:
-            if not SHARED_DATA_PATH.exists():
-                self.logger.debug("SharedSensorData: read_sensor_data - File not found.")
+            snapshot = self.read_snapshot()
+            if snapshot is None:
+                self.logger.debug("SharedSensorData: read_sensor_data - No snapshot published yet.")
                 return None
-                
-            with open(SHARED_DATA_PATH, 'r') as f:
-                data_with_timestamp = json.load(f)
-            
-            file_timestamp = data_with_timestamp.get("timestamp", 0)
-            current_time = time.time()
-            age = current_time - file_timestamp
-            
-            if age > SHARED_DATA_MAX_AGE:
-                self.logger.warning(f"SharedSensorData: read_sensor_data - Data is stale. Age: {age:.1f}s (Max age: {SHARED_DATA_MAX_AGE}s). Timestamp in file: {file_timestamp}.")
+
+            if snapshot.is_stale:
+                self.logger.warning(
+                    f"SharedSensorData: read_sensor_data - Data is stale. Age: {snapshot.age:.1f}s "
+                    f"(Max age: {SHARED_DATA_MAX_AGE}s). Sequence: {snapshot.sequence}."
+                )
                 return None
-            
-            retrieved_data = data_with_timestamp.get("data")
-            self.logger.debug(f"SharedSensorData: read_sensor_data - Successfully read fresh data. Age: {age:.1f}s. Data keys: {list(retrieved_data.keys()) if retrieved_data else 'None'}.")
-            return retrieved_data
 
-        except FileNotFoundError: # Should be caught by SHARED_DATA_PATH.exists() but good to be explicit
-            self.logger.debug("SharedSensorData: read_sensor_data - File not found (FileNotFoundError).")
-            return None
-        except json.JSONDecodeError as e:
-            self.logger.warning(f"SharedSensorData: read_sensor_data - Failed to decode JSON from file {SHARED_DATA_PATH}: {e}")
-            return None
+            return snapshot.data
+
         except Exception as e:
-            self.logger.warning(f"SharedSensorData: read_sensor_data - Failed to read shared sensor data due to unexpected error: {e}", exc_info=True)
+            self.logger.warning(
+                f"SharedSensorData: read_sensor_data - Failed to read shared sensor data due to unexpected error: {e}",
+                exc_info=True,
+            )
             return None
-    
+
     def is_data_fresh(self) -> bool:
         """
         Check if shared data exists and is fresh.
-        
+
         Returns:
             bool: True if data exists and is recent
         """
         try:
-            if not SHARED_DATA_PATH.exists():
+            ring = self._get_reader()
+            if ring is None:
+                return False
+            latest = ring.read_latest()
+            if latest is None:
                 return False
-                
-            with open(SHARED_DATA_PATH, 'r') as f:
-                data_with_timestamp = json.load(f)
-            
-            timestamp = data_with_timestamp.get("timestamp", 0)
-            age = time.time() - timestamp
-            
-            return age <= SHARED_DATA_MAX_AGE
-            
+            return time.monotonic() - float(latest.record["monotonic"]) <= SHARED_DATA_MAX_AGE
         except Exception:
             return False
-    
+
+    def close(self):
+        """Release the shared memory segment (the writer also removes it)."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
     def get_fallback_sensor_data(self) -> Dict[str, Any]:
         """
         Get safe fallback sensor data when real data is unavailable.
-        
+
         Returns:
             dict: Safe default sensor values
         """
@@ -4,12 +4,24 @@ Time-of-Flight (ToF) sensor module for the autonomous mower.
 This module implements VL53L0X sensors following the official CircuitPython
 documentation for multiple sensors on the same I2C bus with continuous mode.
 Based on: https://docs.circuitpython.org/projects/vl53l0x/en/latest/examples.html#multiple-vl53l0x-on-same-i2c-bus-and-with-continuous-mode
+
+With ``start_ranging()`` a background thread collects each sensor's samples
+as they complete (signalled by the sensor's interrupt pin, or its
+``data_ready`` flag when no pin is wired) into a per-sensor ``RangeFilter``.
+``get_range()`` and ``get_distances()`` then return the filtered value and its
+age without touching the bus, so one slow or failing sensor never stalls the
+obstacle checks.
 """
 
 import time
 import platform
 import logging
 import os
+import statistics
+import threading
+from collections import deque
+from typing import Optional, Tuple
+
 from dotenv import load_dotenv
 
 # Conditional hardware imports
@@ -89,6 +101,72 @@ except (ValueError, TypeError) as e:
     ]
     logger.warning("Using default ToF pin configuration.")
 
+# Continuous-ranging defaults
+RANGE_BUFFER_SIZE = 5  # samples kept per sensor for the median filter
+RANGE_OUTLIER_MM = 150  # minimum deviation from the median treated as an outlier
+RANGE_MAX_AGE_S = 0.5  # filtered values older than this are reported as -1
+RANGE_POLL_INTERVAL_S = 0.005  # interrupt pin polling period of the ranging thread
+
+
+class RangeFilter:
+    """
+    Ring buffer of recent samples from one sensor with median/outlier filtering.
+
+    Invalid samples (0 or out of range) are buffered as missing so that a
+    sensor that stops returning data is reported as invalid rather than
+    repeating its last good value. The filtered value is computed when a
+    sample is added, so reading it is just an attribute access.
+    """
+
+    def __init__(self, size: int = RANGE_BUFFER_SIZE, outlier_mm: float = RANGE_OUTLIER_MM):
+        self._samples: deque = deque(maxlen=size)
+        self.outlier_mm = outlier_mm
+        self.outliers = 0
+        # (filtered distance in mm or -1, monotonic time of the last valid sample)
+        self._latest: Tuple[int, Optional[float]] = (-1, None)
+
+    def add(self, distance: int, timestamp: Optional[float] = None):
+        """
+        Add a raw sample.
+
+        Args:
+            distance: Raw range in mm; values outside (0, 8190) are invalid
+            timestamp: Monotonic time of the sample, defaults to now
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        valid = 0 < distance < 8190
+        self._samples.append(distance if valid else None)
+
+        values = [d for d in self._samples if d is not None]
+        # Need a majority of valid samples before reporting anything
+        if len(values) * 2 <= len(self._samples):
+            self._latest = (-1, self._latest[1])
+            return
+        median = statistics.median(values)
+        spread = statistics.median(abs(d - median) for d in values)
+        limit = max(self.outlier_mm, 3 * 1.4826 * spread)
+        inliers = [d for d in values if abs(d - median) <= limit]
+        if valid and abs(distance - median) > limit:
+            self.outliers += 1
+        self._latest = (round(statistics.fmean(inliers)), timestamp if valid else self._latest[1])
+
+    def latest(self) -> Tuple[int, float]:
+        """
+        Filtered distance and its age.
+
+        Returns:
+            Tuple of (distance in mm or -1, seconds since the last valid
+            sample, inf if there never was one)
+        """
+        value, timestamp = self._latest
+        age = time.monotonic() - timestamp if timestamp is not None else float("inf")
+        return value, age
+
+    def clear(self):
+        self._samples.clear()
+        self._latest = (-1, None)
+
 
 class VL53L0XSensors:
     """
@@ -105,6 +183,10 @@ class VL53L0XSensors:
         self._interrupt_pins: dict[str, DigitalInOut | None] = {}
         self._i2c = i2c_bus
         self._owns_i2c = False
+        self._filters: dict[str, RangeFilter] = {}
+        self._ranging_thread: Optional[threading.Thread] = None
+        self._ranging_stop = threading.Event()
+        self.max_age = RANGE_MAX_AGE_S
 
         if simulate or not HARDWARE_AVAILABLE:
             logger.info("ToF: Using simulated data.")
@@ -262,9 +344,90 @@ class VL53L0XSensors:
 
         logger.info("ToF: Sensor initialization sequence complete")
 
+    def start_ranging(self, poll_interval: float = RANGE_POLL_INTERVAL_S):
+        """
+        Collect samples from every sensor in the background.
+
+        The sensors are already in continuous mode; this thread only picks
+        up each sample once the sensor signals it is ready, so it never
+        waits on a sensor that has no data.
+
+        Args:
+            poll_interval: Seconds between checks of the ready signals
+        """
+        if not self.is_hardware_available or self.ranging:
+            return
+        self._filters = {name: RangeFilter() for name, sensor in self._sensors.items() if sensor is not None}
+        self._ranging_stop.clear()
+        self._ranging_thread = threading.Thread(
+            target=self._ranging_loop, args=(poll_interval,), name="tof-ranging", daemon=True
+        )
+        self._ranging_thread.start()
+        logger.info(f"ToF: Background ranging started for {', '.join(self._filters)}")
+
+    def stop_ranging(self, timeout: float = 1.0):
+        """Stop the background ranging thread."""
+        self._ranging_stop.set()
+        if self._ranging_thread is not None:
+            self._ranging_thread.join(timeout=timeout)
+            self._ranging_thread = None
+
+    @property
+    def ranging(self) -> bool:
+        return self._ranging_thread is not None and self._ranging_thread.is_alive()
+
+    def _data_ready(self, name: str, sensor) -> bool:
+        """Whether a new sample is waiting, preferring the GPIO line over an I2C register read."""
+        pin = self._interrupt_pins.get(name)
+        if pin is not None:
+            return not pin.value  # GPIO1 is driven low when a sample is ready
+        return sensor.data_ready
+
+    def _ranging_loop(self, poll_interval: float):
+        failures = {name: 0 for name in self._filters}
+        last_recovery = {name: 0.0 for name in self._filters}
+        while not self._ranging_stop.is_set():
+            for name, range_filter in self._filters.items():
+                sensor = self._sensors.get(name)
+                try:
+                    if not self._data_ready(name, sensor):
+                        continue
+                    distance = sensor.range  # returns at once and clears the interrupt
+                except Exception as e:
+                    logger.debug(f"ToF: Background read failed for '{name}': {e}")
+                    distance = -1
+                range_filter.add(distance)
+
+                failures[name] = 0 if self._is_valid_reading(distance) else failures[name] + 1
+                if failures[name] >= 10 and time.monotonic() - last_recovery[name] > 30:
+                    logger.warning(f"ToF: Attempting recovery for sensor '{name}' after {failures[name]} failures")
+                    self._attempt_sensor_recovery(name, sensor)
+                    last_recovery[name] = time.monotonic()
+                    failures[name] = 0
+            self._ranging_stop.wait(poll_interval)
+
+    def get_range(self, name: str) -> Tuple[int, float]:
+        """
+        Latest filtered distance of one sensor without touching the bus.
+
+        Args:
+            name: Sensor name, e.g. "left"
+
+        Returns:
+            Tuple of (distance in mm or -1, age in seconds; inf if the
+            sensor has produced no valid sample)
+        """
+        range_filter = self._filters.get(name)
+        if range_filter is None:
+            return -1, float("inf")
+        return range_filter.latest()
+
     def get_distances(self) -> dict[str, int]:
         """
         Get distance readings from all sensors with enhanced reliability and health monitoring.
+
+        While background ranging runs this returns the filtered values
+        immediately; readings older than ``max_age`` are reported as -1.
         
         Returns:
             dict: Dictionary with sensor names as keys and distances in mm as values.
@@ -273,6 +436,13 @@ class VL53L0XSensors:
         if not self.is_hardware_available:
             return {"left": -1, "right": -1}
 
+        if self.ranging:
+            readings = {}
+            for name in self._sensors:
+                distance, age = self.get_range(name)
+                readings[name] = distance if age <= self.max_age else -1
+            return readings
+
         readings = {}
         for name, sensor in self._sensors.items():
             if sensor is None:
@@ -429,7 +599,8 @@ class VL53L0XSensors:
     def cleanup(self):
         """Clean up sensor resources."""
         logger.debug("ToF: Cleaning up sensors...")
-        
+        self.stop_ranging()
+
         # Stop continuous mode on all sensors
         if hasattr(self, '_sensors'):
             for name, sensor in self._sensors.items():
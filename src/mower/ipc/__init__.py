@@ -2,9 +2,19 @@
 Inter-process communication utilities for the autonomous mower.
 
 This module provides command queue functionality to enable communication
-between the web UI process and the main controller process.
+between the web UI process and the main controller process, plus shared-memory
+primitives for streaming data between them.
 """
 
 from .command_queue import CommandQueue, CommandProcessor, get_command_queue, get_command_processor
+from .shared_memory import SeqlockRingBuffer, attach_shared_memory, create_shared_memory
 
-__all__ = ['CommandQueue', 'CommandProcessor', 'get_command_queue', 'get_command_processor']
+__all__ = [
+    'CommandQueue',
+    'CommandProcessor',
+    'get_command_queue',
+    'get_command_processor',
+    'SeqlockRingBuffer',
+    'attach_shared_memory',
+    'create_shared_memory',
+]
@@ -1,47 +1,223 @@
 """
 Inter-process communication for commands between web UI and main controller.
 
-This module provides a file-based command queue system to allow the web UI process
-to send commands to the main controller process for hardware control.
+Commands travel over a Unix domain socket as length-prefixed JSON messages
+(``multiprocessing.connection`` framing). Every request carries an ID and a
+deadline; the main controller executes commands in arrival order on a single
+worker thread, rejects new ones immediately when its bounded queue is full and
+skips commands whose deadline passed while they were waiting, so a burst of
+manual-drive commands can never be replayed late.
+
+The original JSON-file queue is kept as a fallback backend. It is selected
+with ``MOWER_IPC_BACKEND=file``, and the processor switches to it on its own
+when the socket cannot be created. Clients follow automatically because they
+use the file backend whenever no socket is listening.
 """
 
+import errno
+import itertools
 import json
+import math
 import os
-import time
+import queue
+import socket
+import stat
+import tempfile
 import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Any, Callable, Dict, Optional
+
 from mower.utilities.logger_config import LoggerConfigInfo
 
 logger = LoggerConfigInfo.get_logger(__name__)
 
+DEFAULT_QUEUE_FILE = "/home/pi/autonomous_mower/ipc_command_queue.json"
+COMMAND_SOCKET_PATH = os.environ.get(
+    "MOWER_COMMAND_SOCKET", os.path.join(tempfile.gettempdir(), "mower_commands.sock")
+)
+IPC_BACKEND = os.environ.get("MOWER_IPC_BACKEND", "socket").lower()
+
+DEFAULT_COMMAND_TIMEOUT = 5.0
+MAX_PENDING_COMMANDS = 32
+MAX_MESSAGE_BYTES = 64 * 1024
+SOCKET_POLL_INTERVAL = 0.5
+SOCKET_PROBE_TIMEOUT = 0.5
+
+
+def _encode_message(message: Dict[str, Any]) -> bytes:
+    # default=str keeps odd handler results (enums, datetimes) from killing the reply
+    return json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _decode_message(data: bytes) -> Dict[str, Any]:
+    message = json.loads(data.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("IPC message must be a JSON object")
+    return message
+
+
+def _is_socket_file(path: str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except OSError:
+        return False
+
+
+def _socket_is_listening(path: str) -> bool:
+    """
+    True if a process accepts connections on the Unix socket at ``path``.
+
+    A socket file left behind by a crashed controller refuses connections
+    and counts as not listening.
+    """
+    if not _is_socket_file(path):
+        return False
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(SOCKET_PROBE_TIMEOUT)
+        probe.connect(path)
+        return True
+    except OSError as e:
+        # Anything but a refusal (full backlog, slow accept) means someone owns the socket
+        return e.errno not in (errno.ECONNREFUSED, errno.ENOENT)
+    finally:
+        probe.close()
+
+
+def _request_timeout(request: Dict[str, Any]) -> Optional[float]:
+    """The request's timeout in seconds, or None if it is not a positive number."""
+    timeout = request.get("timeout", DEFAULT_COMMAND_TIMEOUT)
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)):
+        return None
+    if not math.isfinite(timeout) or timeout <= 0:
+        return None
+    return float(timeout)
+
+
 class CommandQueue:
-    """File-based command queue for inter-process communication."""
-    
-    def __init__(self, queue_file: str = "/home/pi/autonomous_mower/ipc_command_queue.json"):
+    """Client side of the command channel, used by the web UI process."""
+
+    def __init__(
+        self,
+        queue_file: str = DEFAULT_QUEUE_FILE,
+        socket_path: str = COMMAND_SOCKET_PATH,
+        backend: str = IPC_BACKEND,
+    ):
         """
         Initialize the command queue.
-        
+
         Args:
-            queue_file: Path to the command queue file
+            queue_file: Path to the command queue file (file backend)
+            socket_path: Path to the command socket (socket backend)
+            backend: "socket" (default) or "file"
         """
         self.queue_file = Path(queue_file)
+        self.socket_path = socket_path
+        self.backend = backend
         self._lock = threading.Lock()
-        
-    def send_command(self, command: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        self._conn: Optional[Connection] = None
+        self._request_ids = itertools.count(1)
+
+    def send_command(
+        self, command: str, params: Dict[str, Any] = None, timeout: float = DEFAULT_COMMAND_TIMEOUT
+    ) -> Dict[str, Any]:
         """
         Send a command to the main controller process.
-        
+
         Args:
             command: Command name
             params: Command parameters
-            
+            timeout: Seconds the command stays valid; the main controller
+                     drops it unexecuted once this deadline has passed
+
         Returns:
             Command result or timeout error
         """
         params = params or {}
+        try:
+            # An open connection is checked by sending on it; only probe before connecting
+            if self.backend == "file" or (self._conn is None and not _socket_is_listening(self.socket_path)):
+                return self._send_via_file(command, params, timeout)
+            return self._send_via_socket(command, params, timeout)
+        except Exception as e:
+            logger.error(f"Error sending command {command}: {e}")
+            return {"success": False, "error": f"IPC error: {str(e)}"}
+
+    def _connect(self) -> Connection:
+        if self._conn is None:
+            self._conn = Client(self.socket_path, family="AF_UNIX")
+        return self._conn
+
+    def _disconnect(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+    def _send_via_socket(self, command: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        deadline = time.monotonic() + timeout
+        # One request in flight per client; callers queue up here until the deadline
+        if not self._lock.acquire(timeout=timeout):
+            logger.warning(f"Command dropped, channel busy: {command}")
+            return {"success": False, "error": "Command channel busy", "busy": True}
+        try:
+            # Time spent waiting for the channel counts against the command's deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Command expired before it could be sent: {command}")
+                return {"success": False, "error": "Command timeout - expired before it was sent"}
+            request_id = next(self._request_ids)
+            payload = _encode_message(
+                {"id": request_id, "command": command, "params": params, "timeout": remaining}
+            )
+            try:
+                self._connect().send_bytes(payload)
+            except (OSError, EOFError):
+                # Stale connection from before a controller restart; nothing was sent yet
+                self._disconnect()
+                self._connect().send_bytes(payload)
+            logger.debug(f"Command sent: {command} (ID: {request_id})")
+
+            response = self._wait_for_socket_response(request_id, deadline)
+            if response is None:
+                logger.warning(f"Command timeout: {command} (ID: {request_id})")
+                return {"success": False, "error": "Command timeout - main controller may not be processing commands"}
+            logger.debug(f"Command response received: {command} -> {response}")
+            return response
+        except (OSError, EOFError) as e:
+            self._disconnect()
+            logger.error(f"Command channel error for {command}: {e}")
+            return {"success": False, "error": f"IPC error: {str(e)}"}
+        finally:
+            self._lock.release()
+
+    def _wait_for_socket_response(self, request_id: int, deadline: float) -> Optional[Dict[str, Any]]:
+        """Read responses until ours arrives, discarding late replies to earlier requests."""
+        conn = self._conn
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not conn.poll(remaining):
+                return None
+            message = _decode_message(conn.recv_bytes(MAX_MESSAGE_BYTES))
+            if message.get("id") != request_id:
+                continue
+            response = {
+                "success": bool(message.get("success")),
+                "result": message.get("result"),
+                "error": message.get("error"),
+                "message": message.get("message"),
+            }
+            if message.get("busy"):
+                response["busy"] = True
+            return response
+
+    def _send_via_file(self, command: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
         command_id = str(int(time.time() * 1000000))  # Microsecond timestamp as ID
-        
+
         command_data = {
             "id": command_id,
             "command": command,
@@ -49,28 +225,23 @@ class CommandQueue:
             "timestamp": time.time(),
             "status": "pending"
         }
-        
-        try:
-            # Write command to queue file
-            with self._lock:
-                self._write_command(command_data)
-            
-            logger.info(f"Command sent: {command} (ID: {command_id})")
-            
-            # Wait for response with timeout
-            response = self._wait_for_response(command_id, timeout=5.0)
-            
-            if response:
-                logger.info(f"Command response received: {command} -> {response}")
-                return response
-            else:
-                logger.warning(f"Command timeout: {command} (ID: {command_id})")
-                return {"success": False, "error": "Command timeout - main controller may not be processing commands"}
-                
-        except Exception as e:
-            logger.error(f"Error sending command {command}: {e}")
-            return {"success": False, "error": f"IPC error: {str(e)}"}
-    
+
+        # Write command to queue file
+        with self._lock:
+            self._write_command(command_data)
+
+        logger.info(f"Command sent: {command} (ID: {command_id})")
+
+        # Wait for response with timeout
+        response = self._wait_for_response(command_id, timeout=timeout)
+
+        if response:
+            logger.info(f"Command response received: {command} -> {response}")
+            return response
+        else:
+            logger.warning(f"Command timeout: {command} (ID: {command_id})")
+            return {"success": False, "error": "Command timeout - main controller may not be processing commands"}
+
     def _write_command(self, command_data: Dict[str, Any]):
         """Write command to the queue file atomically."""
         try:
@@ -85,27 +256,27 @@ class CommandQueue:
                 except (json.JSONDecodeError, IOError):
                     # File corrupted or empty, start fresh
                     commands = []
-            
+
             # Add new command
             commands.append(command_data)
-            
+
             # Keep only recent commands (last 100)
             commands = commands[-100:]
-            
+
             # Write atomically
             temp_file = self.queue_file.with_suffix('.tmp')
             with open(temp_file, 'w') as f:
                 json.dump(commands, f)
             temp_file.replace(self.queue_file)
-            
+
         except Exception as e:
             logger.error(f"Error writing command to queue: {e}")
             raise
-    
+
     def _wait_for_response(self, command_id: str, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
         """Wait for command response with timeout."""
         start_time = time.time()
-        
+
         while time.time() - start_time < timeout:
             try:
                 if self.queue_file.exists():
@@ -113,7 +284,7 @@ class CommandQueue:
                         content = f.read().strip()
                         if content:
                             commands = json.loads(content)
-                            
+
                             # Find our command
                             for cmd in commands:
                                 if cmd.get("id") == command_id and cmd.get("status") != "pending":
@@ -125,49 +296,205 @@ class CommandQueue:
                                     }
             except (json.JSONDecodeError, IOError):
                 pass
-            
+
             time.sleep(0.1)  # Check every 100ms
-        
+
         return None
 
+    def close(self):
+        """Close the socket connection, if any."""
+        with self._lock:
+            self._disconnect()
+
+
+class _ClientChannel:
+    """One connected web UI client as seen by the command processor."""
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self.send_lock = threading.Lock()
+
+    def reply(self, request_id: Any, response: Dict[str, Any]):
+        message = dict(response)
+        message["id"] = request_id
+        try:
+            with self.send_lock:
+                self.conn.send_bytes(_encode_message(message))
+        except (OSError, ValueError):
+            pass  # client went away; nothing left to tell it
+
+    def shutdown(self):
+        """Hang up on the client without closing the descriptor under the reader thread."""
+        try:
+            sock = socket.socket(fileno=os.dup(self.conn.fileno()))
+        except OSError:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        finally:
+            sock.close()
+
 
 class CommandProcessor:
-    """Process commands from the queue in the main controller."""
-    
-    def __init__(self, command_handler: Callable[[str, Dict[str, Any]], Dict[str, Any]], 
-                 queue_file: str = "/home/pi/autonomous_mower/ipc_command_queue.json"):
+    """Process commands from the web UI in the main controller."""
+
+    def __init__(
+        self,
+        command_handler: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+        queue_file: str = DEFAULT_QUEUE_FILE,
+        socket_path: str = COMMAND_SOCKET_PATH,
+        backend: str = IPC_BACKEND,
+        max_pending: int = MAX_PENDING_COMMANDS,
+    ):
         """
         Initialize the command processor.
-        
+
         Args:
             command_handler: Function to execute commands (typically ResourceManager.execute_command)
-            queue_file: Path to the command queue file
+            queue_file: Path to the command queue file (file backend)
+            socket_path: Path to the command socket (socket backend)
+            backend: "socket" (default) or "file"
+            max_pending: Commands allowed to wait for execution before new ones are rejected
         """
         self.command_handler = command_handler
         self.queue_file = Path(queue_file)
+        self.socket_path = socket_path
+        self.backend = backend
         self._lock = threading.Lock()
         self._running = False
         self._thread = None
-        
+        self._threads = []
+        self._listener: Optional[Listener] = None
+        self._channels = set()
+        self._pending: "queue.Queue" = queue.Queue(maxsize=max_pending)
+
+        self.rejected_count = 0
+        self.expired_count = 0
+
     def start(self):
-        """Start the command processing thread."""
+        """Start the command processing threads."""
         if self._running:
             return
-            
+
         self._running = True
+        if self.backend != "file":
+            try:
+                self._start_socket_server()
+                logger.info(f"Command processor listening on {self.socket_path}")
+                return
+            except (OSError, AttributeError) as e:
+                logger.warning(f"Command socket unavailable ({e}), falling back to file queue")
+                self.backend = "file"
+
         self._thread = threading.Thread(target=self._process_loop, daemon=True)
         self._thread.start()
         logger.info("Command processor started")
-        
+
     def stop(self):
-        """Stop the command processing thread."""
+        """Stop the command processing threads."""
         self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=2.0)
+        if self._listener is not None:
+            try:
+                # accept() is not interrupted by close(); wake it with a throwaway connection
+                Client(self.socket_path, family="AF_UNIX").close()
+            except OSError:
+                pass
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            self._listener = None
+        # Close client connections now so clients notice on their next send and reconnect
+        for channel in list(self._channels):
+            channel.shutdown()
+        for thread in self._threads + [self._thread]:
+            if thread and thread.is_alive():
+                thread.join(timeout=2.0)
+        self._threads = []
         logger.info("Command processor stopped")
-        
+
+    def _start_socket_server(self):
+        if _socket_is_listening(self.socket_path):
+            raise OSError(errno.EADDRINUSE, f"another command processor is listening on {self.socket_path}")
+        # A socket file left behind by a crashed controller blocks bind(); other files are left alone
+        if _is_socket_file(self.socket_path):
+            os.unlink(self.socket_path)
+        self._listener = Listener(self.socket_path, family="AF_UNIX", backlog=4)
+        os.chmod(self.socket_path, 0o660)
+        self._threads = [
+            threading.Thread(target=self._accept_loop, name="ipc-accept", daemon=True),
+            threading.Thread(target=self._execute_loop, name="ipc-execute", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _accept_loop(self):
+        """Accept web UI connections and give each one a reader thread."""
+        while self._running:
+            try:
+                conn = self._listener.accept()
+            except (OSError, AttributeError):
+                if self._running:
+                    logger.error("Command socket accept failed", exc_info=True)
+                    time.sleep(1.0)
+                continue
+            if not self._running:
+                conn.close()
+                break
+            threading.Thread(target=self._read_loop, args=(_ClientChannel(conn),), daemon=True).start()
+
+    def _read_loop(self, channel: _ClientChannel):
+        """Queue requests from one client, rejecting them when the queue is full."""
+        conn = channel.conn
+        self._channels.add(channel)
+        try:
+            while self._running:
+                if not conn.poll(SOCKET_POLL_INTERVAL):
+                    continue
+                request = _decode_message(conn.recv_bytes(MAX_MESSAGE_BYTES))
+                timeout = _request_timeout(request)
+                if timeout is None:
+                    logger.warning(f"Rejecting {request.get('command')}: invalid timeout {request.get('timeout')!r}")
+                    channel.reply(request.get("id"), {"success": False, "error": "Invalid command timeout"})
+                    continue
+                deadline = time.monotonic() + timeout
+                try:
+                    self._pending.put_nowait((channel, request, deadline))
+                except queue.Full:
+                    self.rejected_count += 1
+                    logger.warning(f"Command queue full, rejecting {request.get('command')}")
+                    channel.reply(request.get("id"), {"success": False, "error": "Command queue full", "busy": True})
+        except (EOFError, OSError, ValueError) as e:
+            if self._running and not isinstance(e, EOFError):
+                logger.warning(f"Dropping command client: {e}")
+        finally:
+            self._channels.discard(channel)
+            with channel.send_lock:
+                try:
+                    conn.close()
+                except OSError:
+                    pass
+
+    def _execute_loop(self):
+        """Run queued commands in order on a single thread."""
+        while self._running:
+            try:
+                channel, request, deadline = self._pending.get(timeout=SOCKET_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if time.monotonic() > deadline:
+                # The client has already given up; never act on a stale command
+                self.expired_count += 1
+                logger.warning(f"Skipping expired command: {request.get('command')}")
+                continue
+            result = self._execute_command(request)
+            logger.debug(f"Processed command: {request.get('command')} -> {result}")
+            channel.reply(request.get("id"), result)
+
     def _process_loop(self):
-        """Main processing loop."""
+        """Main processing loop (file backend)."""
         while self._running:
             try:
                 self._process_pending_commands()
@@ -175,59 +502,59 @@ class CommandProcessor:
             except Exception as e:
                 logger.error(f"Error in command processing loop: {e}")
                 time.sleep(1.0)  # Wait longer on error
-                
+
     def _process_pending_commands(self):
-        """Process any pending commands in the queue."""
+        """Process any pending commands in the queue file."""
         if not self.queue_file.exists():
             return
-            
+
         try:
             with self._lock:
                 with open(self.queue_file, 'r') as f:
                     content = f.read().strip()
                     if not content:
                         return
-                        
+
                 commands = json.loads(content)
                 updated = False
-                
+
                 for cmd in commands:
                     if cmd.get("status") == "pending":
                         # Process this command
                         result = self._execute_command(cmd)
                         cmd["status"] = "completed" if result.get("success") else "failed"
                         cmd["result"] = result.get("result")
-                        cmd["error"] = result.get("error") 
+                        cmd["error"] = result.get("error")
                         cmd["message"] = result.get("message")
                         cmd["processed_time"] = time.time()
                         updated = True
-                        
+
                         logger.info(f"Processed command: {cmd['command']} -> {result}")
-                
+
                 # Write back updated commands if any were processed
                 if updated:
                     temp_file = self.queue_file.with_suffix('.tmp')
                     with open(temp_file, 'w') as f:
                         json.dump(commands, f)
                     temp_file.replace(self.queue_file)
-                    
+
         except (json.JSONDecodeError, IOError) as e:
             logger.error(f"Error processing command queue: {e}")
-            
+
     def _execute_command(self, cmd: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single command."""
         try:
             command = cmd.get("command")
             params = cmd.get("params", {})
-            
+
             logger.info(f"Executing command: {command} with params: {params}")
             result = self.command_handler(command, params)
-            
+
             if not isinstance(result, dict):
                 result = {"success": True, "result": result}
-                
+
             return result
-            
+
         except Exception as e:
             logger.error(f"Error executing command {cmd.get('command')}: {e}")
             return {"success": False, "error": str(e)}
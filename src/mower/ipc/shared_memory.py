@@ -0,0 +1,524 @@
+"""
+Shared-memory primitives for inter-process communication.
+
+This module provides a fixed-layout, single-writer/multi-reader seqlock ring
+buffer on top of ``multiprocessing.shared_memory``. The main controller process
+publishes records into the ring and the web UI process reads them without
+touching the filesystem, taking locks or parsing anything.
+
+Layout of the shared segment::
+
+    [ header | slot 0 | slot 1 | ... | slot N-1 ]
+
+Every slot starts with its own 64-bit sequence word followed by one record of
+the caller supplied NumPy structured dtype. The writer marks a slot as busy by
+storing an odd sequence value, copies the record in, then stores the final even
+value. Readers retry whenever they observe an odd value or the sequence changes
+underneath them, so a torn record is never returned.
+
+``SharedWordEvent`` lets readers sleep until a writer bumps a 32-bit counter in
+a shared segment. On Linux it uses the futex syscall directly on the shared
+word; elsewhere, or once the syscall fails with an unexpected error, it
+degrades to short sleeps on the counter.
+"""
+
+import ctypes
+import errno
+import os
+import platform
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+RING_MAGIC = 0x4D4F5752  # "MOWR"
+RING_VERSION = 1
+MAX_READ_RETRIES = 8
+
+# futex(2) syscall numbers by machine; FUTEX_WAIT/FUTEX_WAKE without the
+# PRIVATE flag so waits work across processes sharing the mapping. The machine
+# is the kernel's, so a 32-bit userland on a 64-bit kernel (armhf Raspberry Pi
+# OS reports aarch64) needs the 32-bit number from _FUTEX_SYSCALLS_32.
+_FUTEX_SYSCALLS = {
+    "x86_64": 202,
+    "amd64": 202,
+    "aarch64": 98,
+    "arm64": 98,
+    "armv7l": 240,
+    "armv6l": 240,
+    "i386": 240,
+    "i686": 240,
+}
+_FUTEX_SYSCALLS_32 = {
+    "x86_64": 240,
+    "amd64": 240,
+    "aarch64": 240,
+    "arm64": 240,
+}
+# Errors FUTEX_WAIT reports in normal operation: the word already changed,
+# the timeout expired, or a signal arrived
+_FUTEX_EXPECTED_ERRORS = (errno.EAGAIN, errno.ETIMEDOUT, errno.EINTR)
+_FUTEX_WAIT = 0
+_FUTEX_WAKE = 1
+_FALLBACK_POLL_INTERVAL = 0.002
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "<u4"),
+        ("version", "<u4"),
+        ("capacity", "<u4"),
+        ("record_size", "<u4"),
+        ("write_seq", "<u8"),
+        ("writer_pid", "<u4"),
+        ("generation", "<u4"),  # random per created segment, detects writer restarts
+    ]
+)
+
+
+@dataclass
+class RingRead:
+    """Result of a successful ring buffer read."""
+
+    sequence: int
+    record: np.void
+
+
+def _untrack(shm: shared_memory.SharedMemory):
+    """Stop the resource tracker from unlinking ``shm`` when this process exits."""
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    except Exception:
+        pass
+
+
+def _open_untracked(name: str, create: bool, size: int = 0) -> shared_memory.SharedMemory:
+    """
+    Open a shared memory segment that the resource tracker does not own.
+
+    On Python < 3.13 the resource tracker unlinks every segment a process has
+    touched when that process exits, so a reader shutting down would destroy
+    the writer's segment. Segments here are therefore untracked and their
+    lifetime is managed explicitly: the writer unlinks on close and replaces
+    stale segments left behind by a crash on the next start.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        _untrack(shm)
+        return shm
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing shared memory segment without taking ownership.
+
+    Args:
+        name: Name of the shared memory segment
+
+    Returns:
+        SharedMemory: The attached segment
+
+    Raises:
+        FileNotFoundError: If no segment with that name exists
+    """
+    return _open_untracked(name, create=False)
+
+
+def create_shared_memory(name: str, size: int) -> shared_memory.SharedMemory:
+    """
+    Create a shared memory segment, replacing a stale one left behind by a crashed writer.
+
+    Args:
+        name: Name of the shared memory segment
+        size: Size of the segment in bytes
+
+    Returns:
+        SharedMemory: The newly created segment
+    """
+    try:
+        return _open_untracked(name, create=True, size=size)
+    except FileExistsError:
+        logger.info(f"Replacing stale shared memory segment '{name}'")
+        unlink_shared_memory(attach_shared_memory(name))
+        return _open_untracked(name, create=True, size=size)
+
+
+def new_generation() -> int:
+    """Random identifier stamped into each newly created segment."""
+    return int.from_bytes(os.urandom(4), "little") or 1
+
+
+def segment_replaced(name: str, header_dtype: np.dtype, generation: int) -> bool:
+    """
+    Check whether the segment currently registered under ``name`` is a different one.
+
+    Readers keep their mapping when a writer restarts and recreates the segment,
+    so they would silently keep reading the orphaned copy. Comparing the
+    generation stamp in the header detects that case.
+
+    Args:
+        name: Name of the shared memory segment
+        header_dtype: Header layout containing a ``generation`` field
+        generation: Generation the caller is attached to
+
+    Returns:
+        bool: True if the segment is gone or has been recreated
+    """
+    try:
+        shm = attach_shared_memory(name)
+    except FileNotFoundError:
+        return True
+    try:
+        header = np.ndarray((1,), dtype=header_dtype, buffer=shm.buf, offset=0)
+        current = int(header["generation"][0])
+        del header
+        return current != generation
+    finally:
+        shm.close()
+
+
+def unlink_shared_memory(shm: shared_memory.SharedMemory):
+    """Close and remove a segment opened through this module."""
+    try:
+        shm.close()
+    except Exception:
+        pass
+    try:
+        # SharedMemory.unlink() unregisters from the tracker on Python < 3.13;
+        # register first so the tracker does not complain about an unknown name.
+        if getattr(shm, "_track", True):
+            resource_tracker.register(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+def _futex_number_for(machine: str, pointer_size: int) -> Optional[int]:
+    """futex syscall number for the kernel ``machine`` and this process's pointer size."""
+    machine = machine.lower()
+    if pointer_size == 4 and machine in _FUTEX_SYSCALLS_32:
+        return _FUTEX_SYSCALLS_32[machine]
+    return _FUTEX_SYSCALLS.get(machine)
+
+
+def _load_futex():
+    """Return (syscall function, syscall number) or (None, None) if futex is unavailable."""
+    if platform.system() != "Linux":
+        return None, None
+    number = _futex_number_for(platform.machine(), ctypes.sizeof(ctypes.c_void_p))
+    if number is None:
+        return None, None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        syscall = libc.syscall
+        syscall.restype = ctypes.c_long
+        return syscall, number
+    except (OSError, AttributeError):
+        return None, None
+
+
+_futex_syscall, _futex_number = _load_futex()
+
+
+def _disable_futex(error: int):
+    """Stop using futex in this process after an unexpected error; events poll instead."""
+    global _futex_syscall
+    if _futex_syscall is not None:
+        logger.warning("futex syscall failed (%s); falling back to polling", os.strerror(error))
+    _futex_syscall = None
+
+
+class SharedWordEvent:
+    """
+    Cross-process "something changed" notification on a 32-bit word in shared memory.
+
+    Writers call ``notify()`` after publishing; readers call ``wait(seen, timeout)``
+    with the value they last observed and are woken as soon as it changes. This is
+    the futex pattern: no syscalls at all when nobody is waiting and no polling
+    when somebody is.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int):
+        """
+        Initialize the event.
+
+        Args:
+            buffer: Writable buffer of the shared memory segment
+            offset: 4-byte aligned offset of the counter word inside ``buffer``
+        """
+        if offset % 4:
+            raise ValueError("Event word must be 4-byte aligned")
+        self._word = ctypes.c_uint32.from_buffer(buffer, offset)
+        self._address = ctypes.addressof(self._word)
+        self.uses_futex = _futex_syscall is not None
+
+    @property
+    def value(self) -> int:
+        """Current counter value."""
+        return self._word.value
+
+    def _futex(self, operation: int, value, timeout) -> None:
+        """Issue one futex call, switching to polling for good if it fails unexpectedly."""
+        syscall = _futex_syscall
+        if syscall is None:
+            self.uses_futex = False
+            return
+        result = syscall(_futex_number, ctypes.c_void_p(self._address), operation, value, timeout, None, 0)
+        if result == -1:
+            error = ctypes.get_errno()
+            if operation == _FUTEX_WAKE or error not in _FUTEX_EXPECTED_ERRORS:
+                _disable_futex(error)
+                self.uses_futex = False
+
+    def notify(self):
+        """Bump the counter and wake every waiter."""
+        self._word.value = (self._word.value + 1) & 0xFFFFFFFF
+        if self.uses_futex:
+            self._futex(_FUTEX_WAKE, 0x7FFFFFFF, None)
+
+    def wait(self, seen: int, timeout: float) -> bool:
+        """
+        Sleep until the counter differs from ``seen`` or ``timeout`` expires.
+
+        Args:
+            seen: Counter value the caller has already handled
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            bool: True if the counter changed
+        """
+        deadline = time.monotonic() + timeout
+        while self._word.value == seen:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self.uses_futex:
+                ts = _Timespec(int(remaining), int((remaining % 1) * 1e9))
+                self._futex(_FUTEX_WAIT, ctypes.c_uint32(seen), ctypes.byref(ts))
+            else:
+                time.sleep(min(_FALLBACK_POLL_INTERVAL, remaining))
+        return True
+
+    def close(self):
+        """Release the exported buffer so the segment can be closed."""
+        self._word = None
+        self._address = 0
+
+
+class SeqlockRingBuffer:
+    """
+    Single-writer, multi-reader ring buffer of fixed-size records in shared memory.
+
+    The writer process creates the segment with ``create=True``; readers attach
+    to it by name. Readers never block the writer and the writer never waits for
+    readers: if a reader falls behind, older slots are simply overwritten and
+    the gap is visible through the sequence numbers.
+    """
+
+    def __init__(self, name: str, record_dtype: np.dtype, capacity: int = 16, create: bool = False):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            name: Name of the shared memory segment
+            record_dtype: NumPy structured dtype describing one record
+            capacity: Number of slots in the ring (writer only)
+            create: True in the writer process, False in reader processes
+
+        Raises:
+            FileNotFoundError: If attaching and the segment does not exist yet
+            ValueError: If an attached segment does not match ``record_dtype``
+        """
+        if capacity < 2:
+            raise ValueError("Ring buffer capacity must be at least 2")
+
+        self.name = name
+        self.record_dtype = np.dtype(record_dtype)
+        self.slot_dtype = np.dtype([("seq", "<u8"), ("record", self.record_dtype)])
+        self.is_writer = create
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+        if create:
+            self._shm = create_shared_memory(name, self.segment_size(self.record_dtype, capacity))
+        else:
+            self._shm = attach_shared_memory(name)
+
+        self._header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=self._shm.buf, offset=0)
+
+        if create:
+            self._header["magic"] = RING_MAGIC
+            self._header["version"] = RING_VERSION
+            self._header["capacity"] = capacity
+            self._header["record_size"] = self.record_dtype.itemsize
+            self._header["write_seq"] = 0
+            self._header["writer_pid"] = os.getpid()
+            self._header["generation"] = new_generation()
+        else:
+            self._validate_header()
+            capacity = int(self._header["capacity"][0])
+
+        self.capacity = capacity
+        self.generation = int(self._header["generation"][0])
+        slots = np.ndarray((capacity,), dtype=self.slot_dtype, buffer=self._shm.buf, offset=HEADER_DTYPE.itemsize)
+        self._write_seq = self._header["write_seq"]
+        self._slot_seqs = slots["seq"]
+        self._slot_records = slots["record"]
+        if create:
+            self._slot_seqs[:] = 0
+
+    @classmethod
+    def segment_size(cls, record_dtype: np.dtype, capacity: int) -> int:
+        """Return the number of bytes needed for a ring with ``capacity`` slots."""
+        slot_size = np.dtype([("seq", "<u8"), ("record", np.dtype(record_dtype))]).itemsize
+        return HEADER_DTYPE.itemsize + slot_size * capacity
+
+    def _validate_header(self):
+        """Make sure an attached segment was written with the same layout."""
+        magic = int(self._header["magic"][0])
+        version = int(self._header["version"][0])
+        record_size = int(self._header["record_size"][0])
+        if magic != RING_MAGIC or version != RING_VERSION:
+            self._release()
+            raise ValueError(f"Shared memory segment '{self.name}' is not a compatible ring buffer")
+        if record_size != self.record_dtype.itemsize:
+            self._release()
+            raise ValueError(
+                f"Shared memory segment '{self.name}' record size {record_size} "
+                f"does not match expected {self.record_dtype.itemsize}"
+            )
+
+    @property
+    def write_sequence(self) -> int:
+        """Sequence number of the most recently published record (0 if none)."""
+        return int(self._write_seq[0])
+
+    def is_replaced(self) -> bool:
+        """True if the writer has since removed or recreated the segment (readers only)."""
+        return not self.is_writer and segment_replaced(self.name, HEADER_DTYPE, self.generation)
+
+    def write(self, record: np.ndarray) -> int:
+        """
+        Publish a record into the next slot.
+
+        Args:
+            record: A single (zero-dimensional) record of ``record_dtype``
+
+        Returns:
+            int: Sequence number assigned to the record
+        """
+        if not self.is_writer:
+            raise RuntimeError("Only the process that created the ring buffer may write to it")
+
+        with self._write_lock:
+            sequence = self.write_sequence + 1
+            index = sequence % self.capacity
+            self._slot_seqs[index] = (sequence << 1) | 1  # odd: write in progress
+            self._slot_records[index] = record
+            self._slot_seqs[index] = sequence << 1  # even: record complete
+            self._write_seq[0] = sequence
+            return sequence
+
+    def _read_slot(self, sequence: int) -> Optional[np.void]:
+        """Copy out the record for ``sequence`` if it is still present and consistent."""
+        index = sequence % self.capacity
+        expected = sequence << 1
+        for _ in range(MAX_READ_RETRIES):
+            before = int(self._slot_seqs[index])
+            if before != expected:
+                if before & 1 and (before >> 1) == sequence:
+                    continue  # the writer is still filling this slot
+                return None  # overwritten by a newer record
+            record = self._slot_records[index].copy()
+            if int(self._slot_seqs[index]) == before:
+                return record
+        return None
+
+    def read_latest(self) -> Optional[RingRead]:
+        """
+        Read the most recently published record.
+
+        Returns:
+            RingRead: Sequence number and a private copy of the record,
+                      or None if nothing has been published yet
+        """
+        for _ in range(MAX_READ_RETRIES):
+            sequence = self.write_sequence
+            if sequence == 0:
+                return None
+            record = self._read_slot(sequence)
+            if record is not None:
+                return RingRead(sequence=sequence, record=record)
+        return None
+
+    def read_since(self, last_sequence: int) -> Tuple[List[RingRead], int]:
+        """
+        Read every record published after ``last_sequence`` that is still in the ring.
+
+        Args:
+            last_sequence: Last sequence number the caller has already consumed
+
+        Returns:
+            tuple: (records in publish order, number of records that were overwritten
+                   before they could be read)
+        """
+        newest = self.write_sequence
+        if newest <= last_sequence:
+            return [], 0
+
+        oldest = max(last_sequence + 1, newest - self.capacity + 1)
+        dropped = oldest - (last_sequence + 1)
+        reads = []
+        for sequence in range(oldest, newest + 1):
+            record = self._read_slot(sequence)
+            if record is None:
+                dropped += 1
+                continue
+            reads.append(RingRead(sequence=sequence, record=record))
+        return reads, dropped
+
+    def _release_views(self):
+        """Drop NumPy views so the mapping can be closed."""
+        self._header = None
+        self._write_seq = None
+        self._slot_seqs = None
+        self._slot_records = None
+
+    def _release(self):
+        """Drop NumPy views and close the mapping."""
+        self._release_views()
+        try:
+            self._shm.close()
+        except Exception:
+            pass
+
+    def close(self, unlink: Optional[bool] = None):
+        """
+        Detach from the segment.
+
+        Args:
+            unlink: Remove the segment from the system. Defaults to True for the
+                    writer and False for readers.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if unlink is None:
+            unlink = self.is_writer
+        if unlink:
+            self._release_views()
+            unlink_shared_memory(self._shm)
+        else:
+            self._release()
@@ -38,7 +38,6 @@ import sys  # Added for sys.exit
 import threading  # Added for threading.Lock
 import time
 import utm
-import queue
 from enum import Enum
 
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -51,13 +50,23 @@ from dotenv import load_dotenv
 from mower.config_management import initialize_config_manager
 from mower.config_management.config_manager import get_config
 from mower.config_management.constants import CONFIG_DIR as APP_CONFIG_DIR
+from mower.constants import (
+    COVERAGE_SNAPSHOT_DIR,
+    CUTTING_WIDTH_M,
+    OBSTACLE_GRID_PATH,
+    OCCUPANCY_GRID_RESOLUTION,
+    polygon_coordinates,
+)
 from mower.hardware.async_sensor_manager import AsyncSensorInterface
+from mower.hardware.camera_frame_share import get_frame_sharer
 from mower.hardware.shared_sensor_data import get_shared_sensor_manager
 from mower.obstacle_detection.obstacle_detector import ObstacleDetector
 from mower.hardware.serial_port import SerialPort
 from mower.hardware.ina3221 import INA3221Sensor
+from mower.navigation.coverage_map import CoverageMap
 from mower.navigation.localization import Localization
 from mower.navigation.navigation import NavigationController
+from mower.navigation.occupancy_grid import OccupancyGrid
 from mower.navigation.path_planner import LearningConfig, PathPlanner, PatternConfig, PatternType
 from mower.navigation.gps import GpsPosition
 from mower.obstacle_detection.avoidance_algorithm import AvoidanceAlgorithm
@@ -70,7 +79,8 @@ from mower.simulation import enable_simulation
 from mower.ui.web_process import launch as launch_web
 from mower.utilities.process_management import validate_startup_environment, is_port_available
 from mower.ui.web_ui.web_interface import WebInterface
-from mower.utilities.logger_config import LoggerConfigInfo
+from mower.utilities.control_scheduler import DEFAULT_CONTROL_RATES, ControlScheduler
+from mower.utilities.logger_config import LoggerConfigInfo, rate_limited
 from mower.utilities.single_instance import ensure_single_instance
 
 # Load environment variables from .env file
@@ -172,6 +182,12 @@ class ResourceManager:
         # Web interface thread
         self._web_interface_thread: Optional[threading.Thread] = None
 
+        # Fixed-rate schedulers: safety and GPS fusion run on the control
+        # scheduler's thread; sensor publishing runs on the main thread.
+        self.control_rates: Dict[str, float] = {**DEFAULT_CONTROL_RATES, **get_config("control_loop.rates", {})}
+        self.control_scheduler: Optional[ControlScheduler] = None
+        self.housekeeping_scheduler: Optional[ControlScheduler] = None
+
         # Initialize safety status tracking variables
         self._safety_status_vars: Dict[str, Union[bool, int, float]] = {
             "warning_logged": False,
@@ -251,7 +267,11 @@ class ResourceManager:
             hardware_registry = get_hardware_registry()
             # Initialize localization
             try:
-                self._resources["localization"] = Localization()
+                localization = Localization()
+                sensor_interface = self._resources.get("sensor_interface")
+                if sensor_interface is not None:
+                    localization.set_sensor_interface(sensor_interface)
+                self._resources["localization"] = localization
                 logger.info("Localization system initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize localization: {e}")
@@ -281,8 +301,19 @@ class ResourceManager:
                 model_path=str(APP_CONFIG_DIR / "models" / "pattern_planner.json"),
             )
 
+            # Record of what has actually been mowed, resumed across restarts
+            self._resources["coverage_map"] = self._create_coverage_map(pattern_config.no_go_zones)
+            # Obstacle map shared by the planner and the avoidance loop
+            self._resources["occupancy_grid"] = self._create_occupancy_grid()
+
             try:
-                self._resources["path_planner"] = PathPlanner(pattern_config, learning_config, self)
+                self._resources["path_planner"] = PathPlanner(
+                    pattern_config,
+                    learning_config,
+                    self,
+                    occupancy_grid=self._resources["occupancy_grid"],
+                    coverage_map=self._resources["coverage_map"],
+                )
                 logger.info("Path planner initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize path planner: {e}")
@@ -312,7 +343,8 @@ class ResourceManager:
                             gps_latest_position, 
                             sensor_if, 
                             debug=False, 
-                            resource_manager=self
+                            resource_manager=self,
+                            localization=self._resources.get("localization"),
                         )
                         logger.info("Navigation controller initialized successfully with async sensor interface")
                     else:
@@ -332,7 +364,7 @@ class ResourceManager:
 
             # Initialize the avoidance algorithm
             try:
-                avoidance_algorithm = AvoidanceAlgorithm(self)
+                avoidance_algorithm = AvoidanceAlgorithm(self, self._resources.get("path_planner"))
                 self._resources["avoidance_algorithm"] = avoidance_algorithm
                 logger.info("Avoidance algorithm initialized successfully")
                 
@@ -448,8 +480,10 @@ class ResourceManager:
                 logger.info("Resources not initialized or already cleaned up.")
                 return
 
-            # Stop watchdog first
+            # Stop watchdog and the control loop first
             self._stop_watchdog()
+            if self.control_scheduler:
+                self.control_scheduler.stop()
             
             # Stop IPC command processor
             if hasattr(self, '_command_processor') and self._command_processor:
@@ -519,11 +553,142 @@ class ResourceManager:
                 except Exception as e:
                     logger.error(f"Error during final GPIO cleanup: {e}", exc_info=True)
 
+            # Release the shared sensor and frame segments now that the web process is gone
+            try:
+                get_shared_sensor_manager().close()
+            except Exception as e:
+                logger.error(f"Error releasing shared sensor data: {e}")
+            try:
+                get_frame_sharer().cleanup()
+            except Exception as e:
+                logger.error(f"Error releasing shared camera frames: {e}")
 
             self._resources.clear()
             self._initialized = False
             logger.info("All resources have been cleaned up.")
 
+    @staticmethod
+    def _yard_boundary_latlon() -> List[Tuple[float, float]]:
+        """The configured yard boundary as (lat, lon) points."""
+        return [
+            (coord["lat"], coord.get("lng", coord.get("lon")))
+            for coord in polygon_coordinates
+            if isinstance(coord, dict) and "lat" in coord and ("lng" in coord or "lon" in coord)
+        ]
+
+    def _create_occupancy_grid(self) -> Optional[OccupancyGrid]:
+        """Open the persisted obstacle grid over the yard boundary."""
+        boundary = self._yard_boundary_latlon()
+        if len(boundary) < 3:
+            logger.warning("No yard boundary configured; obstacles will not be mapped")
+            return None
+        try:
+            grid = OccupancyGrid.from_latlon_bounds(
+                boundary, path=str(OBSTACLE_GRID_PATH), resolution=OCCUPANCY_GRID_RESOLUTION
+            )
+            logger.info("Occupancy grid initialized (%d x %d cells)", grid.rows, grid.cols)
+            return grid
+        except Exception as e:
+            logger.error(f"Failed to initialize occupancy grid: {e}")
+            return None
+
+    def _create_coverage_map(self, no_go_zones) -> Optional[CoverageMap]:
+        """Create the coverage map over the yard boundary and resume the last session."""
+        boundary = self._yard_boundary_latlon()
+        if len(boundary) < 3:
+            logger.warning("No yard boundary configured; mowed area will not be recorded")
+            return None
+        try:
+            coverage_map = CoverageMap.from_latlon_boundary(
+                boundary, CUTTING_WIDTH_M, no_go_zones=no_go_zones, snapshot_dir=COVERAGE_SNAPSHOT_DIR
+            )
+            coverage_map.resume_latest()
+            logger.info("Coverage map initialized (%d x %d cells)", coverage_map.rows, coverage_map.cols)
+            return coverage_map
+        except Exception as e:
+            logger.error(f"Failed to initialize coverage map: {e}")
+            return None
+
+    def _update_coverage(self) -> None:
+        """Mark the area swept since the last fused pose while the blade runs."""
+        coverage_map = self._resources.get("coverage_map")
+        localization = self._resources.get("localization")
+        if coverage_map is None or localization is None or not localization.filter.initialized:
+            return
+        registry = self._resources.get("hardware_registry")
+        blade = registry.get_blade_controller() if registry else None
+        blade_on = bool(blade is not None and blade.is_running())
+        position = localization.position
+        coverage_map.update_latlon(position.latitude, position.longitude, blade_on)
+
+    def build_control_schedulers(self) -> None:
+        """
+        Create the fixed-rate schedulers for the periodic control work.
+
+        Rates come from ``control_loop.rates`` in the main config, falling
+        back to ``DEFAULT_CONTROL_RATES``.
+        """
+        rates = self.control_rates
+        self.control_scheduler = ControlScheduler("control")
+        avoidance = self._resources.get("avoidance_algorithm")
+        if avoidance is not None:
+            self.control_scheduler.add_task("safety", avoidance.poll_distance_sensors, rates["safety"])
+        localization = self._resources.get("localization")
+        if localization is not None:
+            # Only the resource manager's sensor interface may touch the IMU bus
+            if self._resources.get("sensor_interface") is not None:
+                localization.set_sensor_interface(self._resources["sensor_interface"])
+                self.control_scheduler.add_task("imu", localization.propagate, rates["imu"])
+            self.control_scheduler.add_task("gps", localization.update, rates["gps"])
+            if self._resources.get("coverage_map") is not None:
+                self.control_scheduler.add_task("coverage", self._update_coverage, rates["gps"])
+
+        self.housekeeping_scheduler = ControlScheduler("housekeeping")
+        self.housekeeping_scheduler.add_task("sensor_publish", self.get_sensor_data, rates["housekeeping"])
+        self.housekeeping_scheduler.add_task("stats_log", self._log_control_stats, 1.0 / 60)
+        coverage_map = self._resources.get("coverage_map")
+        if coverage_map is not None:
+            self.housekeeping_scheduler.add_task("coverage_snapshot", coverage_map.save_snapshot, 1.0 / 30)
+        occupancy_grid = self._resources.get("occupancy_grid")
+        if occupancy_grid is not None:
+            # The web process reads the grid file; keep it reasonably fresh
+            self.housekeeping_scheduler.add_task("occupancy_flush", occupancy_grid.flush, 1.0 / 10)
+
+    def get_control_stats(self) -> Dict[str, Any]:
+        """
+        Timing statistics of every fixed-rate task and paced loop.
+
+        Returns:
+            dict: Per-task figures (rate, overruns, jitter histogram, CPU share)
+                  grouped by scheduler, plus the avoidance loop
+        """
+        stats: Dict[str, Any] = {}
+        for scheduler in (self.control_scheduler, self.housekeeping_scheduler):
+            if scheduler is not None:
+                stats[scheduler.name] = scheduler.get_stats()
+        avoidance = self._resources.get("avoidance_algorithm")
+        if avoidance is not None and getattr(avoidance, "loop_stats", None) is not None:
+            stats["avoidance_loop"] = avoidance.loop_stats.snapshot(time.monotonic())
+        return stats
+
+    def _log_control_stats(self) -> None:
+        """Log a one-line timing summary per task."""
+        for group, tasks in self.get_control_stats().items():
+            if group == "avoidance_loop":
+                tasks = {"loop": tasks}
+            for name, figures in tasks.items():
+                logger.info(
+                    "Control timing %s/%s: %s runs at %s Hz, %s overruns, jitter mean %.2f ms max %.2f ms, cpu %.1f%%",
+                    group,
+                    name,
+                    figures["runs"],
+                    figures["rate_hz"],
+                    figures["overruns"],
+                    figures["jitter_ms"]["mean"],
+                    figures["jitter_ms"]["max"],
+                    figures["cpu_percent"],
+                )
+
     def get_resource(self, name: str) -> Any:
         """
         Get a resource by name.
@@ -584,6 +749,14 @@ class ResourceManager:
         """Get the sensor interface instance."""
         return self._resources.get("sensor_interface")
 
+    def get_localization(self) -> Optional[Localization]:
+        """Get the localization instance."""
+        return self._resources.get("localization")
+
+    def get_occupancy_grid(self) -> Optional[OccupancyGrid]:
+        """Get the shared obstacle occupancy grid."""
+        return self._resources.get("occupancy_grid")
+
     def get_gps(self) -> Optional[Any]:
         """Get the GPS instance from hardware registry."""
         hardware_registry = self._resources.get("hardware_registry") 
@@ -684,6 +857,9 @@ class ResourceManager:
                 # TODO: Implement start_mowing logic when autonomous navigation is ready
                 return {"success": False, "error": "Autonomous mowing not yet implemented"}
 
+            if command == "control_stats":
+                return {"success": True, "stats": self.get_control_stats()}
+
             if command == "return_home":
                 # TODO: Implement return_home logic when autonomous navigation is ready  
                 return {"success": False, "error": "Return home not yet implemented"}
@@ -884,14 +1060,11 @@ class ResourceManager:
             dict: Combined sensor data from sensor interface and GPS service
         """
         try:
-            logger.debug("ResourceManager:get_sensor_data - Attempting to fetch sensor data.")
             # Get base sensor data from sensor interface with timeout protection
             sensor_data = self._get_sensor_data_with_timeout()
-            logger.debug(f"ResourceManager:get_sensor_data - Received from interface: {sensor_data}")
             
             # Add GPS data with error protection
             try:
-                logger.debug("ResourceManager:get_sensor_data - Attempting to fetch GPS location.")
                 gps_location = self.get_gps_location()
                 if gps_location:
                     fix_quality = gps_location.get("metadata", {}).get("fix_quality", 0)
@@ -913,93 +1086,73 @@ class ResourceManager:
                         "status": status
                     }
                     sensor_data["gps"] = current_gps_data
-                    logger.debug(f"ResourceManager:get_sensor_data - GPS data added: {current_gps_data}")
                 else:
-                    logger.warning("ResourceManager:get_sensor_data - get_gps_location returned None. Using GPS fallback.")
+                    logger.warning(
+                        "ResourceManager:get_sensor_data - get_gps_location returned None. Using GPS fallback.",
+                        extra=rate_limited(30.0),
+                    )
                     sensor_data["gps"] = self._get_fallback_gps_data()
             except Exception as gps_error:
-                logger.warning(f"ResourceManager:get_sensor_data - GPS data collection failed: {gps_error}. Using GPS fallback.")
+                logger.warning(
+                    "ResourceManager:get_sensor_data - GPS data collection failed: %s. Using GPS fallback.",
+                    gps_error,
+                    extra=rate_limited(30.0),
+                )
                 sensor_data["gps"] = self._get_fallback_gps_data()
 
-            logger.debug(f"ResourceManager:get_sensor_data - Final sensor data before writing to shared storage: {sensor_data}")
+            logger.debug("ResourceManager:get_sensor_data - Sensor data: %s", sensor_data, extra=rate_limited(5.0))
             # Write sensor data to shared storage for web process with error protection
             try:
                 shared_manager = get_shared_sensor_manager()
                 shared_manager.write_sensor_data(sensor_data)
                 # logger.debug("Successfully wrote sensor data to shared storage") # Already in shared_manager
             except Exception as e:
-                logger.warning(f"ResourceManager:get_sensor_data - Failed to write sensor data to shared storage: {e}")
+                logger.warning(
+                    "ResourceManager:get_sensor_data - Failed to write sensor data to shared storage: %s",
+                    e,
+                    extra=rate_limited(30.0),
+                )
             
             return sensor_data
             
         except Exception as e:
-            logger.error(f"ResourceManager:get_sensor_data - Critical error in sensor data collection: {e}", exc_info=True)
+            logger.error(
+                "ResourceManager:get_sensor_data - Critical error in sensor data collection: %s",
+                e,
+                exc_info=True,
+                extra=rate_limited(10.0),
+            )
             # Return fallback data structure to maintain system stability
             fallback_data_to_return = self._get_complete_fallback_data()
-            logger.warning(f"ResourceManager:get_sensor_data - Returning complete fallback data due to critical error: {fallback_data_to_return}")
+            logger.warning(
+                "ResourceManager:get_sensor_data - Returning complete fallback data due to critical error",
+                extra=rate_limited(10.0),
+            )
             return fallback_data_to_return
 
     def _get_sensor_data_with_timeout(self) -> Dict[str, Any]:
         """
-        Get sensor data with thread-safe timeout protection without signal.alarm.
-        Uses threading approach compatible with Python 3.11+
-        
+        Get the latest sensor data from the sensor interface.
+
+        The async sensor manager serves readings from its latest-value cache,
+        so this call never waits on hardware and needs no worker thread.
+
         Returns:
             dict: Sensor data with fallback values if sensors fail
         """
-        import time
-        import threading
-        import queue
-        
         try:
-            # Get sensor interface
             sensor_interface = self.get_sensor_interface()
             if not sensor_interface:
                 logger.warning("Sensor interface not available")
                 return self._get_fallback_sensor_data()
-            
-            # Use threading + queue approach instead of signal.alarm
-            result_queue: queue.Queue[Dict[str, Any]] = queue.Queue()
-            exception_queue: queue.Queue[Exception] = queue.Queue()
-            
-            def sensor_read_worker() -> None:
-                try:
-                    sensor_data = sensor_interface.get_sensor_data()
-                    result_queue.put(sensor_data)
-                except Exception as e:
-                    exception_queue.put(e)
-            
-            # Create and start worker thread
-            worker_thread = threading.Thread(target=sensor_read_worker)
-            worker_thread.daemon = True
-            worker_thread.start()
-            
-            # Wait for completion with timeout
-            worker_thread.join(timeout=8.0)
-            
-            if worker_thread.is_alive():
-                logger.error("Sensor data collection timed out after 8 seconds")
-                return self._get_fallback_sensor_data()
-            
-            # Check for exceptions
-            if not exception_queue.empty():
-                sensor_error = exception_queue.get()
-                logger.error(f"Sensor data collection failed: {sensor_error}")
-                return self._get_fallback_sensor_data()
-            
-            # Get result
-            if not result_queue.empty():
-                sensor_data = result_queue.get()
-                if sensor_data and isinstance(sensor_data, dict):
-                    logger.debug(f"Sensor data collected successfully: {len(sensor_data)} data types")
-                    return sensor_data
-                else:
-                    logger.warning("Invalid sensor data received")
-                    return self._get_fallback_sensor_data()
-            else:
-                logger.warning("No sensor data received")
-                return self._get_fallback_sensor_data()
-                
+
+            sensor_data = sensor_interface.get_sensor_data()
+            if sensor_data and isinstance(sensor_data, dict):
+                logger.debug(f"Sensor data collected successfully: {len(sensor_data)} data types")
+                return sensor_data
+            logger.warning("Invalid sensor data received")
+            return self._get_fallback_sensor_data()
+
         except Exception as e:
             logger.error(f"Critical error in sensor data collection: {e}")
             return {
@@ -1316,76 +1469,13 @@ def main() -> None:
 
 
         logger.info("Application started. Waiting for shutdown signal...")
-        
-        # Main loop with periodic sensor data sharing
-        # Main sensor data collection loop with enhanced error handling
-        consecutive_errors = 0
-        max_consecutive_errors = 10
-        base_delay = 2.0  # Base delay between collections (seconds)
-        
-        logger.info("Starting enhanced sensor data collection loop")
-        while not stop_event.is_set():
-            try:
-                collection_start_time = time.time()
-                
-                # Collect sensor data with comprehensive error handling
-                if resource_manager:
-                    logger.debug("Main loop: Starting sensor data collection...")
-                    
-                    try:
-                        sensor_data = resource_manager.get_sensor_data()
-                        
-                        if sensor_data and "error" not in sensor_data:
-                            # Successful collection - reset error counter
-                            if consecutive_errors > 0:
-                                logger.info(f"Sensor collection recovered after {consecutive_errors} consecutive errors")
-                                consecutive_errors = 0
-                            
-                            collection_time = time.time() - collection_start_time
-                            logger.debug(f"Sensor data collected successfully in {collection_time:.3f}s")
-                            
-                        else:
-                            # Collection returned error data
-                            consecutive_errors += 1
-                            logger.warning(f"Sensor collection returned error data (consecutive: {consecutive_errors})")
-                            
-                    except Exception as sensor_error:
-                        consecutive_errors += 1
-                        logger.error(f"Sensor collection exception (consecutive: {consecutive_errors}): {sensor_error}", exc_info=True)
-                        
-                        # Implement exponential backoff for persistent failures
-                        if consecutive_errors >= max_consecutive_errors:
-                            logger.critical(f"Maximum consecutive sensor errors reached ({max_consecutive_errors}). Implementing extended backoff.")
-                            stop_event.wait(timeout=30.0)  # Extended delay for critical failures
-                            consecutive_errors = 0  # Reset counter after extended delay
-                        
-                else:
-                    logger.warning("ResourceManager not available for sensor collection")
-                    consecutive_errors += 1
-                
-                # Calculate dynamic delay based on error count
-                delay = base_delay
-                if consecutive_errors > 0:
-                    # Exponential backoff: 2s, 4s, 8s, max 16s
-                    delay = min(base_delay * (2 ** min(consecutive_errors - 1, 3)), 16.0)
-                    logger.debug(f"Using extended delay of {delay}s due to {consecutive_errors} consecutive errors")
-                
-                # Wait for shutdown signal with dynamic timeout
-                logger.debug(f"Waiting {delay}s before next sensor collection cycle")
-                stop_event.wait(timeout=delay)
-                
-            except Exception as loop_error:
-                # Catch-all for any unhandled exceptions in the main loop
-                consecutive_errors += 1
-                logger.critical(f"Unhandled exception in sensor collection loop (consecutive: {consecutive_errors}): {loop_error}", exc_info=True)
-                
-                # Prevent infinite error loops
-                if consecutive_errors >= max_consecutive_errors:
-                    logger.critical("Too many consecutive loop errors. Implementing emergency delay.")
-                    stop_event.wait(timeout=60.0)  # Emergency delay
-                    consecutive_errors = 0
-                else:
-                    stop_event.wait(timeout=base_delay)
+
+        # Fixed-rate control loop: safety and GPS fusion run on the control
+        # scheduler thread, sensor publishing and stats on this thread.
+        resource_manager.build_control_schedulers()
+        resource_manager.control_scheduler.start()
+        logger.info("Starting fixed-rate housekeeping loop at rates %s", resource_manager.control_rates)
+        resource_manager.housekeeping_scheduler.run(stop_event)
 
     except Exception as e:
         logger.critical(f"Unhandled exception in main: {e}", exc_info=True)
@@ -0,0 +1,247 @@
+"""
+Coverage path generation by clipping sweep lines against the mowing area.
+
+The boundary minus the no-go zones is built once with Shapely and rotated so
+the passes run along the x axis. Every pass is then crossed with every ring
+edge of that area in one NumPy broadcast, and the sorted crossings of each
+pass pair up into inside spans (even-odd rule), so there is no Python loop
+over passes or edges. The spans are then grouped into boustrophedon cells (runs of passes
+that each hold exactly one piece and overlap their neighbours) so that a
+concave yard or a yard with islands is mowed one cell at a time instead of
+jumping back and forth across the gaps on every pass.
+
+Coordinates are plain (x, y) pairs in whatever planar frame the caller
+uses; ``spacing`` is in the same units.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+Point = Tuple[float, float]
+
+
+def coverage_area(boundary: Sequence[Point], no_go_zones: Sequence[Sequence[Point]] = ()):
+    """
+    Polygonal area to cover: the boundary minus every no-go zone.
+
+    Self-intersecting rings are repaired with ``make_valid``.
+
+    Args:
+        boundary: Boundary vertices
+        no_go_zones: One vertex list per excluded zone
+
+    Returns:
+        Shapely (Multi)Polygon, empty if the boundary has no area
+    """
+    if len(boundary) < 3:
+        return Polygon()
+    area = _valid_polygonal(Polygon(boundary))
+    zones = [_valid_polygonal(Polygon(zone)) for zone in no_go_zones if len(zone) >= 3]
+    if zones:
+        area = area.difference(shapely.union_all(zones))
+    return area
+
+
+def _valid_polygonal(geometry):
+    """Repair an invalid polygon and keep only its polygonal parts."""
+    if geometry.is_valid:
+        return geometry
+    parts = shapely.get_parts(shapely.make_valid(geometry))
+    polygons = parts[shapely.get_type_id(parts) >= 3]
+    return shapely.union_all(polygons) if len(polygons) else Polygon()
+
+
+def _ring_edges(area) -> np.ndarray:
+    """Every edge (E, 2, 2) of every exterior and interior ring of a polygonal geometry."""
+    rings = shapely.get_rings(shapely.get_parts(area))
+    coords, ring_index = shapely.get_coordinates(rings, return_index=True)
+    same_ring = ring_index[:-1] == ring_index[1:]
+    return np.stack([coords[:-1][same_ring], coords[1:][same_ring]], axis=1)
+
+
+def _rotation(angle: float) -> np.ndarray:
+    """Matrix taking pattern-frame (x, y) rows to world coordinates for a pass direction in degrees."""
+    theta = np.radians(angle)
+    cos, sin = np.cos(theta), np.sin(theta)
+    return np.array([[cos, -sin], [sin, cos]])
+
+
+def sweep_segments(area, spacing: float, angle: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Clip evenly spaced passes against an area.
+
+    Passes run in the direction ``angle`` (degrees counter-clockwise from the
+    x axis), ``spacing`` apart, with the first and last pass half a spacing
+    inside the area's extent.
+
+    Args:
+        area: Shapely polygonal geometry to cover
+        spacing: Distance between neighbouring passes
+        angle: Pass direction in degrees
+
+    Returns:
+        Tuple of (segments, pass_index): segments (N, 2, 2) as
+        [[x_start, y], [x_end, y]] in the rotated pattern frame with
+        x_start < x_end, sorted by pass and then by x; pass_index (N,)
+        is the pass each segment belongs to
+    """
+    if spacing <= 0:
+        raise ValueError("spacing must be positive")
+    empty = np.empty((0, 2, 2)), np.empty(0, dtype=int)
+    if area.is_empty:
+        return empty
+
+    rotation = _rotation(angle)
+    # Rows times the rotation matrix undo the rotation, i.e. world -> pattern frame
+    local = shapely.transform(area, lambda coords: coords @ rotation)
+    min_x, min_y, max_x, max_y = local.bounds
+
+    offsets = np.arange(min_y + spacing / 2, max_y, spacing)
+    if not len(offsets):
+        offsets = np.array([(min_y + max_y) / 2])
+    edges = _ring_edges(local)
+    y0, y1 = edges[:, 0, 1], edges[:, 1, 1]
+    # Half-open crossing rule: an edge spans [min(y0, y1), max(y0, y1)) so a pass
+    # through a vertex is counted once and horizontal edges never cross
+    low, high = np.minimum(y0, y1), np.maximum(y0, y1)
+    crosses = (offsets[:, None] >= low) & (offsets[:, None] < high)
+    pass_index, edge_index = np.nonzero(crosses)
+    if not len(pass_index):
+        return empty
+    edge = edges[edge_index]
+    t = (offsets[pass_index] - edge[:, 0, 1]) / (edge[:, 1, 1] - edge[:, 0, 1])
+    x = edge[:, 0, 0] + t * (edge[:, 1, 0] - edge[:, 0, 0])
+
+    # Even-odd rule: after sorting along each pass, crossings pair up into inside spans
+    order = np.lexsort((x, pass_index))
+    x = x[order].reshape(-1, 2)
+    pass_index = pass_index[order][::2]
+    keep = x[:, 1] > x[:, 0]
+    x, pass_index = x[keep], pass_index[keep]
+
+    segments = np.empty((len(x), 2, 2))
+    segments[:, :, 0] = x
+    segments[:, :, 1] = offsets[pass_index, None]
+    return segments, pass_index
+
+
+def boustrophedon_cells(segments: np.ndarray, pass_index: np.ndarray) -> np.ndarray:
+    """
+    Group sorted sweep segments into boustrophedon cells.
+
+    A segment continues the cell of the segment with the same rank on the
+    previous pass when both passes hold the same number of segments, the two
+    overlap along the pass direction, and neither overlaps the other's
+    neighbours. Anywhere the area splits or merges a new cell starts.
+
+    Args:
+        segments: Output of ``sweep_segments``
+        pass_index: Output of ``sweep_segments``
+
+    Returns:
+        np.ndarray: Cell ID per segment, numbered in order of first appearance
+    """
+    count = len(segments)
+    if not count:
+        return np.empty(0, dtype=int)
+    x0, x1 = segments[:, 0, 0], segments[:, 1, 0]
+
+    passes, first, per_pass = np.unique(pass_index, return_index=True, return_counts=True)
+    slot = np.searchsorted(passes, pass_index)
+    rank = np.arange(count) - first[slot]
+
+    # Candidate predecessor: same rank on the previous, equally populated pass
+    has_prev = slot > 0
+    prev_slot = np.maximum(slot - 1, 0)
+    candidate = has_prev & (passes[prev_slot] == pass_index - 1) & (per_pass[prev_slot] == per_pass[slot])
+    pred = np.where(candidate, first[prev_slot] + rank, 0)
+
+    def overlaps(a, b):
+        return (x0[a] < x1[b]) & (x0[b] < x1[a])
+
+    continues = candidate & overlaps(np.arange(count), pred)
+    # Reject a link if either segment also touches the other's right-hand neighbour
+    has_right = rank + 1 < per_pass[slot]
+    right = np.minimum(np.arange(count) + 1, count - 1)
+    pred_right = np.minimum(pred + 1, count - 1)
+    continues &= ~(has_right & (overlaps(pred_right, np.arange(count)) | overlaps(pred, right)))
+
+    # Segments that start a cell take the next ID; the rest inherit their
+    # predecessor's, which always comes earlier in pass order
+    cells = (np.cumsum(~continues) - 1).tolist()
+    pred = pred.tolist()
+    for i in np.flatnonzero(continues).tolist():
+        cells[i] = cells[pred[i]]
+    return np.asarray(cells)
+
+
+def _cell_waypoints(segments: np.ndarray, reverse_passes: bool, flip_first: bool, alternate: bool) -> np.ndarray:
+    """Waypoints (2N, 2) for one cell's segments in pattern-frame coordinates."""
+    if reverse_passes:
+        segments = segments[::-1]
+    flip = np.full(len(segments), flip_first)
+    if alternate:
+        flip ^= np.arange(len(segments)) % 2 == 1
+    ordered = segments.copy()
+    ordered[flip] = ordered[flip, ::-1]
+    return ordered.reshape(-1, 2)
+
+
+def boustrophedon_path(
+    boundary: Sequence[Point],
+    spacing: float,
+    angle: float = 0.0,
+    no_go_zones: Sequence[Sequence[Point]] = (),
+    start: Optional[Point] = None,
+    alternate: bool = True,
+) -> np.ndarray:
+    """
+    Generate an ordered coverage path for an area.
+
+    Cells are visited greedily, each time picking the unvisited cell whose
+    nearest corner is closest to the current position; inside a cell the
+    passes are mowed in order starting from the corner nearest that position.
+
+    Args:
+        boundary: Boundary vertices
+        spacing: Distance between neighbouring passes
+        angle: Pass direction in degrees counter-clockwise from the x axis
+        no_go_zones: One vertex list per excluded zone
+        start: Position the mower starts from; defaults to the first pass
+        alternate: Reverse every other pass (zigzag). When False every pass
+            runs in the same direction (parallel stripes)
+
+    Returns:
+        np.ndarray: Waypoints (M, 2), two per pass segment (start and end)
+    """
+    segments, pass_index = sweep_segments(coverage_area(boundary, no_go_zones), spacing, angle)
+    if not len(segments):
+        return np.empty((0, 2))
+    rotation = _rotation(angle)
+    cells = boustrophedon_cells(segments, pass_index)
+    by_cell = np.argsort(cells, kind="stable")
+    cell_segments = np.split(segments[by_cell], np.flatnonzero(np.diff(cells[by_cell])) + 1)
+
+    # Corners as (first pass start, first pass end, last pass start, last pass end) per cell
+    corners = np.array([[s[0, 0], s[0, 1], s[-1, 0], s[-1, 1]] for s in cell_segments])
+    position = segments[0, 0] if start is None else np.asarray(start, dtype=float) @ rotation
+
+    remaining = np.ones(len(cell_segments), dtype=bool)
+    pieces: List[np.ndarray] = []
+    for _ in range(len(cell_segments)):
+        distances = np.linalg.norm(corners - position, axis=2)
+        distances[~remaining] = np.inf
+        cell, corner = np.unravel_index(np.argmin(distances), distances.shape)
+        remaining[cell] = False
+        waypoints = _cell_waypoints(cell_segments[cell], corner >= 2, corner % 2 == 1, alternate)
+        pieces.append(waypoints)
+        position = waypoints[-1]
+
+    return np.concatenate(pieces) @ rotation.T
@@ -0,0 +1,439 @@
+"""
+Raster record of the area actually mowed.
+
+``CoverageMap`` is a boolean bitmap over the yard in local metric
+coordinates (UTM easting and northing, like ``OccupancyGrid``) with cells a
+fraction of the cutting width. Every fused pose taken while the blade runs
+stamps the capsule swept by the blade since the previous pose, touching
+only the cells in that segment's bounding box. The number of mowed cells
+inside the mowable area (boundary minus no-go zones) is kept as a running
+count, so the covered share is available in O(1).
+
+A mowing session starts when the blade comes on after ``session_gap``
+seconds idle. ``save_snapshot`` writes the session's bitmap, bit-packed and
+compressed, to ``<directory>/<session id>.npz`` so coverage survives a
+restart, and ``unmowed_regions`` turns what is left into polygons the
+planner can sweep for touch-up passes.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+import utm
+from scipy import ndimage
+
+from mower.navigation.coverage import coverage_area
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+CELLS_PER_WIDTH = 4  # Raster cells across the cutting width
+DEFAULT_MAX_STEP = 2.0  # Longer jumps between poses are GPS glitches, not mowing
+DEFAULT_SESSION_GAP = 6 * 3600.0  # Blade idle time after which a new session starts
+
+
+@dataclass
+class UnmowedRegion:
+    """A connected patch of the mowable area that has not been mowed."""
+
+    area_m2: float
+    centroid: Tuple[float, float]  # (easting, northing)
+    polygon: object  # Shapely polygon in UTM meters
+
+
+class CoverageMap:
+    """
+    Bitmap of mowed cells in UTM coordinates.
+
+    Cell (row, col) covers easting ``origin_e + col * resolution`` and
+    northing ``origin_n + row * resolution``, as in ``OccupancyGrid``.
+    """
+
+    def __init__(
+        self,
+        origin: Tuple[float, float],
+        size_m: Tuple[float, float],
+        cutting_width: float,
+        resolution: Optional[float] = None,
+        zone: Optional[Tuple[int, str]] = None,
+        area=None,
+        max_step: float = DEFAULT_MAX_STEP,
+        session_gap: float = DEFAULT_SESSION_GAP,
+        snapshot_dir=None,
+    ):
+        """
+        Initialize an empty map.
+
+        Args:
+            origin: (easting, northing) of the south-west corner in meters
+            size_m: (width, height) of the map in meters
+            cutting_width: Width of the cut in meters
+            resolution: Cell size in meters; defaults to a quarter of the cutting width
+            zone: UTM (zone number, zone letter) used for lat/lon conversion
+            area: Shapely polygon (UTM meters) of the mowable area; the whole
+                map counts as mowable if None
+            max_step: Pose jumps longer than this (meters) are not swept
+            session_gap: Seconds of blade idle time that end a session
+            snapshot_dir: Default directory for session snapshots
+        """
+        self.origin_e, self.origin_n = float(origin[0]), float(origin[1])
+        self.cutting_width = float(cutting_width)
+        self.resolution = float(resolution or cutting_width / CELLS_PER_WIDTH)
+        self.cols = max(1, int(math.ceil(size_m[0] / self.resolution)))
+        self.rows = max(1, int(math.ceil(size_m[1] / self.resolution)))
+        self.zone = zone
+        self.max_step = max_step
+        self.session_gap = session_gap
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self._lock = threading.Lock()
+
+        self._mowed = np.zeros((self.rows, self.cols), dtype=bool)
+        if area is None:
+            self._mowable = np.ones((self.rows, self.cols), dtype=bool)
+        else:
+            easting, northing = self.cell_center(*np.indices((self.rows, self.cols)))
+            self._mowable = shapely.contains_xy(area, easting, northing)
+        self.mowable_cells = int(self._mowable.sum())
+        self.mowed_cells = 0  # mowed cells inside the mowable area
+
+        self.session_id: Optional[str] = None
+        self.session_started: Optional[float] = None
+        self.last_mowed: Optional[float] = None
+        self._last_point: Optional[Tuple[float, float]] = None
+        self._dirty = False
+
+    @classmethod
+    def from_latlon_boundary(
+        cls,
+        boundary: Sequence[Tuple[float, float]],
+        cutting_width: float,
+        no_go_zones: Sequence[Sequence[Tuple[float, float]]] = (),
+        margin: float = 1.0,
+        **kwargs,
+    ) -> "CoverageMap":
+        """
+        Create a map over a (lat, lon) boundary minus its no-go zones.
+
+        Args:
+            boundary: (lat, lon) boundary vertices
+            cutting_width: Width of the cut in meters
+            no_go_zones: (lat, lon) vertex lists of excluded zones
+            margin: Extra meters around the boundary's bounding box
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            CoverageMap: Map in the UTM zone of the first boundary point
+        """
+        boundary = np.asarray(boundary, dtype=float).reshape(-1, 2)
+        if len(boundary) < 3:
+            raise ValueError("At least three boundary points are required")
+        _, _, zone_number, zone_letter = utm.from_latlon(boundary[0, 0], boundary[0, 1])
+
+        def to_local(points):
+            points = np.asarray(points, dtype=float).reshape(-1, 2)
+            easting, northing, _, _ = utm.from_latlon(
+                points[:, 0], points[:, 1], force_zone_number=zone_number, force_zone_letter=zone_letter
+            )
+            return np.column_stack([easting, northing])
+
+        local = to_local(boundary)
+        area = coverage_area(local, [to_local(zone) for zone in no_go_zones if len(zone) >= 3])
+        origin = (float(local[:, 0].min()) - margin, float(local[:, 1].min()) - margin)
+        size = (float(np.ptp(local[:, 0])) + 2 * margin, float(np.ptp(local[:, 1])) + 2 * margin)
+        return cls(origin, size, cutting_width, zone=(zone_number, zone_letter), area=area, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Coordinates
+    # ------------------------------------------------------------------
+
+    def cell_center(self, rows, cols) -> Tuple[np.ndarray, np.ndarray]:
+        """UTM (easting, northing) of cell centers."""
+        easting = self.origin_e + (np.asarray(cols) + 0.5) * self.resolution
+        northing = self.origin_n + (np.asarray(rows) + 0.5) * self.resolution
+        return easting, northing
+
+    def latlon_to_local(self, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert (lat, lon) to UTM (easting, northing) in the map's zone."""
+        if self.zone is None:
+            raise ValueError("Coverage map has no UTM zone; create it with from_latlon_boundary or pass zone")
+        easting, northing, _, _ = utm.from_latlon(
+            np.asarray(lat, dtype=float),
+            np.asarray(lon, dtype=float),
+            force_zone_number=self.zone[0],
+            force_zone_letter=self.zone[1],
+        )
+        return easting, northing
+
+    def local_to_latlon(self, easting, northing) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert UTM (easting, northing) in the map's zone to (lat, lon)."""
+        if self.zone is None:
+            raise ValueError("Coverage map has no UTM zone; create it with from_latlon_boundary or pass zone")
+        return utm.to_latlon(
+            np.asarray(easting, dtype=float), np.asarray(northing, dtype=float), self.zone[0], self.zone[1], strict=False
+        )
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, easting: float, northing: float, blade_on: bool, now: Optional[float] = None) -> int:
+        """
+        Record one fused pose.
+
+        While the blade runs, the capsule swept since the previous pose is
+        marked mowed. A pose with the blade off, or a jump longer than
+        ``max_step``, breaks the swept line.
+
+        Args:
+            easting: Mower easting in meters
+            northing: Mower northing in meters
+            blade_on: Whether the blade is cutting
+            now: Time in seconds since the epoch
+
+        Returns:
+            int: Mowable cells newly mowed by this pose
+        """
+        if not blade_on:
+            self._last_point = None
+            return 0
+        now = time.time() if now is None else now
+        if self.session_id is None or (self.last_mowed is not None and now - self.last_mowed > self.session_gap):
+            self.start_session(now=now)
+        self.last_mowed = now
+
+        point = (float(easting), float(northing))
+        start = self._last_point
+        if start is None or math.hypot(point[0] - start[0], point[1] - start[1]) > self.max_step:
+            start = point
+        self._last_point = point
+        return self.sweep(start, point)
+
+    def update_latlon(self, lat: float, lon: float, blade_on: bool, now: Optional[float] = None) -> int:
+        """``update`` with a (lat, lon) pose."""
+        if not blade_on:
+            self._last_point = None
+            return 0
+        easting, northing = self.latlon_to_local(lat, lon)
+        return self.update(float(easting), float(northing), True, now)
+
+    def sweep(self, start: Tuple[float, float], end: Tuple[float, float]) -> int:
+        """
+        Mark every cell whose center lies within half the cutting width of a segment.
+
+        Args:
+            start: (easting, northing) where the blade was
+            end: (easting, northing) where the blade is
+
+        Returns:
+            int: Mowable cells newly mowed
+        """
+        radius = self.cutting_width / 2
+        a = np.asarray(start, dtype=float)
+        d = np.asarray(end, dtype=float) - a
+        low = np.minimum(start, end) - radius
+        high = np.maximum(start, end) + radius
+        c0, r0 = np.floor((low - (self.origin_e, self.origin_n)) / self.resolution).astype(int)
+        c1, r1 = np.floor((high - (self.origin_e, self.origin_n)) / self.resolution).astype(int) + 1
+        r0, r1 = max(r0, 0), min(r1, self.rows)
+        c0, c1 = max(c0, 0), min(c1, self.cols)
+        if r0 >= r1 or c0 >= c1:
+            return 0
+
+        # Distance from each cell center in the window to the segment
+        easting, northing = self.cell_center(np.arange(r0, r1)[:, None], np.arange(c0, c1)[None, :])
+        px, py = easting - a[0], northing - a[1]
+        length_sq = float(d @ d)
+        t = np.clip((px * d[0] + py * d[1]) / length_sq, 0.0, 1.0) if length_sq > 0 else 0.0
+        swept = (px - t * d[0]) ** 2 + (py - t * d[1]) ** 2 <= radius * radius
+
+        with self._lock:
+            window = self._mowed[r0:r1, c0:c1]
+            new = swept & ~window
+            window |= swept
+            added = int((new & self._mowable[r0:r1, c0:c1]).sum())
+            self.mowed_cells += added
+            if new.any():
+                self._dirty = True
+        return added
+
+    def start_session(self, session_id: Optional[str] = None, now: Optional[float] = None):
+        """Forget what was mowed and start recording a new session."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._mowed[:] = False
+            self.mowed_cells = 0
+            self.session_id = session_id or time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+            self.session_started = now
+            self.last_mowed = None
+            self._last_point = None
+            self._dirty = True
+        logger.info("Coverage session %s started", self.session_id)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def coverage_fraction(self) -> float:
+        """Share of the mowable area mowed this session (0-1)."""
+        return self.mowed_cells / self.mowable_cells if self.mowable_cells else 0.0
+
+    @property
+    def mowed_area_m2(self) -> float:
+        return self.mowed_cells * self.resolution**2
+
+    def is_mowed(self, easting, northing):
+        """True where the cell containing a point was mowed; False off the map."""
+        cols = np.floor((np.asarray(easting, dtype=float) - self.origin_e) / self.resolution).astype(np.int64)
+        rows = np.floor((np.asarray(northing, dtype=float) - self.origin_n) / self.resolution).astype(np.int64)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        result = np.where(inside, self._mowed[np.where(inside, rows, 0), np.where(inside, cols, 0)], False)
+        return bool(result) if result.ndim == 0 else result
+
+    def unmowed_regions(self, min_area_m2: float = 0.5, min_width: Optional[float] = None) -> List[UnmowedRegion]:
+        """
+        Connected unmowed parts of the mowable area, largest first.
+
+        Args:
+            min_area_m2: Smaller regions are left out
+            min_width: Strips narrower than this (meters) are left out, so the
+                raster edge between two overlapping passes does not count;
+                defaults to half the cutting width
+
+        Returns:
+            list: ``UnmowedRegion`` per region, polygons in UTM meters
+        """
+        with self._lock:
+            unmowed = self._mowable & ~self._mowed
+        width = self.cutting_width / 2 if min_width is None else min_width
+        size = int(round(width / self.resolution))
+        if size > 1:
+            unmowed = ndimage.binary_opening(unmowed, structure=np.ones((size, size), dtype=bool))
+
+        labels, count = ndimage.label(unmowed)
+        if not count:
+            return []
+        cell_area = self.resolution**2
+        sizes = np.bincount(labels.ravel(), minlength=count + 1)
+        regions = []
+        for label, window in enumerate(ndimage.find_objects(labels), start=1):
+            if window is None or sizes[label] * cell_area < min_area_m2:
+                continue
+            mask = labels[window] == label
+            polygon = self._polygon(mask, window[0].start, window[1].start)
+            rows, cols = np.nonzero(mask)
+            easting, northing = self.cell_center(rows.mean() + window[0].start, cols.mean() + window[1].start)
+            regions.append(UnmowedRegion(float(sizes[label] * cell_area), (float(easting), float(northing)), polygon))
+        regions.sort(key=lambda region: region.area_m2, reverse=True)
+        return regions
+
+    def _polygon(self, mask: np.ndarray, row0: int, col0: int):
+        """Union of the horizontal cell runs of a region mask."""
+        padded = np.pad(mask, ((0, 0), (1, 1))).astype(np.int8)
+        edges = np.diff(padded, axis=1)
+        run_rows, run_starts = np.nonzero(edges == 1)
+        _, run_ends = np.nonzero(edges == -1)
+        min_e = self.origin_e + (col0 + run_starts) * self.resolution
+        max_e = self.origin_e + (col0 + run_ends) * self.resolution
+        min_n = self.origin_n + (row0 + run_rows) * self.resolution
+        return shapely.union_all(shapely.box(min_e, min_n, max_e, min_n + self.resolution))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _metadata(self) -> dict:
+        return {
+            "origin": [self.origin_e, self.origin_n],
+            "resolution": self.resolution,
+            "shape": [self.rows, self.cols],
+            "zone": list(self.zone) if self.zone else None,
+        }
+
+    def save_snapshot(self, directory=None, force: bool = False) -> Optional[Path]:
+        """
+        Write the current session to ``<directory>/<session id>.npz``.
+
+        Args:
+            directory: Snapshot directory; defaults to ``snapshot_dir``
+            force: Write even if nothing changed since the last snapshot
+
+        Returns:
+            Path: File written, or None if there was nothing to write
+        """
+        directory = directory or self.snapshot_dir
+        if directory is None or self.session_id is None or not (self._dirty or force):
+            return None
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            packed = np.packbits(self._mowed)
+            self._dirty = False
+            session = {
+                "session_id": self.session_id,
+                "started": self.session_started,
+                "last_mowed": self.last_mowed,
+                "coverage": self.coverage_fraction,
+            }
+        path = directory / f"{self.session_id}.npz"
+        temporary = directory / f".{self.session_id}.tmp.npz"
+        np.savez_compressed(temporary, mowed=packed, meta=json.dumps({**self._metadata(), **session}))
+        os.replace(temporary, path)
+        return path
+
+    def load_snapshot(self, path) -> bool:
+        """
+        Resume the session stored at ``path``.
+
+        Returns:
+            bool: False if the file is unreadable or has a different layout
+        """
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                packed = data["mowed"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Could not read coverage snapshot %s: %s", path, e)
+            return False
+        if {key: meta.get(key) for key in self._metadata()} != self._metadata():
+            logger.warning("Coverage snapshot %s has a different layout; ignoring it", path)
+            return False
+        mowed = np.unpackbits(packed, count=self.rows * self.cols).reshape(self.rows, self.cols).astype(bool)
+        with self._lock:
+            self._mowed = mowed
+            self.mowed_cells = int((mowed & self._mowable).sum())
+            self.session_id = meta["session_id"]
+            self.session_started = meta.get("started")
+            self.last_mowed = meta.get("last_mowed")
+            self._last_point = None
+            self._dirty = False
+        logger.info("Resumed coverage session %s at %.1f%%", self.session_id, self.coverage_fraction * 100)
+        return True
+
+    def resume_latest(self, directory=None) -> bool:
+        """Load the newest snapshot in ``directory`` (default ``snapshot_dir``) that fits this map."""
+        directory = directory or self.snapshot_dir
+        if directory is None or not Path(directory).is_dir():
+            return False
+        snapshots = sorted(Path(directory).glob("*.npz"), key=lambda p: p.stat().st_mtime, reverse=True)
+        return any(self.load_snapshot(path) for path in snapshots if not path.name.startswith("."))
+
+    def close(self):
+        """Save the session to ``snapshot_dir`` if it changed."""
+        self.save_snapshot()
+
+    def get_status(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "coverage_percent": round(self.coverage_fraction * 100, 2),
+            "mowed_area_m2": round(self.mowed_area_m2, 2),
+            "mowable_area_m2": round(self.mowable_cells * self.resolution**2, 2),
+        }
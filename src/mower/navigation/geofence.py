@@ -0,0 +1,336 @@
+"""
+Shared geofence index for boundary and no-go-zone containment checks.
+
+The yard boundary (``user_polygon.json``) and no-go zones
+(``no_go_zones.json``) are parsed once into Shapely geometries that are
+prepared for repeated predicates, with an STRtree over the no-go zones.
+``get_geofence()`` hands out the cached index and rebuilds it when either
+file changes on disk, so a boundary saved by the web process is picked up
+by the main controller without a restart. ``save_boundary`` and
+``save_no_go_zones`` write the files and drop the cached index immediately.
+
+Coordinates follow Shapely's (x, y) = (longitude, latitude) order for the
+array methods (``contains_xy`` and friends); the scalar helpers take
+(lat, lon) like the rest of the navigation code. Points stored as two-item
+lists are read as [lng, lat], matching the GeoJSON layout the safety checks
+already use; dict points use explicit "lat" and "lng"/"lon" keys.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import LineString, Polygon
+from shapely.strtree import STRtree
+
+from mower.config_management.constants import NO_GO_ZONES_PATH, USER_POLYGON_PATH
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+LngLat = Tuple[float, float]
+
+
+def parse_point(point: Any) -> Optional[LngLat]:
+    """
+    Parse one stored point into (lng, lat).
+
+    Args:
+        point: {"lat": .., "lng"|"lon": ..} dict or [lng, lat] pair
+
+    Returns:
+        (lng, lat) tuple, or None if the point is malformed
+    """
+    try:
+        if isinstance(point, dict):
+            lng = point.get("lng", point.get("lon"))
+            lat = point.get("lat")
+            if lng is None or lat is None:
+                return None
+            return float(lng), float(lat)
+        if isinstance(point, (list, tuple)) and len(point) >= 2:
+            return float(point[0]), float(point[1])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def parse_ring(points: Any) -> List[LngLat]:
+    """Parse a list of stored points, skipping malformed entries."""
+    if isinstance(points, dict):
+        points = points.get("points") or points.get("coordinates") or points.get("boundary") or []
+        # GeoJSON polygons nest the outer ring one level deeper
+        if points and isinstance(points[0], list) and points[0] and isinstance(points[0][0], (list, dict)):
+            points = points[0]
+    if not isinstance(points, list):
+        return []
+    parsed = (parse_point(point) for point in points)
+    return [point for point in parsed if point is not None]
+
+
+def _boundary_points(data: Any) -> List[LngLat]:
+    """Extract the boundary ring from any of the user_polygon.json layouts."""
+    if isinstance(data, dict):
+        if data.get("coordinates"):
+            return parse_ring(data["coordinates"][0])
+        return parse_ring(data.get("boundary", []))
+    return parse_ring(data)
+
+
+def _polygon(points: Sequence[LngLat]) -> Optional[Polygon]:
+    if len(points) < 3:
+        return None
+    polygon = Polygon(points)
+    shapely.prepare(polygon)
+    return polygon
+
+
+@lru_cache(maxsize=32)
+def _prepared_polygon(points: Tuple[Tuple[float, float], ...]) -> Polygon:
+    polygon = Polygon(points)
+    shapely.prepare(polygon)
+    return polygon
+
+
+def prepared_polygon(points) -> Polygon:
+    """
+    Prepared Shapely polygon for an (N, 2) sequence of vertices, cached by value.
+
+    Used by code that tests many points against the same ad-hoc polygon
+    (e.g. path generation against the pattern boundary).
+    """
+    return _prepared_polygon(tuple(map(tuple, np.asarray(points, dtype=float).tolist())))
+
+
+class Geofence:
+    """
+    Prepared yard boundary and no-go zones.
+
+    Attributes:
+        boundary_points: Parsed boundary vertices as (lng, lat)
+        boundary: Prepared boundary polygon, or None if none is configured
+        no_go_zones: Prepared no-go zone polygons
+    """
+
+    def __init__(self, boundary_points: Sequence[LngLat], no_go_zones: Sequence[Sequence[LngLat]] = ()):
+        """
+        Build the index.
+
+        Args:
+            boundary_points: Boundary vertices as (lng, lat)
+            no_go_zones: One vertex list per zone, as (lng, lat)
+        """
+        self.boundary_points = list(boundary_points)
+        self.boundary = _polygon(self.boundary_points)
+        self.no_go_zones = [zone for zone in (_polygon(points) for points in no_go_zones) if zone is not None]
+        self._tree = STRtree(self.no_go_zones)
+        self._no_go_union = shapely.union_all(self.no_go_zones) if self.no_go_zones else None
+        if self._no_go_union is not None:
+            shapely.prepare(self._no_go_union)
+
+    @property
+    def has_boundary(self) -> bool:
+        return self.boundary is not None
+
+    def within_boundary_xy(self, x, y) -> np.ndarray:
+        """
+        Vectorized boundary test.
+
+        Args:
+            x: Longitudes (scalar or array)
+            y: Latitudes (scalar or array)
+
+        Returns:
+            np.ndarray: True where the point lies inside the boundary;
+                all True when no boundary is configured
+        """
+        if self.boundary is None:
+            return np.ones(np.broadcast(x, y).shape, dtype=bool)
+        return shapely.contains_xy(self.boundary, x, y)
+
+    def in_no_go_xy(self, x, y) -> np.ndarray:
+        """Vectorized test for points inside any no-go zone (x = lng, y = lat)."""
+        if self._no_go_union is None:
+            return np.zeros(np.broadcast(x, y).shape, dtype=bool)
+        return shapely.intersects_xy(self._no_go_union, x, y)
+
+    def contains_xy(self, x, y) -> np.ndarray:
+        """Vectorized test for points inside the boundary and outside every no-go zone."""
+        return self.within_boundary_xy(x, y) & ~self.in_no_go_xy(x, y)
+
+    def within_boundary(self, lat: float, lon: float) -> bool:
+        """True if (lat, lon) lies inside the yard boundary."""
+        return bool(self.within_boundary_xy(lon, lat))
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """True if (lat, lon) is inside the boundary and not in a no-go zone."""
+        return bool(self.contains_xy(lon, lat))
+
+    def no_go_zones_intersecting(self, geometry) -> np.ndarray:
+        """Indices of the no-go zones that intersect a Shapely geometry."""
+        if not self.no_go_zones:
+            return np.empty(0, dtype=int)
+        return self._tree.query(geometry, predicate="intersects")
+
+    def path_is_clear(self, points: Sequence[Tuple[float, float]]) -> bool:
+        """
+        Check that a path stays inside the boundary and out of the no-go zones.
+
+        Args:
+            points: Path waypoints as (lat, lon)
+
+        Returns:
+            bool: True if every segment of the path is allowed
+        """
+        lnglat = [(lon, lat) for lat, lon in points]
+        if len(lnglat) < 2:
+            return bool(len(lnglat) == 0 or self.contains(points[0][0], points[0][1]))
+        line = LineString(lnglat)
+        if self.boundary is not None and not self.boundary.covers(line):
+            return False
+        return len(self.no_go_zones_intersecting(line)) == 0
+
+
+def load_geofence(boundary_path=USER_POLYGON_PATH, no_go_path=NO_GO_ZONES_PATH) -> Geofence:
+    """
+    Build a geofence from the boundary and no-go zone files.
+
+    Missing or unreadable files are treated as empty.
+    """
+    return Geofence(_boundary_points(_read_json(boundary_path)), load_no_go_zones(no_go_path, parsed=True))
+
+
+def _read_json(path) -> Any:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read geofence file %s: %s", path, e)
+        return None
+
+
+def _signature(path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+_cache_lock = threading.Lock()
+_cache: Dict[Tuple[str, str], Tuple[Any, Geofence]] = {}
+
+
+def get_geofence(boundary_path=USER_POLYGON_PATH, no_go_path=NO_GO_ZONES_PATH) -> Geofence:
+    """
+    Return the shared geofence index, rebuilding it if either file changed.
+
+    Args:
+        boundary_path: Boundary file (user_polygon.json)
+        no_go_path: No-go zone file
+
+    Returns:
+        Geofence: Cached index for these files
+    """
+    key = (str(boundary_path), str(no_go_path))
+    signature = (_signature(boundary_path), _signature(no_go_path))
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    geofence = load_geofence(boundary_path, no_go_path)
+    with _cache_lock:
+        _cache[key] = (signature, geofence)
+    return geofence
+
+
+def invalidate_geofence():
+    """Drop every cached geofence index."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _write_json(path, data: Any):
+    """Write JSON atomically so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _as_latlng_dicts(points: Sequence[LngLat]) -> List[Dict[str, float]]:
+    return [{"lat": lat, "lng": lng} for lng, lat in points]
+
+
+def load_boundary(path=USER_POLYGON_PATH) -> List[Dict[str, float]]:
+    """Return the stored boundary as a list of {"lat", "lng"} dicts."""
+    return _as_latlng_dicts(_boundary_points(_read_json(path)))
+
+
+def load_no_go_zones(path=NO_GO_ZONES_PATH, parsed: bool = False) -> List[Any]:
+    """
+    Return the stored no-go zones.
+
+    Args:
+        path: No-go zone file
+        parsed: Return (lng, lat) vertex lists instead of {"lat", "lng"} dicts
+    """
+    data = _read_json(path)
+    if isinstance(data, dict):
+        data = data.get("zones", [])
+    zones = [parse_ring(zone) for zone in data] if isinstance(data, list) else []
+    zones = [zone for zone in zones if zone]
+    return zones if parsed else [_as_latlng_dicts(zone) for zone in zones]
+
+
+def save_boundary(boundary: Sequence[Any], path=USER_POLYGON_PATH):
+    """
+    Save the yard boundary and invalidate the cached geofence.
+
+    Existing dict-style files keep their other keys (e.g. "home").
+
+    Args:
+        boundary: Boundary points as dicts or [lng, lat] pairs
+    """
+    points = parse_ring(list(boundary))
+    if len(points) < 3:
+        raise ValueError("A boundary needs at least 3 valid points")
+    existing = _read_json(path)
+    if isinstance(existing, dict):
+        existing.pop("coordinates", None)
+        existing["boundary"] = _as_latlng_dicts(points)
+        data = existing
+    else:
+        data = _as_latlng_dicts(points)
+    _write_json(path, data)
+    invalidate_geofence()
+    logger.info("Saved boundary with %d points to %s", len(points), path)
+
+
+def save_no_go_zones(zones: Sequence[Any], path=NO_GO_ZONES_PATH):
+    """
+    Save the no-go zones and invalidate the cached geofence.
+
+    Args:
+        zones: One list of points (dicts or [lng, lat] pairs) per zone
+    """
+    parsed = [parse_ring(zone) for zone in zones]
+    if any(len(zone) < 3 for zone in parsed):
+        raise ValueError("Every no-go zone needs at least 3 valid points")
+    _write_json(path, [_as_latlng_dicts(zone) for zone in parsed])
+    invalidate_geofence()
+    logger.info("Saved %d no-go zones to %s", len(parsed), path)
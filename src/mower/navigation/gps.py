@@ -1,17 +1,15 @@
 import argparse
 import json
-import operator
 import os
 import threading
 import time
 import urllib.parse
 import urllib.request
-from functools import reduce
 from typing import Any, Dict, List, Optional, Tuple  # Added List, Dict, Any
 
 import pynmea2
-import utm
 
+from mower.navigation.nmea_stream import NmeaStreamParser, UtmProjector, nmea_checksum
 from mower.utilities.logger_config import LoggerConfigInfo
 from mower.utilities.text_writer import CsvLogger
 
@@ -33,6 +31,9 @@ if not GOOGLE_MAPS_API_KEY:
 
 GEOLOCATION_API_URL = "https://www.googleapis.com/geolocation/v1/geolocate"
 
+# Shared by the line parsers so consecutive fixes reuse the cached UTM zone
+_projector = UtmProjector()
+
 
 class SingletonMeta(type):
     """
@@ -87,6 +88,7 @@ class GpsPosition(metaclass=SingletonMeta):
         self.position_reader = GpsNmeaPositions(debug=self.debug)
         self.position = None
         self.metadata = None  # Store GPS metadata (satellites, HDOP, etc.)
+        self.parser = NmeaStreamParser(on_position=self._on_position)
         self.running = True
         self.lock = threading.Lock()
         self.line_reader = None
@@ -108,21 +110,8 @@ class GpsPosition(metaclass=SingletonMeta):
     def _read_gps(self):
         while self.running:
             try:
-                # Get both position and metadata
-                positions = self.run()
-                metadata = self.run_metadata()
-                
-                if positions:
-                    with self.lock:
-                        self.position = positions
-                
-                if metadata:
-                    with self.lock:
-                        self.metadata = metadata
-                        
-                if not positions:
-                    logger.debug("No valid GPS position received.")
-                time.sleep(1)  # Adjust as needed
+                if self.run() is None and self.line_reader is None:
+                    time.sleep(1)
             except IOError as e:
                 logger.error("IO error reading GPS data: %s", e)
                 time.sleep(5)  # Wait before retrying
@@ -133,41 +122,58 @@ class GpsPosition(metaclass=SingletonMeta):
                 logger.error("Runtime error in GPS module: %s", e)
                 time.sleep(5)  # Wait before retrying
 
+    def _on_position(self, position):
+        with self.lock:
+            self.position = position
+            self.metadata = self.parser.metadata
+
     def run(self):
+        """
+        Feed the bytes waiting on the serial port to the stream parser.
+
+        Blocks for up to the port timeout when nothing is waiting, so the
+        reader thread keeps up with 10 Hz receivers without polling.
+
+        Returns:
+            The latest (timestamp, easting, northing, zone number, zone letter)
+            position, or None
+        """
         if self.line_reader is None:
             logger.warning("GPS line_reader is not initialized; cannot run().")
             return None
-        try:
-            # Read a single NMEA line from the serial port
-            line = self.line_reader.readline().decode(errors='ignore').strip()
-            if line:
-                # Format as (timestamp, nmea) tuple for compatibility
-                return self.run_once([(time.time(), line)])
-            else:
-                return None
-        except Exception as e:
-            logger.error(f"Exception in GpsPosition.run(): {e}")
-            return None
+        chunk = self.line_reader.read(self.line_reader.in_waiting or 1)
+        if chunk:
+            self.parser.feed(chunk)
+            if self.parser.metadata is not None:
+                with self.lock:
+                    self.metadata = self.parser.metadata
+        return self.parser.position
+
+    def write(self, data: bytes) -> int:
+        """
+        Send raw bytes (e.g. RTCM corrections) to the receiver.
+
+        Shares the port with the reader thread, so correction streams do not
+        need a second connection to the receiver.
+
+        Returns:
+            int: Number of bytes written; 0 if the port is not open
+        """
+        if self.line_reader is None:
+            return 0
+        return self.line_reader.write(data) or 0
+
+    def latest_gga(self) -> Optional[bytes]:
+        """The receiver's latest GGA sentence with a fix, without line ending."""
+        return self.parser.last_gga
 
     def run_once(self, lines):
         positions = self.position_reader.run(lines)
         return positions[-1] if positions else None
 
     def run_metadata(self):
-        """Parse GPS metadata from current NMEA lines."""
-        if self.line_reader is None:
-            logger.warning("GPS line_reader is not initialized; cannot run_metadata().")
-            return None
-        try:
-            line = self.line_reader.readline().decode(errors='ignore').strip()
-            if line:
-                # Format as (timestamp, nmea) tuple for compatibility
-                return self.run_metadata_once([(time.time(), line)])
-            else:
-                return None
-        except Exception as e:
-            logger.error(f"Exception in GpsPosition.run_metadata(): {e}")
-            return None
+        """Latest GPS metadata parsed from the serial stream."""
+        return self.parser.metadata
 
     def run_metadata_once(self, lines):
         """Parse GPS metadata from given NMEA lines."""
@@ -308,7 +314,7 @@ def parse_gps_position(line, debug=False):
     try:
         # Recalculate and check checksum
         line_no_checksum = line[1:].split("*")[0]
-        expected_checksum = reduce(operator.xor, map(ord, line_no_checksum), 0)
+        expected_checksum = nmea_checksum(line_no_checksum.encode("latin-1"))
         provided_checksum = int(line.split("*")[1], 16)
         if expected_checksum != provided_checksum:
             logger.info("NMEA checksum does not match: %s != %s for line %s",
@@ -338,7 +344,7 @@ def parse_gps_position(line, debug=False):
                 logger.debug("GPGGA sentence received, but lat/lon is empty.")
             return None
 
-        utm_position = utm.from_latlon(msg.latitude, msg.longitude)
+        utm_position = _projector.from_latlon(msg.latitude, msg.longitude)
         return (
             float(utm_position[0]),
             float(utm_position[1]),
@@ -357,7 +363,7 @@ def parse_gps_position(line, debug=False):
                 logger.debug("GPRMC sentence received, but lat/lon is empty.")
             return None
 
-        utm_position = utm.from_latlon(msg.latitude, msg.longitude)
+        utm_position = _projector.from_latlon(msg.latitude, msg.longitude)
         return (
             float(utm_position[0]),
             float(utm_position[1]),
@@ -396,7 +402,7 @@ def parse_gps_metadata(line, debug=False):
     # Verify checksum before parsing
     try:
         line_no_checksum = line[1:].split("*")[0]
-        expected_checksum = reduce(operator.xor, map(ord, line_no_checksum), 0)
+        expected_checksum = nmea_checksum(line_no_checksum.encode("latin-1"))
         provided_checksum = int(line.split("*")[1], 16)
         if expected_checksum != provided_checksum:
             if debug:
@@ -463,7 +469,7 @@ def parse_nmea_checksum(nmea_line):
 
 
 def calculate_nmea_checksum(nmea_line):
-    return reduce(operator.xor, map(ord, nmea_line[1:-3]), 0)
+    return nmea_checksum(nmea_line[1:-3].encode("latin-1"))
 
 
 def nmea_to_degrees(gps_str, direction):
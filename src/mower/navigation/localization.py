@@ -3,20 +3,27 @@ import os
 import sys
 import time
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
-import numpy as np
-from shapely.geometry import Point, Polygon
+import utm
 
 from core.logger import configure_logging, get_logger
 from mower.constants import max_lat, max_lng, min_lat, min_lng, polygon_coordinates
+from mower.navigation.geofence import get_geofence
 from mower.navigation.gps import GpsLatestPosition, GpsNmeaPositions
+from mower.navigation.pose_filter import HEADING, PoseEKF, imu_yaw_to_yaw, yaw_to_compass
 
 configure_logging()
 logging = get_logger(__name__)
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+MAX_PREDICT_DT = 0.5  # longest single prediction step in seconds, e.g. after a stall
+IMU_HEADING_STD = math.radians(3.0)  # BNO085 rotation vector heading accuracy
+IMU_YAW_RATE_STD = 0.02  # gyro noise in rad/s
+# Heading of the IMU's zero-yaw axis, degrees counter-clockwise from east
+IMU_YAW_OFFSET_DEG = float(os.getenv("IMU_YAW_OFFSET_DEG", "0.0"))
+
 
 @dataclass
 class Position:
@@ -28,6 +35,8 @@ class Position:
     heading: float
     accuracy: float
     last_update: float
+    easting: float = 0.0
+    northing: float = 0.0
 
 
 class Localization:
@@ -76,11 +85,24 @@ class Localization:
             "max_lng": max_lng,
         }
 
-        # Kalman filter parameters
-        self.kalman_state = None
-        self.kalman_covariance = None
-        self.process_noise = 0.1
-        self.measurement_noise = 0.5
+        # Pose filter in the UTM zone of the first GPS fix
+        self.filter = PoseEKF()
+        self.utm_zone: Optional[Tuple[int, str]] = None
+        self._last_fix_time = None
+        self._last_propagate: Optional[float] = None
+
+    def set_sensor_interface(self, sensor_interface) -> None:
+        """
+        Read IMU data from an existing sensor interface.
+
+        The resource manager passes its own interface so localization shares
+        the sensor manager (and its bus arbitration) instead of starting a
+        second one.
+
+        Args:
+            sensor_interface: Object with a ``get_sensor_data()`` method
+        """
+        self.sensor_interface = sensor_interface
 
     def get_sensor_interface(self):
         """Get or initialize the enhanced sensor interface."""
@@ -90,166 +112,134 @@ class Localization:
             self.sensor_interface = EnhancedSensorInterface()
         return self.sensor_interface
 
-    def estimate_position(self) -> Tuple[float, float]:
+    def propagate(self, now: Optional[float] = None):
         """
-        Estimate current position using sensor fusion of GPS and IMU data.
+        Advance the pose filter to ``now`` and fuse the latest IMU reading.
 
-        Returns:
-            Tuple[float, float]: Estimated latitude and longitude
+        Meant to run at the IMU rate; GPS fixes are fused by ``update``.
+
+        Args:
+            now: Monotonic time in seconds; defaults to ``time.monotonic()``
         """
         try:
-            # Get sensor data
-            sensor_interface = self.get_sensor_interface()
-            sensor_data = sensor_interface.get_sensor_data()
-
-            # Get GPS data
-            gps_data = self.latest_position.run()
-
-            if gps_data and "heading" in sensor_data:
-                return self._process_sensor_data(gps_data, sensor_data)
-            else:
-                return self._handle_limited_data(sensor_data)
-
+            sensor_data = self.get_sensor_interface().get_sensor_data()
+            self._propagate(sensor_data, time.monotonic() if now is None else now)
         except Exception as e:
-            logging.error(f"Position estimation error: {str(e)}")
-            return (self.position.latitude, self.position.longitude)
+            logging.error(f"Pose propagation error: {str(e)}")
 
-    def _process_sensor_data(self, gps_data: Dict, sensor_data: Dict) -> Tuple[float, float]:
+    def _propagate(self, sensor_data: Dict, now: float):
         """
-        Process GPS and sensor data for position estimation.
+        Predict to ``now`` and fuse heading, gyro yaw rate and wheel odometry.
 
         Args:
-            gps_data: Dictionary containing GPS data
-            sensor_data: Dictionary containing sensor readings
-
-        Returns:
-            Tuple[float, float]: Processed latitude and longitude
+            sensor_data: Sensor readings; IMU fields are read from ``imu`` or the top level
+            now: Monotonic time in seconds
         """
-        gps_lat = gps_data["latitude"]
-        gps_lon = gps_data["longitude"]
-        imu_heading = sensor_data["heading"]
-
-        # Initialize Kalman filter if needed
-        if self.kalman_state is None:
-            self.kalman_state = np.array([gps_lat, gps_lon])
-            self.kalman_covariance = np.eye(2) * 0.1
-
-        # Predict step
-        predicted_pos = self._predict_position(
-            self.kalman_state,
-            imu_heading,
-            sensor_data.get("speed", 0),
-            time.time() - self.position.last_update,
-        )
-
-        # Update Kalman filter
-        kalman_gain = self._calculate_kalman_gain()
-        self.kalman_state = self._update_kalman_state(predicted_pos, kalman_gain, gps_lat, gps_lon)
+        if self._last_propagate is not None:
+            self.filter.predict(min(now - self._last_propagate, MAX_PREDICT_DT))
+        self._last_propagate = now
+
+        imu = sensor_data.get("imu", sensor_data)
+        heading = imu.get("heading")
+        if isinstance(heading, (int, float)):
+            # IMU yaw and gyro z share one right-handed frame: both counter-clockwise
+            yaw = imu_yaw_to_yaw(heading, IMU_YAW_OFFSET_DEG)
+            self.filter.update_heading(yaw, IMU_HEADING_STD)
+            self.position.heading = yaw_to_compass(yaw)
+        gyro_z = (imu.get("gyroscope") or {}).get("z")
+        if isinstance(gyro_z, (int, float)):
+            self.filter.update_yaw_rate(float(gyro_z), IMU_YAW_RATE_STD)
+
+        odometry = sensor_data.get("odometry")
+        if odometry:
+            self.filter.update_odometry(odometry["speed"], odometry["yaw_rate"])
 
-        # Update position data
-        self._update_position_data(imu_heading)
-
-        return (self.position.latitude, self.position.longitude)
-
-    def _handle_limited_data(self, sensor_data: Dict) -> Tuple[float, float]:
+    def estimate_position(self) -> Tuple[float, float]:
         """
-        Handle position estimation with limited sensor data.
-
-        Args:
-            sensor_data: Dictionary containing sensor readings
+        Estimate current position using sensor fusion of GPS and IMU data.
 
         Returns:
-            Tuple[float, float]: Best estimate of position
+            Tuple[float, float]: Estimated latitude and longitude
         """
-        if self.kalman_state is not None and "heading" in sensor_data:
-            predicted_pos = self._predict_position(
-                self.kalman_state,
-                sensor_data["heading"],
-                sensor_data.get("speed", 0),
-                time.time() - self.position.last_update,
-            )
-            self.kalman_state = predicted_pos
-            self.kalman_covariance += self.process_noise
-
-            self._update_position_from_kalman()
+        try:
+            gps_data = self.latest_position.run()
+            if gps_data:
+                return self._process_sensor_data(gps_data, self._get_gps_metadata())
+            return self._handle_limited_data()
 
+        except Exception as e:
+            logging.error(f"Position estimation error: {str(e)}")
             return (self.position.latitude, self.position.longitude)
 
-        logging.warning("Insufficient data for position estimation")
-        return (self.position.latitude, self.position.longitude)
+    def _get_gps_metadata(self) -> Optional[Dict]:
+        """Latest HDOP / fix quality from ``parse_gps_metadata``, if the GPS reader has any."""
+        get_metadata = getattr(self.latest_position.gps_position, "get_latest_metadata", None)
+        return get_metadata() if get_metadata else None
 
-    def _predict_position(
-        self,
-        current_pos: np.ndarray,
-        heading: float,
-        speed: float,
-        time_delta: float,
-    ) -> np.ndarray:
+    def _process_sensor_data(self, gps_data: Tuple, metadata: Optional[Dict]) -> Tuple[float, float]:
         """
-        Predict next position based on current motion.
+        Fuse a GPS fix into the pose filter.
 
         Args:
-            current_pos: Current position as numpy array
-            heading: Current heading in degrees
-            speed: Current speed
-            time_delta: Time since last update
+            gps_data: (timestamp, easting, northing, zone number, zone letter)
+            metadata: GPS metadata with ``hdop`` and ``fix_quality``, or None
 
         Returns:
-            np.ndarray: Predicted position
+            Tuple[float, float]: Fused latitude and longitude
         """
-        heading_rad = math.radians(heading)
-        distance = speed * time_delta
-
-        lat_change = distance * math.cos(heading_rad)
-        lon_change = distance * math.sin(heading_rad)
-
-        return current_pos + np.array([lat_change, lon_change])
-
-    def _calculate_kalman_gain(self) -> float:
-        """Calculate Kalman gain for position updating."""
-        return self.kalman_covariance / (self.kalman_covariance + self.measurement_noise)
+        timestamp, easting, northing, zone_number, zone_letter = gps_data[:5]
+        if timestamp != self._last_fix_time:
+            self._last_fix_time = timestamp
+            if self.utm_zone is None:
+                self.utm_zone = (zone_number, zone_letter)
+            elif self.utm_zone != (zone_number, zone_letter):
+                # Keep working in the first fix's zone so the frame stays continuous
+                lat, lon = utm.to_latlon(easting, northing, zone_number, zone_letter)
+                easting, northing, _, _ = utm.from_latlon(lat, lon, force_zone_number=self.utm_zone[0])
+            metadata = metadata or {}
+            self.filter.update_gps(easting, northing, metadata.get("hdop"), metadata.get("fix_quality", 1))
+
+        self._update_position_data()
+        return (self.position.latitude, self.position.longitude)
 
-    def _update_kalman_state(
-        self,
-        predicted_pos: np.ndarray,
-        kalman_gain: float,
-        gps_lat: float,
-        gps_lon: float,
-    ) -> np.ndarray:
+    def _handle_limited_data(self) -> Tuple[float, float]:
         """
-        Update Kalman filter state with new measurements.
-
-        Args:
-            predicted_pos: Predicted position
-            kalman_gain: Calculated Kalman gain
-            gps_lat: GPS latitude
-            gps_lon: GPS longitude
+        Report the filter's dead-reckoned position when no GPS fix is available.
 
         Returns:
-            np.ndarray: Updated Kalman state
+            Tuple[float, float]: Best estimate of position
         """
-        measurement = np.array([gps_lat, gps_lon])
-        self.kalman_covariance = (1 - kalman_gain) * self.kalman_covariance + self.process_noise
-        return predicted_pos + kalman_gain * (measurement - predicted_pos)
+        if self.filter.initialized:
+            self._update_position_data()
+        else:
+            logging.warning("Insufficient data for position estimation")
+        return (self.position.latitude, self.position.longitude)
 
-    def _update_position_data(self, heading: float):
-        """
-        Update position object with new data.
+    def _update_position_data(self):
+        """Copy the filter state into ``self.position``."""
+        if not self.filter.initialized or self.utm_zone is None:
+            return
+        easting, northing = float(self.filter.x[0]), float(self.filter.x[1])
+        lat, lon = utm.to_latlon(easting, northing, *self.utm_zone, strict=False)
+        self.position.latitude = float(lat)
+        self.position.longitude = float(lon)
+        self.position.easting = easting
+        self.position.northing = northing
+        self.position.heading = yaw_to_compass(self.filter.x[HEADING])
+        self.position.accuracy = self.filter.position_std
+        self.position.last_update = time.time()
 
-        Args:
-            heading: Current heading in degrees
+    def get_position_covariance(self) -> Optional[List[List[float]]]:
         """
-        self.position.latitude = float(self.kalman_state[0])
-        self.position.longitude = float(self.kalman_state[1])
-        self.position.heading = heading
-        self.position.last_update = time.time()
-        self.position.accuracy = float(np.sqrt(self.kalman_covariance.diagonal().mean()))
+        Covariance of the fused (easting, northing) position.
 
-    def _update_position_from_kalman(self):
-        """Update position object from Kalman state."""
-        self.position.latitude = float(self.kalman_state[0])
-        self.position.longitude = float(self.kalman_state[1])
-        self.position.last_update = time.time()
+        Returns:
+            Optional[List[List[float]]]: 2x2 covariance in square meters, or
+            None before the first GPS fix
+        """
+        if not self.filter.initialized:
+            return None
+        return self.filter.position_covariance.tolist()
 
     def update(self) -> Dict:
         """
@@ -261,11 +251,6 @@ class Localization:
         try:
             new_lat, new_lon = self.estimate_position()
 
-            # Update orientation from IMU
-            sensor_data = self.get_sensor_interface().get_sensor_data()
-            if "heading" in sensor_data:
-                self.position.heading = sensor_data["heading"]
-
             # Check boundary
             in_bounds = self.is_within_yard(new_lat, new_lon)
             if not in_bounds:
@@ -276,6 +261,7 @@ class Localization:
                 "longitude": new_lon,
                 "heading": self.position.heading,
                 "accuracy": self.position.accuracy,
+                "covariance": self.get_position_covariance(),
                 "last_update": self.position.last_update,
                 "in_bounds": in_bounds,
             }
@@ -325,11 +311,10 @@ class Localization:
             if not in_rectangle:
                 return False
 
-            # Then check against detailed polygon if available
-            if self.yard_boundary:
-                point = Point(lon, lat)
-                polygon = Polygon(self.yard_boundary)
-                return polygon.contains(point)
+            # Then check against the shared prepared boundary if available
+            geofence = get_geofence()
+            if geofence.has_boundary:
+                return geofence.within_boundary(lat, lon)
 
             return True
 
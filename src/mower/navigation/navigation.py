@@ -9,10 +9,13 @@ import utm  # Ensure `utm` is installed in your environment
 from mower.hardware.hardware_registry import get_hardware_registry
 from mower.navigation.gps import GpsLatestPosition, GpsPosition
 from mower.safety.autonomous_safety import SafetyChecker, SafetyValidationError, requires_safety_validation
+from mower.utilities.control_scheduler import FixedRate
 from mower.utilities.logger_config import LoggerConfigInfo
 
 logger = LoggerConfigInfo.get_logger(__name__)
 
+NAVIGATION_RATE_HZ = 10.0  # navigation steps per second while driving to a target
+
 
 @dataclass
 class NavigationStatus:
@@ -36,6 +39,7 @@ class NavigationController:
         sensor_interface,
         debug: bool = False,
         resource_manager=None,
+        localization=None,
     ):
         """
         Initialize the navigation controller.
@@ -45,12 +49,16 @@ class NavigationController:
             sensor_interface: Sensor interface
             debug: Enable debug logging
             resource_manager: ResourceManager instance for safety validation
+            localization: Localization whose fused pose (and covariance) replaces
+                the raw GPS position once it has a fix
         """
         self.gps_latest_position = gps_latest_position
+        self.localization = localization
         self.robohat_driver = get_hardware_registry().get_robohat()
         self.sensor_interface = sensor_interface
         self.debug = debug
         self.manual_control_enabled = False  # ADDED: manual control flag
+        self.loop_stats = None  # timing of the latest navigate_to_location loop
 
         # Initialize safety checker if resource manager provided
         self.safety_checker = None
@@ -144,6 +152,8 @@ class NavigationController:
             self.status.target_position = target_location
             self.status.is_moving = True
             self.status.target_reached = False
+            rate = FixedRate(NAVIGATION_RATE_HZ)
+            self.loop_stats = rate.stats
 
             while not self.status.target_reached:
                 if not self._execute_navigation_step():
@@ -153,7 +163,7 @@ class NavigationController:
                     self._handle_safety_stop("Position update timeout")
                     return False
 
-                time.sleep(0.1)
+                rate.sleep()
 
             self._handle_successful_arrival()
             return True
@@ -191,9 +201,13 @@ class NavigationController:
         """
         Get the latest GPS position.
 
+        Uses the fused pose from ``localization`` when it has one.
+
         Returns:
             Optional[Tuple[float, float]]: Latitude and longitude if available
         """
+        if self.localization is not None and self.localization.filter.initialized:
+            return (self.localization.position.latitude, self.localization.position.longitude)
         try:
             position = self.gps_latest_position.run()
 
@@ -396,6 +410,18 @@ class NavigationController:
         """
         return max(min(value, max_val), min_val)
 
+    def get_position_covariance(self):
+        """
+        Covariance of the fused position estimate.
+
+        Returns:
+            Optional[List[List[float]]]: 2x2 (easting, northing) covariance in
+            square meters, or None without a fused estimate
+        """
+        if self.localization is None:
+            return None
+        return self.localization.get_position_covariance()
+
     def get_status(self) -> Dict:
         """
         Get current navigation status.
@@ -410,6 +436,7 @@ class NavigationController:
             "target_position": self.status.target_position,
             "distance_to_target": self.status.distance_to_target,
             "heading_error": self.status.heading_error,
+            "position_covariance": self.get_position_covariance(),
             "last_error": self.status.last_error,
         }
 
@@ -0,0 +1,281 @@
+"""
+Incremental NMEA 0183 parser for raw serial byte streams.
+
+``NmeaStreamParser.feed`` takes whatever bytes the serial port returned,
+frames complete ``$...*hh\\r\\n`` sentences directly in a ``bytearray``
+and keeps any partial sentence for the next chunk. Sentences are never
+decoded to ``str``: the checksum is computed on the bytes and only GGA, RMC
+and GSA sentences are split into fields; everything else is counted and
+dropped after a three-byte type check.
+
+Positions are projected to UTM with ``UtmProjector``, which keeps the
+current zone's constants and only re-derives the zone when the receiver
+crosses a zone or latitude band edge. Per sentence the parser allocates a
+bounded amount (one slice and its fields), so a 10 Hz RTK receiver with
+several sentences per epoch is parsed as fast as it arrives.
+"""
+
+import math
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from utm.conversion import (
+    E,
+    E_P2,
+    K0,
+    M1,
+    M2,
+    M3,
+    M4,
+    R,
+    latitude_to_zone_letter,
+    latlon_to_zone_number,
+    zone_number_to_central_longitude,
+)
+
+# NMEA 0183 caps sentences at 82 characters; leave room for long proprietary ones
+MAX_SENTENCE_LENGTH = 128
+
+UtmPosition = Tuple[float, float, int, str]
+
+
+def nmea_checksum(body: bytes) -> int:
+    """
+    XOR of all bytes between ``$`` and ``*``.
+
+    Folds the bytes as one integer instead of looping per byte.
+    """
+    if not body:
+        return 0
+    value = int.from_bytes(body, "little")
+    shift = (1 << (len(body) - 1).bit_length()) * 4  # half the width, in bits, of the next power of two
+    while shift >= 8:
+        value = (value ^ (value >> shift)) & ((1 << shift) - 1)
+        shift >>= 1
+    return value
+
+
+class UtmProjector:
+    """
+    Lat/lon to UTM conversion that caches the zone between calls.
+
+    Uses the same series as ``utm.from_latlon`` but in plain ``math`` with
+    the zone's central meridian and hemisphere precomputed. The zone is
+    recomputed only when the 6 degree strip or 8 degree band changes (and
+    always in the bands with Norway's and Svalbard's irregular zones).
+    """
+
+    def __init__(self):
+        self._key: Optional[Tuple[int, int]] = None
+        self.zone_number: Optional[int] = None
+        self.zone_letter: Optional[str] = None
+        self._central_lon = 0.0
+        self._false_northing = 0.0
+        self.zone_changes = 0
+
+    def _select_zone(self, latitude: float, longitude: float):
+        band = int(latitude + 80) >> 3
+        key = (band, int((longitude + 180) // 6))
+        # Bands V (56-64 N) and X (72-84 N) contain non-standard zones
+        if key == self._key and band not in (17, 19):
+            return
+        zone_number = latlon_to_zone_number(latitude, longitude)
+        zone_letter = latitude_to_zone_letter(latitude)
+        if (zone_number, zone_letter) != (self.zone_number, self.zone_letter):
+            self.zone_number, self.zone_letter = zone_number, zone_letter
+            self._central_lon = math.radians(zone_number_to_central_longitude(zone_number))
+            self._false_northing = 0.0 if zone_letter >= "N" else 10000000.0
+            self.zone_changes += 1
+        self._key = key
+
+    def from_latlon(self, latitude: float, longitude: float) -> UtmPosition:
+        """
+        Project a WGS84 position.
+
+        Args:
+            latitude: Degrees north, -80 to 84
+            longitude: Degrees east, -180 to 180
+
+        Returns:
+            Tuple of (easting, northing, zone number, zone letter)
+        """
+        if not -80.0 <= latitude <= 84.0 or not -180.0 <= longitude <= 180.0:
+            raise ValueError(f"position out of UTM range: {latitude}, {longitude}")
+        self._select_zone(latitude, longitude)
+
+        lat_rad = math.radians(latitude)
+        lat_sin = math.sin(lat_rad)
+        lat_cos = math.cos(lat_rad)
+        lat_tan = lat_sin / lat_cos
+        lat_tan2 = lat_tan * lat_tan
+        lat_tan4 = lat_tan2 * lat_tan2
+
+        n = R / math.sqrt(1 - E * lat_sin * lat_sin)
+        c = E_P2 * lat_cos * lat_cos
+        a = lat_cos * ((math.radians(longitude) - self._central_lon + math.pi) % (2 * math.pi) - math.pi)
+        a2 = a * a
+        a3 = a2 * a
+        a4 = a3 * a
+        a5 = a4 * a
+        a6 = a5 * a
+
+        m = R * (M1 * lat_rad - M2 * math.sin(2 * lat_rad) + M3 * math.sin(4 * lat_rad) - M4 * math.sin(6 * lat_rad))
+        easting = (
+            K0 * n * (a + a3 / 6 * (1 - lat_tan2 + c) + a5 / 120 * (5 - 18 * lat_tan2 + lat_tan4 + 72 * c - 58 * E_P2))
+            + 500000
+        )
+        northing = K0 * (
+            m
+            + n
+            * lat_tan
+            * (
+                a2 / 2
+                + a4 / 24 * (5 - lat_tan2 + 9 * c + 4 * c * c)
+                + a6 / 720 * (61 - 58 * lat_tan2 + lat_tan4 + 600 * c - 330 * E_P2)
+            )
+        )
+        return easting, northing + self._false_northing, self.zone_number, self.zone_letter
+
+
+def _degrees(value: bytes, hemisphere: bytes) -> float:
+    """NMEA ``(d)ddmm.mmmm`` plus hemisphere to signed decimal degrees."""
+    raw = float(value)
+    degrees = int(raw / 100)
+    result = degrees + (raw - degrees * 100) / 60
+    return -result if hemisphere in (b"S", b"W") else result
+
+
+class NmeaStreamParser:
+    """Frames and parses NMEA sentences from arbitrary byte chunks."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.time,
+        on_position: Optional[Callable[[Tuple], None]] = None,
+        max_sentence_length: int = MAX_SENTENCE_LENGTH,
+    ):
+        """
+        Initialize the parser.
+
+        Args:
+            clock: Timestamp source for parsed positions
+            on_position: Called with each new (timestamp, easting, northing,
+                zone number, zone letter) position
+            max_sentence_length: Partial sentences longer than this are dropped
+        """
+        self.clock = clock
+        self.on_position = on_position
+        self.max_sentence_length = max_sentence_length
+        self.projector = UtmProjector()
+        self._buffer = bytearray()
+        self._last_fix_time = None
+
+        self.position: Optional[Tuple] = None
+        self.metadata: Optional[Dict] = None
+        self.last_gga: Optional[bytes] = None  # latest GGA with a fix, for NTRIP casters
+        self.stats = {"sentences": 0, "positions": 0, "checksum_errors": 0, "malformed": 0, "ignored": 0, "overflows": 0}
+
+    def feed(self, data: bytes) -> int:
+        """
+        Consume a chunk of serial data.
+
+        Args:
+            data: Raw bytes, possibly ending mid-sentence
+
+        Returns:
+            int: Number of complete sentences framed from the buffer
+        """
+        buffer = self._buffer
+        buffer += data
+        framed = 0
+        start = 0
+        while True:
+            begin = buffer.find(b"$", start)
+            if begin < 0:
+                start = len(buffer)
+                break
+            end = buffer.find(b"\n", begin)
+            if end < 0:
+                if len(buffer) - begin > self.max_sentence_length:
+                    # Garbage or a lost newline: resynchronize on the next '$'
+                    self.stats["overflows"] += 1
+                    start = begin + 1
+                    continue
+                start = begin
+                break
+            # A '$' inside the line means the previous sentence was cut short
+            begin = buffer.rfind(b"$", begin, end)
+            self._handle(bytes(buffer[begin:end]))
+            framed += 1
+            start = end + 1
+        del buffer[:start]
+        return framed
+
+    def _handle(self, sentence: bytes):
+        """Verify and dispatch one sentence without its trailing newline."""
+        self.stats["sentences"] += 1
+        star = sentence.rfind(b"*")
+        try:
+            provided = int(sentence[star + 1 : star + 3], 16) if star > 0 else -1
+        except ValueError:
+            provided = -1
+        body = sentence[1:star]
+        if provided < 0 or nmea_checksum(body) != provided:
+            self.stats["checksum_errors"] += 1
+            return
+
+        kind = body[2:5]
+        try:
+            if kind == b"GGA":
+                if self._handle_gga(body.split(b",")):
+                    self.last_gga = sentence.rstrip(b"\r")
+            elif kind == b"RMC":
+                self._handle_rmc(body.split(b","))
+            elif kind == b"GSA":
+                self._handle_gsa(body.split(b","))
+            else:
+                self.stats["ignored"] += 1
+        except (IndexError, ValueError):
+            self.stats["malformed"] += 1
+
+    def _set_position(self, fix_time: bytes, latitude: float, longitude: float):
+        # Receivers send GGA and RMC for the same epoch; project it once
+        if fix_time and fix_time == self._last_fix_time:
+            return
+        self._last_fix_time = fix_time
+        self.position = (self.clock(), *self.projector.from_latlon(latitude, longitude))
+        self.stats["positions"] += 1
+        if self.on_position is not None:
+            self.on_position(self.position)
+
+    def _handle_gga(self, fields) -> bool:
+        quality = int(fields[6] or 0)
+        if quality < 1:
+            return False
+        self.metadata = {
+            "satellites": int(fields[7] or 0),
+            "hdop": float(fields[8]) if fields[8] else 99.9,
+            "fix_quality": quality,
+            "altitude": float(fields[9]) if fields[9] else 0.0,
+        }
+        if not fields[2] or not fields[4]:
+            return False
+        self._set_position(fields[1], _degrees(fields[2], fields[3]), _degrees(fields[4], fields[5]))
+        return True
+
+    def _handle_rmc(self, fields):
+        if fields[2] != b"A" or not fields[3] or not fields[5]:
+            return
+        self._set_position(fields[1], _degrees(fields[3], fields[4]), _degrees(fields[5], fields[6]))
+
+    def _handle_gsa(self, fields):
+        fix_type = fields[2]
+        if fix_type not in (b"2", b"3"):
+            return
+        satellites = sum(1 for sat in fields[3:15] if sat)
+        hdop = float(fields[16]) if fields[16] else 99.9
+        if self.metadata is None:
+            self.metadata = {"satellites": satellites, "hdop": hdop, "fix_quality": 1, "altitude": 0.0}
+        else:
+            # GGA's fix quality (RTK float/fixed) is more specific than GSA's 2D/3D
+            self.metadata = {**self.metadata, "satellites": satellites, "hdop": hdop}
@@ -0,0 +1,480 @@
+"""
+Log-odds occupancy grid for obstacle mapping.
+
+The grid covers the yard in local metric coordinates (UTM easting and
+northing, as produced by ``navigation/gps.py``). Each cell stores the
+log-odds of being occupied together with the time of its last update, in a
+NumPy memmap so the map survives restarts without a separate save step and
+is paged in lazily.
+
+Range sensors (ToF) and camera detections are fused as rays: cells along
+the ray become more likely free and the end cell more likely occupied.
+Evidence decays towards "unknown" with a configurable half-life, applied
+lazily whenever a cell is read or updated, so stale obstacles (a chair that
+was moved, a pet) fade without a periodic sweep over the whole grid.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import utm
+
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+# Log-odds increments for one observation (p=0.7 occupied, p=0.4 free)
+LOG_ODDS_OCCUPIED = math.log(0.7 / 0.3)
+LOG_ODDS_FREE = math.log(0.4 / 0.6)
+LOG_ODDS_LIMIT = 5.0  # Clamp so cells can still change their mind (p ~ 0.993)
+DEFAULT_OCCUPIED_THRESHOLD = 0.65  # Probability above which a cell is an obstacle
+DEFAULT_DECAY_HALF_LIFE = 600.0  # Seconds for stored evidence to halve
+
+CELL_DTYPE = np.dtype([("log_odds", "<f4"), ("stamp", "<f8")])
+
+
+def _probability(log_odds: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-log_odds))
+
+
+def _log_odds(probability: float) -> float:
+    return math.log(probability / (1.0 - probability))
+
+
+def camera_ray(
+    box: Sequence[float],
+    frame_size: Tuple[int, int],
+    hfov_deg: float,
+    vfov_deg: float,
+    height_m: float,
+    pitch_deg: float,
+) -> Optional[Tuple[float, float]]:
+    """
+    Bearing and ground distance of a detection from a forward-facing camera.
+
+    Pinhole model: the object is taken to stand on flat ground at the bottom
+    edge of its box.
+
+    Args:
+        box: [x1, y1, x2, y2] in pixels
+        frame_size: (width, height) of the frame in pixels
+        hfov_deg: Horizontal field of view in degrees
+        vfov_deg: Vertical field of view in degrees
+        height_m: Lens height above the ground in meters
+        pitch_deg: Downward tilt of the optical axis in degrees
+
+    Returns:
+        Optional[Tuple[float, float]]: (angle relative to the heading in
+        degrees clockwise, distance in meters), or None if the bottom of the
+        box is at or above the horizon
+    """
+    width, height = frame_size
+    fx = width / 2 / math.tan(math.radians(hfov_deg) / 2)
+    fy = height / 2 / math.tan(math.radians(vfov_deg) / 2)
+    bearing = math.atan2((box[0] + box[2]) / 2 - width / 2, fx)
+    depression = math.radians(pitch_deg) + math.atan2(box[3] - height / 2, fy)
+    if depression <= 0:
+        return None
+    return math.degrees(bearing), height_m / math.tan(depression) / math.cos(bearing)
+
+
+class OccupancyGrid:
+    """
+    Log-odds occupancy grid in UTM coordinates backed by a memory-mapped file.
+
+    Cell (row, col) covers easting ``origin_e + col * resolution`` and
+    northing ``origin_n + row * resolution``. Points outside the grid are
+    ignored by updates and read as unknown (probability 0.5).
+    """
+
+    def __init__(
+        self,
+        origin: Tuple[float, float],
+        size_m: Tuple[float, float],
+        resolution: float = 0.1,
+        zone: Optional[Tuple[int, str]] = None,
+        path: Optional[str] = None,
+        decay_half_life: Optional[float] = DEFAULT_DECAY_HALF_LIFE,
+        read_only: bool = False,
+    ):
+        """
+        Initialize the grid, reopening the file at ``path`` if it matches.
+
+        Args:
+            origin: (easting, northing) of the south-west grid corner in meters
+            size_m: (width, height) of the grid in meters
+            resolution: Cell size in meters
+            zone: UTM (zone number, zone letter) used for lat/lon conversion
+            path: File for the memory-mapped cells (in memory if None)
+            decay_half_life: Seconds for evidence to halve, None to disable decay
+            read_only: Map an existing file without write access, e.g. from
+                another process; raises instead of creating a new map
+        """
+        self.origin_e, self.origin_n = float(origin[0]), float(origin[1])
+        self.resolution = float(resolution)
+        self.cols = max(1, int(math.ceil(size_m[0] / resolution)))
+        self.rows = max(1, int(math.ceil(size_m[1] / resolution)))
+        self.zone = zone
+        self.path = str(path) if path else None
+        self.decay_half_life = decay_half_life
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._cells = self._open_cells()
+        self._log_odds = self._cells["log_odds"]
+        self._stamps = self._cells["stamp"]
+
+    @classmethod
+    def from_latlon_bounds(
+        cls, points: Iterable[Tuple[float, float]], margin: float = 5.0, **kwargs
+    ) -> "OccupancyGrid":
+        """
+        Create a grid covering a set of (lat, lon) points plus a margin.
+
+        Args:
+            points: (lat, lon) points, e.g. the yard boundary
+            margin: Extra meters around the bounding box
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            OccupancyGrid: Grid in the UTM zone of the first point
+        """
+        points = list(points)
+        if not points:
+            raise ValueError("At least one point is required to size the grid")
+        lats = np.array([p[0] for p in points], dtype=float)
+        lons = np.array([p[1] for p in points], dtype=float)
+        _, _, zone_number, zone_letter = utm.from_latlon(lats[0], lons[0])
+        eastings, northings, _, _ = utm.from_latlon(
+            lats, lons, force_zone_number=zone_number, force_zone_letter=zone_letter
+        )
+        origin = (float(eastings.min()) - margin, float(northings.min()) - margin)
+        size = (float(np.ptp(eastings)) + 2 * margin, float(np.ptp(northings)) + 2 * margin)
+        return cls(origin, size, zone=(zone_number, zone_letter), **kwargs)
+
+    @classmethod
+    def open_read_only(cls, path: str, **kwargs) -> "OccupancyGrid":
+        """
+        Map a grid file written by another process, without write access.
+
+        Args:
+            path: Cell file; its layout is read from ``path + ".json"``
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            OccupancyGrid: Grid whose queries see the writer's flushed updates
+
+        Raises:
+            OSError: If the file or its metadata is missing
+            ValueError: If the metadata does not match the file
+        """
+        path = str(path)
+        with open(path + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        rows, cols = meta["shape"]
+        resolution = meta["resolution"]
+        zone = tuple(meta["zone"]) if meta.get("zone") else None
+        # Half a cell short so rounding cannot add a row or column
+        size = ((cols - 0.5) * resolution, (rows - 0.5) * resolution)
+        return cls(meta["origin"], size, resolution, zone, path, read_only=True, **kwargs)
+
+    def _metadata(self) -> dict:
+        return {
+            "origin": [self.origin_e, self.origin_n],
+            "resolution": self.resolution,
+            "shape": [self.rows, self.cols],
+            "zone": list(self.zone) if self.zone else None,
+        }
+
+    def _open_cells(self) -> np.ndarray:
+        """Map the cell file, creating (or recreating) it if needed."""
+        if self.path is None:
+            return np.zeros((self.rows, self.cols), dtype=CELL_DTYPE)
+
+        meta_path = self.path + ".json"
+        if self.read_only:
+            with open(meta_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            cells = np.lib.format.open_memmap(self.path, mode="r")
+            if stored != self._metadata() or cells.shape != (self.rows, self.cols) or cells.dtype != CELL_DTYPE:
+                raise ValueError(f"Occupancy grid at {self.path} does not match its metadata")
+            return cells
+
+        if os.path.exists(self.path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    stored = json.load(f)
+                if stored == self._metadata():
+                    return np.lib.format.open_memmap(self.path, mode="r+")
+                logger.warning("Occupancy grid at %s has a different layout; starting a new map", self.path)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not reopen occupancy grid %s: %s", self.path, e)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        cells = np.lib.format.open_memmap(self.path, mode="w+", dtype=CELL_DTYPE, shape=(self.rows, self.cols))
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(self._metadata(), f)
+        return cells
+
+    # ------------------------------------------------------------------
+    # Coordinates
+    # ------------------------------------------------------------------
+
+    def to_cell(self, easting, northing) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convert UTM coordinates to cell indices.
+
+        Returns:
+            Tuple of (rows, cols, inside) arrays; ``inside`` marks points on the grid
+        """
+        cols = np.floor((np.asarray(easting, dtype=float) - self.origin_e) / self.resolution).astype(np.int64)
+        rows = np.floor((np.asarray(northing, dtype=float) - self.origin_n) / self.resolution).astype(np.int64)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        return rows, cols, inside
+
+    def cell_center(self, rows, cols) -> Tuple[np.ndarray, np.ndarray]:
+        """UTM (easting, northing) of cell centers."""
+        easting = self.origin_e + (np.asarray(cols) + 0.5) * self.resolution
+        northing = self.origin_n + (np.asarray(rows) + 0.5) * self.resolution
+        return easting, northing
+
+    def latlon_to_local(self, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert (lat, lon) to UTM (easting, northing) in the grid's zone."""
+        if self.zone is None:
+            raise ValueError("Grid has no UTM zone; create it with from_latlon_bounds or pass zone")
+        easting, northing, _, _ = utm.from_latlon(
+            np.asarray(lat, dtype=float),
+            np.asarray(lon, dtype=float),
+            force_zone_number=self.zone[0],
+            force_zone_letter=self.zone[1],
+        )
+        return easting, northing
+
+    def local_to_latlon(self, easting, northing) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert UTM (easting, northing) in the grid's zone to (lat, lon)."""
+        if self.zone is None:
+            raise ValueError("Grid has no UTM zone; create it with from_latlon_bounds or pass zone")
+        return utm.to_latlon(
+            np.asarray(easting, dtype=float), np.asarray(northing, dtype=float), self.zone[0], self.zone[1], strict=False
+        )
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _decayed(self, log_odds: np.ndarray, stamps: np.ndarray, now: float) -> np.ndarray:
+        if not self.decay_half_life:
+            return log_odds
+        age = np.clip(now - stamps, 0.0, None)
+        return log_odds * np.exp2(-age / self.decay_half_life)
+
+    def _apply(self, rows: np.ndarray, cols: np.ndarray, deltas: np.ndarray, now: Optional[float]):
+        """Add log-odds deltas to cells, summing repeated cells and applying decay first."""
+        if rows.size == 0:
+            return
+        now = time.time() if now is None else now
+        flat = rows * self.cols + cols
+        unique, inverse = np.unique(flat, return_inverse=True)
+        total = np.bincount(inverse, weights=deltas)
+        r, c = np.divmod(unique, self.cols)
+        with self._lock:
+            current = self._decayed(self._log_odds[r, c], self._stamps[r, c], now)
+            self._log_odds[r, c] = np.clip(current + total, -LOG_ODDS_LIMIT, LOG_ODDS_LIMIT)
+            self._stamps[r, c] = now
+
+    def update_rays(self, origins, endpoints, hits=None, now: Optional[float] = None):
+        """
+        Fuse a batch of range observations.
+
+        Cells traversed by each ray are updated as free; the end cell of a ray
+        whose ``hit`` flag is set is updated as occupied.
+
+        Args:
+            origins: Sensor positions (N, 2) or a single (2,) position, UTM meters
+            endpoints: Ray end points (N, 2), UTM meters
+            hits: Bool array (N,); False for rays that reached max range.
+                  Defaults to all True.
+            now: Observation time in seconds since the epoch
+        """
+        endpoints = np.atleast_2d(np.asarray(endpoints, dtype=float))
+        origins = np.broadcast_to(np.asarray(origins, dtype=float), endpoints.shape)
+        hits = np.ones(len(endpoints), dtype=bool) if hits is None else np.asarray(hits, dtype=bool)
+        if len(endpoints) == 0:
+            return
+
+        # Sample each ray at half-cell spacing; every ray gets at least its end point
+        lengths = np.hypot(*(endpoints - origins).T)
+        counts = np.maximum(np.ceil(lengths / (self.resolution / 2)).astype(np.int64), 1) + 1
+        ray_ids = np.repeat(np.arange(len(endpoints)), counts)
+        starts = np.cumsum(counts) - counts
+        fractions = (np.arange(counts.sum()) - starts[ray_ids]) / (counts[ray_ids] - 1).clip(min=1)
+        samples = origins[ray_ids] + (endpoints - origins)[ray_ids] * fractions[:, None]
+
+        rows, cols, inside = self.to_cell(samples[:, 0], samples[:, 1])
+        end_rows, end_cols, end_inside = self.to_cell(endpoints[:, 0], endpoints[:, 1])
+
+        # One free update per (ray, cell), skipping the end cell of rays that hit
+        flat = rows * self.cols + cols
+        end_flat = end_rows * self.cols + end_cols
+        free = inside & ~(hits[ray_ids] & (flat == end_flat[ray_ids]))
+        keys = np.unique(ray_ids[free] * (self.rows * self.cols) + flat[free])
+        free_cells = keys % (self.rows * self.cols)
+
+        occupied = hits & end_inside
+        all_rows = np.concatenate([free_cells // self.cols, end_rows[occupied]])
+        all_cols = np.concatenate([free_cells % self.cols, end_cols[occupied]])
+        deltas = np.concatenate(
+            [np.full(len(free_cells), LOG_ODDS_FREE), np.full(int(occupied.sum()), LOG_ODDS_OCCUPIED)]
+        )
+        self._apply(all_rows, all_cols, deltas, now)
+
+    def integrate_range(
+        self,
+        easting: float,
+        northing: float,
+        heading: float,
+        distance: float,
+        max_range: float,
+        sensor_angle: float = 0.0,
+        now: Optional[float] = None,
+    ):
+        """
+        Fuse one range reading taken from the mower's pose.
+
+        Args:
+            easting: Mower easting in meters
+            northing: Mower northing in meters
+            heading: Mower heading in degrees (0 = north, clockwise)
+            distance: Measured distance in meters
+            max_range: Sensor maximum range in meters; readings at or beyond
+                       it only clear cells
+            sensor_angle: Sensor mounting angle relative to the heading, degrees
+            now: Observation time in seconds since the epoch
+        """
+        bearing = math.radians(heading + sensor_angle)
+        reach = min(distance, max_range)
+        endpoint = (easting + reach * math.sin(bearing), northing + reach * math.cos(bearing))
+        self.update_rays([easting, northing], [endpoint], [distance < max_range], now)
+
+    def mark_occupied(self, points, now: Optional[float] = None):
+        """Add one occupied observation at each (easting, northing) point."""
+        self._mark(points, LOG_ODDS_OCCUPIED, now)
+
+    def mark_free(self, points, now: Optional[float] = None):
+        """Add one free observation at each (easting, northing) point."""
+        self._mark(points, LOG_ODDS_FREE, now)
+
+    def mark_latlon(self, points: Sequence[Tuple[float, float]], now: Optional[float] = None):
+        """Add one occupied observation at each (lat, lon) point."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(points):
+            easting, northing = self.latlon_to_local(points[:, 0], points[:, 1])
+            self.mark_occupied(np.column_stack([easting, northing]), now)
+
+    def _mark(self, points, delta: float, now: Optional[float]):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        rows, cols, inside = self.to_cell(points[:, 0], points[:, 1])
+        self._apply(rows[inside], cols[inside], np.full(int(inside.sum()), delta), now)
+
+    def clear(self):
+        """Reset every cell to unknown."""
+        with self._lock:
+            self._log_odds[:] = 0.0
+            self._stamps[:] = 0.0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def probability(self, easting, northing, now: Optional[float] = None):
+        """
+        Occupancy probability at one or more points.
+
+        Returns:
+            float or np.ndarray: Probability in [0, 1]; 0.5 for unknown or off-grid points
+        """
+        now = time.time() if now is None else now
+        rows, cols, inside = self.to_cell(easting, northing)
+        rows, cols = np.where(inside, rows, 0), np.where(inside, cols, 0)
+        log_odds = self._decayed(self._log_odds[rows, cols], self._stamps[rows, cols], now)
+        result = np.where(inside, _probability(log_odds), 0.5)
+        return float(result) if result.ndim == 0 else result
+
+    def is_occupied(self, easting, northing, threshold: float = DEFAULT_OCCUPIED_THRESHOLD, now=None):
+        """True where the occupancy probability exceeds ``threshold``."""
+        result = np.asarray(self.probability(easting, northing, now)) > threshold
+        return bool(result) if result.ndim == 0 else result
+
+    def _window(self, min_e: float, min_n: float, max_e: float, max_n: float) -> Tuple[slice, slice]:
+        r0, c0, _ = self.to_cell(min_e, min_n)
+        r1, c1, _ = self.to_cell(max_e, max_n)
+        rows = slice(int(np.clip(r0, 0, self.rows)), int(np.clip(r1 + 1, 0, self.rows)))
+        cols = slice(int(np.clip(c0, 0, self.cols)), int(np.clip(c1 + 1, 0, self.cols)))
+        return rows, cols
+
+    def region(self, min_e: float, min_n: float, max_e: float, max_n: float, now=None) -> np.ndarray:
+        """
+        Occupancy probabilities of every cell in a rectangle.
+
+        Returns:
+            np.ndarray: (rows, cols) probabilities, row 0 at ``min_n``
+        """
+        now = time.time() if now is None else now
+        rows, cols = self._window(min_e, min_n, max_e, max_n)
+        return _probability(self._decayed(self._log_odds[rows, cols], self._stamps[rows, cols], now))
+
+    def occupied_cells(
+        self,
+        bounds: Optional[Tuple[float, float, float, float]] = None,
+        threshold: float = DEFAULT_OCCUPIED_THRESHOLD,
+        now: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Centers of occupied cells, optionally within (min_e, min_n, max_e, max_n).
+
+        Returns:
+            np.ndarray: (K, 2) array of (easting, northing)
+        """
+        now = time.time() if now is None else now
+        if bounds is None:
+            rows, cols = slice(0, self.rows), slice(0, self.cols)
+        else:
+            rows, cols = self._window(*bounds)
+        log_odds = self._decayed(self._log_odds[rows, cols], self._stamps[rows, cols], now)
+        r, c = np.nonzero(log_odds > _log_odds(threshold))
+        easting, northing = self.cell_center(r + rows.start, c + cols.start)
+        return np.column_stack([easting, northing])
+
+    def any_occupied_within(
+        self,
+        easting: float,
+        northing: float,
+        radius: float,
+        threshold: float = DEFAULT_OCCUPIED_THRESHOLD,
+        now: Optional[float] = None,
+    ) -> bool:
+        """True if any occupied cell center lies within ``radius`` meters of a point."""
+        cells = self.occupied_cells(
+            (easting - radius, northing - radius, easting + radius, northing + radius), threshold, now
+        )
+        if not len(cells):
+            return False
+        return bool((np.hypot(cells[:, 0] - easting, cells[:, 1] - northing) <= radius).any())
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        """Write pending changes of the memory-mapped file to disk."""
+        if isinstance(self._cells, np.memmap):
+            self._cells.flush()
+
+    def close(self):
+        """Flush and release the memory map; the grid is unusable afterwards."""
+        self.flush()
+        self._cells = self._log_odds = self._stamps = None
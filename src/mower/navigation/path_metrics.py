@@ -0,0 +1,103 @@
+"""
+Quality metrics of a mowing path, computed in one vectorized pass.
+
+Segment vectors are taken once with ``np.diff``; length, heading changes
+and the turn count all come from them without a Python loop. Coverage is
+the true swept area: the path buffered by half the cutting width (one GEOS
+call, which also merges overlapping passes) intersected with the boundary
+minus the no-go zones, so concave yards are no longer credited with the
+area of their convex hull.
+
+Coordinates are plain (x, y) pairs in one planar frame; ``width`` is in
+the same units.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+import shapely
+
+from mower.navigation.coverage import coverage_area
+
+Point = Tuple[float, float]
+
+DEFAULT_TURN_THRESHOLD = math.radians(15.0)  # Smaller heading changes are not turns
+MIN_SEGMENT = 1e-9  # Shorter segments carry no heading
+
+
+@dataclass(frozen=True)
+class PathMetrics:
+    """Length, turning and coverage figures of a path."""
+
+    length: float
+    turn_count: int
+    total_turning: float  # Sum of absolute heading changes in radians
+    smoothness: float  # 1 - mean heading change / pi; 1.0 for a straight path
+    swept_area: float  # Area cut at least once
+    overlap: float  # Share of the cut area (length x width) that was cut before
+    coverage: float  # Share of the mowable area cut at least once (0-1)
+
+
+def segment_lengths(path: Sequence[Point]) -> np.ndarray:
+    """Length of every segment of a path, (N - 1,)."""
+    points = np.asarray(path, dtype=float).reshape(-1, 2)
+    steps = np.diff(points, axis=0)
+    return np.hypot(steps[:, 0], steps[:, 1])
+
+
+def path_metrics(
+    path: Sequence[Point],
+    boundary: Sequence[Point] = (),
+    width: float = 0.0,
+    no_go_zones: Sequence[Sequence[Point]] = (),
+    turn_threshold: float = DEFAULT_TURN_THRESHOLD,
+) -> PathMetrics:
+    """
+    Measure a path.
+
+    Args:
+        path: Waypoints in order
+        boundary: Boundary vertices; coverage is 0 without one
+        width: Cutting width; swept area, overlap and coverage are 0 if not positive
+        no_go_zones: Vertex lists of areas excluded from the mowable area
+        turn_threshold: Heading change in radians above which a vertex counts as a turn
+
+    Returns:
+        PathMetrics: Figures for the path
+    """
+    points = np.asarray(path, dtype=float).reshape(-1, 2)
+    steps = np.diff(points, axis=0)
+    lengths = np.hypot(steps[:, 0], steps[:, 1])
+    length = float(lengths.sum())
+
+    # Heading changes between consecutive non-degenerate segments, wrapped to [0, pi]
+    moving = steps[lengths > MIN_SEGMENT]
+    headings = np.arctan2(moving[:, 1], moving[:, 0])
+    turns = np.abs((np.diff(headings) + np.pi) % (2 * np.pi) - np.pi)
+    total_turning = float(turns.sum())
+    smoothness = 1.0 - float(turns.mean()) / np.pi if len(turns) else 1.0
+
+    swept_area = overlap = coverage = 0.0
+    if width > 0 and len(points):
+        radius = width / 2
+        line = shapely.linestrings(points) if len(points) > 1 else shapely.points(points[0])
+        swept = shapely.buffer(line, radius)
+        swept_area = float(shapely.area(swept))
+        nominal = length * width + np.pi * radius**2  # every pass counted, plus the round ends
+        overlap = max(0.0, 1.0 - swept_area / nominal)
+        if len(boundary) >= 3:
+            area = coverage_area(boundary, no_go_zones)
+            if area.area > 0:
+                coverage = float(shapely.area(shapely.intersection(swept, area)) / area.area)
+
+    return PathMetrics(
+        length=length,
+        turn_count=int((turns > turn_threshold).sum()),
+        total_turning=total_turning,
+        smoothness=max(0.0, min(1.0, smoothness)),
+        swept_area=swept_area,
+        overlap=overlap,
+        coverage=min(1.0, coverage),
+    )
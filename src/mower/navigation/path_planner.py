@@ -7,14 +7,21 @@ different mowing patterns and learning-based optimization.
 
 import json
 import os  # Added for environment variables
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple  # Added Dict and Any
 
 import numpy as np
 import requests  # Added for API calls
-
+import shapely
+import utm
+
+from mower.navigation.coverage import boustrophedon_path
+from mower.navigation.coverage_map import CoverageMap
+from mower.navigation.geofence import prepared_polygon
+from mower.navigation.occupancy_grid import OccupancyGrid
+from mower.navigation.path_metrics import path_metrics, segment_lengths
 from mower.utilities.logger_config import LoggerConfigInfo
 
 # Initialize logger
@@ -45,6 +52,34 @@ class PatternType(Enum):
     CUSTOM = auto()
 
 
+def _is_latlon_outline(points, spacing: float) -> bool:
+    """
+    Whether boundary points are (lat, lon) degrees rather than meters.
+
+    Degrees are told apart by range and size: an outline within lat/lon
+    limits whose extent is below one pass spacing cannot be a yard in meters.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) < 3:
+        return False
+    in_range = (np.abs(points[:, 0]) <= 90).all() and (np.abs(points[:, 1]) <= 180).all()
+    return bool(in_range and np.ptp(points, axis=0).max() < spacing)
+
+
+def _utm_projector(origin: Tuple[float, float]):
+    """Return a function mapping (lat, lon) points to (easting, northing) in the UTM zone of ``origin``."""
+    _, _, zone_number, zone_letter = utm.from_latlon(origin[0], origin[1])
+
+    def to_local(points) -> np.ndarray:
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        easting, northing, _, _ = utm.from_latlon(
+            points[:, 0], points[:, 1], force_zone_number=zone_number, force_zone_letter=zone_letter
+        )
+        return np.column_stack([easting, northing])
+
+    return to_local
+
+
 @dataclass
 class PatternConfig:
     """Configuration for mowing patterns."""
@@ -55,6 +90,7 @@ class PatternConfig:
     overlap: float  # Overlap between passes (0-1)
     start_point: Tuple[float, float]  # Starting point (lat, lon)
     boundary_points: List[Tuple[float, float]]  # Boundary points
+    no_go_zones: List[List[Tuple[float, float]]] = field(default_factory=list)  # Areas excluded from coverage
 
 
 @dataclass
@@ -80,6 +116,8 @@ class PathPlanner:
         pattern_config: PatternConfig,
         learning_config: Optional[LearningConfig] = None,
         resource_manager=None,  # Added resource_manager
+        occupancy_grid: Optional[OccupancyGrid] = None,
+        coverage_map: Optional[CoverageMap] = None,
     ):
         """Initialize the path planner."""
         self.pattern_config = pattern_config
@@ -88,6 +126,8 @@ class PathPlanner:
         self.current_path = []
         self.completed_areas = set()
         self.obstacles = []
+        self.occupancy_grid = occupancy_grid
+        self.coverage_map = coverage_map
 
         # Learning components
         self.q_table = {}
@@ -179,36 +219,9 @@ class PathPlanner:
         return []
 
     def _generate_parallel_path(self) -> List[Tuple[float, float]]:
-        """Generate parallel mowing pattern."""
+        """Generate parallel mowing pattern (every pass in the same direction)."""
         try:
-            boundary = np.array(self.pattern_config.boundary_points)
-
-            # Calculate pattern direction vector
-            angle_rad = np.radians(self.pattern_config.angle)
-            direction = np.array([np.cos(angle_rad), np.sin(angle_rad)])
-
-            # Project boundary points onto pattern direction
-            proj = np.dot(boundary, direction)
-            min_proj, max_proj = np.min(proj), np.max(proj)
-
-            # Calculate number of passes
-            width = max_proj - min_proj
-            spacing = self.pattern_config.spacing * (1 - self.pattern_config.overlap)
-            num_passes = int(np.ceil(width / spacing))
-
-            # Generate pass lines
-            path = []
-            for i in range(num_passes):
-                offset = min_proj + i * spacing
-                line_start = offset * direction
-                line_end = line_start + width * direction
-
-                # Find intersection points with boundary
-                intersections = self._find_boundary_intersections(line_start, line_end, boundary)
-                if intersections:
-                    path.extend(intersections)
-
-            return path
+            return self._generate_sweep_path(alternate=False)
 
         except ValueError as e:
             logger.error("Error generating parallel path - value error: %s", e)
@@ -264,43 +277,9 @@ class PathPlanner:
             return []
 
     def _generate_zigzag_path(self) -> List[Tuple[float, float]]:
-        """Generate zigzag mowing pattern."""
+        """Generate zigzag mowing pattern (boustrophedon, alternating pass direction)."""
         try:
-            boundary = np.array(self.pattern_config.boundary_points)
-
-            # Calculate pattern direction vector
-            angle_rad = np.radians(self.pattern_config.angle)
-            direction = np.array([np.cos(angle_rad), np.sin(angle_rad)])
-
-            # Project boundary points onto pattern direction
-            proj = np.dot(boundary, direction)
-            min_proj, max_proj = np.min(proj), np.max(proj)
-
-            # Calculate number of passes
-            width = max_proj - min_proj
-            spacing = self.pattern_config.spacing * (1 - self.pattern_config.overlap)
-            num_passes = int(np.ceil(width / spacing))
-
-            # Generate zigzag points
-            path = []
-            for i in range(num_passes):
-                offset = min_proj + i * spacing
-                if i % 2 == 0:
-                    # Forward pass
-                    line_start = offset * direction
-                    line_end = line_start + width * direction
-                else:
-                    # Backward pass
-                    line_end = offset * direction
-                    line_start = line_end + width * direction
-
-                # Find intersection points with boundary
-                intersections = self._find_boundary_intersections(line_start, line_end, boundary)
-
-                if intersections:
-                    path.extend(intersections)
-
-            return path
+            return self._generate_sweep_path(alternate=True)
 
         except ValueError as e:
             logger.error("Error generating zigzag path - value error: %s", e)
@@ -312,6 +291,27 @@ class PathPlanner:
             logger.error("Error generating zigzag path - runtime error: %s", e)
             return []
 
+    def _generate_sweep_path(self, alternate: bool) -> List[Tuple[float, float]]:
+        """
+        Clip all passes against the boundary minus the no-go zones in one go.
+
+        Args:
+            alternate: Reverse every other pass within a coverage cell
+
+        Returns:
+            List of pass start and end points, ordered cell by cell
+        """
+        config = self.pattern_config
+        path = boustrophedon_path(
+            config.boundary_points,
+            config.spacing * (1 - config.overlap),
+            angle=config.angle,
+            no_go_zones=config.no_go_zones,
+            start=config.start_point,
+            alternate=alternate,
+        )
+        return list(map(tuple, path.tolist()))
+
     def _generate_checkerboard_path(self) -> List[Tuple[float, float]]:
         """Generate checkerboard mowing pattern."""
         try:
@@ -381,10 +381,8 @@ class PathPlanner:
                 y_points = y + amplitude * np.sin(2 * np.pi * x_points / wave_length)
 
                 # Add points that fall within boundary
-                for x, wave_y in zip(x_points, y_points):
-                    point = np.array([x, wave_y])
-                    if self._point_in_polygon(point, boundary):
-                        path.append((x, wave_y))
+                inside = self._points_in_polygon(x_points, y_points, boundary)
+                path.extend(zip(x_points[inside], y_points[inside]))
 
                 y += self.pattern_config.spacing
 
@@ -426,10 +424,8 @@ class PathPlanner:
                 y = center[1] + r * np.sin(theta)
 
                 # Add points that fall within boundary
-                for px, py in zip(x, y):
-                    point = np.array([px, py])
-                    if self._point_in_polygon(point, boundary):
-                        path.append((px, py))
+                inside = self._points_in_polygon(x, y, boundary)
+                path.extend(zip(x[inside], y[inside]))
 
                 r -= self.pattern_config.spacing * (1 - self.pattern_config.overlap)
 
@@ -451,39 +447,6 @@ class PathPlanner:
         # For now, default to parallel pattern
         return self._generate_parallel_path()
 
-    def _find_boundary_intersections(
-        self, start: np.ndarray, end: np.ndarray, boundary: np.ndarray
-    ) -> List[Tuple[float, float]]:
-        """Find intersection points of line with boundary."""
-        try:
-            intersections = []
-
-            # Check each boundary segment
-            for i in range(len(boundary)):
-                p1 = boundary[i]
-                p2 = boundary[(i + 1) % len(boundary)]
-
-                # Find intersection point
-                intersection = self._line_intersection(start, end, p1, p2)
-                if intersection is not None:
-                    intersections.append(tuple(intersection))
-
-            # Sort intersections by distance from start
-            if intersections:
-                intersections.sort(key=lambda p: np.linalg.norm(np.array(p) - start))
-
-            return intersections
-
-        except ValueError as e:
-            logger.error("Error finding boundary intersections - value error: %s", e)
-            return []
-        except (TypeError, IndexError) as e:
-            logger.error("Error finding boundary intersections - type/index error: %s", e)
-            return []
-        except (RuntimeError, AttributeError) as e:
-            logger.error("Error finding boundary intersections - runtime error: %s", e)
-            return []
-
     def _line_intersection(
         self, p1: np.ndarray, p2: np.ndarray, p3: np.ndarray, p4: np.ndarray
     ) -> Optional[np.ndarray]:
@@ -531,25 +494,87 @@ class PathPlanner:
 
     def _point_in_polygon(self, point: np.ndarray, polygon: np.ndarray) -> bool:
         """Check if a point is inside a polygon."""
-        x, y = point
-        n = len(polygon)
-        inside = False
-
-        j = n - 1
-        for i in range(n):
-            if ((polygon[i, 1] > y) != (polygon[j, 1] > y)) and (
-                x
-                < (polygon[j, 0] - polygon[i, 0]) * (y - polygon[i, 1]) / (polygon[j, 1] - polygon[i, 1])
-                + polygon[i, 0]
-            ):
-                inside = not inside
-            j = i
+        return bool(shapely.contains_xy(prepared_polygon(polygon), point[0], point[1]))
 
-        return inside
+    def _points_in_polygon(self, x: np.ndarray, y: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+        """Vectorized inside-polygon mask for coordinate arrays."""
+        return shapely.contains_xy(prepared_polygon(polygon), x, y)
 
     def update_obstacle_map(self, obstacles: List[Tuple[float, float]]) -> None:
-        """Update the obstacle map."""
+        """Update the obstacle map, recording (lat, lon) obstacles in the occupancy grid if attached."""
         self.obstacles = obstacles
+        if self.occupancy_grid is not None and self.occupancy_grid.zone is not None and obstacles:
+            self.occupancy_grid.mark_latlon(obstacles)
+
+    def is_position_blocked(self, lat: float, lon: float, clearance: float = 0.5) -> bool:
+        """
+        Check the occupancy grid for obstacles near a position.
+
+        Args:
+            lat: Latitude of the position
+            lon: Longitude of the position
+            clearance: Radius in meters that must be free of obstacles
+
+        Returns:
+            bool: True if an occupied cell lies within ``clearance``; always
+                False without an occupancy grid
+        """
+        if self.occupancy_grid is None:
+            return False
+        easting, northing = self.occupancy_grid.latlon_to_local(lat, lon)
+        return self.occupancy_grid.any_occupied_within(float(easting), float(northing), clearance)
+
+    def plan_touch_up(
+        self, start: Optional[Tuple[float, float]] = None, min_area_m2: float = 0.5
+    ) -> List[Tuple[float, float]]:
+        """
+        Sweep the regions the coverage map says are still unmowed.
+
+        Regions are visited nearest first; each is covered with the pattern's
+        pass spacing and angle.
+
+        Args:
+            start: (lat, lon) the mower starts from; defaults to the largest region
+            min_area_m2: Smaller unmowed regions are skipped
+
+        Returns:
+            List of (lat, lon) waypoints; empty without a coverage map or
+            when everything is mowed
+        """
+        coverage_map = self.coverage_map
+        if coverage_map is None or coverage_map.zone is None:
+            return []
+        regions = coverage_map.unmowed_regions(min_area_m2)
+        if not regions:
+            return []
+        config = self.pattern_config
+        spacing = config.spacing * (1 - config.overlap)
+        if start is None:
+            position = np.array(regions[0].centroid)
+        else:
+            position = np.array(coverage_map.latlon_to_local(*start), dtype=float)
+
+        pieces = []
+        remaining = list(regions)
+        while remaining:
+            nearest = min(remaining, key=lambda r: np.hypot(*(np.array(r.centroid) - position)))
+            remaining.remove(nearest)
+            for polygon in shapely.get_parts(nearest.polygon):
+                path = boustrophedon_path(
+                    list(polygon.exterior.coords),
+                    spacing,
+                    angle=config.angle,
+                    no_go_zones=[list(ring.coords) for ring in polygon.interiors],
+                    start=tuple(position),
+                )
+                if len(path):
+                    pieces.append(path)
+                    position = path[-1]
+        if not pieces:
+            return []
+        waypoints = np.vstack(pieces)
+        lats, lons = coverage_map.local_to_latlon(waypoints[:, 0], waypoints[:, 1])
+        return list(zip(np.asarray(lats).tolist(), np.asarray(lons).tolist()))
 
     def _get_current_state(self) -> str:
         """Get current state representation for learning."""
@@ -592,7 +617,8 @@ class PathPlanner:
             return -100.0  # Penalize empty paths heavily
 
         # Base reward for path length (encourage efficiency)
-        total_distance = sum(np.linalg.norm(np.array(path[i + 1]) - np.array(path[i])) for i in range(len(path) - 1))
+        lengths = segment_lengths(path)
+        total_distance = float(lengths.sum())
         # Efficiency (add epsilon to avoid division by zero)
         reward = 0.4 * (1.0 / (total_distance + 1e-6))
 
@@ -600,23 +626,14 @@ class PathPlanner:
         # reward -= 0.3 * len(self.obstacles)
 
         # Penalize for elevation changes if data is available
-        elevation_penalty = 0.0
-        max_slope_penalty = 0.0
         if elevation_data and len(elevation_data) == len(path):
-            for i in range(len(path) - 1):
-                distance_segment = np.linalg.norm(np.array(path[i + 1]) - np.array(path[i]))
-                # Avoid division by zero for very short segments
-                if distance_segment > 1e-6:
-                    elevation_diff = abs(elevation_data[i + 1] - elevation_data[i])
-                    slope = elevation_diff / distance_segment
-
-                    # Penalize based on absolute elevation change
-                    # Example penalty factor
-                    elevation_penalty += elevation_diff * 0.01
-                    # Penalize for slopes exceeding a threshold (e.g., 20%)
-                    if abs(slope) > 0.20:
-                        # Example penalty factor
-                        max_slope_penalty += (abs(slope) - 0.20) * 0.1
+            # Skip very short segments to avoid division by zero
+            valid = lengths > 1e-6
+            elevation_diff = np.abs(np.diff(np.asarray(elevation_data, dtype=float)))[valid]
+            slope = elevation_diff / lengths[valid]
+            # Penalize absolute elevation change, and slopes above 20%
+            elevation_penalty = float(elevation_diff.sum()) * 0.01
+            max_slope_penalty = float(np.clip(slope - 0.20, 0.0, None).sum()) * 0.1
             reward -= 0.3 * (elevation_penalty + max_slope_penalty)
             if elevation_penalty > 0 or max_slope_penalty > 0:
                 logger.debug(f"Elevation penalty: {elevation_penalty}, " f"Max slope penalty: {max_slope_penalty}")
@@ -628,71 +645,36 @@ class PathPlanner:
         try:
             if len(path) < 2:
                 return float("inf")
-
-            total_distance = 0.0
-            for i in range(len(path) - 1):
-                p1 = np.array(path[i])
-                p2 = np.array(path[i + 1])
-                total_distance += np.linalg.norm(p2 - p1)
-
-            return total_distance
+            return float(segment_lengths(path).sum())
         except Exception as e:
             logger.error(f"Error calculating path distance: {e}")
             return float("inf")
 
     def _calculate_coverage(self, path: List[Tuple[float, float]]) -> float:
-        """Calculate area coverage of path."""
+        """
+        Share of the boundary minus no-go zones swept by a pass-spacing-wide cut along the path.
+
+        ``spacing`` is in meters, so a (lat, lon) boundary is projected to UTM
+        together with the path and the no-go zones before measuring.
+        """
         try:
             if not path:
                 return 0.0
-
-            # Convert path to numpy array
-            path_array = np.array(path)
-
-            # Calculate convex hull of path points
-            from scipy.spatial import ConvexHull
-
-            hull = ConvexHull(path_array)
-
-            # Calculate area of convex hull
-            area = hull.volume
-
-            # Calculate total area of boundary
-            boundary_array = np.array(self.pattern_config.boundary_points)
-            boundary_hull = ConvexHull(boundary_array)
-            total_area = boundary_hull.volume
-
-            return min(1.0, area / total_area)
+            config = self.pattern_config
+            boundary, no_go_zones = config.boundary_points, config.no_go_zones
+            if _is_latlon_outline(boundary, config.spacing):
+                to_local = _utm_projector(boundary[0])
+                path, boundary = to_local(path), to_local(boundary)
+                no_go_zones = [to_local(zone) for zone in no_go_zones if len(zone) >= 3]
+            return path_metrics(path, boundary, config.spacing, no_go_zones).coverage
         except Exception as e:
             logger.error(f"Error calculating coverage: {e}")
             return 0.0
 
     def _calculate_smoothness(self, path: List[Tuple[float, float]]) -> float:
-        """Calculate smoothness of path."""
+        """Calculate smoothness of path (1 - mean heading change / pi)."""
         try:
-            if len(path) < 3:
-                return 1.0
-
-            # Calculate angles between consecutive segments
-            angles = []
-            for i in range(len(path) - 2):
-                p1 = np.array(path[i])
-                p2 = np.array(path[i + 1])
-                p3 = np.array(path[i + 2])
-
-                v1 = p2 - p1
-                v2 = p3 - p2
-
-                # Calculate angle between vectors
-                cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
-                angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
-                angles.append(angle)
-
-            # Calculate average angle deviation from straight line
-            avg_angle = np.mean(angles)
-            smoothness = 1.0 - (avg_angle / np.pi)
-
-            return max(0.0, min(1.0, smoothness))
+            return path_metrics(path).smoothness
         except Exception as e:
             logger.error(f"Error calculating smoothness: {e}")
             return 0.0
@@ -841,6 +823,7 @@ class PathPlanner:
                 overlap=settings.get("overlap", 0.1),
                 start_point=original_config.start_point,
                 boundary_points=original_config.boundary_points,
+                no_go_zones=original_config.no_go_zones,
             )
 
             # Apply the new config
@@ -36,7 +36,6 @@ class PathPlanningOptimizer:
         self.path_planner = path_planner
         self.path_cache = {}
         self.boundary_cache = {}
-        self.intersection_cache = {}
 
         # Apply optimizations
         self._apply_optimizations()
@@ -82,9 +81,6 @@ class PathPlanningOptimizer:
         # Replace the original method with the cached version
         self.path_planner.generate_path = cached_generate_path
 
-        # Cache boundary calculations
-        self._cache_boundary_calculations()
-
         logger.info("Applied caching optimizations")
 
     def _get_cache_key(self) -> str:
@@ -100,38 +96,10 @@ class PathPlanningOptimizer:
             f"{pattern_config.spacing:.2f}_"
             f"{pattern_config.angle:.2f}_"
             f"{pattern_config.overlap:.2f}_"
-            f"{hash(tuple(sorted(pattern_config.boundary_points)))}"
+            f"{hash(tuple(sorted(pattern_config.boundary_points)))}_"
+            f"{hash(tuple(tuple(map(tuple, zone)) for zone in pattern_config.no_go_zones))}"
         )
 
-    def _cache_boundary_calculations(self):
-        """Cache boundary calculations."""
-        # Cache the _find_boundary_intersections method
-        original_find_intersections = self.path_planner._find_boundary_intersections
-
-        @functools.wraps(original_find_intersections)
-        def cached_find_intersections(start, end, boundary):
-            # Create a cache key
-            cache_key = (
-                tuple(start),
-                tuple(end),
-                hash(tuple(map(tuple, boundary))),
-            )
-
-            # Check if the intersections are already cached
-            if cache_key in self.intersection_cache:
-                return self.intersection_cache[cache_key]
-
-            # Find the intersections
-            intersections = original_find_intersections(start, end, boundary)
-
-            # Cache the intersections
-            self.intersection_cache[cache_key] = intersections
-
-            return intersections
-
-        # Replace the original method with the cached version
-        self.path_planner._find_boundary_intersections = cached_find_intersections
-
     def _apply_vectorization(self):
         """Apply vectorization to performance-critical methods."""
         # Optimize the _calculate_path_distance method
@@ -162,40 +130,8 @@ class PathPlanningOptimizer:
         # Replace the original method with the vectorized version
         self.path_planner._calculate_path_distance = vectorized_calculate_distance
 
-        # Optimize the _point_in_polygon method
-        original_point_in_polygon = self.path_planner._point_in_polygon
-
-        @functools.wraps(original_point_in_polygon)
-        def vectorized_point_in_polygon(point, polygon):
-            try:
-                # Use a more efficient implementation of the ray casting algorithm
-                x, y = point
-                n = len(polygon)
-                inside = False
-
-                # Cache frequently accessed values
-                polygon_x = polygon[:, 0]
-                polygon_y = polygon[:, 1]
-
-                j = n - 1
-                for i in range(n):
-                    # Check if the ray from point crosses this edge
-                    if ((polygon_y[i] > y) != (polygon_y[j] > y)) and (
-                        x
-                        < (polygon_x[j] - polygon_x[i]) * (y - polygon_y[i]) / (polygon_y[j] - polygon_y[i])
-                        + polygon_x[i]
-                    ):
-                        inside = not inside
-                    j = i
-
-                return inside
-            except Exception as e:
-                logger.error(f"Error in vectorized point-in-polygon test: {e}")
-                # Fall back to original method
-                return original_point_in_polygon(point, polygon)
-
-        # Replace the original method with the vectorized version
-        self.path_planner._point_in_polygon = vectorized_point_in_polygon
+        # _point_in_polygon already uses prepared Shapely geometry; a Python
+        # ray cast here would only slow it down.
 
         logger.info("Applied vectorization optimizations")
 
@@ -203,7 +139,6 @@ class PathPlanningOptimizer:
         """Clear all caches."""
         self.path_cache.clear()
         self.boundary_cache.clear()
-        self.intersection_cache.clear()
         logger.info("Cleared all caches")
 
     def update_obstacle_map(self, obstacles):
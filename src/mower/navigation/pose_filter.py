@@ -0,0 +1,383 @@
+"""
+Extended Kalman filter for the mower's planar pose.
+
+The state is ``[x, y, heading, velocity, yaw_rate]`` in a local metric
+frame (UTM easting/northing in meters), with ``heading`` measured in
+radians counter-clockwise from east and ``yaw_rate`` in rad/s. The motion
+model is a unicycle with constant velocity and yaw rate; changes in both are
+treated as process noise.
+
+``predict`` runs at the IMU rate and the ``update_*`` methods fuse whatever
+measurements are available: GPS positions weighted by HDOP and fix quality,
+IMU heading and gyro yaw rate, and wheel odometry. Every matrix is allocated
+once in ``__init__``; the steps only write into those buffers, so running
+the filter at 50-100 Hz produces no garbage.
+"""
+
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+X, Y, HEADING, VELOCITY, YAW_RATE = range(5)
+STATE_SIZE = 5
+
+# 1-sigma horizontal error per unit of HDOP, in meters, by NMEA GGA fix quality
+GPS_FIX_SIGMA_M: Dict[int, float] = {
+    1: 2.5,  # autonomous GPS
+    2: 0.8,  # DGPS / SBAS
+    4: 0.02,  # RTK fixed
+    5: 0.3,  # RTK float
+    6: 5.0,  # dead reckoning
+}
+
+# 99.9 % quantile of the chi-square distribution with 2 degrees of freedom
+GPS_GATE_CHI2 = 13.8
+# Consecutive gated-out fixes after which the position is re-anchored to GPS
+GPS_MAX_REJECTIONS = 10
+
+
+def wrap_angle(angle: float) -> float:
+    """Wrap an angle in radians to [-pi, pi)."""
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+def compass_to_yaw(heading_deg: float) -> float:
+    """Convert a compass heading (degrees clockwise from north) to radians counter-clockwise from east."""
+    return wrap_angle(math.radians(90.0 - heading_deg))
+
+
+def yaw_to_compass(yaw: float) -> float:
+    """Convert radians counter-clockwise from east to a compass heading in degrees."""
+    return (90.0 - math.degrees(yaw)) % 360.0
+
+
+def imu_yaw_to_yaw(yaw_deg: float, offset_deg: float = 0.0) -> float:
+    """
+    Convert the IMU's yaw to the filter heading.
+
+    The IMU reports yaw as a right-handed rotation about z (degrees,
+    counter-clockwise positive), the same sense as its gyro z rate, so only a
+    unit change and the mounting offset are needed; no compass flip.
+
+    Args:
+        yaw_deg: IMU yaw in degrees
+        offset_deg: Heading of the IMU's zero-yaw axis, counter-clockwise from east
+    """
+    return wrap_angle(math.radians(yaw_deg + offset_deg))
+
+
+class _Measurement:
+    """Preallocated buffers for one measurement model of dimension ``size``."""
+
+    def __init__(self, size: int, rows: tuple):
+        self.size = size
+        self.H = np.zeros((size, STATE_SIZE))
+        for row, column in enumerate(rows):
+            self.H[row, column] = 1.0
+        self.R = np.zeros((size, size))
+        self.z = np.zeros(size)
+        self.innovation = np.zeros(size)
+        self.S = np.zeros((size, size))
+        self.S_inv = np.zeros((size, size))
+        self.PHt = np.zeros((STATE_SIZE, size))
+        self.HP = np.zeros((size, STATE_SIZE))
+        self.K = np.zeros((STATE_SIZE, size))
+        self.correction = np.zeros(STATE_SIZE)
+        self.scratch = np.zeros(size)
+
+
+def _invert_small(matrix: np.ndarray, out: np.ndarray) -> bool:
+    """Invert a 1x1 or 2x2 matrix into ``out``; False if it is singular."""
+    if matrix.shape[0] == 1:
+        if matrix[0, 0] <= 0:
+            return False
+        out[0, 0] = 1.0 / matrix[0, 0]
+        return True
+    a, b, c, d = matrix[0, 0], matrix[0, 1], matrix[1, 0], matrix[1, 1]
+    determinant = a * d - b * c
+    if determinant <= 0:
+        return False
+    out[0, 0] = d / determinant
+    out[0, 1] = -b / determinant
+    out[1, 0] = -c / determinant
+    out[1, 1] = a / determinant
+    return True
+
+
+class PoseEKF:
+    """Five-state EKF (x, y, heading, velocity, yaw rate) on a local metric frame."""
+
+    def __init__(
+        self,
+        accel_std: float = 0.5,
+        yaw_accel_std: float = 1.0,
+        initial_position_std: float = 5.0,
+        initial_heading_std: float = math.pi,
+        gps_gate: Optional[float] = GPS_GATE_CHI2,
+        max_gps_rejections: int = GPS_MAX_REJECTIONS,
+    ):
+        """
+        Initialize the filter.
+
+        Args:
+            accel_std: Linear acceleration noise in m/s^2
+            yaw_accel_std: Angular acceleration noise in rad/s^2
+            initial_position_std: Position uncertainty in meters after ``reset``
+            initial_heading_std: Heading uncertainty in radians after ``reset``
+                without a heading
+            gps_gate: Mahalanobis distance squared beyond which GPS fixes are
+                rejected as outliers; None disables gating
+            max_gps_rejections: Consecutive rejected fixes after which the
+                position is re-anchored to the next fix, so a diverged
+                estimate cannot lock GPS out for good
+        """
+        self.accel_std = accel_std
+        self.yaw_accel_std = yaw_accel_std
+        self.initial_position_std = initial_position_std
+        self.initial_heading_std = initial_heading_std
+        self.gps_gate = gps_gate
+        self.max_gps_rejections = max_gps_rejections
+
+        self.x = np.zeros(STATE_SIZE)
+        self.P = np.zeros((STATE_SIZE, STATE_SIZE))
+        self._F = np.eye(STATE_SIZE)
+        self._Q = np.zeros((STATE_SIZE, STATE_SIZE))
+        self._FP = np.zeros((STATE_SIZE, STATE_SIZE))
+        self._KHP = np.zeros((STATE_SIZE, STATE_SIZE))
+
+        self._gps = _Measurement(2, (X, Y))
+        self._heading = _Measurement(1, (HEADING,))
+        self._yaw_rate = _Measurement(1, (YAW_RATE,))
+        self._odometry = _Measurement(2, (VELOCITY, YAW_RATE))
+
+        self.initialized = False
+        self.rejected_gps = 0
+        self.consecutive_rejected_gps = 0
+
+    def reset(self, x: float, y: float, heading: Optional[float] = None, position_std: Optional[float] = None):
+        """
+        Start the filter at a known position, at rest.
+
+        Args:
+            x: Easting in meters
+            y: Northing in meters
+            heading: Heading in radians counter-clockwise from east, if known
+            position_std: Position uncertainty in meters
+        """
+        position_std = self.initial_position_std if position_std is None else position_std
+        self.x[:] = 0.0
+        self.x[X] = x
+        self.x[Y] = y
+        self.P[:] = 0.0
+        self.P[X, X] = self.P[Y, Y] = position_std**2
+        if heading is None:
+            self.P[HEADING, HEADING] = self.initial_heading_std**2
+        else:
+            self.x[HEADING] = wrap_angle(heading)
+            self.P[HEADING, HEADING] = math.radians(5.0) ** 2
+        self.P[VELOCITY, VELOCITY] = 0.5**2
+        self.P[YAW_RATE, YAW_RATE] = 0.5**2
+        self.initialized = True
+        self.consecutive_rejected_gps = 0
+
+    def reposition(self, x: float, y: float, position_std: float):
+        """
+        Move the position estimate to a fix, keeping heading and motion state.
+
+        Args:
+            x: Easting in meters
+            y: Northing in meters
+            position_std: Position uncertainty in meters
+        """
+        self.x[X] = x
+        self.x[Y] = y
+        self.P[(X, Y), :] = 0.0
+        self.P[:, (X, Y)] = 0.0
+        self.P[X, X] = self.P[Y, Y] = position_std**2
+        self.consecutive_rejected_gps = 0
+
+    def predict(self, dt: float):
+        """Propagate the state and covariance by ``dt`` seconds."""
+        if not self.initialized or dt <= 0:
+            return
+        heading, velocity, yaw_rate = self.x[HEADING], self.x[VELOCITY], self.x[YAW_RATE]
+        cos_h, sin_h = math.cos(heading), math.sin(heading)
+
+        self.x[X] += velocity * cos_h * dt
+        self.x[Y] += velocity * sin_h * dt
+        self.x[HEADING] = wrap_angle(heading + yaw_rate * dt)
+
+        F = self._F
+        F[X, HEADING] = -velocity * sin_h * dt
+        F[X, VELOCITY] = cos_h * dt
+        F[Y, HEADING] = velocity * cos_h * dt
+        F[Y, VELOCITY] = sin_h * dt
+        F[HEADING, YAW_RATE] = dt
+
+        # Piecewise-constant acceleration noise on velocity and yaw rate
+        Q = self._Q
+        q_v = self.accel_std**2
+        q_w = self.yaw_accel_std**2
+        Q[VELOCITY, VELOCITY] = q_v * dt * dt
+        Q[YAW_RATE, YAW_RATE] = q_w * dt * dt
+        Q[HEADING, HEADING] = q_w * dt**4 / 4
+        Q[HEADING, YAW_RATE] = Q[YAW_RATE, HEADING] = q_w * dt**3 / 2
+        Q[X, X] = q_v * dt**4 / 4 * cos_h * cos_h
+        Q[Y, Y] = q_v * dt**4 / 4 * sin_h * sin_h
+        Q[X, Y] = Q[Y, X] = q_v * dt**4 / 4 * cos_h * sin_h
+        Q[X, VELOCITY] = Q[VELOCITY, X] = q_v * dt**3 / 2 * cos_h
+        Q[Y, VELOCITY] = Q[VELOCITY, Y] = q_v * dt**3 / 2 * sin_h
+
+        np.matmul(F, self.P, out=self._FP)
+        np.matmul(self._FP, F.T, out=self.P)
+        self.P += Q
+
+    def _update(self, m: _Measurement, angular_row: Optional[int] = None, gate: Optional[float] = None) -> bool:
+        """
+        Fuse the measurement held in ``m.z`` with noise ``m.R``.
+
+        Args:
+            m: Measurement buffers
+            angular_row: Row of ``m.z`` holding an angle, whose innovation is wrapped
+            gate: Reject the measurement if its squared Mahalanobis distance exceeds this
+
+        Returns:
+            bool: True if the measurement was applied
+        """
+        np.matmul(m.H, self.x, out=m.innovation)
+        np.subtract(m.z, m.innovation, out=m.innovation)
+        if angular_row is not None:
+            m.innovation[angular_row] = wrap_angle(m.innovation[angular_row])
+
+        np.matmul(self.P, m.H.T, out=m.PHt)
+        np.matmul(m.H, m.PHt, out=m.S)
+        m.S += m.R
+        if not _invert_small(m.S, m.S_inv):
+            return False
+        if gate is not None:
+            np.matmul(m.S_inv, m.innovation, out=m.scratch)
+            if float(m.innovation @ m.scratch) > gate:
+                return False
+
+        np.matmul(m.PHt, m.S_inv, out=m.K)
+        np.matmul(m.K, m.innovation, out=m.correction)
+        self.x += m.correction
+        self.x[HEADING] = wrap_angle(self.x[HEADING])
+
+        # P = (I - KH) P, then re-symmetrize against rounding
+        np.matmul(m.H, self.P, out=m.HP)
+        np.matmul(m.K, m.HP, out=self._KHP)
+        self.P -= self._KHP
+        np.add(self.P, self.P.T, out=self._FP)
+        np.multiply(self._FP, 0.5, out=self.P)
+        return True
+
+    def update_gps(self, easting: float, northing: float, hdop: Optional[float] = None, fix_quality: int = 1) -> bool:
+        """
+        Fuse a GPS position.
+
+        The measurement noise is ``GPS_FIX_SIGMA_M[fix_quality] * hdop``. The
+        first fix after construction initializes the filter.
+
+        Args:
+            easting: UTM easting in meters
+            northing: UTM northing in meters
+            hdop: Horizontal dilution of precision; 1.0 if unknown
+            fix_quality: NMEA GGA fix quality indicator
+
+        After ``max_gps_rejections`` outliers in a row the filter is taken to
+        have diverged (or the mower was carried) and the position jumps to
+        the fix.
+
+        Returns:
+            bool: True if the fix was used; False for no fix or an outlier
+        """
+        sigma_per_hdop = GPS_FIX_SIGMA_M.get(int(fix_quality or 0))
+        if sigma_per_hdop is None:
+            return False
+        sigma = sigma_per_hdop * (hdop if hdop and hdop > 0 else 1.0)
+        if not self.initialized:
+            self.reset(easting, northing, position_std=sigma)
+            return True
+
+        m = self._gps
+        m.z[0] = easting
+        m.z[1] = northing
+        m.R[0, 0] = m.R[1, 1] = sigma * sigma
+        applied = self._update(m, gate=self.gps_gate)
+        if applied:
+            self.consecutive_rejected_gps = 0
+            return True
+        self.rejected_gps += 1
+        self.consecutive_rejected_gps += 1
+        if self.consecutive_rejected_gps >= self.max_gps_rejections:
+            self.reposition(easting, northing, sigma)
+            return True
+        return False
+
+    def update_heading(self, heading: float, std: float = math.radians(3.0)) -> bool:
+        """
+        Fuse an absolute heading (radians counter-clockwise from east).
+
+        Args:
+            heading: Measured heading
+            std: Measurement standard deviation in radians
+        """
+        if not self.initialized:
+            return False
+        m = self._heading
+        m.z[0] = heading
+        m.R[0, 0] = std * std
+        return self._update(m, angular_row=0)
+
+    def update_yaw_rate(self, yaw_rate: float, std: float = 0.02) -> bool:
+        """
+        Fuse a gyro yaw rate (rad/s, counter-clockwise positive).
+
+        Args:
+            yaw_rate: Measured yaw rate
+            std: Measurement standard deviation in rad/s
+        """
+        if not self.initialized:
+            return False
+        m = self._yaw_rate
+        m.z[0] = yaw_rate
+        m.R[0, 0] = std * std
+        return self._update(m)
+
+    def update_odometry(
+        self, velocity: float, yaw_rate: float, velocity_std: float = 0.05, yaw_rate_std: float = 0.1
+    ) -> bool:
+        """
+        Fuse wheel odometry as forward speed and yaw rate.
+
+        Args:
+            velocity: Forward speed in m/s
+            yaw_rate: Yaw rate in rad/s, counter-clockwise positive
+            velocity_std: Speed standard deviation in m/s
+            yaw_rate_std: Yaw rate standard deviation in rad/s
+        """
+        if not self.initialized:
+            return False
+        m = self._odometry
+        m.z[0] = velocity
+        m.z[1] = yaw_rate
+        m.R[0, 0] = velocity_std * velocity_std
+        m.R[1, 1] = yaw_rate_std * yaw_rate_std
+        return self._update(m)
+
+    @property
+    def position_covariance(self) -> np.ndarray:
+        """2x2 covariance of (x, y) in square meters (a copy)."""
+        return self.P[:2, :2].copy()
+
+    @property
+    def position_std(self) -> float:
+        """Root-mean-square 1-sigma position error in meters."""
+        return math.sqrt(max(0.0, (self.P[X, X] + self.P[Y, Y]) / 2))
+
+    @property
+    def heading_std(self) -> float:
+        """1-sigma heading error in radians."""
+        return math.sqrt(max(0.0, self.P[HEADING, HEADING]))
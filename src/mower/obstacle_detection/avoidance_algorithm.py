@@ -31,15 +31,30 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
-from mower.constants import AVOIDANCE_DELAY, MIN_DISTANCE_THRESHOLD
+from mower.constants import (
+    AVOIDANCE_DELAY,
+    CAMERA_HEIGHT_M,
+    CAMERA_HFOV_DEG,
+    CAMERA_MAX_RANGE_M,
+    CAMERA_PITCH_DEG,
+    CAMERA_VFOV_DEG,
+    MIN_DISTANCE_THRESHOLD,
+    TOF_MAX_RANGE_M,
+)
 from mower.hardware.sensor_interface import get_sensor_interface
+from mower.navigation.occupancy_grid import camera_ray
 from mower.navigation.path_planner import PathPlanner
 from mower.safety.autonomous_safety import SafetyChecker, SafetyValidationError
+from mower.utilities.control_scheduler import FixedRate, TaskStats
 from mower.utilities.logger_config import LoggerConfigInfo
 
 # Initialize logger
 logger = LoggerConfigInfo.get_logger(__name__)
 
+# ToF sensor keys in the ``tof`` readings and their mounting angle relative
+# to the heading (degrees, clockwise)
+TOF_SENSOR_ANGLES = {"front_left": -30.0, "front_right": 30.0}
+
 
 class NavigationStatus(Enum):
     """
@@ -176,6 +191,14 @@ class AvoidanceAlgorithm:
             pattern_planner = PathPlanner(pattern_config=pattern_config)
 
         self.pattern_planner = pattern_planner
+
+        # Range and camera observations are mapped into the shared grid
+        self.occupancy_grid = None
+        self.localization = None
+        if hasattr(self._resource_manager, "get_occupancy_grid"):
+            self.occupancy_grid = self._resource_manager.get_occupancy_grid()
+            self.localization = self._resource_manager.get_localization()
+
         self.obstacles = []  # Added type annotation
         self.recovery_attempts = 0
         self.max_recovery_attempts = 3
@@ -203,11 +226,13 @@ class AvoidanceAlgorithm:
         self.obstacle_right = False
         self.camera_obstacle_detected = False
         self.dropoff_detected = False
+        self._last_tof_fused: Optional[float] = None  # read timestamp of the last ToF reading in the grid
 
         self.thread_lock = threading.RLock()
         self.running = False
         self.stop_thread = False
         self.avoidance_thread = None
+        self.loop_stats: Optional[TaskStats] = None  # timing of the monitoring loop while it runs
 
         # Configuration parameters
         self.obstacle_threshold = 30.0  # cm
@@ -239,6 +264,7 @@ class AvoidanceAlgorithm:
 
         try:
             detected_objects = self.obstacle_detector.detect_obstacles()
+            self._map_camera_detections(detected_objects)
 
             if detected_objects:
                 for obj in detected_objects:
@@ -356,18 +382,32 @@ class AvoidanceAlgorithm:
         self.avoidance_thread = None
         logger.info("Avoidance algorithm stopped")
 
+    def poll_distance_sensors(self) -> None:
+        """
+        Refresh the ToF obstacle flags; run by the main controller's safety task.
+
+        This is the only place ToF ranges are fused into the occupancy grid;
+        the avoidance loop reads the same cached readings for its flags only.
+        """
+        sensor_data = self._update_sensor_obstacle_status()
+        if sensor_data is not None:
+            self._map_tof_ranges(sensor_data)
+
     def _update_sensor_obstacle_status(self):
         """
         Update obstacle status based on distance sensor readings.
 
         This method checks the VL53L0X distance sensors and updates
         the obstacle_left and obstacle_right flags accordingly.
+
+        Returns:
+            dict: The sensor data the flags were computed from, or None on error
         """
         try:
             # Check if sensor_interface is initialized
             if self.sensor_interface is None:
                 logger.error("Sensor interface not initialized")
-                return
+                return None
 
             sensor_data_full = self.sensor_interface.get_sensor_data()
             tof_data = sensor_data_full.get("tof", {})
@@ -382,9 +422,68 @@ class AvoidanceAlgorithm:
                 logger.debug(f"Left obstacle detected: {left_distance}cm")
             if self.obstacle_right:
                 logger.debug(f"Right obstacle detected: {right_distance}cm")
+            return sensor_data_full
 
         except Exception as e:
             logger.error(f"Error updating sensor obstacle status: {e}")
+            return None
+
+    def _grid_pose(self) -> Optional[Tuple[float, float, float]]:
+        """Return (easting, northing, compass heading) in the occupancy grid, or None if unknown."""
+        if self.occupancy_grid is None or self.localization is None:
+            return None
+        if not self.localization.filter.initialized:
+            return None
+        position = self.localization.position
+        easting, northing = self.occupancy_grid.latlon_to_local(position.latitude, position.longitude)
+        return float(easting), float(northing), float(position.heading)
+
+    def _map_tof_ranges(self, sensor_data: Dict[str, Any]) -> None:
+        """
+        Fuse the ToF readings (cm) into the occupancy grid as rays.
+
+        The sensor cache is polled faster than the ToF sensors sample, so a
+        reading is fused only once: it is skipped while its read timestamp
+        matches the last one fused, and when it has none (no real reading yet).
+        """
+        sampling = sensor_data.get("status", {}).get("tof", {}).get("sampling", {})
+        read_at = sampling.get("timestamp")
+        if read_at is None or read_at == self._last_tof_fused:
+            return
+        pose = self._grid_pose()
+        if pose is None:
+            return
+        self._last_tof_fused = read_at
+        tof_data = sensor_data.get("tof", {})
+        for key, angle in TOF_SENSOR_ANGLES.items():
+            distance_cm = tof_data.get(key)
+            if not isinstance(distance_cm, (int, float)) or not 0 <= distance_cm < float("inf"):
+                continue
+            self.occupancy_grid.integrate_range(*pose, distance_cm / 100.0, TOF_MAX_RANGE_M, sensor_angle=angle)
+
+    def _map_camera_detections(self, detected_objects: List[dict]) -> None:
+        """
+        Fuse YOLOv8 detections into the occupancy grid as rays.
+
+        Each box is placed on the ground plane below its bottom edge; boxes
+        from the OpenCV fallback carry no class and are skipped.
+        """
+        frame_size = getattr(self.obstacle_detector, "frame_size", None)
+        if not detected_objects or frame_size is None:
+            return
+        pose = self._grid_pose()
+        if pose is None:
+            return
+        for obj in detected_objects:
+            box = obj.get("box") if isinstance(obj, dict) else None
+            if box is None or len(box) < 4 or obj.get("class_name") not in self._objects_to_avoid():
+                continue
+            if obj.get("confidence", 0.0) <= 0.5:
+                continue
+            ray = camera_ray(box, frame_size, CAMERA_HFOV_DEG, CAMERA_VFOV_DEG, CAMERA_HEIGHT_M, CAMERA_PITCH_DEG)
+            if ray is not None:
+                angle, distance = ray
+                self.occupancy_grid.integrate_range(*pose, distance, CAMERA_MAX_RANGE_M, sensor_angle=angle)
 
     def _detect_dropoff(self) -> bool:
         """
@@ -438,6 +537,8 @@ class AvoidanceAlgorithm:
     def _avoidance_loop(self) -> None:
         """Main loop for obstacle detection and avoidance."""
         logger.info("Avoidance monitoring loop started")
+        rate = FixedRate(1.0 / AVOIDANCE_DELAY)
+        self.loop_stats = rate.stats
 
         try:
             while not self.stop_thread and self.running:
@@ -510,7 +611,7 @@ class AvoidanceAlgorithm:
                             logger.error("Recovery strategy failed")
                             self.recovery_attempts += 1
 
-                time.sleep(AVOIDANCE_DELAY)
+                rate.sleep()
 
         except Exception as e:
             logger.error(f"Error in avoidance loop: {e}")
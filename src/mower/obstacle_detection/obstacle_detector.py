@@ -10,11 +10,13 @@ This module provides comprehensive obstacle detection capabilities using:
 """
 
 import io
+import itertools
 import os
 import threading
 import time
+from collections import deque
 from threading import Condition
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -23,6 +25,7 @@ from dotenv import load_dotenv
 from PIL import Image
 
 from mower.hardware.hardware_registry import get_hardware_registry
+from mower.obstacle_detection.pipeline import FramePacket, PipelineStage, StagePipeline
 from mower.obstacle_detection.sort import Sort  # Import SORT
 from mower.utilities.logger_config import LoggerConfigInfo
 
@@ -114,7 +117,14 @@ class ObstacleDetector:
         # Thread synchronization
         self.frame_condition = Condition()
         self.frame = None
+        self.latest_detections: List[dict] = []
         self.frame_lock = threading.Lock()
+        self.frame_size: Optional[Tuple[int, int]] = None  # (width, height) of the last frame
+
+        # Continuous processing pipeline (created by start_processing)
+        self.pipeline: Optional[StagePipeline] = None
+        self._frame_sequence = itertools.count(1)
+        self._input_buffers: deque = deque()
 
         # Initialize tracker
         self.tracker = Sort()
@@ -122,8 +132,8 @@ class ObstacleDetector:
         # Initialize frame sharer for web interface
         self._frame_sharer = None
         try:
-            from mower.hardware.camera_frame_share import CameraFrameSharer
-            self._frame_sharer = CameraFrameSharer()
+            from mower.hardware.camera_frame_share import get_frame_sharer
+            self._frame_sharer = get_frame_sharer()
             logger.info("Frame sharer initialized for web interface")
         except ImportError as e:
             logger.debug(f"Frame sharing not available: {e}")
@@ -226,14 +236,13 @@ class ObstacleDetector:
             # Share frame with web process if we captured it
             if hasattr(self, '_frame_sharer') and self._frame_sharer is not None:
                 try:
-                    # Convert frame to JPEG bytes for frame sharing
-                    success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                    if success:
-                        jpeg_bytes = buffer.tobytes()
-                        self._frame_sharer.write_frame(jpeg_bytes)
+                    # Raw frame; the web process encodes JPEG only while someone is streaming
+                    self._frame_sharer.write_frame(frame)
                 except Exception as e:
                     logger.debug(f"Failed to share frame in detect_obstacles: {e}")
 
+        if isinstance(frame, np.ndarray):
+            self.frame_size = (frame.shape[1], frame.shape[0])
         detected_objects = []
 
         # Try remote detection first if enabled
@@ -250,29 +259,12 @@ class ObstacleDetector:
         # YOLOv8-based detection (preferred if available)
         if self.yolov8_detector:
             try:
-                yolo_objects = self.yolov8_detector.detect(frame)
+                yolo_objects = self.yolov8_detector.detect(frame) or []
+                # Empty frames update the tracker too, so stale tracks expire
+                self._apply_tracking(yolo_objects)
                 if yolo_objects:
                     detected_objects.extend(yolo_objects)
-
-                    # Apply tracking
-                    if len(yolo_objects) > 0:
-                        # Extract bounding boxes and confidences for tracker
-                        detections_np = np.array(
-                            [
-                                [d["box"][0], d["box"][1], d["box"][2], d["box"][3], d["confidence"]]
-                                for d in yolo_objects
-                            ]
-                        )
-
-                        # Update tracker and get tracked objects
-                        tracked_objects = self.tracker.update(detections_np)
-
-                        # Add track IDs to detections
-                        for i, obj in enumerate(yolo_objects):
-                            obj["track_id"] = int(tracked_objects[i, 4])
-
-                    if len(detected_objects) > 0:
-                        return detected_objects
+                    return detected_objects
             except (ValueError, RuntimeError, IOError) as e:
                 logger.warning("YOLOv8 detection failed, falling back: %s", e)
 
@@ -282,6 +274,26 @@ class ObstacleDetector:
 
         return detected_objects
 
+    def _apply_tracking(self, yolo_objects: List[dict]):
+        """
+        Update the tracker with YOLOv8 detections and attach track IDs to them.
+
+        Call once per frame, with an empty list when nothing was detected, so
+        unmatched tracks age and expire.
+        """
+        # Extract bounding boxes and confidences for tracker
+        detections_np = np.array(
+            [[d["box"][0], d["box"][1], d["box"][2], d["box"][3], d["confidence"]] for d in yolo_objects]
+        ).reshape(-1, 5)
+
+        # Update tracker; it assigns a track ID to every detection in input order
+        self.tracker.update(detections_np)
+
+        # Add track IDs and estimated motion (pixels per frame) to detections
+        for obj, track_id in zip(yolo_objects, self.tracker.detection_track_ids):
+            obj["track_id"] = int(track_id)
+            obj["velocity"] = self.tracker.velocity(track_id)
+
     def _detect_obstacles_opencv(self, frame) -> List[dict]:
         """Perform basic obstacle detection using OpenCV."""
         try:
@@ -451,11 +463,11 @@ class ObstacleDetector:
             frame_with_detections = frame.copy()
 
             for detection in detections:
-                # Get detection info
-                name = detection["name"]
-                score = detection["score"]
-                box = detection.get("box")
+                # Get detection info (drop detections use position/confidence)
                 det_type = detection.get("type", "unknown")
+                name = detection.get("name", det_type)
+                score = detection.get("score", detection.get("confidence", 0.0))
+                box = detection.get("box") or detection.get("position")
 
                 # Choose color based on type
                 if det_type == "ml":
@@ -546,46 +558,101 @@ class ObstacleDetector:
         return annotated_frame, all_detections
 
     def start_processing(self):
-        """Start continuous frame processing in background thread."""
-        self.processing_thread = threading.Thread(target=self._processing_loop, daemon=True)
-        self.processing_thread.start()
+        """Start continuous frame processing on a staged background pipeline."""
+        if self.pipeline is None:
+            self.pipeline = StagePipeline(
+                "obstacle-detection",
+                [
+                    PipelineStage("capture", self._capture_stage, source=True),
+                    PipelineStage("preprocess", self._preprocess_stage),
+                    PipelineStage("inference", self._inference_stage),
+                    PipelineStage("track", self._track_stage),
+                    PipelineStage("publish", self._publish_stage),
+                ],
+            )
+        self.pipeline.start()
 
-    def _processing_loop(self):
-        """Main processing loop for continuous detection."""
-        # Initialize frame sharer for web interface
-        frame_sharer = None
-        try:
-            from mower.hardware.camera_frame_share import CameraFrameSharer
-            frame_sharer = CameraFrameSharer()
-            logger.info("Frame sharing initialized for web interface")
-        except ImportError as e:
-            logger.debug(f"Frame sharing not available: {e}")
-        
-        while True:
+    def stop_processing(self):
+        """Stop the continuous processing pipeline."""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Report detector configuration and pipeline performance.
+
+        Returns:
+            dict: Detector flags plus per-stage latency/FPS counters under ``pipeline``
+        """
+        return {
+            "yolov8_enabled": self.yolov8_detector is not None,
+            "remote_detection": self.use_remote_detection,
+            "pipeline": self.pipeline.get_status() if self.pipeline else {"running": False},
+        }
+
+    def _uses_local_yolov8(self) -> bool:
+        detector = self.yolov8_detector
+        return detector is not None and detector.preprocessor is not None and not self.use_remote_detection
+
+    def _capture_stage(self) -> Optional[FramePacket]:
+        """Grab the next camera frame and share it with the web process."""
+        frame = self.camera.get_frame()
+        if frame is None:
+            return None
+        if self._frame_sharer is not None:
             try:
-                # Capture and process frame
-                frame = self.camera.get_frame()
-                if frame is not None:
-                    # Share frame with web process if available
-                    if frame_sharer is not None:
-                        try:
-                            frame_sharer.write_frame(frame)
-                        except Exception as e:
-                            logger.debug(f"Failed to share frame: {e}")
-                    
-                    processed_frame, detections = self.process_frame(frame)
-
-                    # Store latest results
-                    with self.frame_lock:
-                        self.frame = processed_frame
-                        self.latest_detections = detections
-
-                # Small delay to prevent CPU overload
-                time.sleep(0.1)
-
-            except (ValueError, RuntimeError, cv2.error, TypeError) as e:
-                logger.error("Error in processing loop: %s", e)
-                time.sleep(1)  # Longer delay on error
+                self._frame_sharer.write_frame(frame)
+            except Exception as e:
+                logger.debug(f"Failed to share frame: {e}")
+        return FramePacket(sequence=next(self._frame_sequence), capture_time=time.monotonic(), frame=frame)
+
+    def _preprocess_stage(self, packet: FramePacket) -> FramePacket:
+        """Letterbox the frame into a model input tensor while the previous frame is in inference."""
+        if self._uses_local_yolov8():
+            # Rotate a few input tensors: at most three frames are between here and inference
+            if len(self._input_buffers) < 4:
+                self._input_buffers.append(self.yolov8_detector.preprocessor.new_input_buffer())
+            buffer = self._input_buffers[0]
+            self._input_buffers.rotate(-1)
+            packet.data["input"], packet.data["transform"] = self.yolov8_detector.prepare_input(packet.frame, out=buffer)
+        return packet
+
+    def _inference_stage(self, packet: FramePacket) -> FramePacket:
+        """Run the detector on the prepared tensor (or the full detection path without YOLOv8)."""
+        if "input" in packet.data:
+            try:
+                packet.data["yolo"] = self.yolov8_detector.detect_prepared(
+                    packet.data.pop("input"), packet.data.pop("transform")
+                )
+            except (ValueError, RuntimeError, IOError) as e:
+                logger.warning("YOLOv8 detection failed, falling back: %s", e)
+                packet.data["yolo"] = []
+        else:
+            packet.data["obstacles"] = self.detect_obstacles(packet.frame)
+        return packet
+
+    def _track_stage(self, packet: FramePacket) -> FramePacket:
+        """Track YOLOv8 detections, add drop detection and draw the annotated frame."""
+        obstacles = packet.data.get("obstacles")
+        if obstacles is None:
+            obstacles = packet.data.get("yolo") or []
+            self._apply_tracking(obstacles)
+            if not obstacles:
+                obstacles = self._detect_obstacles_opencv(packet.frame)
+        detections = obstacles + self.detect_drops(packet.frame)
+        packet.data["detections"] = detections
+        packet.data["annotated"] = self.draw_detections(packet.frame, detections)
+        return packet
+
+    def _publish_stage(self, packet: FramePacket) -> FramePacket:
+        """Expose the latest results to readers of ``frame``/``latest_detections``."""
+        with self.frame_lock:
+            self.frame = packet.data["annotated"]
+            self.latest_detections = packet.data["detections"]
+        with self.frame_condition:
+            self.frame_condition.notify_all()
+        self.pipeline.record_end_to_end(packet)
+        return packet
 
 
 # Singleton instance
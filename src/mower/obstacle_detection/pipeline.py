@@ -0,0 +1,269 @@
+"""
+Staged frame pipeline for continuous obstacle detection.
+
+Each stage runs on its own thread and hands work to the next through a small
+bounded queue. When a downstream stage falls behind, the oldest queued item is
+discarded rather than blocking the producer, so every stage always works on the
+freshest frame available. OpenCV and the TFLite interpreter release the GIL,
+which lets capture and preprocessing of frame N+1 overlap inference on frame N.
+
+Every stage keeps latency and throughput counters that are reported through
+``StagePipeline.get_status()``.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+STATS_WINDOW = 60  # samples kept for latency and FPS figures
+IDLE_SLEEP = 0.05  # back-off when a source stage has nothing to deliver
+
+
+@dataclass
+class FramePacket:
+    """One frame travelling through the pipeline, collecting results per stage."""
+
+    sequence: int
+    capture_time: float
+    frame: Any
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class DropOldestQueue:
+    """Bounded FIFO whose ``put`` never blocks: a full queue discards its oldest item."""
+
+    def __init__(self, maxsize: int = 1):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of queued items
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._items: Deque[Any] = deque()
+        self._maxsize = maxsize
+        self._condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item: Any) -> bool:
+        """
+        Queue an item, discarding the oldest one if the queue is full.
+
+        Returns:
+            bool: True if an older item was dropped to make room
+        """
+        with self._condition:
+            dropped = len(self._items) >= self._maxsize
+            if dropped:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+            return dropped
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Take the oldest item, waiting up to ``timeout`` seconds.
+
+        Returns:
+            The item, or None if the queue stayed empty
+        """
+        with self._condition:
+            if not self._items and not self._condition.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+    def clear(self):
+        """Discard every queued item."""
+        with self._condition:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._items)
+
+
+class StageStats:
+    """Rolling latency and throughput counters for one stage."""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._finished: Deque[float] = deque(maxlen=window)
+        self.processed = 0
+        self.errors = 0
+
+    def record(self, started: float, finished: float):
+        """Record one item handled between ``started`` and ``finished`` (monotonic seconds)."""
+        with self._lock:
+            self._latencies.append(finished - started)
+            self._finished.append(finished)
+            self.processed += 1
+
+    def record_error(self):
+        """Count an item the stage failed to process."""
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return processed count, FPS and latency figures in milliseconds."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            finished = list(self._finished)
+            processed, errors = self.processed, self.errors
+
+        fps = 0.0
+        if len(finished) >= 2 and finished[-1] > finished[0]:
+            fps = (len(finished) - 1) / (finished[-1] - finished[0])
+        if latencies:
+            mean_ms = sum(latencies) / len(latencies) * 1000
+            p95_ms = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+            max_ms = latencies[-1] * 1000
+        else:
+            mean_ms = p95_ms = max_ms = 0.0
+        return {
+            "processed": processed,
+            "errors": errors,
+            "fps": round(fps, 2),
+            "latency_ms": round(mean_ms, 2),
+            "latency_p95_ms": round(p95_ms, 2),
+            "latency_max_ms": round(max_ms, 2),
+        }
+
+
+class PipelineStage:
+    """A named step of the pipeline running on its own thread."""
+
+    def __init__(self, name: str, func: Callable, source: bool = False):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name used in status reports
+            func: For a source stage, ``func()`` returns the next item or None;
+                  otherwise ``func(item)`` returns the item to pass on, or None
+                  to stop this item here
+            source: True for the first stage, which produces items itself
+        """
+        self.name = name
+        self.func = func
+        self.source = source
+        self.input: Optional[DropOldestQueue] = None
+        self.output: Optional[DropOldestQueue] = None
+        self.stats = StageStats()
+
+    def run(self, stop_event: threading.Event):
+        """Stage loop: take an item, process it, hand the result on."""
+        while not stop_event.is_set():
+            if self.source:
+                item = None
+            else:
+                item = self.input.get(timeout=0.5)
+                if item is None:
+                    continue
+
+            started = time.monotonic()
+            try:
+                result = self.func() if self.source else self.func(item)
+            except Exception as e:  # keep the pipeline alive on per-frame failures
+                self.stats.record_error()
+                logger.error("Pipeline stage '%s' failed: %s", self.name, e, exc_info=True)
+                stop_event.wait(IDLE_SLEEP)
+                continue
+
+            if result is None:
+                if self.source:
+                    stop_event.wait(IDLE_SLEEP)
+                continue
+            self.stats.record(started, time.monotonic())
+            if self.output is not None:
+                self.output.put(result)
+
+
+class StagePipeline:
+    """
+    Chain of stages connected by drop-oldest queues.
+
+    The first stage is the source; every later stage consumes the output of
+    the one before it.
+    """
+
+    def __init__(self, name: str, stages: List[PipelineStage], queue_size: int = 1):
+        """
+        Initialize the pipeline.
+
+        Args:
+            name: Pipeline name used for thread names and logs
+            stages: Ordered stages; the first one must be a source stage
+            queue_size: Capacity of each queue between stages
+        """
+        if not stages or not stages[0].source:
+            raise ValueError("The first pipeline stage must be a source stage")
+        self.name = name
+        self.stages = stages
+        self.queues = []
+        for upstream, downstream in zip(stages, stages[1:]):
+            link = DropOldestQueue(queue_size)
+            upstream.output = link
+            downstream.input = link
+            self.queues.append(link)
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._latency = StageStats()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        """Start one thread per stage."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(
+                target=stage.run, args=(self._stop_event,), name=f"{self.name}-{stage.name}", daemon=True
+            )
+            for stage in self.stages
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info("Pipeline '%s' started with stages: %s", self.name, ", ".join(s.name for s in self.stages))
+
+    def stop(self, timeout: float = 2.0):
+        """Signal every stage to stop and wait for the threads to exit."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        for link in self.queues:
+            link.clear()
+        self._threads = []
+        logger.info("Pipeline '%s' stopped", self.name)
+
+    def record_end_to_end(self, packet: FramePacket):
+        """Record capture-to-publish latency for a packet leaving the last stage."""
+        self._latency.record(packet.capture_time, time.monotonic())
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Report per-stage and end-to-end performance.
+
+        Returns:
+            dict: ``running``, ``stages`` (per-stage counters plus the number of
+                  items dropped from the stage's input queue and its current
+                  depth) and ``end_to_end`` capture-to-publish figures
+        """
+        stages = {}
+        for stage in self.stages:
+            stats = stage.stats.snapshot()
+            stats["dropped"] = stage.input.dropped if stage.input is not None else 0
+            stats["queue_depth"] = len(stage.input) if stage.input is not None else 0
+            stages[stage.name] = stats
+        return {"running": self.running, "stages": stages, "end_to_end": self._latency.snapshot()}
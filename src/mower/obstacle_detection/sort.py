@@ -3,157 +3,225 @@ Simple Online and Realtime Tracking (SORT) with Kalman Filter.
 
 This implementation is adapted from the original SORT algorithm
 and is used for object tracking in the autonomous mower project.
-It provides a basic framework for tracking objects across frames
-using bounding box information.
+Detections are associated with existing tracks by solving an IoU cost
+assignment (Hungarian algorithm), and the Kalman predict/update steps of
+all tracks run as stacked NumPy arrays, so the per-frame cost does not grow
+with Python overhead per tracked object.
 
 Original paper: https://arxiv.org/abs/1602.00763
 """
 
+from typing import Optional, Tuple
+
 import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+
+def xyxy_to_xywh(boxes: np.ndarray) -> np.ndarray:
+    """Convert [x1, y1, x2, y2] boxes to [center x, center y, width, height]."""
+    boxes = np.asarray(boxes, dtype=np.float64)
+    wh = boxes[:, 2:4] - boxes[:, 0:2]
+    return np.hstack([boxes[:, 0:2] + wh / 2, wh])
+
+
+def xywh_to_xyxy(boxes: np.ndarray) -> np.ndarray:
+    """Convert [center x, center y, width, height] boxes to [x1, y1, x2, y2]."""
+    half = boxes[:, 2:4] / 2
+    return np.hstack([boxes[:, 0:2] - half, boxes[:, 0:2] + half])
+
+
+def iou_batch(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise IoU between two sets of [x1, y1, x2, y2] boxes.
+
+    Args:
+        boxes_a: Array of shape (N, 4)
+        boxes_b: Array of shape (M, 4)
+
+    Returns:
+        np.ndarray: IoU matrix of shape (N, M)
+    """
+    a = boxes_a[:, None, :4]
+    b = boxes_b[None, :, :4]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    intersection = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def associate_detections_to_trackers(
+    detections: np.ndarray, trackers: np.ndarray, iou_threshold: float = 0.3
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Assign detections to predicted track boxes by maximising total IoU.
+
+    Args:
+        detections: Detection boxes (N, >=4) as [x1, y1, x2, y2, ...]
+        trackers: Predicted track boxes (M, >=4) as [x1, y1, x2, y2, ...]
+        iou_threshold: Minimum IoU for an assignment to count as a match
+
+    Returns:
+        Tuple of (matches (K, 2) as [detection index, tracker index],
+        unmatched detection indices, unmatched tracker indices)
+    """
+    if len(detections) == 0 or len(trackers) == 0:
+        return np.empty((0, 2), dtype=int), np.arange(len(detections)), np.arange(len(trackers))
+
+    iou_matrix = iou_batch(detections, trackers)
+    det_idx, trk_idx = linear_sum_assignment(-iou_matrix)
+    good = iou_matrix[det_idx, trk_idx] >= iou_threshold
+    matches = np.stack([det_idx[good], trk_idx[good]], axis=1)
+
+    unmatched_detections = np.setdiff1d(np.arange(len(detections)), matches[:, 0])
+    unmatched_trackers = np.setdiff1d(np.arange(len(trackers)), matches[:, 1])
+    return matches, unmatched_detections, unmatched_trackers
+
+
+def _diag(values: np.ndarray) -> np.ndarray:
+    """Stack of diagonal matrices (N, D, D) from rows of diagonal entries (N, D)."""
+    n, d = values.shape
+    out = np.zeros((n, d, d))
+    out[:, np.arange(d), np.arange(d)] = values
+    return out
 
 
 class KalmanFilter:
     """
-    A simple Kalman filter for tracking bounding boxes.
+    A constant-velocity Kalman filter for tracking bounding boxes.
 
-    This class implements a linear Kalman filter to estimate the state
-    (position and velocity) of a tracked object based on noisy
-    measurements (bounding box detections).
+    The state of each track is [x, y, w, h, vx, vy, vw, vh] (box center,
+    size and their velocities per frame). Every method operates on a stack
+    of tracks at once: means have shape (N, 8) and covariances (N, 8, 8).
+    Noise scales with the box size so that near and far objects are
+    treated alike.
     """
 
-    def __init__(self):
+    ndim = 4
+
+    def __init__(self, dt: float = 1.0):
         """Initialize the Kalman filter."""
-        ndim, dt = 4, 1.0
+        ndim = self.ndim
 
         # State transition matrix (predict next state)
-        self._motion_mat = np.eye(2 * ndim, 2 * ndim)
-        for i in range(ndim):
-            self._motion_mat[i, ndim + i] = dt
-
-        # Measurement matrix (relate state to measurement)
-        self._update_mat = np.eye(ndim, 2 * ndim)
+        self._motion_mat = np.eye(2 * ndim)
+        self._motion_mat[:ndim, ndim:] = dt * np.eye(ndim)
 
         # Process noise covariance (uncertainty in motion model)
         self._std_weight_position = 1.0 / 20
         self._std_weight_velocity = 1.0 / 160
 
-    def initiate(self, measurement):
+    @staticmethod
+    def _scale(boxes: np.ndarray) -> np.ndarray:
+        """Per-axis noise scale [w, h, w, h] for each box (N, 4)."""
+        size = np.maximum(boxes[:, 2:4], 1.0)
+        return np.hstack([size, size])
+
+    def initiate(self, measurements: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Create track from unassociated measurement.
+        Create tracks from unassociated measurements.
 
         Args:
-            measurement: Initial bounding box [x, y, w, h]
+            measurements: Bounding boxes (N, 4) as [x, y, w, h]
 
         Returns:
-            Mean and covariance of the new track
+            Mean (N, 8) and covariance (N, 8, 8) of the new tracks
         """
-        mean_pos = measurement
-        mean_vel = np.zeros_like(mean_pos)
-        mean = np.r_[mean_pos, mean_vel]
-
-        std = [
-            2 * self._std_weight_position * measurement[3],
-            2 * self._std_weight_position * measurement[3],
-            1e-2,
-            2 * self._std_weight_position * measurement[3],
-            10 * self._std_weight_velocity * measurement[3],
-            10 * self._std_weight_velocity * measurement[3],
-            1e-5,
-            10 * self._std_weight_velocity * measurement[3],
-        ]
-        covariance = np.diag(np.square(std))
-        return mean, covariance
+        scale = self._scale(measurements)
+        mean = np.hstack([measurements, np.zeros_like(measurements)])
+        std = np.hstack([2 * self._std_weight_position * scale, 10 * self._std_weight_velocity * scale])
+        return mean, _diag(np.square(std))
 
-    def predict(self, mean, covariance):
+    def predict(self, mean: np.ndarray, covariance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Run Kalman filter prediction step.
+        Run Kalman filter prediction step for every track.
 
         Args:
-            mean: Current state mean
-            covariance: Current state covariance
+            mean: State means (N, 8)
+            covariance: State covariances (N, 8, 8)
 
         Returns:
-            Predicted state mean and covariance
+            Predicted state means and covariances
         """
-        std_pos = [
-            self._std_weight_position * mean[3],
-            self._std_weight_position * mean[3],
-            1e-2,
-            self._std_weight_position * mean[3],
-        ]
-        std_vel = [
-            self._std_weight_velocity * mean[3],
-            self._std_weight_velocity * mean[3],
-            1e-5,
-            self._std_weight_velocity * mean[3],
-        ]
-        motion_cov = np.diag(np.square(np.r_[std_pos, std_vel]))
-
-        mean = np.dot(self._motion_mat, mean)
-        covariance = np.linalg.multi_dot((self._motion_mat, covariance, self._motion_mat.T)) + motion_cov
+        scale = self._scale(mean[:, :4])
+        std = np.hstack([self._std_weight_position * scale, self._std_weight_velocity * scale])
+        motion_cov = _diag(np.square(std))
+
+        mean = mean @ self._motion_mat.T
+        covariance = self._motion_mat @ covariance @ self._motion_mat.T + motion_cov
         return mean, covariance
 
-    def project(self, mean, covariance):
+    def update(
+        self, mean: np.ndarray, covariance: np.ndarray, measurements: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Project state distribution to measurement space.
+        Run Kalman filter correction step for every track.
 
         Args:
-            mean: Current state mean
-            covariance: Current state covariance
+            mean: State means (N, 8)
+            covariance: State covariances (N, 8, 8)
+            measurements: Bounding box detections (N, 4) as [x, y, w, h]
 
         Returns:
-            Projected measurement mean and covariance
-        """
-        std = [
-            self._std_weight_position * mean[3],
-            self._std_weight_position * mean[3],
-            1e-1,
-            self._std_weight_position * mean[3],
-        ]
-        innovation_cov = np.diag(np.square(std))
-
-        mean = np.dot(self._update_mat, mean)
-        covariance = np.linalg.multi_dot((self._update_mat, covariance, self._update_mat.T))
-        return mean, covariance + innovation_cov
-
-    def update(self, mean, covariance, measurement):
+            Updated state means and covariances
         """
-        Run Kalman filter correction step.
-
-        Args:
-            mean: Current state mean
-            covariance: Current state covariance
-            measurement: Bounding box detection [x, y, w, h]
-
-        Returns:
-            Updated state mean and covariance
-        """
-        projected_mean, projected_cov = self.project(mean, covariance)
-
-        chol_factor = np.linalg.cholesky(projected_cov)
-        kalman_gain = np.linalg.solve(
-            chol_factor, np.linalg.solve(chol_factor.T, np.dot(covariance, self._update_mat.T).T)
-        ).T
-        innovation = measurement - projected_mean
-
-        new_mean = mean + np.dot(innovation, kalman_gain.T)
-        new_covariance = covariance - np.linalg.multi_dot((kalman_gain, projected_cov, kalman_gain.T))
+        ndim = self.ndim
+        innovation_cov = _diag(np.square(self._std_weight_position * self._scale(mean[:, :4])))
+
+        # The measurement matrix selects the first four state entries, so
+        # H P H^T and P H^T are plain slices of the covariance.
+        projected_cov = covariance[:, :ndim, :ndim] + innovation_cov
+        cross_cov = covariance[:, :, :ndim]
+        kalman_gain = np.linalg.solve(projected_cov, cross_cov.transpose(0, 2, 1)).transpose(0, 2, 1)
+        innovation = measurements - mean[:, :ndim]
+
+        new_mean = mean + (kalman_gain @ innovation[:, :, None])[:, :, 0]
+        new_covariance = covariance - kalman_gain @ projected_cov @ kalman_gain.transpose(0, 2, 1)
         return new_mean, new_covariance
 
 
 class Sort:
     """
     Main class for the SORT algorithm.
+
+    Track state is held in parallel arrays (one row per track) rather than
+    one object per track.
+
+    Attributes:
+        detection_track_ids: Track ID assigned to each detection passed to
+            the most recent ``update`` call, in input order
     """
 
-    def __init__(self):
-        """Initialize the tracker."""
-        self.max_age = 1
-        self.min_hits = 3
-        self.trackers = []
+    def __init__(self, max_age: int = 1, min_hits: int = 3, iou_threshold: float = 0.3):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_age: Frames a track survives without a matching detection
+            min_hits: Consecutive hits before a track is reported
+            iou_threshold: Minimum IoU for associating a detection to a track
+        """
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.iou_threshold = iou_threshold
+        self.kf = KalmanFilter()
         self.frame_count = 0
+        self._next_id = 1
 
-    def update(self, dets=np.empty((0, 5))):
+        self.means = np.empty((0, 8))
+        self.covariances = np.empty((0, 8, 8))
+        self.ids = np.empty(0, dtype=int)
+        self.hits = np.empty(0, dtype=int)
+        self.hit_streaks = np.empty(0, dtype=int)
+        self.time_since_update = np.empty(0, dtype=int)
+        self.detection_track_ids = np.empty(0, dtype=int)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def update(self, dets=np.empty((0, 5))) -> np.ndarray:
         """
         Update tracks with detections.
 
@@ -161,109 +229,82 @@ class Sort:
             dets: Array of detections [[x1, y1, x2, y2, score], ...]
 
         Returns:
-            Array of tracked objects [[x1, y1, x2, y2, track_id], ...]
+            Array of tracked objects [[x1, y1, x2, y2, track_id], ...] for
+            confirmed tracks matched in this frame
         """
         self.frame_count += 1
-        # Get predicted locations from existing trackers.
-        trks = np.zeros((len(self.trackers), 5))
-        to_del = []
-        ret = []
-        i = 0
-        for t in self.trackers:
-            pos = t.predict()[0][:4].copy()
-            trks[i, :] = [pos[0], pos[1], pos[2], pos[3], 0]
-            if np.any(np.isnan(pos)):
-                to_del.append(i)
-            ret.append(np.concatenate((pos, ([t.id + 1])), axis=0))
-            i += 1
-        if trks.shape[0] > 0:
-            trks = np.ma.compress_rows(np.ma.masked_invalid(trks))
-            for t in reversed(to_del):
-                self.trackers.pop(t)
-        dets_to_trk = np.empty((0, 5))
-        if len(self.trackers) == 0:
-            dets_to_trk = dets
-        else:
-            dets_to_trk = dets
-        for d in dets_to_trk:
-            t = KalmanBoxTracker(d, self.frame_count)
-            self.trackers.append(t)
-            ret.append(np.concatenate((d[:4], ([t.id + 1])), axis=0))
-        i = len(self.trackers)
-        for trk in reversed(self.trackers):
-            d = trk.update(dets_to_trk, self.frame_count)
-            if trk.time_since_update > self.max_age:
-                self.trackers.pop(i)
-            i -= 1
-            if d:
-                ret.append(np.concatenate((d[:4], ([trk.id + 1])), axis=0))
-        if len(ret) > 0:
-            return np.stack(ret)
-        return np.empty((0, 5))
-
-
-class KalmanBoxTracker(object):
-    """
-    This class represents the internal state of individual tracked objects
-    observed as bbox.
-    """
-
-    count = 0
-
-    def __init__(self, detection, frame_count):
-        """
-        Initialises a tracker using initial bounding box.
-        """
-        # define constant velocity model
-        self.kf = KalmanFilter()
-        # [x1, y1, x2, y2] -> [x, y, w, h]
-        x, y, w, h = detection[:4]
-        detection[:4] = [(x + w) / 2, (y + h) / 2, w - x, h - y]
-        self.mean, self.covariance = self.kf.initiate(detection[:4])
-        self.id = self.count
-        KalmanBoxTracker.count += 1
-        self.hits = 1  # number of total hits including the first detection
-        self.time_since_update = 0
-        self.history = []
-        self.age = 0
-        self.max_age = 0
-        self.state = 0  # 0 init, 1 confirmed, 2 deleted
-        self.time_since_update = 0
-        self.update(detection, frame_count)
-
-    def update(self, detection, frame_count):
-        """
-        Updates the state vector with observed bbox.
+        dets = np.asarray(dets, dtype=np.float64)
+        if dets.size == 0:
+            dets = np.empty((0, 5))
+
+        # Predict all tracks forward one frame and drop any that diverged
+        if len(self):
+            self.means, self.covariances = self.kf.predict(self.means, self.covariances)
+            self.time_since_update += 1
+            self.hit_streaks[self.time_since_update > 1] = 0
+            self._keep(np.isfinite(self.means[:, :4]).all(axis=1))
+
+        predicted = xywh_to_xyxy(self.means[:, :4])
+        matches, unmatched_dets, _ = associate_detections_to_trackers(dets, predicted, self.iou_threshold)
+        detection_ids = np.empty(len(dets), dtype=int)
+
+        # Correct matched tracks in one batch
+        if len(matches):
+            det_idx, trk_idx = matches[:, 0], matches[:, 1]
+            self.means[trk_idx], self.covariances[trk_idx] = self.kf.update(
+                self.means[trk_idx], self.covariances[trk_idx], xyxy_to_xywh(dets[det_idx, :4])
+            )
+            self.hits[trk_idx] += 1
+            self.hit_streaks[trk_idx] += 1
+            self.time_since_update[trk_idx] = 0
+            detection_ids[det_idx] = self.ids[trk_idx]
+
+        # Start new tracks for unmatched detections
+        if len(unmatched_dets):
+            count = len(unmatched_dets)
+            mean, covariance = self.kf.initiate(xyxy_to_xywh(dets[unmatched_dets, :4]))
+            new_ids = np.arange(self._next_id, self._next_id + count)
+            self._next_id += count
+            self.means = np.concatenate([self.means, mean])
+            self.covariances = np.concatenate([self.covariances, covariance])
+            self.ids = np.concatenate([self.ids, new_ids])
+            self.hits = np.concatenate([self.hits, np.ones(count, dtype=int)])
+            self.hit_streaks = np.concatenate([self.hit_streaks, np.ones(count, dtype=int)])
+            self.time_since_update = np.concatenate([self.time_since_update, np.zeros(count, dtype=int)])
+            detection_ids[unmatched_dets] = new_ids
+        self.detection_track_ids = detection_ids
+
+        confirmed = (self.time_since_update == 0) & (
+            (self.hit_streaks >= self.min_hits) | (self.frame_count <= self.min_hits)
+        )
+        result = np.hstack([xywh_to_xyxy(self.means[confirmed, :4]), self.ids[confirmed, None]])
+
+        self._keep(self.time_since_update <= self.max_age)
+        return result
+
+    def velocity(self, track_id: int) -> Optional[Tuple[float, float]]:
         """
-        if detection.size > 0:
-            self.time_since_update = 0
-            # [x1, y1, x2, y2] -> [x, y, w, h]
-            x, y, w, h = detection[:4]
-            detection[:4] = [(x + w) / 2, (y + h) / 2, w - x, h - y]
-            self.mean, self.covariance = self.kf.update(self.mean, self.covariance, detection[:4])
-            self.hits += 1
-        self.age += 1
-        if self.state == 0 and self.hits >= 3:
-            self.state = 1
-            return self.get_state()
-        elif self.time_since_update >= self.max_age:
-            self.state = 2
-            return []
-        return self.get_state()
-
-    def predict(self):
-        """
-        Advances the state vector and returns the predicted bounding box estimate.
-        """
-        self.mean, self.covariance = self.kf.predict(self.mean, self.covariance)
-        self.age += 1
-        self.time_since_update += 1
-        return self.mean, self.covariance
+        Estimated box center velocity of a track.
 
-    def get_state(self):
-        """
-        Returns the current bounding box estimate.
+        Args:
+            track_id: ID returned by ``update``
+
+        Returns:
+            (vx, vy) in pixels per frame, or None if the track is gone
         """
-        # [x, y, w, h] -> [x1, y1, x2, y2]
-        x, y, a, h = self.mean[:4]
-        return [x - a / 2, y - h / 2, x + a / 2, y + h / 2]
+        rows = np.flatnonzero(self.ids == track_id)
+        if not len(rows):
+            return None
+        vx, vy = self.means[rows[0], 4:6]
+        return float(vx), float(vy)
+
+    def _keep(self, mask: np.ndarray):
+        """Keep only the tracks selected by a boolean mask."""
+        if mask.all():
+            return
+        self.means = self.means[mask]
+        self.covariances = self.covariances[mask]
+        self.ids = self.ids[mask]
+        self.hits = self.hits[mask]
+        self.hit_streaks = self.hit_streaks[mask]
+        self.time_since_update = self.time_since_update[mask]
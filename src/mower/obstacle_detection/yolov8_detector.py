@@ -8,7 +8,8 @@ works with both CPU and Coral TPU when available.
 
 import os
 import time
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -51,6 +52,7 @@ class YOLOv8TFLiteDetector:
         self.input_width = 0
         self.floating_model = False
         self.has_detect_output = False  # True if model has detection output format
+        self.preprocessor: Optional["LetterboxPreprocessor"] = None
 
         # Load labels
         self.labels = self._load_labels()
@@ -97,6 +99,12 @@ class YOLOv8TFLiteDetector:
 
             # Check if floating point model
             self.floating_model = self.input_details[0]["dtype"] == np.float32
+            self.preprocessor = LetterboxPreprocessor(
+                self.input_width,
+                self.input_height,
+                input_dtype=self.input_details[0]["dtype"],
+                quantization=self.input_details[0].get("quantization", (0.0, 0)),
+            )
 
             # Detect output format - YOLOv8 TFLite has specific output shapes
             num_outputs = len(self.output_details)
@@ -107,10 +115,11 @@ class YOLOv8TFLiteDetector:
             # Or sometimes [1, num_classes + 5, num_boxes]
             if num_outputs >= 1:
                 output_shape = self.output_details[0]["shape"]
-                # Check if the second-to-last dimension matches num_classes + 5
-                # or if the last dimension matches num_classes + 5
+                # Check if either dimension matches num_classes + 4 (YOLOv8 head)
+                # or num_classes + 5 (head with a separate objectness score)
+                feature_counts = (len(self.labels) + 4, len(self.labels) + 5)
                 if len(output_shape) == 3 and (
-                    output_shape[2] == len(self.labels) + 5 or output_shape[1] == len(self.labels) + 5
+                    output_shape[2] in feature_counts or output_shape[1] in feature_counts
                 ):
                     self.has_detect_output = True
                     logger.info("Detected YOLOv8 output format.")
@@ -142,47 +151,15 @@ class YOLOv8TFLiteDetector:
         Preprocess image for the model.
 
         Args:
-            image: PIL.Image or numpy array
+            image: PIL.Image or numpy array (BGR/BGRA as delivered by OpenCV)
 
         Returns:
-            Preprocessed numpy array ready for inference
+            Letterboxed input tensor with batch dimension. The buffer is reused
+            by the next call, so copy it if it must outlive that.
         """
-        # Convert to PIL if numpy, ensuring RGB format
-        if isinstance(image, np.ndarray):
-            # Handle BGR (OpenCV) to RGB conversion if needed
-            if len(image.shape) == 3 and image.shape[2] == 3:
-                # Convert BGR to RGB for PIL
-                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            elif len(image.shape) == 3 and image.shape[2] == 4:
-                # Convert BGRA to RGB
-                image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGB)
-            image = Image.fromarray(image)
-        elif isinstance(image, Image.Image):
-            # Ensure PIL image is in RGB mode
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-
-        # Resize to model input size
-        image_resized = image.resize((self.input_width, self.input_height))
-
-        # Convert to numpy array
-        image_array = np.array(
-            image_resized,
-            dtype=np.float32 if self.floating_model else np.uint8,
-        )
-
-        # Ensure we have exactly 3 channels (RGB)
-        if len(image_array.shape) == 3 and image_array.shape[2] != 3:
-            logger.error(f"Image has {image_array.shape[2]} channels, expected 3 (RGB)")
+        if self.preprocessor is None:
             return None
-
-        # Normalization
-        if self.floating_model:
-            image_array = image_array / 255.0
-
-        # Add batch dimension
-        input_data = np.expand_dims(image_array, axis=0)
-
+        input_data, _ = self.preprocessor.preprocess(image)
         return input_data
 
     def detect(self, image) -> List[Dict]:
@@ -193,19 +170,43 @@ class YOLOv8TFLiteDetector:
             image: PIL.Image or numpy array
 
         Returns:
-            List of detection dictionaries with class, confidence, and bounding box
+            List of detection dictionaries with class, confidence, and bounding
+            box in the coordinates of ``image``
         """
-        if self.interpreter is None:
+        if self.interpreter is None or self.input_details is None or self.preprocessor is None:
             return []
 
-        # Preprocess image
-        input_data = self.preprocess_image(image)
+        # Letterbox straight into the interpreter's input tensor
+        transform = self.preprocessor.load_into(self.interpreter, self.input_details[0]["index"], image)
+        return self._invoke(transform)
+
+    def prepare_input(self, image, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, "LetterboxTransform"]:
+        """
+        Preprocess an image ahead of inference, e.g. on a separate pipeline stage.
+
+        Args:
+            image: PIL.Image or numpy array
+            out: Optional buffer from ``preprocessor.new_input_buffer()``
 
-        # Set input tensor
-        if self.input_details is None or self.interpreter is None:
+        Returns:
+            tuple: (input tensor, transform) to pass to ``detect_prepared``
+        """
+        return self.preprocessor.preprocess(image, out=out)
+
+    def detect_prepared(self, input_data: np.ndarray, transform: "LetterboxTransform") -> List[Dict]:
+        """
+        Run detection on an input tensor produced by ``prepare_input``.
+
+        Returns:
+            List of detection dictionaries in source image coordinates
+        """
+        if self.interpreter is None or self.input_details is None:
             return []
         self.interpreter.set_tensor(self.input_details[0]["index"], input_data)
+        return self._invoke(transform)
 
+    def _invoke(self, transform: "LetterboxTransform") -> List[Dict]:
+        """Run the loaded input through the model and decode the results."""
         # Run inference
         start_time = time.time()
         self.interpreter.invoke()
@@ -213,13 +214,12 @@ class YOLOv8TFLiteDetector:
 
         # Get results based on output format
         if self.has_detect_output:
-            detections = self._process_yolov8_output()
+            boxes = non_max_suppression_array(self._decode_output(), iou_threshold=0.5)
+            detections = self.detections_to_dicts(transform.to_source(boxes))
         else:
-            # Fallback for classification models
+            # Fallback for classification models (no boxes, so no NMS)
             detections = self._process_classification_output()
 
-        # Apply Non-Max Suppression (NMS) to filter overlapping detections
-        detections = non_max_suppression(detections, iou_threshold=0.5)
         # Log performance
         logger.debug(
             "YOLOv8 inference: %.2fs (%.1f FPS), %d detections",
@@ -229,87 +229,54 @@ class YOLOv8TFLiteDetector:
         )
         return detections
 
+    def _decode_output(self) -> np.ndarray:
+        """Decode the raw output tensor into a ``DETECTION_DTYPE`` array (before NMS)."""
+        if self.interpreter is None or self.output_details is None:
+            return np.empty(0, dtype=DETECTION_DTYPE)
+        output_data = self.interpreter.get_tensor(self.output_details[0]["index"])[0]
+        if np.issubdtype(output_data.dtype, np.integer):
+            # Quantized (Edge TPU) models: dequantize the whole tensor in one step
+            scale, zero_point = self.output_details[0].get("quantization", (0.0, 0))
+            if scale:
+                output_data = (output_data.astype(np.float32) - zero_point) * scale
+        return decode_yolov8_output(
+            output_data,
+            num_classes=len(self.labels),
+            conf_threshold=self.conf_threshold,
+            img_width=self.input_width,
+            img_height=self.input_height,
+        )
+
     def _process_yolov8_output(self) -> List[Dict]:
         """
         Process YOLOv8 detection output format.
         Handles different possible output tensor layouts robustly.
         """
-        # Get output tensor - format depends on the model
-        if self.interpreter is None or self.output_details is None:
-            return []
-        output_data = self.interpreter.get_tensor(self.output_details[0]["index"])[0]
+        return self.detections_to_dicts(self._decode_output())
 
-        # CORRECT: Transpose the output to a consistent shape [num_boxes, num_details]
-        # Handle different output shapes
-        # YOLOv8 can output either [1, num_boxes, num_features] or [1, num_features, num_boxes]
-        if len(output_data.shape) == 2:
-            # Output shape is [num_boxes, num_features] or [num_features, num_boxes]
-            num_classes = len(self.labels)
-            expected_features = num_classes + 5  # x, y, w, h, confidence + class probabilities
-            
-            # Check which dimension matches expected features
-            if output_data.shape[1] == expected_features:
-                # Shape is [num_boxes, num_features] - correct format
-                logger.debug("YOLOv8 output in correct format [%d, %d]", output_data.shape[0], output_data.shape[1])
-            elif output_data.shape[0] == expected_features:
-                # Shape is [num_features, num_boxes] - need to transpose
-                output_data = output_data.T
-                logger.debug("Transposed YOLOv8 output from [%d, %d] to [%d, %d]", 
-                           output_data.shape[1], output_data.shape[0], 
-                           output_data.shape[0], output_data.shape[1])
-            else:
-                logger.warning("Unexpected YOLOv8 output shape: %s, expected features: %d", 
-                             output_data.shape, expected_features)
-                # Try to continue with current shape
-        else:
-            logger.warning("Unexpected YOLOv8 output tensor rank: %d", len(output_data.shape))
-            return []
+    def detections_to_dicts(self, detections: np.ndarray) -> List[Dict]:
+        """
+        Convert a ``DETECTION_DTYPE`` array into the detection dicts used by callers.
 
-        # Get original image dimensions (use input size as reference)
-        img_width, img_height = self.input_width, self.input_height
+        Args:
+            detections: Structured array of detections
 
-        detections = []
-        
-        for row in output_data:
-            # Extract class scores (everything after the first 4 bbox coordinates)
-            class_scores = row[4:]
-            class_id = np.argmax(class_scores)
-            confidence = class_scores[class_id]
-            
-            # Skip low confidence detections
-            if confidence < self.conf_threshold:
-                continue
-            
-            # Extract bounding box coordinates (first 4 values)
-            cx, cy, w, h = row[:4]
-            
-            # Scale box coordinates to original image size
-            x1 = int((cx - w / 2) * img_width)
-            y1 = int((cy - h / 2) * img_height)
-            x2 = int((cx + w / 2) * img_width)
-            y2 = int((cy + h / 2) * img_height)
-            
-            # Clamp coordinates to image bounds
-            x1 = max(0, x1)
-            y1 = max(0, y1)
-            x2 = min(img_width - 1, x2)
-            y2 = min(img_height - 1, y2)
-            
-            # Get class name
+        Returns:
+            List of detection dictionaries with class, confidence, and bounding box
+        """
+        results = []
+        for x1, y1, x2, y2, confidence, class_id in detections.tolist():
             if class_id < len(self.labels):
                 class_name = self.labels[class_id]
             else:
                 class_name = f"Class {class_id}"
-
-            # Create detection dict
-            detections.append({
+            results.append({
                 "class_name": class_name,
-                "confidence": float(confidence),
+                "confidence": confidence,
                 "box": [x1, y1, x2, y2],
                 "type": "yolov8"
             })
-
-        return detections
+        return results
 
     def _process_classification_output(self) -> List[Dict]:
         """Fallback for classification models."""
@@ -410,29 +377,375 @@ class YOLOv8TFLiteDetector:
         return image_with_boxes
 
 
-# Helper function (consider moving to utils if needed elsewhere)
-def non_max_suppression(detections: List[Dict], iou_threshold: float = 0.5) -> List[Dict]:
-    """Apply Non-Maximum Suppression."""
-    if not detections:
-        return []
+@dataclass
+class LetterboxTransform:
+    """How a source image was placed into the model input, for mapping boxes back."""
+
+    scale: float
+    pad_x: int
+    pad_y: int
+    src_width: int
+    src_height: int
 
-    # Sort by confidence score (descending)
-    detections.sort(key=lambda x: x["confidence"], reverse=True)
+    def to_source(self, detections: np.ndarray) -> np.ndarray:
+        """
+        Map ``DETECTION_DTYPE`` boxes from model input pixels back to the source image.
 
-    keep_detections = []
-    while detections:
-        best_detection = detections.pop(0)
-        keep_detections.append(best_detection)
+        Args:
+            detections: Structured array of detections in model input coordinates
 
-        # Remove overlapping boxes
-        remaining_detections = []
-        for det in detections:
-            iou = calculate_iou(best_detection["box"], det["box"])
-            if iou < iou_threshold:
-                remaining_detections.append(det)
-        detections = remaining_detections
+        Returns:
+            np.ndarray: Copy of ``detections`` in source image coordinates
+        """
+        mapped = detections.copy()
+        for field, pad, limit in (
+            ("x1", self.pad_x, self.src_width),
+            ("x2", self.pad_x, self.src_width),
+            ("y1", self.pad_y, self.src_height),
+            ("y2", self.pad_y, self.src_height),
+        ):
+            mapped[field] = np.clip(np.round((detections[field] - pad) / self.scale), 0, limit - 1)
+        return mapped
+
+
+class LetterboxPreprocessor:
+    """
+    Letterbox frames into a model input tensor using OpenCV and preallocated buffers.
+
+    The frame is resized once with its aspect ratio preserved, converted to RGB
+    in place and padded into the destination tensor. uint8 models whose input
+    quantization is the identity get the padded pixels written straight into
+    the interpreter's input buffer; float and other quantized models go through
+    one extra vectorized conversion pass.
+    """
+
+    def __init__(
+        self,
+        input_width: int,
+        input_height: int,
+        input_dtype=np.uint8,
+        quantization: Tuple[float, int] = (0.0, 0),
+        pad_value: int = 114,
+    ):
+        """
+        Initialize the preprocessor.
+
+        Args:
+            input_width: Model input width in pixels
+            input_height: Model input height in pixels
+            input_dtype: Model input tensor dtype
+            quantization: (scale, zero_point) of the model input, (0.0, 0) if not quantized
+            pad_value: Gray level used for the letterbox borders
+        """
+        self.input_width = int(input_width)
+        self.input_height = int(input_height)
+        self.input_dtype = np.dtype(input_dtype)
+        self.pad_value = (pad_value, pad_value, pad_value)
+
+        scale, zero_point = quantization if quantization else (0.0, 0)
+        self._lut = None
+        identity = self.input_dtype == np.uint8 and (
+            not scale or (abs(scale - 1 / 255) < 1e-6 and zero_point == 0)
+        )
+        if self.input_dtype.kind != "f" and not identity:
+            # Map each 0-255 pixel to its quantized model value once; this
+            # covers uint8 models with any other scale / zero point as well
+            info = np.iinfo(self.input_dtype)
+            levels = np.round(np.arange(256) / 255.0 / scale) + zero_point
+            self._lut = np.clip(levels, info.min, info.max).astype(self.input_dtype)
+        self.uint8_fast_path = identity
+
+        shape = (1, self.input_height, self.input_width, 3)
+        self._input = np.empty(shape, dtype=self.input_dtype)
+        self._canvas = np.empty(shape[1:], dtype=np.uint8)
+        self._resized: Optional[np.ndarray] = None
+
+    def _geometry(self, src_width: int, src_height: int) -> Tuple[LetterboxTransform, int, int]:
+        """Return the transform plus the resized width and height for a source size."""
+        scale = min(self.input_width / src_width, self.input_height / src_height)
+        new_width = max(1, min(self.input_width, int(round(src_width * scale))))
+        new_height = max(1, min(self.input_height, int(round(src_height * scale))))
+        transform = LetterboxTransform(
+            scale=scale,
+            pad_x=(self.input_width - new_width) // 2,
+            pad_y=(self.input_height - new_height) // 2,
+            src_width=src_width,
+            src_height=src_height,
+        )
+        return transform, new_width, new_height
+
+    def letterbox(self, image, dst: np.ndarray) -> LetterboxTransform:
+        """
+        Write the letterboxed RGB uint8 image into ``dst`` (``input_height x input_width x 3``).
+
+        Args:
+            image: BGR/BGRA/grayscale numpy array, or PIL.Image (RGB)
+            dst: Destination uint8 array
+
+        Returns:
+            LetterboxTransform: Placement of the image inside ``dst``
+        """
+        if isinstance(image, Image.Image):
+            frame = np.asarray(image.convert("RGB") if image.mode != "RGB" else image)
+            conversion = None
+        else:
+            frame = image
+            if frame.ndim == 2:
+                conversion = cv2.COLOR_GRAY2RGB
+            elif frame.shape[2] == 4:
+                conversion = cv2.COLOR_BGRA2RGB
+            else:
+                conversion = cv2.COLOR_BGR2RGB
+
+        src_height, src_width = frame.shape[:2]
+        transform, new_width, new_height = self._geometry(src_width, src_height)
+
+        if self._resized is None or self._resized.shape[:2] != (new_height, new_width):
+            self._resized = np.empty((new_height, new_width, 3), dtype=np.uint8)
+        resized = self._resized
+
+        interpolation = cv2.INTER_AREA if transform.scale < 1 else cv2.INTER_LINEAR
+        if conversion in (cv2.COLOR_BGR2RGB, None):
+            # Resize first so the color swap runs on the smaller image, in place
+            cv2.resize(frame, (new_width, new_height), dst=resized, interpolation=interpolation)
+            if conversion is not None:
+                cv2.cvtColor(resized, conversion, dst=resized)
+        else:
+            # Channel count changes, so convert first (rare: grayscale or BGRA input)
+            cv2.resize(cv2.cvtColor(frame, conversion), (new_width, new_height), dst=resized, interpolation=interpolation)
+
+        cv2.copyMakeBorder(
+            resized,
+            transform.pad_y,
+            self.input_height - new_height - transform.pad_y,
+            transform.pad_x,
+            self.input_width - new_width - transform.pad_x,
+            cv2.BORDER_CONSTANT,
+            dst=dst,
+            value=self.pad_value,
+        )
+        return transform
+
+    def _convert(self, canvas: np.ndarray, out: np.ndarray):
+        """Convert letterboxed uint8 pixels into the model's input representation."""
+        if self._lut is not None:
+            cv2.LUT(canvas, self._lut, dst=out)
+        else:
+            np.multiply(canvas, np.float32(1 / 255.0), out=out, dtype=np.float32)
+
+    def new_input_buffer(self) -> np.ndarray:
+        """Allocate a tensor suitable as the ``out`` argument of ``preprocess``."""
+        return np.empty_like(self._input)
+
+    def preprocess(self, image, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, LetterboxTransform]:
+        """
+        Letterbox ``image`` into an input tensor.
+
+        Args:
+            image: BGR/BGRA/grayscale numpy array, or PIL.Image (RGB)
+            out: Tensor from ``new_input_buffer`` to fill; defaults to the
+                 preprocessor's own buffer, which the next call overwrites
+
+        Returns:
+            tuple: (input tensor with batch dimension, transform)
+        """
+        if out is None:
+            out = self._input
+        if self.uint8_fast_path:
+            transform = self.letterbox(image, out[0])
+        else:
+            transform = self.letterbox(image, self._canvas)
+            self._convert(self._canvas, out[0])
+        return out, transform
+
+    def load_into(self, interpreter, input_index: int, image) -> LetterboxTransform:
+        """
+        Letterbox ``image`` directly into an interpreter's input tensor.
+
+        Falls back to ``set_tensor`` when the interpreter cannot expose its
+        input buffer.
+
+        Args:
+            interpreter: TFLite interpreter with allocated tensors
+            input_index: Index of the input tensor
+            image: BGR/BGRA/grayscale numpy array, or PIL.Image (RGB)
+
+        Returns:
+            LetterboxTransform: Placement of the image inside the model input
+        """
+        try:
+            view = interpreter.tensor(input_index)()
+            usable = view.shape == self._input.shape and view.dtype == self.input_dtype
+        except (AttributeError, TypeError, ValueError):
+            view, usable = None, False
+
+        if not usable:
+            input_data, transform = self.preprocess(image)
+            interpreter.set_tensor(input_index, input_data)
+            return transform
+
+        if self.uint8_fast_path:
+            transform = self.letterbox(image, view[0])
+        else:
+            transform = self.letterbox(image, self._canvas)
+            self._convert(self._canvas, view[0])
+        # The interpreter refuses to invoke while views of its buffers are alive
+        del view
+        return transform
+
+
+# Boxes are in model input pixels; confidence already includes objectness
+DETECTION_DTYPE = np.dtype(
+    [
+        ("x1", "<i4"),
+        ("y1", "<i4"),
+        ("x2", "<i4"),
+        ("y2", "<i4"),
+        ("confidence", "<f4"),
+        ("class_id", "<i4"),
+    ]
+)
+
+
+def decode_yolov8_output(
+    output_data: np.ndarray,
+    num_classes: int,
+    conf_threshold: float,
+    img_width: int,
+    img_height: int,
+) -> np.ndarray:
+    """
+    Decode a single-image YOLO output tensor in one pass over all anchors.
+
+    Accepts both ``[num_boxes, num_features]`` and ``[num_features, num_boxes]``
+    layouts, where each box is ``cx, cy, w, h`` in normalized coordinates
+    followed by the class scores, optionally preceded by an objectness score
+    (``num_classes + 5`` features).
+
+    Args:
+        output_data: Output tensor without the batch dimension
+        num_classes: Number of class labels
+        conf_threshold: Minimum confidence to keep a box
+        img_width: Width that normalized coordinates are scaled to
+        img_height: Height that normalized coordinates are scaled to
+
+    Returns:
+        np.ndarray: Structured array of ``DETECTION_DTYPE``, unsorted
+    """
+    if output_data.ndim != 2:
+        logger.warning("Unexpected YOLOv8 output tensor rank: %d", output_data.ndim)
+        return np.empty(0, dtype=DETECTION_DTYPE)
+
+    # Work on [num_features, num_boxes] so each feature is one contiguous row
+    feature_counts = (num_classes + 4, num_classes + 5)
+    if output_data.shape[0] in feature_counts and output_data.shape[1] not in feature_counts:
+        features = output_data
+    elif output_data.shape[1] in feature_counts:
+        features = output_data.T
+    else:
+        logger.warning(
+            "Unexpected YOLOv8 output shape: %s, expected features: %d",
+            output_data.shape,
+            num_classes + 4,
+        )
+        # Try to continue assuming [num_boxes, num_features] without objectness
+        features = output_data.T
+
+    has_objectness = features.shape[0] == num_classes + 5
+    scores = features[5:] if has_objectness else features[4:]
+    if scores.shape[0] == 0:
+        return np.empty(0, dtype=DETECTION_DTYPE)
+
+    class_ids = np.argmax(scores, axis=0)
+    confidences = np.take_along_axis(scores, class_ids[np.newaxis, :], axis=0)[0]
+    if has_objectness:
+        confidences = confidences * features[4]
+
+    # Only the few boxes above threshold go through box conversion
+    keep = np.flatnonzero(confidences >= conf_threshold)
+    cx, cy, w, h = features[:4, keep].astype(np.float32)
+
+    detections = np.empty(keep.size, dtype=DETECTION_DTYPE)
+    detections["x1"] = np.clip(np.trunc((cx - w / 2) * img_width), 0, img_width - 1)
+    detections["y1"] = np.clip(np.trunc((cy - h / 2) * img_height), 0, img_height - 1)
+    detections["x2"] = np.clip(np.trunc((cx + w / 2) * img_width), 0, img_width - 1)
+    detections["y2"] = np.clip(np.trunc((cy + h / 2) * img_height), 0, img_height - 1)
+    detections["confidence"] = confidences[keep]
+    detections["class_id"] = class_ids[keep]
+    return detections
+
+
+def nms_indices(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Greedy Non-Maximum Suppression over an ``[N, 4]`` array of ``x1, y1, x2, y2`` boxes.
+
+    Each iteration compares the best remaining box against all others at once,
+    so the Python loop runs once per kept box rather than once per pair.
+
+    Args:
+        boxes: Box corners, one row per box
+        scores: Confidence per box
+        iou_threshold: Boxes overlapping a kept box by at least this IoU are dropped
+
+    Returns:
+        np.ndarray: Indices of kept boxes, highest score first
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    boxes = np.asarray(boxes, dtype=np.float64)
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-np.asarray(scores), kind="stable")
+
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        inter_w = np.maximum(0.0, np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]))
+        inter_h = np.maximum(0.0, np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]))
+        inter = inter_w * inter_h
+        union = areas[best] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union != 0)
+        order = rest[iou < iou_threshold]
+    return np.asarray(keep, dtype=np.intp)
+
+
+def non_max_suppression_array(detections: np.ndarray, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Class-aware Non-Maximum Suppression on a ``DETECTION_DTYPE`` array.
+
+    Boxes of different classes never suppress each other: every class is
+    shifted into its own coordinate range so a single NMS pass handles all
+    classes together.
+
+    Args:
+        detections: Structured array of detections
+        iou_threshold: IoU at or above which the weaker box is dropped
+
+    Returns:
+        np.ndarray: Kept detections, highest confidence first
+    """
+    if detections.size == 0:
+        return detections
+
+    boxes = np.stack(
+        [detections["x1"], detections["y1"], detections["x2"], detections["y2"]], axis=1
+    ).astype(np.float64)
+    offset = boxes.max() + 1.0
+    boxes += (detections["class_id"].astype(np.float64) * offset)[:, np.newaxis]
+    return detections[nms_indices(boxes, detections["confidence"], iou_threshold)]
+
+
+def non_max_suppression(detections: List[Dict], iou_threshold: float = 0.5) -> List[Dict]:
+    """Apply Non-Maximum Suppression to detection dicts (class-agnostic)."""
+    if not detections:
+        return []
 
-    return keep_detections
+    boxes = np.array([det["box"] for det in detections], dtype=np.float64)
+    scores = np.array([det["confidence"] for det in detections], dtype=np.float64)
+    return [detections[i] for i in nms_indices(boxes, scores, iou_threshold)]
 
 
 def calculate_iou(box1, box2):
@@ -2,29 +2,43 @@ import json
 import logging
 import time
 
-from shapely.geometry import Point, Polygon
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
 
 # from mower.navigation.navigation import NavigationController  # Removed:
 # not used directly
-from mower.constants import MIN_DISTANCE_THRESHOLD, polygon_coordinates
+from mower.constants import (
+    MIN_DISTANCE_THRESHOLD,
+    OBSTACLE_GRID_PATH,
+    OCCUPANCY_GRID_RESOLUTION,
+    TOF_MAX_RANGE_M,
+    polygon_coordinates,
+)
 from mower.hardware.hardware_registry import get_hardware_registry
 from mower.hardware.sensor_interface import EnhancedSensorInterface
 from mower.navigation.localization import Localization
+from mower.navigation.occupancy_grid import OccupancyGrid
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ToF sensor keys in sensor_data and their mounting angle relative to the
+# heading (degrees, clockwise)
+TOF_SENSOR_ANGLES = {"left_distance": -30.0, "right_distance": 30.0}
+
 
 class ObstacleMapper:
     def __init__(
         self,
         localization: Localization,
         sensors: EnhancedSensorInterface,
+        grid_path=OBSTACLE_GRID_PATH,
+        resolution: float = OCCUPANCY_GRID_RESOLUTION,
     ):
         self.localization = localization  # Store the instance properly
         self.sensors = sensors
         self.driver = get_hardware_registry().get_robohat_driver()
-        self.obstacle_map = []  # Store obstacle locations
         # Pass required interfaces to NavigationController
         # NOTE: NavigationController expects GpsLatestPosition,
         # RoboHATDriver, and EnhancedSensorInterface.
@@ -38,8 +52,15 @@ class ObstacleMapper:
         # Placeholder, user must implement navigation logic.
         self.navigation_controller = None
 
-        # Convert polygon_coordinates to a Shapely Polygon
+        # Convert polygon_coordinates to a prepared Shapely Polygon
         self.yard_boundary = self.load_yard_boundary()
+        shapely.prepare(self.yard_boundary)
+
+        # Obstacle locations as a log-odds occupancy grid over the yard
+        boundary_latlon = [(lat, lon) for lon, lat in self.yard_boundary.exterior.coords]
+        self.occupancy_grid = OccupancyGrid.from_latlon_bounds(
+            boundary_latlon, path=str(grid_path) if grid_path else None, resolution=resolution
+        )
 
     def load_yard_boundary(self):
         """Convert polygon_coordinates to a Shapely Polygon."""
@@ -103,30 +124,72 @@ class ObstacleMapper:
 
         return left_distance < MIN_DISTANCE_THRESHOLD or right_distance < MIN_DISTANCE_THRESHOLD
 
+    def _current_pose(self):
+        """Return (easting, northing, heading) of the mower, or None if unknown."""
+        position = self.localization.estimate_position()
+        if not position:
+            return None
+        lat, lon = position
+        easting, northing = self.occupancy_grid.latlon_to_local(lat, lon)
+        heading = getattr(getattr(self.localization, "position", None), "heading", None)
+        return float(easting), float(northing), heading
+
+    def integrate_sensor_readings(self):
+        """
+        Fuse the current ToF readings into the occupancy grid as rays.
+
+        Readings below the sensor range mark their end cell occupied; every
+        reading clears the cells between the mower and its end point.
+        """
+        pose = self._current_pose()
+        sensor_data = getattr(self.sensors, "sensor_data", None)
+        if pose is None or pose[2] is None or not isinstance(sensor_data, dict):
+            return
+        easting, northing, heading = pose
+        for key, angle in TOF_SENSOR_ANGLES.items():
+            distance_cm = sensor_data.get(key)
+            if distance_cm is None or distance_cm < 0:
+                continue
+            self.occupancy_grid.integrate_range(
+                easting, northing, heading, distance_cm / 100.0, TOF_MAX_RANGE_M, sensor_angle=angle
+            )
+
     def record_obstacle(self):
-        """Record the current GPS position as an obstacle if inside the boundary."""
+        """Record an obstacle at the current GPS position if inside the boundary."""
         position = self.localization.estimate_position()  # Call properly
         if position:
             lat, lon = position
-            obstacle_point = Point(lon, lat)
 
-            if self.yard_boundary.contains(obstacle_point):
+            if self.is_within_yard(position):
                 logger.info(f"Obstacle detected inside boundary at {lat}, {lon}")
-                self.obstacle_map.append({"latitude": lat, "longitude": lon})
+                self.occupancy_grid.mark_latlon([(lat, lon)])
             else:
                 logger.warning(f"Obstacle at {lat}, {lon} is outside boundary. Ignored.")
 
+    def get_obstacle_map(self):
+        """Return the occupied grid cells as a list of latitude/longitude dicts."""
+        cells = self.occupancy_grid.occupied_cells()
+        if not len(cells):
+            return []
+        lats, lons = self.occupancy_grid.local_to_latlon(cells[:, 0], cells[:, 1])
+        return [{"latitude": float(lat), "longitude": float(lon)} for lat, lon in zip(lats, lons)]
+
+    def clear_obstacle_map(self):
+        """Forget every recorded obstacle."""
+        self.occupancy_grid.clear()
+
     def save_obstacle_map(self, filename="obstacle_map.json"):
-        """Save the obstacle map to a JSON file."""
+        """Flush the occupancy grid and export the occupied cells to a JSON file."""
+        self.occupancy_grid.flush()
         with open(filename, "w") as f:
-            json.dump(self.obstacle_map, f, indent=4)
+            json.dump(self.get_obstacle_map(), f)
         logger.info(f"Obstacle map saved to {filename}")
 
     def is_within_yard(self, position):
         """Check if the current position is within the yard boundary."""
         if position:
             lat, lon = position
-            return self.yard_boundary.contains(Point(lon, lat))
+            return bool(shapely.contains_xy(self.yard_boundary, lon, lat))
         return False
 
     def explore_yard(self, duration=300):
@@ -153,16 +216,13 @@ class ObstacleMapper:
             minx, miny, maxx, maxy = self.yard_boundary.bounds
 
             # Generate grid points within the yard boundary
-            grid_points = []
-            x = minx
-            while x <= maxx:
-                y = miny
-                while y <= maxy:
-                    point = Point(x, y)
-                    if self.yard_boundary.contains(point):
-                        grid_points.append((y, x))
-                    y += grid_spacing
-                x += grid_spacing
+            xs, ys = np.meshgrid(
+                np.arange(minx, maxx + grid_spacing / 2, grid_spacing),
+                np.arange(miny, maxy + grid_spacing / 2, grid_spacing),
+                indexing="ij",
+            )
+            inside = shapely.contains_xy(self.yard_boundary, xs, ys)
+            grid_points = list(zip(ys[inside], xs[inside]))
 
             # Navigate to each grid point
             for lat, lon in grid_points:
@@ -193,7 +253,8 @@ class ObstacleMapper:
             # Drive the mower forward at low speed
             self.driver.run(steering=0.0, throttle=0.2)
 
-            # Check for obstacles and record them if found
+            # Fuse range readings, then record obstacles if found
+            self.integrate_sensor_readings()
             if self.detect_obstacle():
                 self.record_obstacle()
 
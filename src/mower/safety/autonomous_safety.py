@@ -44,7 +44,6 @@ import time
 from functools import wraps
 from pathlib import Path
 from typing import Dict, Optional, Tuple, Union, Any
-from shapely.geometry import Point, Polygon
 
 from mower.utilities.logger_config import LoggerConfigInfo
 
@@ -347,52 +346,42 @@ class SafetyChecker:
             if not self.boundary_file.exists():
                 return False, f"Boundary file not found: {self.boundary_file}"
             
-            # Load boundary configuration
+            # Load boundary configuration through the shared geofence index,
+            # which only re-parses the file when it changes
             try:
-                with open(self.boundary_file, 'r') as f:
-                    boundary_config = json.load(f)
+                from mower.navigation.geofence import get_geofence
+
+                geofence = get_geofence(self.boundary_file, self.config_dir / "no_go_zones.json")
             except Exception as e:
                 return False, f"Error reading boundary file: {e}"
-            
-            # Extract coordinates
-            coordinates = boundary_config.get('coordinates', [])
-            if not coordinates:
-                # Try legacy format with 'boundary' key
-                boundary_points = boundary_config.get('boundary', [])
-                if boundary_points:
-                    coordinates = [boundary_points]  # Wrap in array for GeoJSON format
-                else:
-                    return False, "No boundary coordinates found in config"
-            
-            if not coordinates or not coordinates[0]:
-                return False, "Empty boundary coordinates"
-            
-            # Get the outer ring (first coordinate set)
-            boundary_points = coordinates[0]
-            
+
+            boundary_points = geofence.boundary_points
+            if not boundary_points:
+                return False, "No boundary coordinates found in config"
+
             # Validate minimum number of points for a polygon
             if len(boundary_points) < 4:  # Need at least 4 points (last should close the polygon)
                 return False, f"Boundary needs at least 4 points, got {len(boundary_points)}"
-            
-            # Create Shapely polygon for geometric validation
+
+            # Validate the polygon geometry
             try:
-                polygon = Polygon(boundary_points)
-                
+                polygon = geofence.boundary
+
                 if not polygon.is_valid:
                     return False, "Boundary polygon geometry is invalid"
-                
+
                 # Check minimum area requirement
                 area = polygon.area
                 # Convert from degree-based area to approximate square meters
                 # This is a rough approximation - for precise area calculation would need projection
                 area_m2 = area * 111000 * 111000  # Very rough conversion
-                
+
                 if area_m2 < MIN_BOUNDARY_AREA:
                     return False, f"Boundary area too small: {area_m2:.1f}m² < {MIN_BOUNDARY_AREA}m²"
-                
+
             except Exception as e:
                 return False, f"Error validating boundary geometry: {e}"
-            
+
             # Check if current GPS position is within boundary
             try:
                 # Get current GPS position
@@ -404,9 +393,7 @@ class SafetyChecker:
                         _, easting, northing, zone_number, zone_letter = position_data
                         lat, lon = utm.to_latlon(easting, northing, zone_number, zone_letter)
                         
-                        current_point = Point(lon, lat)  # Note: Shapely uses (x, y) = (lon, lat)
-                        
-                        if not polygon.contains(current_point):
+                        if not geofence.within_boundary(lat, lon):
                             return False, f"Current position ({lat:.6f}, {lon:.6f}) is outside boundary"
                         
                         logger.debug(f"Current position {lat:.6f}, {lon:.6f} is within boundary")
@@ -6,5 +6,6 @@ different components of the mower system.
 """
 
 from .gps_service import GpsService
+from .ntrip_relay import NtripConfig, NtripRelay
 
-__all__ = ["GpsService"]
+__all__ = ["GpsService", "NtripConfig", "NtripRelay"]
@@ -1,5 +1,7 @@
+import asyncio
 import threading
 from mower.navigation.gps import GpsPosition, GpsLatestPosition
+from mower.services.ntrip_relay import NtripConfig, NtripRelay
 from mower.utilities.logger_config import LoggerConfigInfo
 
 class GpsService:
@@ -19,17 +21,30 @@ class GpsService:
         self.logger = LoggerConfigInfo.get_logger(__name__)
         self.gps_position = None
         self.gps_latest_position = None
+        self.ntrip_relay = None
         self._thread = None
         self._stop_event = threading.Event()
         self._initialized = True
 
-    def start(self, serial_port="/dev/ttyACM0"):
+    def start(self, serial_port="/dev/ttyACM0", ntrip_config=None):
+        """
+        Start reading the receiver and, if a caster is configured, relaying corrections.
+
+        Args:
+            serial_port: GPS serial device
+            ntrip_config: NTRIP caster settings; defaults to ``NtripConfig.from_env()``
+        """
         if self._thread and self._thread.is_alive():
             self.logger.warning("GPS service already running.")
             return
 
         self.gps_position = GpsPosition(serial_port=serial_port)
         self.gps_latest_position = GpsLatestPosition(self.gps_position)
+        ntrip_config = ntrip_config or NtripConfig.from_env()
+        if ntrip_config is not None:
+            # Corrections go out through the same port the position reader uses
+            self.ntrip_relay = NtripRelay(ntrip_config, self.gps_position.write, self.gps_position.latest_gga)
+            self.logger.info(f"RTK corrections from {ntrip_config.host}/{ntrip_config.mountpoint} enabled.")
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
         self.logger.info("GPS service started.")
@@ -37,6 +52,8 @@ class GpsService:
     def _run(self):
         try:
             self.gps_position.start()
+            if self.ntrip_relay is not None:
+                asyncio.run(self.ntrip_relay.run())
             while not self._stop_event.is_set():
                 # Perform any periodic checks or updates here
                 self._stop_event.wait(1)
@@ -49,10 +66,13 @@ class GpsService:
             return
 
         self._stop_event.set()
+        if self.ntrip_relay is not None:
+            self.ntrip_relay.stop()
         if self._thread:
             self._thread.join()
         self.gps_position = None
         self.gps_latest_position = None
+        self.ntrip_relay = None
         self.logger.info("GPS service stopped.")
 
     def get_position(self):
@@ -64,3 +84,8 @@ class GpsService:
         if self.gps_position:
             return self.gps_position.get_latest_metadata()
         return None
+
+    def get_ntrip_status(self):
+        if self.ntrip_relay:
+            return self.ntrip_relay.get_status()
+        return None
@@ -0,0 +1,389 @@
+"""
+NTRIP client that relays RTCM corrections to the GPS receiver.
+
+``NtripRelay`` is an asyncio task that connects to an NTRIP caster,
+frames the RTCM3 stream, and writes each correction message to the
+receiver through the same serial port that ``GpsPosition`` reads (via its
+``write`` callable), so no second process has to open the port. The
+caster is sent the receiver's latest GGA sentence from the live NMEA
+parser on connect and every ``gga_interval`` seconds, as VRS mountpoints
+require.
+
+Messages wait in a bounded queue between the socket and the serial port.
+If the port falls behind, the oldest messages are dropped: stale
+corrections are worse than none. Lost connections are retried with
+exponential backoff.
+
+``GpsService`` starts the relay when ``NTRIP_URL`` and ``NTRIP_MOUNTPOINT``
+are configured. ``python -m mower.services.ntrip_relay`` runs it with the
+GPS service alone, without the main controller.
+"""
+
+import asyncio
+import base64
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+RTCM3_PREAMBLE = 0xD3
+USER_AGENT = "NTRIP MowerRelay/1.0"
+
+
+def _crc24q_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 16
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x1000000:
+                crc ^= 0x1864CFB
+        table.append(crc & 0xFFFFFF)
+    return table
+
+
+_CRC24Q = _crc24q_table()
+
+
+def crc24q(data: bytes) -> int:
+    """CRC-24Q used by RTCM3 frames."""
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFF) ^ _CRC24Q[(crc >> 16) ^ byte]
+    return crc
+
+
+class RtcmFramer:
+    """Splits a byte stream into CRC-checked RTCM3 frames."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.crc_errors = 0
+        self.skipped_bytes = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Consume received bytes.
+
+        Args:
+            data: Bytes from the caster, in any chunking
+
+        Returns:
+            list: Complete frames (preamble, length, payload and CRC)
+        """
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        start = 0
+        while True:
+            begin = buffer.find(bytes((RTCM3_PREAMBLE,)), start)
+            if begin < 0:
+                self.skipped_bytes += len(buffer) - start
+                start = len(buffer)
+                break
+            self.skipped_bytes += begin - start
+            if len(buffer) - begin < 3:
+                start = begin
+                break
+            if buffer[begin + 1] & 0xFC:
+                # The six bits after the preamble are reserved (zero) in real frames
+                self.skipped_bytes += 1
+                start = begin + 1
+                continue
+            length = ((buffer[begin + 1] & 0x03) << 8) | buffer[begin + 2]
+            end = begin + 3 + length + 3
+            if len(buffer) < end:
+                start = begin
+                break
+            frame = bytes(buffer[begin:end])
+            if crc24q(frame[:-3]) != int.from_bytes(frame[-3:], "big"):
+                # Not a frame after all (0xD3 inside a payload): resync one byte on
+                self.crc_errors += 1
+                start = begin + 1
+                continue
+            frames.append(frame)
+            start = end
+        del buffer[:start]
+        return frames
+
+
+def rtcm_message_type(frame: bytes) -> int:
+    """Message number from the first 12 bits of a frame's payload."""
+    return (frame[3] << 4) | (frame[4] >> 4)
+
+
+@dataclass
+class NtripConfig:
+    """Caster connection settings."""
+
+    host: str
+    port: int = 2101
+    mountpoint: str = ""
+    username: str = ""
+    password: str = ""
+    gga_interval: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> Optional["NtripConfig"]:
+        """
+        Settings from the ``NTRIP_*`` variables written by the setup wizard.
+
+        Returns:
+            NtripConfig, or None if no caster is configured
+        """
+        host = os.getenv("NTRIP_URL", "").strip()
+        mountpoint = os.getenv("NTRIP_MOUNTPOINT", "").strip()
+        # .env.example ships placeholder values such as NTRIP_url
+        if not host or not mountpoint or host.startswith("NTRIP_"):
+            return None
+        try:
+            port = int(os.getenv("NTRIP_PORT", "2101"))
+        except ValueError:
+            port = 2101
+        return cls(
+            host=host,
+            port=port,
+            mountpoint=mountpoint,
+            username=os.getenv("NTRIP_USER", ""),
+            password=os.getenv("NTRIP_PASS", ""),
+        )
+
+
+class NtripError(Exception):
+    """The caster refused the connection or the stream broke."""
+
+
+class NtripRelay:
+    """Forwards RTCM corrections from an NTRIP caster to the GPS receiver."""
+
+    def __init__(
+        self,
+        config: NtripConfig,
+        write: Callable[[bytes], Any],
+        get_gga: Callable[[], Optional[bytes]],
+        max_pending: int = 64,
+        reconnect_min: float = 1.0,
+        reconnect_max: float = 60.0,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 30.0,
+    ):
+        """
+        Initialize the relay.
+
+        Args:
+            config: Caster settings
+            write: Writes bytes to the receiver; called from a worker thread
+            get_gga: Latest GGA sentence (without line ending), or None before a fix
+            max_pending: Messages queued for the receiver before the oldest are dropped
+            reconnect_min: First reconnect delay in seconds
+            reconnect_max: Upper bound of the doubling reconnect delay
+            connect_timeout: Seconds allowed for connecting and the caster's reply
+            read_timeout: Seconds without data before the connection is dropped
+        """
+        self.config = config
+        self.write = write
+        self.get_gga = get_gga
+        self.max_pending = max_pending
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._pending: Deque[bytes] = deque(maxlen=max_pending)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._has_pending: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.connected = False
+        self.stats: Dict[str, Any] = {
+            "connects": 0,
+            "connection_errors": 0,
+            "bytes_received": 0,
+            "rtcm_messages": 0,
+            "bytes_sent_to_gps": 0,
+            "dropped_messages": 0,
+            "gga_sent": 0,
+            "last_message_types": {},
+            "last_error": None,
+        }
+
+    def stop(self):
+        """Ask ``run`` to finish; safe to call from any thread."""
+        self._stopping = True
+        loop = self._loop
+        if loop is not None and self._stop is not None:
+            try:
+                loop.call_soon_threadsafe(self._stop.set)
+            except RuntimeError:
+                pass  # the loop already finished
+
+    async def run(self):
+        """Relay corrections until ``stop`` is called, reconnecting as needed."""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._has_pending = asyncio.Event()
+        if self._stopping:
+            return
+        writer_task = asyncio.create_task(self._drain_to_receiver())
+        delay = self.reconnect_min
+        try:
+            while not self._stop.is_set():
+                received_before = self.stats["bytes_received"]
+                try:
+                    await self._session()
+                except (OSError, asyncio.TimeoutError, NtripError) as e:
+                    self.stats["connection_errors"] += 1
+                    self.stats["last_error"] = str(e) or type(e).__name__
+                    logger.warning("NTRIP connection to %s failed: %s", self.config.host, self.stats["last_error"])
+                if self._stop.is_set():
+                    break
+                # A session that delivered corrections resets the backoff
+                if self.stats["bytes_received"] > received_before:
+                    delay = self.reconnect_min
+                wait = delay * random.uniform(0.8, 1.2)
+                delay = min(delay * 2, self.reconnect_max)
+                try:
+                    await asyncio.wait_for(self._stop.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            writer_task.cancel()
+            await asyncio.gather(writer_task, return_exceptions=True)
+
+    def _request(self) -> bytes:
+        lines = [
+            f"GET /{self.config.mountpoint} HTTP/1.0",
+            f"Host: {self.config.host}:{self.config.port}",
+            f"User-Agent: {USER_AGENT}",
+        ]
+        if self.config.username:
+            credentials = f"{self.config.username}:{self.config.password}".encode()
+            lines.append(f"Authorization: Basic {base64.b64encode(credentials).decode()}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+    async def _open(self):
+        """Connect and check the caster's reply; returns (reader, writer)."""
+        reader, writer = await asyncio.open_connection(self.config.host, self.config.port)
+        try:
+            writer.write(self._request())
+            await writer.drain()
+            status = await reader.readline()
+            if b" 200" not in status:
+                raise NtripError(f"caster replied {status.decode(errors='replace').strip() or 'nothing'}")
+            if status.startswith(b"HTTP"):
+                # Skip the HTTP headers; "ICY 200 OK" casters start the stream right away
+                while (await reader.readline()).strip():
+                    pass
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def _session(self):
+        """One connection: stream corrections until it breaks or the relay stops."""
+        reader, writer = await asyncio.wait_for(self._open(), self.connect_timeout)
+        self.connected = True
+        self.stats["connects"] += 1
+        logger.info("NTRIP connected to %s:%s/%s", self.config.host, self.config.port, self.config.mountpoint)
+        gga_task = asyncio.create_task(self._send_gga(writer))
+        stop_task = asyncio.create_task(self._stop.wait())
+        framer = RtcmFramer()
+        try:
+            while True:
+                read_task = asyncio.ensure_future(reader.read(4096))
+                done, _ = await asyncio.wait(
+                    {read_task, stop_task}, timeout=self.read_timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if read_task not in done:
+                    read_task.cancel()
+                    if stop_task in done:
+                        return
+                    raise NtripError(f"no data for {self.read_timeout:.0f} s")
+                data = read_task.result()
+                if not data:
+                    raise NtripError("caster closed the connection")
+                self.stats["bytes_received"] += len(data)
+                for frame in framer.feed(data):
+                    self._enqueue(frame)
+        finally:
+            self.connected = False
+            gga_task.cancel()
+            stop_task.cancel()
+            await asyncio.gather(gga_task, stop_task, return_exceptions=True)
+            writer.close()
+
+    async def _send_gga(self, writer: asyncio.StreamWriter):
+        """Report the receiver's position to the caster now and every ``gga_interval``."""
+        while True:
+            gga = self.get_gga()
+            if gga:
+                writer.write(gga + b"\r\n")
+                await writer.drain()
+                self.stats["gga_sent"] += 1
+            # Retry soon until the receiver has a fix
+            await asyncio.sleep(self.config.gga_interval if gga else 1.0)
+
+    def _enqueue(self, frame: bytes):
+        if len(self._pending) == self.max_pending:
+            self.stats["dropped_messages"] += 1
+        self._pending.append(frame)
+        self.stats["rtcm_messages"] += 1
+        message_type = rtcm_message_type(frame)
+        self.stats["last_message_types"][message_type] = time.time()
+        self._has_pending.set()
+
+    async def _drain_to_receiver(self):
+        """Write queued messages to the receiver off the event loop."""
+        while True:
+            await self._has_pending.wait()
+            self._has_pending.clear()
+            while self._pending:
+                # Send everything queued in one write
+                batch = b"".join(self._pending)
+                self._pending.clear()
+                written = await asyncio.to_thread(self.write, batch)
+                self.stats["bytes_sent_to_gps"] += written if isinstance(written, int) else len(batch)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Connection state and relay counters."""
+        return {
+            "connected": self.connected,
+            "host": self.config.host,
+            "mountpoint": self.config.mountpoint,
+            "pending_messages": len(self._pending),
+            **{key: value for key, value in self.stats.items() if key != "last_message_types"},
+            "message_types": sorted(self.stats["last_message_types"]),
+        }
+
+
+def main():
+    """Run the GPS service with its correction relay, without the main controller."""
+    from dotenv import load_dotenv
+
+    from mower.services.gps_service import GpsService
+
+    load_dotenv()
+    if NtripConfig.from_env() is None:
+        logger.error("Set NTRIP_URL and NTRIP_MOUNTPOINT (and NTRIP_USER / NTRIP_PASS) to relay corrections")
+        return
+    service = GpsService()
+    service.start(serial_port=os.getenv("GPS_SERIAL_PORT", "/dev/ttyACM0"))
+    try:
+        while True:
+            time.sleep(10)
+            if service.ntrip_relay is not None:
+                logger.info("NTRIP relay: %s", service.ntrip_relay.get_status())
+    except KeyboardInterrupt:
+        logger.info("Stopping NTRIP relay...")
+    finally:
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,19 @@ Base classes for simulated hardware components.
 This module provides base classes and interfaces for simulated hardware components.
 These classes define the common functionality and interfaces that all simulated
 hardware components should implement.
+
+Every component reads time from its ``clock`` and draws noise from its
+``rng``. They default to wall-clock time and the global ``random`` module;
+the headless runner (``mower.simulation.headless``) replaces them with a
+virtual clock and a seeded generator.
 """
 
 import logging
+import random
 import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from mower.simulation import is_simulation_enabled
 
@@ -38,6 +44,8 @@ class SimulatedHardwareComponent(ABC):
         self.initialized = False
         self.state: Dict[str, Any] = {}
         self._lock = threading.RLock()
+        self.clock: Callable[[], float] = time.time
+        self.rng = random
         logger.info(f"Initialized simulated {component_name}")
 
     def _initialize(self, *args, **kwargs) -> bool:
@@ -173,7 +181,7 @@ class SimulatedSensor(SimulatedHardwareComponent):
             Dict[str, Any]: Dictionary containing the simulated sensor data
         """
         with self._lock:
-            current_time = time.time()
+            current_time = self.clock()
             if current_time - self.last_reading_time >= self.reading_interval:
                 self._update_sensor_data()
                 self.last_reading_time = current_time
@@ -215,13 +223,11 @@ class SimulatedSensor(SimulatedHardwareComponent):
         Returns:
             float: The sensor value with noise added
         """
-        import random
-
         if noise_level is None:
             noise_level = self.noise_level
 
         # Add random noise within the specified range
-        noise = random.uniform(-noise_level, noise_level) * value
+        noise = self.rng.uniform(-noise_level, noise_level) * value
         return value + noise
 
 
@@ -263,7 +269,7 @@ class SimulatedActuator(SimulatedHardwareComponent):
         with self._lock:
             try:
                 self.target_state[key] = value
-                self.last_command_time = time.time()
+                self.last_command_time = self.clock()
                 self._update_actuator_state(key, value)
                 return True
             except Exception as e:
@@ -292,7 +298,7 @@ class SimulatedActuator(SimulatedHardwareComponent):
         based on the elapsed time since the last command.
         """
         with self._lock:
-            current_time = time.time()
+            current_time = self.clock()
             elapsed_time = current_time - self.last_command_time
 
             if elapsed_time >= self.response_time:
@@ -0,0 +1,241 @@
+"""
+Headless, faster-than-real-time simulation runner.
+
+``HeadlessSimulation`` owns a private ``VirtualWorld`` and a ``VirtualClock``
+and steps the world, the simulated actuators (motors, blade) and sensors
+(GPS, IMU, ToF) at a fixed ``dt`` as fast as the CPU allows. Control code is
+registered on a ``ControlScheduler`` driven by the same virtual clock, so it
+runs at its configured rate in simulated time.
+
+Runs are deterministic: every component gets its own ``random.Random``
+stream derived from the run's seed, and nothing reads the wall clock. No
+module-level singletons are involved, so independent runs (e.g. one per
+seed) can execute side by side in separate processes.
+
+Usage:
+    sim = HeadlessSimulation(seed=7)
+    sim.world.add_obstacle(Vector2D(5, 5), 0.5)
+    follower = WaypointFollower(sim, path)
+    sim.add_controller("follow", follower, rate_hz=10)
+    sim.run(duration=600, until=lambda: follower.done)
+"""
+
+import math
+import random
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mower.simulation.actuators.blade_sim import SimulatedBladeController
+from mower.simulation.actuators.motor_sim import SimulatedRoboHATDriver
+from mower.simulation.sensors.gps_sim import SimulatedGpsPosition
+from mower.simulation.sensors.imu_sim import SimulatedBNO085Sensor
+from mower.simulation.sensors.tof_sim import SimulatedVL53L0XSensors
+from mower.simulation.world_model import Vector2D, VirtualWorld
+from mower.utilities.control_scheduler import ControlScheduler
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+
+class VirtualClock:
+    """Manually advanced clock; call it to read the current simulated time."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = float(start)
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class HeadlessSimulation:
+    """Fixed-step simulation of the mower and its hardware without a UI or real time."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        dt: float = 0.02,
+        world_size: Tuple[float, float] = (100.0, 100.0),
+        start: Tuple[float, float] = (0.0, 0.0),
+        heading: float = 0.0,
+    ):
+        """
+        Initialize the simulation.
+
+        Args:
+            seed: Seed for all randomness in this run
+            dt: Simulation step in seconds
+            world_size: World width and height in meters
+            start: Initial robot position in meters
+            heading: Initial robot heading in radians
+        """
+        if dt <= 0:
+            raise ValueError(f"dt must be positive, got {dt}")
+        self.seed = seed
+        self.dt = dt
+        self.clock = VirtualClock()
+        self.world = VirtualWorld(*world_size, clock=self.clock)
+        self.world.set_robot_position(Vector2D(*start), heading)
+        self.scheduler = ControlScheduler("simulation", clock=self.clock)
+        self.steps = 0
+        self.distance_driven = 0.0
+
+        # Scenario-level randomness (obstacle layouts etc.) and one stream per component
+        seeds = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(seeds.spawn(1)[0])
+        component_seeds = iter(seeds.spawn(5))
+
+        self.motors = self._attach(SimulatedRoboHATDriver(), component_seeds)
+        self.blade = self._attach(SimulatedBladeController(), component_seeds)
+        self.gps = self._attach(SimulatedGpsPosition(), component_seeds)
+        self.imu = self._attach(SimulatedBNO085Sensor(), component_seeds)
+        self.tof = self._attach(SimulatedVL53L0XSensors(), component_seeds)
+        self.actuators = (self.motors, self.blade)
+        self.sensors = {"gps": self.gps, "imu": self.imu, "tof": self.tof}
+
+        for component in (self.motors, self.blade, self.imu, self.tof):
+            component._initialize()
+        # The GPS's NMEA thread runs on wall-clock time; its position
+        # readings come from get_data() like every other sensor
+        self.gps.initialized = True
+
+    def _attach(self, component, seeds):
+        """Point a simulated component at this run's world, clock and random stream."""
+        component.world = self.world
+        component.clock = self.clock
+        component.rng = random.Random(int(next(seeds).generate_state(1)[0]))
+        if hasattr(component, "last_reading_time"):
+            component.last_reading_time = -math.inf  # first get_data() reads the world
+        return component
+
+    def add_controller(self, name: str, func: Callable[[], Any], rate_hz: float):
+        """
+        Run ``func`` at ``rate_hz`` in simulated time.
+
+        Args:
+            name: Unique controller name
+            func: Called with no arguments once per period
+            rate_hz: Call frequency
+        """
+        task = self.scheduler.add_task(name, func, rate_hz)
+        # Anchor the deadline grid now; see step() for the half-step rounding
+        task.deadline = task.stats.started = self.clock()
+        return task
+
+    def step(self):
+        """Advance the simulation by one ``dt``."""
+        # Controllers act on the current state. Deadlines are rounded to the
+        # nearest step so float error never delays a task by a whole step.
+        self.scheduler.run_pending(self.clock() + self.dt / 2)
+        before = self.world.robot.position
+        self.world.update(self.dt)
+        after = self.world.robot.position
+        self.distance_driven += math.hypot(after.x - before.x, after.y - before.y)
+        self.clock.advance(self.dt)
+        self.steps += 1
+        for actuator in self.actuators:
+            actuator.update()
+        for sensor in self.sensors.values():
+            sensor.get_data()
+
+    def run(
+        self,
+        duration: Optional[float] = None,
+        until: Optional[Callable[[], bool]] = None,
+        max_steps: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Step until a limit is reached or ``until`` returns True.
+
+        Args:
+            duration: Simulated seconds to run
+            until: Checked after every step; True ends the run
+            max_steps: Upper bound on steps
+
+        Returns:
+            dict: Simulated and wall time, steps and the real-time factor
+        """
+        if duration is None and until is None and max_steps is None:
+            raise ValueError("run() needs a duration, an until condition or max_steps")
+        end_time = self.clock() + duration if duration is not None else math.inf
+        remaining = max_steps if max_steps is not None else math.inf
+        started, start_time, start_steps = time.perf_counter(), self.clock(), self.steps
+        # Stop within half a step of the requested duration despite float drift
+        while self.clock() < end_time - self.dt / 2 and remaining > 0:
+            self.step()
+            remaining -= 1
+            if until is not None and until():
+                break
+        wall = time.perf_counter() - started
+        simulated = self.clock() - start_time
+        return {
+            "sim_time_s": simulated,
+            "wall_time_s": wall,
+            "steps": self.steps - start_steps,
+            "realtime_factor": simulated / wall if wall > 0 else math.inf,
+        }
+
+    def sensor_data(self) -> Dict[str, Dict[str, Any]]:
+        """Latest reading of every simulated sensor."""
+        return {name: sensor.get_state() for name, sensor in self.sensors.items()}
+
+
+class WaypointFollower:
+    """
+    Drives the simulated robot through a list of waypoints.
+
+    A simple proportional heading controller on ground-truth pose, meant for
+    exercising planners and the simulation rather than as a navigation
+    reference. Register it with ``HeadlessSimulation.add_controller``.
+    """
+
+    def __init__(
+        self,
+        sim: HeadlessSimulation,
+        waypoints: Sequence[Sequence[float]],
+        speed: float = 0.5,
+        tolerance: float = 0.15,
+        turn_gain: float = 2.0,
+    ):
+        """
+        Initialize the follower.
+
+        Args:
+            sim: Simulation whose robot is driven
+            waypoints: (x, y) targets in meters, visited in order
+            speed: Cruise speed in m/s
+            tolerance: Distance at which a waypoint counts as reached
+            turn_gain: Angular speed command per radian of heading error
+        """
+        self.sim = sim
+        self.waypoints = np.asarray(waypoints, dtype=float).reshape(-1, 2)
+        self.speed = speed
+        self.tolerance = tolerance
+        self.turn_gain = turn_gain
+        self.index = 0
+
+    @property
+    def done(self) -> bool:
+        return self.index >= len(self.waypoints)
+
+    def __call__(self):
+        robot = self.sim.world.robot
+        while not self.done:
+            dx, dy = self.waypoints[self.index] - robot.position.to_tuple()
+            if math.hypot(dx, dy) > self.tolerance:
+                break
+            self.index += 1
+        if self.done:
+            self.sim.motors.stop()
+            return
+
+        error = (math.atan2(dy, dx) - robot.heading + math.pi) % (2 * math.pi) - math.pi
+        angular = max(-robot.max_angular_velocity, min(robot.max_angular_velocity, self.turn_gain * error))
+        # Slow down while pointing away from the target, turn in place beyond 90 degrees
+        linear = self.speed * max(0.0, math.cos(error))
+        half_track = angular * robot.width / 2
+        self.sim.motors.set_motors((linear - half_track) / robot.max_speed, (linear + half_track) / robot.max_speed)
@@ -0,0 +1,232 @@
+"""
+Vectorized obstacle queries for the simulated world.
+
+Obstacles are circles stored as NumPy arrays (``centers`` (N, 2), ``radii``
+(N,)) and bucketed into a uniform grid. Every query takes a batch (many rays
+or many points) and is answered with array operations only:
+
+- ``cast_rays`` samples each ray once per grid cell, looks the sampled cells
+  up in the grid to get candidate (ray, obstacle) pairs and intersects only
+  those pairs. Obstacles are registered in every cell their bounding box,
+  grown by half a sample step, touches; so a ray that hits a circle always
+  has a sample in a cell that lists it.
+- ``resolve_collisions`` pushes points out of the obstacles they are inside,
+  deepest penetration first.
+
+Rays with an unbounded range, or batches where the grid would not save
+work, fall back to a brute-force (rays x obstacles) broadcast.
+"""
+
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Grid keys pack the cell's (ix, iy) into one int64
+_KEY_SHIFT = np.int64(1 << 32)
+_KEY_OFFSET = np.int64(1 << 31)
+
+
+def _cell_keys(ix: np.ndarray, iy: np.ndarray) -> np.ndarray:
+    return ix.astype(np.int64) * _KEY_SHIFT + (iy.astype(np.int64) + _KEY_OFFSET)
+
+
+class ObstacleIndex:
+    """Uniform-grid index over circular obstacles with batched queries."""
+
+    def __init__(self, centers: np.ndarray, radii: np.ndarray, cell_size: Optional[float] = None):
+        """
+        Build the index.
+
+        Args:
+            centers: Obstacle centers (N, 2) in meters
+            radii: Obstacle radii (N,) in meters
+            cell_size: Grid cell edge in meters; defaults to twice the median
+                radius, but at least 0.5 m
+        """
+        self.centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        self.radii = np.asarray(radii, dtype=float).reshape(-1)
+        if len(self.centers) != len(self.radii):
+            raise ValueError("centers and radii must have the same length")
+        if cell_size is None:
+            cell_size = max(0.5, 2.0 * float(np.median(self.radii))) if len(self.radii) else 1.0
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = float(cell_size)
+        self._build_grid()
+
+    def __len__(self) -> int:
+        return len(self.radii)
+
+    def _build_grid(self):
+        # Grow each bounding box by half a ray sample step (samples are one cell apart)
+        reach = self.radii + self.cell_size / 2
+        low = np.floor((self.centers - reach[:, None]) / self.cell_size).astype(np.int64)
+        high = np.floor((self.centers + reach[:, None]) / self.cell_size).astype(np.int64)
+        span = high - low + 1
+        per_obstacle = span[:, 0] * span[:, 1]
+
+        owner = np.repeat(np.arange(len(self.radii)), per_obstacle)
+        offset = np.arange(per_obstacle.sum()) - np.repeat(np.cumsum(per_obstacle) - per_obstacle, per_obstacle)
+        ix = low[owner, 0] + offset // span[owner, 1]
+        iy = low[owner, 1] + offset % span[owner, 1]
+
+        keys = _cell_keys(ix, iy)
+        order = np.argsort(keys, kind="stable")
+        self._cell_obstacles = owner[order]
+        self._cell_keys, self._cell_start, self._cell_count = np.unique(
+            keys[order], return_index=True, return_counts=True
+        )
+
+    def _lookup(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obstacles registered in the cells containing ``points``.
+
+        Returns:
+            Tuple of (point index, obstacle index) candidate pairs
+        """
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        keys = _cell_keys(cells[:, 0], cells[:, 1])
+        slot = np.minimum(np.searchsorted(self._cell_keys, keys), max(len(self._cell_keys) - 1, 0))
+        found = np.zeros(len(keys), dtype=bool)
+        if len(self._cell_keys):
+            found = self._cell_keys[slot] == keys
+        point_index = np.flatnonzero(found)
+        counts = self._cell_count[slot[point_index]]
+        starts = self._cell_start[slot[point_index]]
+        pairs_point = np.repeat(point_index, counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return pairs_point, self._cell_obstacles[np.repeat(starts, counts) + within]
+
+    def _ray_candidates(self, origins, directions, max_range) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Candidate (ray, obstacle) pairs from the grid, or None to use brute force."""
+        if not math.isfinite(max_range):
+            return None
+        steps = int(math.ceil(max_range / self.cell_size)) + 1
+        if len(origins) * steps >= len(origins) * len(self.radii):
+            return None
+        t = np.arange(steps) * self.cell_size
+        samples = origins[:, None, :] + directions[:, None, :] * t[None, :, None]
+        sample_ray, obstacle = self._lookup(samples.reshape(-1, 2))
+        ray = sample_ray // steps
+        # The same obstacle is usually found from several samples of a ray
+        pair = np.unique(ray * len(self.radii) + obstacle)
+        return pair // len(self.radii), pair % len(self.radii)
+
+    def cast_rays(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_range: float = float("inf"),
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distance along each ray to the nearest obstacle edge.
+
+        Obstacles whose centers are behind a ray's origin are ignored; a ray
+        starting inside an obstacle whose center is ahead reports a negative
+        distance (matching ``VirtualWorld.get_distance_to_nearest_obstacle``).
+
+        Args:
+            origins: Ray origins (R, 2)
+            directions: Ray directions (R, 2); need not be normalized
+            max_range: Distance reported for rays that hit nothing
+
+        Returns:
+            Tuple of (distances (R,), obstacle index (R,) with -1 for a miss)
+        """
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        directions = np.asarray(directions, dtype=float).reshape(-1, 2)
+        norms = np.linalg.norm(directions, axis=1, keepdims=True)
+        directions = np.divide(directions, norms, out=np.zeros_like(directions), where=norms > 0)
+
+        distances = np.full(len(origins), float(max_range))
+        hits = np.full(len(origins), -1)
+        if not len(self.radii) or not len(origins):
+            return distances, hits
+
+        candidates = self._ray_candidates(origins, directions, max_range)
+        if candidates is None:
+            ray, obstacle = np.divmod(np.arange(len(origins) * len(self.radii)), len(self.radii))
+        else:
+            ray, obstacle = candidates
+
+        to_center = self.centers[obstacle] - origins[ray]
+        projection = np.einsum("ij,ij->i", to_center, directions[ray])
+        perpendicular_sq = np.einsum("ij,ij->i", to_center, to_center) - projection**2
+        radius_sq = self.radii[obstacle] ** 2
+        valid = (projection > 0) & (perpendicular_sq <= radius_sq)
+        edge = projection - np.sqrt(np.maximum(radius_sq - perpendicular_sq, 0.0))
+        valid &= edge < max_range
+
+        ray, obstacle, edge = ray[valid], obstacle[valid], edge[valid]
+        # Nearest hit per ray: sort by (ray, distance) and keep each ray's first
+        order = np.lexsort((edge, ray))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = ray[order][1:] != ray[order][:-1]
+        nearest = order[first]
+        distances[ray[nearest]] = edge[nearest]
+        hits[ray[nearest]] = obstacle[nearest]
+        return distances, hits
+
+    def within(self, point: np.ndarray, max_range: float) -> np.ndarray:
+        """Indices of obstacles whose edge is within ``max_range`` of ``point``."""
+        distance = np.linalg.norm(self.centers - np.asarray(point, dtype=float), axis=1)
+        return np.flatnonzero(distance <= max_range + self.radii)
+
+    def resolve_collisions(
+        self,
+        points: np.ndarray,
+        clearance: float = 0.01,
+        max_iterations: int = 4,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Push points out of every obstacle they are inside.
+
+        Each iteration moves every colliding point out of its most deeply
+        penetrated obstacle, to ``clearance`` beyond the edge; further
+        iterations handle points pushed into a neighbouring obstacle. A
+        point exactly on the line through two overlapping centers has no
+        push-out direction that leaves both and may stay inside one.
+
+        Args:
+            points: Points (P, 2)
+            clearance: Gap left between a pushed point and the obstacle edge
+            max_iterations: Upper bound on push-out rounds
+
+        Returns:
+            Tuple of (resolved points (P, 2), unit push-out normals (P, 2) of
+            the last collision, zero where none, collided mask (P,))
+        """
+        points = np.array(points, dtype=float).reshape(-1, 2)
+        normals = np.zeros_like(points)
+        collided = np.zeros(len(points), dtype=bool)
+        if not len(self.radii):
+            return points, normals, collided
+
+        for _ in range(max_iterations):
+            point, obstacle = self._lookup(points)
+            offset = points[point] - self.centers[obstacle]
+            distance = np.linalg.norm(offset, axis=1)
+            depth = self.radii[obstacle] - distance
+            inside = depth > 0
+            if not inside.any():
+                break
+            point, obstacle, offset, distance, depth = (
+                point[inside], obstacle[inside], offset[inside], distance[inside], depth[inside]
+            )
+            order = np.lexsort((-depth, point))
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = point[order][1:] != point[order][:-1]
+            deepest = order[first]
+
+            p, o = point[deepest], obstacle[deepest]
+            # A point exactly on a center is pushed along +x
+            normal = np.where(
+                distance[deepest, None] > 0,
+                offset[deepest] / np.maximum(distance[deepest, None], 1e-12),
+                [1.0, 0.0],
+            )
+            points[p] = self.centers[o] + normal * (self.radii[o] + clearance)[:, None]
+            normals[p] = normal
+            collided[p] = True
+        return points, normals, collided
@@ -0,0 +1,382 @@
+"""
+Monte-Carlo evaluation of coverage missions in the headless simulator.
+
+Each run generates a random yard (a star-shaped polygon) with random round
+obstacles from its seed, plans a boustrophedon coverage path around the
+obstacles the planner is told about, and drives it in a
+``HeadlessSimulation``. Obstacles the planner does not know about must be
+handled by the avoidance policy, which by default watches the simulated
+ToF sensors and skips the waypoint it was heading for when something is
+close ahead.
+
+Runs are independent and seeded, so a sweep is spread over a
+``ProcessPoolExecutor`` and reproduces exactly. The per-run metrics are
+written column-wise to a compressed NumPy archive (``.npz``) or CSV, and
+two archives from different builds can be compared with ``summarize``.
+
+Usage:
+    python -m mower.simulation.scenario_sweep --runs 200 --out results.npz --label my-branch
+"""
+
+import argparse
+import csv
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import Point, Polygon
+
+from mower.navigation.coverage import boustrophedon_path
+from mower.simulation.headless import HeadlessSimulation, WaypointFollower
+from mower.simulation.world_model import Vector2D
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+# Metric columns written for every run, in order
+RESULT_COLUMNS = (
+    "seed",
+    "completed",
+    "coverage_pct",
+    "distance_m",
+    "sim_time_s",
+    "wall_time_s",
+    "collisions",
+    "avoidances",
+    "obstacles",
+    "area_m2",
+)
+
+
+@dataclass
+class Scenario:
+    """One randomized yard and the mission parameters to mow it with."""
+
+    seed: int
+    boundary: List[Tuple[float, float]]
+    # (x, y, radius) of each obstacle, in meters
+    obstacles: List[Tuple[float, float, float]]
+    # Obstacles with known[i] set are passed to the planner as no-go zones
+    known: List[bool] = field(default_factory=list)
+    spacing: float = 0.5
+    angle: float = 0.0
+    speed: float = 0.5
+    time_limit: float = 3600.0
+    # Margin around known obstacles in the plan, about half the robot's length
+    clearance: float = 0.4
+
+
+def generate_scenario(
+    seed: int,
+    yard_radius: Tuple[float, float] = (5.0, 10.0),
+    obstacle_count: Tuple[int, int] = (0, 12),
+    obstacle_radius: Tuple[float, float] = (0.15, 0.6),
+    known_fraction: float = 0.5,
+    spacing: float = 0.5,
+) -> Scenario:
+    """
+    Random yard with random obstacles, reproducible from ``seed``.
+
+    Args:
+        seed: Scenario seed; also seeds the simulation run
+        yard_radius: Range of the yard's outer radius in meters
+        obstacle_count: Inclusive range of the number of obstacles
+        obstacle_radius: Range of obstacle radii in meters
+        known_fraction: Probability that the planner knows an obstacle
+        spacing: Distance between passes in meters
+
+    Returns:
+        Scenario: The generated scenario
+    """
+    rng = np.random.default_rng(seed)
+    radius = rng.uniform(*yard_radius)
+    vertices = rng.integers(5, 10)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, vertices))
+    radii = radius * rng.uniform(0.6, 1.0, vertices)
+    center = radius + 1.0
+    boundary = np.column_stack((center + radii * np.cos(angles), center + radii * np.sin(angles)))
+    yard = Polygon(boundary)
+
+    obstacles = []
+    for _ in range(rng.integers(obstacle_count[0], obstacle_count[1] + 1)):
+        r = rng.uniform(*obstacle_radius)
+        # Rejection-sample a center well inside the yard
+        for _ in range(50):
+            x, y = rng.uniform(center - radius, center + radius, 2)
+            if yard.contains(Point(x, y).buffer(r + spacing)):
+                obstacles.append((float(x), float(y), float(r)))
+                break
+
+    return Scenario(
+        seed=seed,
+        boundary=[tuple(map(float, p)) for p in boundary],
+        obstacles=obstacles,
+        known=[bool(k) for k in rng.random(len(obstacles)) < known_fraction],
+        spacing=spacing,
+        angle=float(rng.uniform(0, 180)),
+    )
+
+
+class AvoidingFollower(WaypointFollower):
+    """
+    Waypoint follower that gives up on a waypoint when it is blocked.
+
+    The robot counts as blocked when the ToF sensors see an obstacle close
+    ahead or it is touching one (the simulated bumper), and a waypoint is
+    also abandoned when it has not been reached within ``waypoint_timeout``.
+    Each skip counts as one avoidance. After a skip the robot must be clear
+    again before the next one, so it gets to turn towards its new target.
+    """
+
+    def __init__(
+        self,
+        sim: HeadlessSimulation,
+        waypoints,
+        avoid_distance_cm: float = 25.0,
+        waypoint_timeout: float = 60.0,
+        **kwargs,
+    ):
+        super().__init__(sim, waypoints, **kwargs)
+        self.avoid_distance_cm = avoid_distance_cm
+        self.waypoint_timeout = waypoint_timeout
+        self.avoidances = 0
+        self._blocked = False
+        self._target = (self.index, sim.clock())
+
+    def __call__(self):
+        tof = self.sim.tof.state
+        blocked = (
+            min(tof["left_distance"], tof["right_distance"]) < self.avoid_distance_cm or self.sim.world.in_contact
+        )
+        timed_out = self._target[0] == self.index and self.sim.clock() - self._target[1] > self.waypoint_timeout
+        if not self.done and ((blocked and not self._blocked) or timed_out):
+            self.avoidances += 1
+            self.index += 1
+        self._blocked = blocked
+        if self._target[0] != self.index:
+            self._target = (self.index, self.sim.clock())
+        super().__call__()
+
+
+def coverage_percent(
+    trajectory: np.ndarray,
+    boundary: Sequence[Tuple[float, float]],
+    obstacles: Sequence[Tuple[float, float, float]],
+    width: float,
+    resolution: float = 0.1,
+) -> float:
+    """
+    Share of the mowable area swept by a cutting disc of ``width`` along a trajectory.
+
+    Args:
+        trajectory: Robot positions (T, 2), closely spaced
+        boundary: Yard boundary vertices
+        obstacles: (x, y, radius) of every obstacle
+        width: Cutting width in meters
+        resolution: Raster cell size in meters
+
+    Returns:
+        float: Covered share of the mowable cells in percent
+    """
+    area = Polygon(boundary)
+    if obstacles:
+        area = area.difference(shapely.union_all([Point(x, y).buffer(r) for x, y, r in obstacles]))
+    min_x, min_y, max_x, max_y = area.bounds
+    xs = np.arange(min_x, max_x, resolution) + resolution / 2
+    ys = np.arange(min_y, max_y, resolution) + resolution / 2
+    grid_x, grid_y = np.meshgrid(xs, ys, indexing="ij")
+    mowable = shapely.contains_xy(area, grid_x, grid_y)
+    if not mowable.any():
+        return 0.0
+
+    # Stamp a disc stencil onto every raster cell the trajectory passes through
+    cells = np.unique(np.floor((trajectory - (min_x, min_y)) / resolution).astype(int), axis=0)
+    reach = int(math.ceil(width / 2 / resolution))
+    offsets = np.stack(np.meshgrid(np.arange(-reach, reach + 1), np.arange(-reach, reach + 1)), -1).reshape(-1, 2)
+    offsets = offsets[np.linalg.norm(offsets, axis=1) * resolution <= width / 2]
+    stamped = (cells[:, None, :] + offsets[None, :, :]).reshape(-1, 2)
+    inside = (stamped >= 0).all(axis=1) & (stamped[:, 0] < len(xs)) & (stamped[:, 1] < len(ys))
+    covered = np.zeros_like(mowable)
+    covered[stamped[inside, 0], stamped[inside, 1]] = True
+    return float((covered & mowable).sum() / mowable.sum() * 100.0)
+
+
+def run_scenario(
+    scenario: Scenario,
+    follower_factory: Optional[Callable[[HeadlessSimulation, np.ndarray], WaypointFollower]] = None,
+    dt: float = 0.02,
+) -> Dict[str, float]:
+    """
+    Plan and drive one scenario.
+
+    Args:
+        scenario: Scenario to run
+        follower_factory: Builds the controller that drives the path;
+            defaults to ``AvoidingFollower``. Must be picklable (e.g. a
+            module-level function) when used with ``run_sweep``.
+        dt: Simulation step in seconds
+
+    Returns:
+        dict: One value per ``RESULT_COLUMNS`` entry
+    """
+    started = time.perf_counter()
+    zones = [
+        list(Point(x, y).buffer(r + scenario.clearance, 4).exterior.coords)
+        for (x, y, r), known in zip(scenario.obstacles, scenario.known)
+        if known
+    ]
+    path = boustrophedon_path(scenario.boundary, scenario.spacing, scenario.angle, zones)
+    start = tuple(path[0]) if len(path) else scenario.boundary[0]
+    sim = HeadlessSimulation(seed=scenario.seed, dt=dt, start=start)
+    for x, y, r in scenario.obstacles:
+        sim.world.add_obstacle(Vector2D(x, y), r, obstacle_type="scenario")
+
+    if follower_factory is None:
+        follower = AvoidingFollower(sim, path, speed=scenario.speed)
+    else:
+        follower = follower_factory(sim, path)
+    sim.add_controller("follow", follower, rate_hz=20)
+
+    trajectory = [start]
+    # Record the position every few centimeters for the coverage raster
+    stride = max(1, int(0.05 / (scenario.speed * dt)))
+
+    def finished():
+        if sim.steps % stride == 0:
+            trajectory.append(sim.world.robot.position.to_tuple())
+        return follower.done
+
+    result = sim.run(duration=scenario.time_limit, until=finished)
+    trajectory.append(sim.world.robot.position.to_tuple())
+
+    return {
+        "seed": scenario.seed,
+        "completed": follower.done,
+        "coverage_pct": coverage_percent(
+            np.asarray(trajectory), scenario.boundary, scenario.obstacles, scenario.spacing
+        ),
+        "distance_m": sim.distance_driven,
+        "sim_time_s": result["sim_time_s"],
+        "wall_time_s": time.perf_counter() - started,
+        "collisions": sim.world.collision_count,
+        "avoidances": getattr(follower, "avoidances", 0),
+        "obstacles": len(scenario.obstacles),
+        "area_m2": Polygon(scenario.boundary).area,
+    }
+
+
+def run_sweep(
+    scenarios: Iterable[Scenario],
+    workers: Optional[int] = None,
+    follower_factory=None,
+) -> Dict[str, np.ndarray]:
+    """
+    Run scenarios across a process pool.
+
+    Args:
+        scenarios: Scenarios to run
+        workers: Worker processes; defaults to the CPU count. 1 runs in-process.
+        follower_factory: Passed to ``run_scenario``
+
+    Returns:
+        dict: Column name to array of per-run values, in scenario order
+    """
+    scenarios = list(scenarios)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(scenarios) <= 1:
+        rows = [run_scenario(s, follower_factory) for s in scenarios]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(scenarios) // (workers * 4))
+            rows = list(
+                pool.map(run_scenario, scenarios, [follower_factory] * len(scenarios), chunksize=chunksize)
+            )
+    return {column: np.array([row[column] for row in rows]) for column in RESULT_COLUMNS}
+
+
+def save_results(path: str, columns: Dict[str, np.ndarray], label: str = "", scenarios: Sequence[Scenario] = ()):
+    """
+    Write sweep results column-wise.
+
+    ``.csv`` paths get a plain CSV with one row per run; anything else a
+    compressed NumPy archive that also records the label and scenarios.
+    """
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(zip(*columns.values()))
+        return
+    np.savez_compressed(
+        path,
+        label=np.array(label),
+        scenarios=np.array([repr(asdict(s)) for s in scenarios]),
+        **columns,
+    )
+
+
+def load_results(path: str) -> Dict[str, np.ndarray]:
+    """Read the metric columns of a ``.npz`` written by ``save_results``."""
+    with np.load(path) as archive:
+        return {column: archive[column] for column in RESULT_COLUMNS if column in archive}
+
+
+def summarize(columns: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+    """
+    Mean, spread and tail of every metric across runs.
+
+    Returns:
+        dict: Metric name to ``mean``, ``std``, ``p5``, ``p50`` and ``p95``
+    """
+    summary = {}
+    for column in RESULT_COLUMNS:
+        if column == "seed" or column not in columns:
+            continue
+        values = columns[column].astype(float)
+        p5, p50, p95 = np.percentile(values, [5, 50, 95])
+        summary[column] = {
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "p5": float(p5),
+            "p50": float(p50),
+            "p95": float(p95),
+        }
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Monte-Carlo coverage mission sweep in the headless simulator.")
+    parser.add_argument("--runs", type=int, default=100, help="Number of randomized scenarios")
+    parser.add_argument("--first-seed", type=int, default=0, help="Seed of the first scenario")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--spacing", type=float, default=0.5, help="Pass spacing in meters")
+    parser.add_argument("--known-fraction", type=float, default=0.5, help="Share of obstacles the planner knows")
+    parser.add_argument("--out", default="sweep_results.npz", help="Results file (.npz or .csv)")
+    parser.add_argument("--label", default="", help="Build label stored with .npz results")
+    parser.add_argument("--compare", help="Earlier .npz results to print alongside this sweep")
+    args = parser.parse_args(argv)
+
+    scenarios = [
+        generate_scenario(seed, known_fraction=args.known_fraction, spacing=args.spacing)
+        for seed in range(args.first_seed, args.first_seed + args.runs)
+    ]
+    started = time.perf_counter()
+    columns = run_sweep(scenarios, workers=args.workers)
+    save_results(args.out, columns, label=args.label, scenarios=scenarios)
+    print(f"{args.runs} runs in {time.perf_counter() - started:.1f}s -> {args.out}")
+
+    baseline = summarize(load_results(args.compare)) if args.compare else None
+    for metric, stats in summarize(columns).items():
+        line = f"{metric:>14}: mean {stats['mean']:10.2f}  p5 {stats['p5']:10.2f}  p95 {stats['p95']:10.2f}"
+        if baseline and metric in baseline:
+            line += f"  (baseline mean {baseline[metric]['mean']:10.2f})"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
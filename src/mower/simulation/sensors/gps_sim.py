@@ -7,7 +7,6 @@ requiring physical hardware.
 """
 
 import math
-import random
 import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
@@ -104,21 +103,21 @@ class SimulatedGpsPosition(SimulatedSensor):
         northing = (lat - self.origin_lat) * 111000.0
 
         # Determine fix quality
-        if random.random() < self.fix_probability:
-            if random.random() < self.dgps_probability:
+        if self.rng.random() < self.fix_probability:
+            if self.rng.random() < self.dgps_probability:
                 fix_quality = 2  # DGPS fix
-                satellites = random.randint(8, 12)
-                hdop = random.uniform(0.8, 1.5)
+                satellites = self.rng.randint(8, 12)
+                hdop = self.rng.uniform(0.8, 1.5)
                 status = "GPS fix acquired (DGPS)."
             else:
                 fix_quality = 1  # GPS fix
-                satellites = random.randint(4, 8)
-                hdop = random.uniform(1.5, 3.0)
+                satellites = self.rng.randint(4, 8)
+                hdop = self.rng.uniform(1.5, 3.0)
                 status = "GPS fix acquired."
         else:
             fix_quality = 0  # No fix
-            satellites = random.randint(0, 3)
-            hdop = random.uniform(10.0, 99.9)
+            satellites = self.rng.randint(0, 3)
+            hdop = self.rng.uniform(10.0, 99.9)
             status = "Waiting for GPS fix..."
             # Return early without updating position
             self.state.update(
@@ -132,7 +131,7 @@ class SimulatedGpsPosition(SimulatedSensor):
             return
 
         # Update state
-        timestamp = time.time()
+        timestamp = self.clock()
         self.state.update(
             {
                 "position": (
@@ -193,7 +192,7 @@ class SimulatedGpsPosition(SimulatedSensor):
         Returns:
             List[Tuple[float, str]]: List of (timestamp, nmea_sentence) tuples
         """
-        timestamp = time.time()
+        timestamp = self.clock()
 
         # Convert lat/lng to NMEA format
         lat_deg = int(lat)
@@ -14,6 +14,8 @@ import math
 # , List, Tuple, Union, Type # Unused specific types
 from typing import Any, Dict, Optional
 
+import numpy as np
+
 from mower.simulation.hardware_sim import SimulatedSensor
 from mower.simulation.world_model import Vector2D, get_world_instance
 from mower.utilities.logger_config import LoggerConfigInfo
@@ -98,37 +100,30 @@ class SimulatedVL53L0XSensors(SimulatedSensor):
         robot_position = Vector2D(*robot_state["position"])
         robot_heading = robot_state["heading"]
 
-        # Update each sensor
-        for sensor_name in ["left", "right"]:
-            if not self.state["sensor_status"].get(sensor_name, False):
+        working = [name for name in ("left", "right") if self.state["sensor_status"].get(name, False)]
+        for sensor_name in ("left", "right"):
+            if sensor_name not in working:
                 self.state[f"{sensor_name}_distance"] = float("nan")  # Ensure non-working sensor reads NaN
-                continue  # Skip update for non-working sensor
-
-            # Calculate sensor position in world coordinates
-            sensor_rel_pos = self.sensor_positions[sensor_name]
-            sensor_rel_pos = sensor_rel_pos.rotate(robot_heading)
-            sensor_position = robot_position + sensor_rel_pos
+        if not working:
+            return
 
-            # Calculate sensor direction in world coordinates
-            sensor_orientation = robot_heading + self.sensor_orientations[sensor_name]
-            sensor_direction = Vector2D(math.cos(sensor_orientation), math.sin(sensor_orientation))
+        # Sensor positions and directions in world coordinates
+        cos_h, sin_h = math.cos(robot_heading), math.sin(robot_heading)
+        rotation = np.array([[cos_h, -sin_h], [sin_h, cos_h]])
+        offsets = np.array([self.sensor_positions[name].to_tuple() for name in working])
+        origins = np.array(robot_position.to_tuple()) + offsets @ rotation.T
+        angles = robot_heading + np.array([self.sensor_orientations[name] for name in working])
+        directions = np.column_stack((np.cos(angles), np.sin(angles)))
 
-            # Get distance to nearest obstacle in sensor direction
-            distance, obstacle = self.world.get_distance_to_nearest_obstacle(
-                sensor_position, sensor_direction, self.max_range
-            )
+        # One batched ray cast for all sensors; the world works in meters
+        distances, _ = self.world.cast_rays(origins, directions, self.max_range / 100.0)
 
-            # Convert distance to cm
-            distance_cm = distance * 100.0
-
-            # Clamp to sensor range
-            distance_cm = max(self.min_range, min(self.max_range, distance_cm))
+        for sensor_name, distance in zip(working, distances):
+            # Convert distance to cm and clamp to sensor range
+            distance_cm = max(self.min_range, min(self.max_range, float(distance) * 100.0))
 
             # Add noise to distance
-            distance_cm = self.add_noise(distance_cm)
-
-            # Update sensor data
-            self.state[f"{sensor_name}_distance"] = distance_cm
+            self.state[f"{sensor_name}_distance"] = self.add_noise(distance_cm)
 
     def _get_sensor_data(self) -> Dict[str, Any]:
         """Get the current simulated ToF sensor data."""
@@ -5,19 +5,29 @@ This module provides a virtual world model for simulating the autonomous mower's
 environment. It includes representations of the robot's position and orientation,
 the environment (terrain, obstacles, etc.), and methods for updating and querying
 the world state.
+
+Obstacle queries (ray casts, range queries and collisions) go through an
+``ObstacleIndex`` built from the obstacle list on first use after a change,
+so they stay fast with thousands of obstacles; ``cast_rays`` answers many
+virtual range sensors in one call.
 """
 
 import logging
 import math
 import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from mower.simulation.obstacle_index import ObstacleIndex
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Seconds without contact before touching an obstacle again is a new collision
+COLLISION_GAP = 0.5
+
 
 class Vector2D:
     """
@@ -417,13 +427,14 @@ class VirtualWorld:
 
     # The VirtualWorld class has many attributes to support simulation
     # features.
-    def __init__(self, width: float = 100.0, height: float = 100.0):
+    def __init__(self, width: float = 100.0, height: float = 100.0, clock: Callable[[], float] = time.time):
         """
         Initialize the virtual world.
 
         Args:
             width: Width of the world in meters
             height: Height of the world in meters
+            clock: Time source used when ``update`` is called without a dt
         """
         self.width = width
         self.height = height
@@ -431,18 +442,35 @@ class VirtualWorld:
         self.terrain = Terrain(width, height)
         self.obstacles: List[Obstacle] = []
         self.time = 0.0
-        self.last_update_time = time.time()
+        self.clock = clock
+        self.last_update_time = clock()
         self._lock = threading.RLock()
+        self._obstacle_index: Optional[ObstacleIndex] = None
+        self._indexed_obstacles = 0
+        # Number of times the robot ran into an obstacle. Contacts less than
+        # COLLISION_GAP seconds apart (sliding along an edge) count once.
+        self.collision_count = 0
+        self._in_contact = False
+        self._last_contact = -math.inf
+
+    def _index(self) -> ObstacleIndex:
+        """Obstacle index, rebuilt when obstacles were added or removed."""
+        if self._obstacle_index is None or self._indexed_obstacles != len(self.obstacles):
+            centers = np.array([o.position.to_tuple() for o in self.obstacles], dtype=float).reshape(-1, 2)
+            radii = np.array([o.radius for o in self.obstacles], dtype=float)
+            self._obstacle_index = ObstacleIndex(centers, radii)
+            self._indexed_obstacles = len(self.obstacles)
+        return self._obstacle_index
 
     def update(self, dt: Optional[float] = None) -> None:
         """
         Update the world state based on elapsed time.
 
         Args:
-            dt: Elapsed time in seconds (if None, uses real elapsed time)
+            dt: Elapsed time in seconds (if None, uses the time elapsed on ``clock``)
         """
         with self._lock:
-            current_time = time.time()
+            current_time = self.clock()
             if dt is None:
                 dt = current_time - self.last_update_time
 
@@ -458,23 +486,33 @@ class VirtualWorld:
 
     def _handle_collisions(self) -> None:
         """Handle collisions between the robot and obstacles."""
-        for obstacle in self.obstacles:
-            # Calculate distance from robot center to obstacle
-            distance = obstacle.distance_to(self.robot.position)
-
-            # If robot is colliding with obstacle, move it out
-            if distance < 0:
-                # Calculate direction from obstacle to robot
-                direction = (self.robot.position - obstacle.position).normalize()
-
-                # Move robot out of obstacle
-                self.robot.position = obstacle.position + direction * (obstacle.radius + 0.01)
-
-                # Stop robot's movement in the collision direction
-                dot_product = self.robot.velocity.dot(direction)
-                if dot_product < 0:
-                    # Robot is moving toward obstacle, stop it
-                    self.robot.velocity = self.robot.velocity - direction * dot_product
+        if not self.obstacles:
+            return
+        points, normals, collided = self._index().resolve_collisions(
+            np.array([self.robot.position.to_tuple()]), clearance=0.01
+        )
+        if not collided[0]:
+            self._in_contact = False
+            return
+        if self.time - self._last_contact > COLLISION_GAP:
+            self.collision_count += 1
+        self._in_contact = True
+        self._last_contact = self.time
+
+        # Move robot out of obstacle
+        self.robot.position = Vector2D(*points[0])
+
+        # Stop robot's movement in the collision direction
+        direction = Vector2D(*normals[0])
+        dot_product = self.robot.velocity.dot(direction)
+        if dot_product < 0:
+            # Robot is moving toward obstacle, stop it
+            self.robot.velocity = self.robot.velocity - direction * dot_product
+
+    @property
+    def in_contact(self) -> bool:
+        """Whether the robot was pushed out of an obstacle in the last update."""
+        return self._in_contact
 
     def add_obstacle(
         self,
@@ -494,11 +532,13 @@ class VirtualWorld:
         """
         with self._lock:
             self.obstacles.append(Obstacle(position, radius, height, obstacle_type))
+            self._obstacle_index = None
 
     def clear_obstacles(self) -> None:
         """Clear all obstacles from the world."""
         with self._lock:
             self.obstacles.clear()
+            self._obstacle_index = None
 
     def get_obstacles_in_range(self, position: Vector2D, max_range: float) -> List[Obstacle]:
         """
@@ -512,11 +552,10 @@ class VirtualWorld:
             List[Obstacle]: List of obstacles within range
         """
         with self._lock:
-            return [
-                obstacle
-                for obstacle in self.obstacles
-                if position.distance_to(obstacle.position) <= max_range + obstacle.radius
-            ]
+            if not self.obstacles:
+                return []
+            indices = self._index().within(position.to_tuple(), max_range)
+            return [self.obstacles[i] for i in indices]
 
     def get_distance_to_nearest_obstacle(
         self,
@@ -530,45 +569,39 @@ class VirtualWorld:
         Args:
             position: Position to check from
             direction: Direction to check in
-            max_range: Maximum range to check        Returns:
+            max_range: Maximum range to check
+
+        Returns:
             Tuple[float, Optional[Obstacle]]: Distance to nearest obstacle and
                 the obstacle itself (or max_range, None if no obstacle found)
         """
         with self._lock:
-            # Normalize direction
-            direction = direction.normalize()
-
-            # Check each obstacle
-            min_distance = max_range
-            nearest_obstacle = None
-
-            for obstacle in self.obstacles:
-                # Vector from position to obstacle
-                to_obstacle = obstacle.position - position
-
-                # Project onto direction
-                projection = to_obstacle.dot(direction)
-
-                # Skip if obstacle is behind us
-                if projection <= 0:
-                    continue
-
-                # Calculate perpendicular distance
-                perpendicular = (to_obstacle - direction * projection).magnitude()
-
-                # Skip if obstacle is too far to the side
-                if perpendicular > obstacle.radius:
-                    continue
-
-                # Calculate distance to edge of obstacle
-                distance = projection - math.sqrt(obstacle.radius**2 - perpendicular**2)
+            distances, hits = self.cast_rays(
+                np.array([position.to_tuple()]), np.array([direction.to_tuple()]), max_range
+            )
+            if hits[0] < 0:
+                return max_range, None
+            return float(distances[0]), self.obstacles[hits[0]]
+
+    def cast_rays(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_range: float = float("inf"),
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cast many rays against all obstacles at once.
 
-                # Update if this is the nearest obstacle
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_obstacle = obstacle
+        Args:
+            origins: Ray origins (R, 2) in meters
+            directions: Ray directions (R, 2)
+            max_range: Distance reported for rays that hit nothing
 
-            return min_distance, nearest_obstacle
+        Returns:
+            Tuple of (distances (R,), index into ``obstacles`` per ray, -1 for a miss)
+        """
+        with self._lock:
+            return self._index().cast_rays(origins, directions, max_range)
 
     def get_robot_state(self) -> Dict[str, Any]:
         """
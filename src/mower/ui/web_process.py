@@ -68,39 +68,45 @@ class SharedFrameCamera:
     
     def get_frame(self):
         """Get the latest frame from the main process."""
-        # Try to read a shared frame
-        frame_bytes = self.frame_sharer.read_frame(timeout=0.5)
-        
-        if frame_bytes is not None:
-            # Decode JPEG to numpy array for compatibility
-            import cv2
-            import numpy as np
-            
-            try:
-                # Decode JPEG bytes to numpy array
-                frame_array = np.frombuffer(frame_bytes, dtype=np.uint8)
-                frame = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
-                
-                if frame is not None:
-                    return frame
-            except Exception as e:
-                self.logger.debug(f"Error decoding shared frame: {e}")
-        
+        # Raw frames come straight from shared memory, no JPEG round trip
+        result = self.frame_sharer.read_raw_frame(timeout=0.5)
+        if result is not None:
+            return result[1]
+
         # Fallback to dummy camera if no shared frame available
         self.logger.debug("No shared frame available, using fallback")
         return self.fallback_camera.get_frame()
-    
+
+    def get_jpeg_frame(self, last_sequence=0, timeout=1.0, quality=None, scale=1.0):
+        """
+        Wait for a frame newer than ``last_sequence`` and return it as JPEG.
+
+        Every viewer shares the same encoded bytes, so each frame is encoded
+        at most once no matter how many streams are open.
+
+        Args:
+            last_sequence: Sequence number of the last frame sent to the client
+            timeout: Maximum time to wait for a new frame in seconds
+            quality: JPEG quality; defaults to the sharer's
+            scale: Downscale factor applied before encoding
+
+        Returns:
+            tuple: (sequence, JPEG bytes or None)
+        """
+        return self.frame_sharer.read_jpeg(
+            timeout=timeout, after_sequence=last_sequence, quality=quality, scale=scale
+        )
+
     def capture_frame(self):
         """Capture a frame and return as JPEG bytes."""
-        # Try to read a shared frame directly as JPEG bytes
-        frame_bytes = self.frame_sharer.read_frame(timeout=0.5)
-        
+        _, frame_bytes = self.frame_sharer.read_jpeg(timeout=0.5)
+
         if frame_bytes is not None:
             return frame_bytes
-        
+
         # Fallback to dummy camera
         return self.fallback_camera.capture_frame()
-    
+
     def get_last_frame(self):
         """Return the last captured frame as JPEG bytes."""
         return self.capture_frame()
@@ -156,13 +162,12 @@ class DummyResourceManager:
         try:
             from mower.hardware.shared_sensor_data import get_shared_sensor_manager
             shared_manager = get_shared_sensor_manager()
-            real_sensor_data_from_json = shared_manager.read_sensor_data() # This now has more logging
+            real_sensor_data = shared_manager.read_sensor_data()
             
-            if real_sensor_data_from_json is not None:
-                self.logger.info("DummyResourceManager:get_sensor_data - Fresh data successfully read from shared storage.")
-                self.logger.debug(f"DummyResourceManager:get_sensor_data - Data from JSON: {real_sensor_data_from_json}")
+            if real_sensor_data is not None:
+                self.logger.debug("DummyResourceManager:get_sensor_data - Fresh data successfully read from shared storage.")
                 # We have fresh real sensor data - transform it to web UI format
-                final_data_for_ui = self._transform_sensor_data_for_web_ui(real_sensor_data_from_json)
+                final_data_for_ui = self._transform_sensor_data_for_web_ui(real_sensor_data)
             else:
                 self.logger.warning("DummyResourceManager:get_sensor_data - No fresh/valid data from shared_manager.read_sensor_data() (returned None). Using N/A fallback.")
         except Exception as e:
@@ -253,7 +258,7 @@ class DummyResourceManager:
             # Add power data from any available source (INA3221 data is in hardware layer)
             if "power" not in transformed_data:
                 # Add default power info if not present
-                self.logger.warning("DummyResourceManager:_transform_sensor_data_for_web_ui - Power key missing in sensor_data from JSON, creating N/A fallback.") # Existing log
+                self.logger.warning("DummyResourceManager:_transform_sensor_data_for_web_ui - Power key missing in shared sensor data, creating N/A fallback.")
                 transformed_data["power"] = {
                     "voltage": "N/A",    # Changed from 12.0
                     "current": "N/A",    # Changed from 1.0
@@ -299,10 +304,12 @@ class DummyResourceManager:
         return 80.0
     
     def get_boundary(self):
-        return []
+        from mower.navigation.geofence import load_boundary
+        return load_boundary()
     
     def get_no_go_zones(self):
-        return []
+        from mower.navigation.geofence import load_no_go_zones
+        return load_no_go_zones()
     
     def get_home_location(self):
         return {"lat": 0.0, "lng": 0.0}
@@ -311,10 +318,14 @@ class DummyResourceManager:
         pass
     
     def save_boundary(self, boundary):
-        pass
+        # Writes the boundary file and invalidates the shared geofence index;
+        # the main controller's index reloads on the file change.
+        from mower.navigation.geofence import save_boundary
+        save_boundary(boundary)
     
     def save_no_go_zones(self, zones):
-        pass
+        from mower.navigation.geofence import save_no_go_zones
+        save_no_go_zones(zones)
     
     def get_mowing_schedule(self):
         return []
@@ -2,6 +2,8 @@
 
 import os
 import sys
+import threading
+import time
 from pathlib import Path
 
 from dotenv import load_dotenv, set_key
@@ -23,11 +25,16 @@ except ImportError:
     Babel = None
 
 # Import data collection integration
+from mower.constants import OBSTACLE_GRID_PATH
 from mower.data_collection.integration import integrate_data_collection
+from mower.navigation.occupancy_grid import OccupancyGrid
 from mower.navigation.path_planner import PatternType
 from mower.ui.web_ui.i18n import init_babel  # Import the babel init function
+from mower.ui.web_ui.map_payloads import ObstacleTiles, PolylineLayer
+from mower.ui.web_ui.mjpeg_broadcaster import MjpegBroadcaster, StreamProfile, raw_frame_source
 from mower.ui.web_ui.simulation_helper import get_simulated_sensor_data
-from mower.utilities.logger_config import LoggerConfigInfo
+from mower.ui.web_ui.telemetry_hub import SENSOR_DEADBANDS, TelemetryHub, run_hub
+from mower.utilities.logger_config import LoggerConfigInfo, rate_limited
 
 # Load environment variables for camera streaming
 load_dotenv()
@@ -87,6 +94,18 @@ def create_app(mower_resource_manager_instance):
         transports=['polling', 'websocket']  # Ensure both transports available for Cloudflare
     )
 
+    def run_blocking(func, *args):
+        """Run a blocking call without stalling the Socket.IO event loop."""
+        if socketio.async_mode == "eventlet":
+            from eventlet import tpool
+
+            return tpool.execute(func, *args)
+        if socketio.async_mode == "gevent":
+            import gevent
+
+            return gevent.get_hub().threadpool.apply(func, args)
+        return func(*args)
+
     # Integrate data collection functionality
     try:
         integrate_data_collection(app, mower_resource_manager_instance)
@@ -214,6 +233,39 @@ def create_app(mower_resource_manager_instance):
         """Render the camera feed page."""
         return render_template("camera.html")
 
+    video_broadcasters = {}
+
+    def _camera_source(camera):
+        """Broadcaster source for whichever frame interface the camera offers."""
+        get_jpeg_frame = getattr(camera, "get_jpeg_frame", None)
+        if callable(get_jpeg_frame):
+            # Shared-frame cameras encode straight from shared memory
+            def shared_source(after_sequence, timeout, profile):
+                sequence, jpeg_bytes = get_jpeg_frame(after_sequence, timeout, profile.quality, profile.scale)
+                if jpeg_bytes is None:
+                    jpeg_bytes = camera.capture_frame()
+                    sequence = after_sequence + 1 if jpeg_bytes is not None else after_sequence
+                return sequence, jpeg_bytes
+
+            return shared_source
+        if callable(getattr(camera, "get_frame", None)):
+            return raw_frame_source(camera.get_frame)
+
+        # Cameras that only hand out JPEG bytes are passed through as is
+        capture = getattr(camera, "capture_frame", None) or camera.get_last_frame
+        sequence = 0
+
+        def jpeg_source(after_sequence, timeout, profile):
+            nonlocal sequence
+            jpeg_bytes = capture()
+            if jpeg_bytes is None:
+                time.sleep(0.1)  # runs on the encoder thread, not the event loop
+                return after_sequence, None
+            sequence += 1
+            return sequence, jpeg_bytes
+
+        return jpeg_source
+
     @app.route("/video_feed")
     def video_feed():
         """Stream camera feed as multipart response."""
@@ -267,76 +319,25 @@ def create_app(mower_resource_manager_instance):
 
                 return Response(generate_test_pattern(), mimetype="multipart/x-mixed-replace; boundary=frame")
 
-            def generate_frames():
-                """Generate camera frames."""
-                # Initialize camera if not already done - prevents double-visit issue
-                if hasattr(camera, 'initialize') and callable(camera.initialize):
-                    try:
-                        if not camera.initialize():
-                            logger.warning("Camera initialization failed, using fallback")
-                    except Exception as e:
-                        logger.error(f"Camera initialization error: {e}")
-                
-                while True:
-                    # Get frame from camera
-                    try:
-                        # Try get_frame() first (returns raw frame)
-                        frame = camera.get_frame()
-                    except (AttributeError, TypeError):
-                        try:
-                            # Fall back to capture_frame() (returns JPEG bytes)
-                            jpeg_bytes = camera.capture_frame()
-                            if jpeg_bytes is None:
-                                continue
-
-                            # If we got JPEG bytes directly, yield them
-                            yield (b"--frame\r\n" b"Content-Type: image/jpeg\r\n\r\n" + jpeg_bytes + b"\r\n")
-
-                            # Use configured FPS timing for JPEG stream
-                            socketio.sleep(FRAME_TIME)
-                            continue
-                        except Exception:
-                            # If both methods fail, try get_last_frame()
-                            try:
-                                jpeg_bytes = camera.get_last_frame()
-                                if jpeg_bytes is None:
-                                    continue
-
-                                # If we got JPEG bytes directly, yield them
-                                yield (b"--frame\r\n" b"Content-Type: image/jpeg\r\n\r\n" + jpeg_bytes + b"\r\n")
-
-                                # Use configured FPS timing for fallback JPEG stream
-                                socketio.sleep(FRAME_TIME)
-                                continue
-                            except Exception:
-                                logger.error("All camera frame methods failed")
-                                socketio.sleep(1)  # Longer delay on error
-                                continue
-
-                    if frame is None:
-                        socketio.sleep(0.1)
-                        continue
-
-                    # Convert frame to JPEG
-                    try:
-                        import cv2
-
-                        # Encode to JPEG with configurable quality for better image clarity
-                        # Higher JPEG quality reduces pixelation at the cost of bandwidth
-                        _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
-                        frame_bytes = buffer.tobytes()
-
-                        # Yield the frame in multipart response
-                        yield (b"--frame\r\n" b"Content-Type: image/jpeg\r\n\r\n" + frame_bytes + b"\r\n")
-
-                        # Use configured FPS timing from environment
-                        socketio.sleep(FRAME_TIME)
-                    except Exception as e:
-                        logger.error(f"Error encoding frame: {e}")
-                        socketio.sleep(0.5)  # Delay on error
+            # Initialize camera if not already done - prevents double-visit issue
+            if hasattr(camera, 'initialize') and callable(camera.initialize):
+                try:
+                    if not camera.initialize():
+                        logger.warning("Camera initialization failed, using fallback")
+                except Exception as e:
+                    logger.error(f"Camera initialization error: {e}")
 
+            # One encoder per camera serves every open stream
+            broadcaster = video_broadcasters.get(id(camera))
+            if broadcaster is None:
+                broadcaster = MjpegBroadcaster(
+                    _camera_source(camera), StreamProfile(fps=STREAMING_FPS, quality=JPEG_QUALITY)
+                )
+                video_broadcasters.clear()
+                video_broadcasters[id(camera)] = broadcaster
+            viewer = broadcaster.subscribe()
             return Response(
-                generate_frames(),
+                broadcaster.stream(viewer, wait=run_blocking),
                 mimetype="multipart/x-mixed-replace; boundary=frame",
             )
 
@@ -469,17 +470,128 @@ def create_app(mower_resource_manager_instance):
             logger.error(f"Failed to save mowing area: {e}")
             return jsonify({"success": False, "error": str(e)}), 500
 
+    # Map layers served as encoded polylines with incremental updates (see map_payloads)
+    map_layers = {"path": PolylineLayer("path"), "trace": PolylineLayer("trace")}
+
+    def _refresh_path_layer():
+        path_planner = mower.get_path_planner()
+        map_layers["path"].replace(getattr(path_planner, "current_path", None) or [])
+        return map_layers["path"]
+
+    def _not_modified(etag):
+        if etag in request.headers.get("If-None-Match", ""):
+            response = make_response("", 304)
+            response.headers["ETag"] = etag
+            return response
+        return None
+
+    def _layer_response(layer):
+        """Polyline payload; ``?since=N&generation=G`` returns only the points appended after N."""
+        etag = layer.etag()
+        cached = _not_modified(etag)
+        if cached is not None:
+            return cached
+        response = jsonify(
+            {"success": True, **layer.payload(request.args.get("since", type=int), request.args.get("generation"))}
+        )
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
     @app.route("/api/get-path", methods=["GET"])
     def get_current_path():
-        """Get the current planned path."""
+        """Get the current planned path; ``?format=polyline`` for the compact form."""
         try:
+            layer = _refresh_path_layer()
+            if request.args.get("format") == "polyline":
+                return _layer_response(layer)
+            etag = layer.etag()
+            cached = _not_modified(etag)
+            if cached is not None:
+                return cached
             path_planner = mower.get_path_planner()
             path = path_planner.current_path
-            return jsonify({"success": True, "path": path})
+            response = jsonify({"success": True, "path": path})
+            response.headers["ETag"] = etag
+            return response
         except Exception as e:
             logger.error(f"Failed to get path: {e}")
             return jsonify({"success": False, "error": str(e)}), 500
 
+    @app.route("/api/map/<layer_name>", methods=["GET"])
+    def get_map_layer(layer_name):
+        """Planned path or position trace as an encoded polyline."""
+        try:
+            if layer_name == "path":
+                return _layer_response(_refresh_path_layer())
+            if layer_name in map_layers:
+                return _layer_response(map_layers[layer_name])
+            return jsonify({"success": False, "error": f"Unknown map layer: {layer_name}"}), 404
+        except Exception as e:
+            logger.error(f"Failed to get map layer {layer_name}: {e}")
+            return jsonify({"success": False, "error": str(e)}), 500
+
+    grid_file = {"stamp": None, "grid": None}
+
+    def _persisted_grid():
+        """The main process's grid file mapped read-only, reopened when it is recreated."""
+        path = str(OBSTACLE_GRID_PATH)
+        try:
+            stat = os.stat(path + ".json")
+        except OSError:
+            return None
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if grid_file["stamp"] != stamp:
+            try:
+                grid_file["grid"] = OccupancyGrid.open_read_only(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not open occupancy grid {path}: {e}")
+                grid_file["grid"] = None
+            grid_file["stamp"] = stamp
+        return grid_file["grid"]
+
+    def _obstacle_tiles():
+        grid = getattr(mower.get_path_planner(), "occupancy_grid", None)
+        if grid is None:
+            # The web UI runs in its own process; serve the grid the main process persists
+            grid = _persisted_grid()
+        return ObstacleTiles(grid) if grid is not None else None
+
+    @app.route("/api/map/obstacles", methods=["GET"])
+    def get_obstacle_tile_index():
+        """Occupancy grid metadata and the ETag of every non-empty tile."""
+        try:
+            tiles = _obstacle_tiles()
+            if tiles is None:
+                return jsonify({"success": True, "tiles": []})
+            return jsonify({"success": True, **tiles.index()})
+        except Exception as e:
+            logger.error(f"Failed to get obstacle tile index: {e}")
+            return jsonify({"success": False, "error": str(e)}), 500
+
+    @app.route("/api/map/obstacles/<int:row>/<int:col>", methods=["GET"])
+    def get_obstacle_tile(row, col):
+        """One occupancy tile: deflated uint8 probabilities (0-255), row 0 south."""
+        try:
+            tiles = _obstacle_tiles()
+            if tiles is None:
+                return jsonify({"success": False, "error": "No occupancy grid"}), 404
+            data, etag, shape = tiles.tile(row, col)
+        except IndexError as e:
+            return jsonify({"success": False, "error": str(e)}), 404
+        except Exception as e:
+            logger.error(f"Failed to get obstacle tile ({row}, {col}): {e}")
+            return jsonify({"success": False, "error": str(e)}), 500
+        cached = _not_modified(etag)
+        if cached is not None:
+            return cached
+        response = make_response(data)
+        response.headers["Content-Type"] = "application/octet-stream"
+        response.headers["Content-Encoding"] = "deflate"
+        response.headers["ETag"] = etag
+        response.headers["X-Tile-Shape"] = f"{shape[0]}x{shape[1]}"
+        return response
+
     @app.route("/api/home", methods=["GET"])
     def get_home():
         """Get the home location."""
@@ -683,12 +795,10 @@ def create_app(mower_resource_manager_instance):
     def handle_connect(auth=None):
         """Handle client connection."""
         logger.info("Client connected")
+        telemetry_hub.connect(request.sid)
         try:
             emit("status_update", mower.get_status())
-            # Use the path_planner directly instead of calling
-            # get_current_path()
-            path_planner = mower.get_path_planner()
-            emit("path_update", path_planner.current_path)
+            emit("path_update", _refresh_path_layer().payload())
         except Exception as e:
             logger.error(f"Error in handle_connect: {e}")
 
@@ -696,6 +806,7 @@ def create_app(mower_resource_manager_instance):
     def handle_disconnect():
         """Handle client disconnection."""
         logger.info("Client disconnected from web interface")
+        telemetry_hub.disconnect(request.sid)
 
     @socketio.on("request_data")
     def handle_data_request(data):
@@ -821,12 +932,11 @@ def create_app(mower_resource_manager_instance):
             )
 
     @socketio.on("request_path_update")
-    def handle_path_update():
-        """Send current path to client."""
+    def handle_path_update(data=None):
+        """Send the current path; {"since": N, "generation": G} sends only appended points."""
         try:
-            path_planner = mower.get_path_planner()
-            path = path_planner.current_path
-            emit("path_update", path)
+            data = data or {}
+            emit("path_update", _refresh_path_layer().payload(data.get("since"), data.get("generation")))
         except Exception as e:
             logger.error(f"Error sending path update: {e}")
 
@@ -837,112 +947,108 @@ def create_app(mower_resource_manager_instance):
         error_msg = error_data.get("message")
         logger.error(
             "Error received from client - Type: {}, Message: {}".format(error_type, error_msg)
-        )  # Background task for sending updates
+        )
 
-    def send_updates():
-        """Send periodic updates to connected clients."""
-        logger.info("Starting send_updates background task.")
-        while True:
-            try:
-                socketio.sleep(0.1)  # 100ms interval
-                logger.debug("send_updates loop running.")
+    def read_status():
+        try:
+            return mower.get_status()
+        except Exception as e:
+            logger.error("Error getting mower status: %s", e, extra=rate_limited(10.0))
+            return {"state": "error", "initialized": False, "resources_available": [], "error": str(e)}
+
+    def _sensor_interface():
+        sensor_interface = mower.get_sensor_interface()
+        if (
+            sensor_interface
+            and hasattr(sensor_interface, "get_safety_status")
+            and hasattr(sensor_interface, "get_sensor_data")
+        ):
+            return sensor_interface
+        return mower  # DummyResourceManager reads the shared sensor snapshot
+
+    def read_safety():
+        try:
+            if USE_SIMULATION:
+                return get_simulated_sensor_data().get("imu", {}).get("safety_status", {"is_safe": True})
+            return _sensor_interface().get_safety_status()
+        except Exception as e:
+            logger.error("App.py:read_safety - Error getting safety status: %s", e, extra=rate_limited(10.0))
+            return {"is_safe": True, "error": str(e), "source": "app.py_exception_fallback"}
 
-                # Get status data
-                try:
-                    status = mower.get_status()
-                except Exception as e:
-                    logger.error(f"Error getting mower status: {e}")
-                    status = {"state": "error", "initialized": False, "resources_available": [], "error": str(e)}
+    def read_sensors():
+        try:
+            if USE_SIMULATION:
+                sensor_data = get_simulated_sensor_data()
+            else:
+                sensor_data = _sensor_interface().get_sensor_data()
+            logger.debug("App.py:read_sensors - Sensor data: %s", sensor_data, extra=rate_limited(5.0))
+        except Exception as e:
+            logger.error(
+                "App.py:read_sensors - Error getting sensor data: %s", e, exc_info=True, extra=rate_limited(10.0)
+            )
+            # Provide fallback sensor data instead of empty dict
+            return {
+                "imu": {
+                    "heading": 0.0,
+                    "roll": 0.0,
+                    "pitch": 0.0,
+                    "safety_status": {
+                        "emergency_stop_active": False,
+                        "obstacle_detected_nearby": False,
+                        "low_battery_warning": False,
+                        "system_error": True,
+                    },
+                    "error": str(e),
+                },
+                "environment": {"temperature": 20.0, "humidity": 50.0, "pressure": 1013.25, "error": str(e)},
+                "tof": {"left": 100.0, "right": 100.0, "error": str(e)},
+                "power": {
+                    "voltage": 12.0,
+                    "current": 1.0,
+                    "power": 12.0,
+                    "percentage": 80.0,
+                    "status": "Error - using fallback data",
+                    "error": str(e),
+                },
+            }
 
-                # Get safety status - use real or simulated based on mode
-                try:
-                    if USE_SIMULATION:
-                        sim_data = get_simulated_sensor_data()
-                        safety_status = sim_data.get("imu", {}).get("safety_status", {"is_safe": True})
-                        sensor_data = sim_data
-                    else:
-                        logger.debug("Not in simulation mode, getting real sensor data...")
-                        sensor_interface = mower.get_sensor_interface()
-                        logger.debug(f"APP.PY send_updates: Retrieved sensor_interface: {sensor_interface}")
-                        if (
-                            sensor_interface
-                            and hasattr(sensor_interface, "get_safety_status")
-                            and hasattr(sensor_interface, "get_sensor_data")
-                        ):
-                            logger.debug("Using sensor_interface for data collection...")
-                            safety_status = sensor_interface.get_safety_status()
-                            sensor_data = sensor_interface.get_sensor_data()
-                        else:
-                            logger.debug(
-                                "App.py:send_updates - Using mower (DummyResourceManager) methods for data collection."
-                            )
-                            safety_status = mower.get_safety_status()  # This calls DummyRM.get_safety_status
-                            sensor_data = mower.get_sensor_data()  # This calls DummyRM.get_sensor_data which reads JSON
-                        logger.info(f"App.py:send_updates - Data fetched by DummyResourceManager: {sensor_data}")
-                except Exception as e:
-                    logger.error(
-                        f"App.py:send_updates - Error getting safety or sensor data via DummyResourceManager: {e}",
-                        exc_info=True,
-                    )
-                    safety_status = {"is_safe": True, "error": str(e), "source": "app.py_exception_fallback"}
-                    # Provide fallback sensor data instead of empty dict
-                    sensor_data = {
-                        "imu": {
-                            "heading": 0.0,
-                            "roll": 0.0,
-                            "pitch": 0.0,
-                            "safety_status": {
-                                "emergency_stop_active": False,
-                                "obstacle_detected_nearby": False,
-                                "low_battery_warning": False,
-                                "system_error": True,
-                            },
-                            "error": str(e),
-                        },
-                        "environment": {"temperature": 20.0, "humidity": 50.0, "pressure": 1013.25, "error": str(e)},
-                        "tof": {"left": 100.0, "right": 100.0, "error": str(e)},
-                        "power": {
-                            "voltage": 12.0,
-                            "current": 1.0,
-                            "power": 12.0,
-                            "percentage": 80.0,
-                            "status": "Error - using fallback data",
-                            "error": str(e),
-                        },
-                    }
-
-                # Ensure sensor_data is never empty
-                if not sensor_data:
-                    logger.warning("Sensor data is empty, providing minimal fallback...")
-                    sensor_data = {
-                        "imu": {"heading": 1000, "roll": 88.8, "pitch": 88.8},
-                        "environment": {"temperature": 203.0, "humidity": 150.0, "pressure": 0.25},
-                        "tof": {"left": 1080.0, "right": 1080.0},
-                        "power": {"voltage": 50.0, "current": 450.0, "power": 150.0, "percentage": 800.0},
-                    }
-
-                # Always emit valid data
-                try:
-                    socketio.emit("status_update", status)
-                except Exception as e:
-                    logger.error(f"Error emitting status_update: {e}")
-                try:
-                    socketio.emit("safety_status", safety_status)
-                except Exception as e:
-                    logger.error(f"Error emitting safety_status: {e}")
-                try:
-                    logger.info(f"App.py:send_updates - Emitting sensor_data via SocketIO: {sensor_data}")
-                    socketio.emit("sensor_data", sensor_data)
-                    # logger.debug(f"Emitted sensor_data: {sensor_data}") # Redundant with info log
-                except Exception as e:
-                    logger.error(f"App.py:send_updates - Error emitting sensor_data via SocketIO: {e}", exc_info=True)
+        gps = sensor_data.get("gps") if isinstance(sensor_data, dict) else None
+        if isinstance(gps, dict) and gps.get("status") == "valid" and gps.get("latitude") is not None:
+            # Roughly 0.2 m between trace points
+            map_layers["trace"].append((gps["latitude"], gps["longitude"]), min_spacing_deg=2e-6)
+
+        # Ensure sensor_data is never empty
+        if not sensor_data:
+            logger.warning("Sensor data is empty, providing minimal fallback...", extra=rate_limited(10.0))
+            sensor_data = {
+                "imu": {"heading": 1000, "roll": 88.8, "pitch": 88.8},
+                "environment": {"temperature": 203.0, "humidity": 150.0, "pressure": 0.25},
+                "tof": {"left": 1080.0, "right": 1080.0},
+                "power": {"voltage": 50.0, "current": 450.0, "power": 150.0, "percentage": 800.0},
+            }
+        return sensor_data
 
-            except Exception as e:
-                logger.error(f"App.py:send_updates - Error in update loop: {e}", exc_info=True)
-                socketio.sleep(1)  # Wait longer on error
+    # Updates are published per client, only when something changed (see telemetry_hub)
+    telemetry_hub = TelemetryHub(
+        lambda event, payload, sid: socketio.emit(event, payload, to=sid),
+        event_factory=getattr(socketio.server.eio, "create_event", threading.Event),
+    )
+    telemetry_hub.add_topic("status", read_status, max_rate_hz=5, default_rate_hz=2)
+    telemetry_hub.add_topic("safety", read_safety, max_rate_hz=10)
+    telemetry_hub.add_topic("sensors", read_sensors, max_rate_hz=10, default_rate_hz=5, deadbands=SENSOR_DEADBANDS)
+    app.telemetry_hub = telemetry_hub
+
+    @socketio.on("subscribe_telemetry")
+    def handle_subscribe_telemetry(data):
+        """Set this client's telemetry topics and rates, e.g. {"topics": {"sensors": 2}}; {} restores the defaults."""
+        topics = (data or {}).get("topics")
+        if isinstance(topics, dict):
+            telemetry_hub.subscribe(request.sid, topics)
+        else:
+            telemetry_hub.connect(request.sid)
 
     if not hasattr(app, "update_thread_started") or not app.update_thread_started:
-        socketio.start_background_task(send_updates)
+        socketio.start_background_task(run_hub, telemetry_hub, socketio.sleep)
         app.update_thread_started = True
 
     return app, socketio
@@ -995,9 +1101,4 @@ if __name__ == "__main__":
     mower = ResourceManager()
     app, socketio = create_app(mower)
 
-    # Start the background task only if it's not already running
-    if not hasattr(app, "update_thread_started") or not app.update_thread_started:
-        socketio.start_background_task(send_updates)
-        app.update_thread_started = True
-
     socketio.run(app, host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,279 @@
+"""
+Compact map payloads for the web UI.
+
+Planned paths and position traces are sent as encoded polylines (the
+Google polyline algorithm, at ``PRECISION`` decimal places) instead of
+JSON lists of float pairs, which is several times smaller. Each layer
+carries a ``generation`` that changes when the line is replaced and a
+``version`` that counts its points, so a client that already has version
+N of a generation asks for the points appended since then only. ETags
+built from the same pair let unchanged layers answer 304.
+
+Occupancy grids are served as tiles of ``TILE_CELLS`` x ``TILE_CELLS``
+cells with probabilities quantized to one byte, deflate-compressed. The
+tile index lists an ETag per non-empty tile so clients refetch only tiles
+that changed. Evidence decay is applied at time steps of
+1/``TILE_DECAY_STEPS`` of the grid's half-life rather than at request
+time, so a tile's bytes and ETag change when its cells are updated or at
+the next decay step, not on every request.
+"""
+
+import math
+import secrets
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PRECISION = 6  # ~0.1 m in latitude
+TILE_CELLS = 64
+TILE_DECAY_STEPS = 10  # decay is re-applied to served tiles this often per half-life
+
+
+def encode_polyline(points: Sequence[Tuple[float, float]], precision: int = PRECISION) -> str:
+    """
+    Encode (lat, lon) points with the Google polyline algorithm.
+
+    Args:
+        points: (lat, lon) pairs
+        precision: Decimal places kept (5 in Google's format, 6 in OSRM's)
+
+    Returns:
+        str: Encoded polyline
+    """
+    coords = np.asarray(points, dtype=float).reshape(-1, 2)
+    if not len(coords):
+        return ""
+    scaled = np.round(coords * 10**precision).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    values = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+
+    # Split each value into 5-bit chunks, low bits first; every chunk but the
+    # last of a value carries the 0x20 continuation bit
+    shifts = np.arange(7, dtype=np.int64) * 5
+    chunks = (values[:, None] >> shifts) & 0x1F
+    counts = 1 + (values[:, None] >= (np.int64(1) << shifts[1:])).sum(axis=1)
+    used = np.arange(7) < counts[:, None]
+    more = np.arange(7) < (counts[:, None] - 1)
+    chars = (chunks | np.where(more, 0x20, 0)) + 63
+    return chars[used].astype(np.uint8).tobytes().decode("ascii")
+
+
+def decode_polyline(encoded: str, precision: int = PRECISION) -> np.ndarray:
+    """
+    Decode a polyline produced by ``encode_polyline``.
+
+    Returns:
+        np.ndarray: (N, 2) array of (lat, lon)
+    """
+    data = np.frombuffer(encoded.encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+    if not len(data):
+        return np.empty((0, 2))
+    ends = np.flatnonzero((data & 0x20) == 0)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    position = np.arange(len(data)) - np.repeat(starts, ends - starts + 1)
+    value_index = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    values = np.zeros(len(ends), dtype=np.int64)
+    np.add.at(values, value_index, (data & 0x1F) << (position * 5))
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+    return np.cumsum(deltas.reshape(-1, 2), axis=0) / 10**precision
+
+
+class PolylineLayer:
+    """A line that is replaced or grown, served in full or as appended points."""
+
+    def __init__(self, name: str, precision: int = PRECISION):
+        self.name = name
+        self.precision = precision
+        self.generation = secrets.token_hex(4)
+        self._points: List[Tuple[float, float]] = []
+        self._encoded: Optional[Tuple[int, str]] = None  # (version, full polyline)
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return len(self._points)
+
+    def _key(self, point) -> Tuple[int, int]:
+        scale = 10**self.precision
+        return round(float(point[0]) * scale), round(float(point[1]) * scale)
+
+    def replace(self, points: Sequence[Tuple[float, float]]) -> bool:
+        """
+        Set the whole line, e.g. a newly planned path.
+
+        Points that only extend the current line keep the generation, so
+        clients just fetch the tail.
+
+        Returns:
+            bool: True if the layer changed
+        """
+        points = [(float(p[0]), float(p[1])) for p in points]
+        with self._lock:
+            current = self._points
+            if len(points) >= len(current) and all(
+                self._key(a) == self._key(b) for a, b in zip(points, current)
+            ):
+                if len(points) == len(current):
+                    return False
+                self._points = current + points[len(current):]
+            else:
+                self.generation = secrets.token_hex(4)
+                self._points = points
+                self._encoded = None
+            return True
+
+    def append(self, point: Tuple[float, float], min_spacing_deg: float = 0.0) -> bool:
+        """
+        Add a point, skipping it if it is within ``min_spacing_deg`` of the last one.
+
+        Returns:
+            bool: True if the point was added
+        """
+        with self._lock:
+            if self._points and min_spacing_deg > 0:
+                last = self._points[-1]
+                if abs(point[0] - last[0]) <= min_spacing_deg and abs(point[1] - last[1]) <= min_spacing_deg:
+                    return False
+            self._points.append((float(point[0]), float(point[1])))
+            return True
+
+    def clear(self):
+        self.replace([])
+
+    def etag(self) -> str:
+        return f'W/"{self.name}-{self.generation}-{self.version}"'
+
+    def payload(self, since: Optional[int] = None, generation: Optional[str] = None) -> Dict[str, Any]:
+        """
+        The layer for a client that has ``since`` points of ``generation``.
+
+        Args:
+            since: Points the client already has; None for the full line
+            generation: Generation those points belong to
+
+        Returns:
+            dict: ``points`` holds the polyline of the points after ``since``
+            (absolute coordinates); ``since`` is 0 when the full line is sent
+        """
+        with self._lock:
+            points = self._points
+            version = len(points)
+            if since is None or generation != self.generation or not 0 <= since <= version:
+                since = 0
+            if since == 0:
+                if self._encoded is None or self._encoded[0] != version:
+                    self._encoded = (version, encode_polyline(points, self.precision))
+                encoded = self._encoded[1]
+            else:
+                encoded = encode_polyline(points[since:], self.precision)
+            return {
+                "layer": self.name,
+                "encoding": f"polyline{self.precision}",
+                "generation": self.generation,
+                "version": version,
+                "since": since,
+                "points": encoded,
+            }
+
+
+class ObstacleTiles:
+    """Quantized, compressed tiles of an occupancy grid."""
+
+    def __init__(self, grid, tile_cells: int = TILE_CELLS):
+        """
+        Initialize the tiler.
+
+        Args:
+            grid: ``OccupancyGrid`` to serve
+            tile_cells: Tile edge length in cells
+        """
+        self.grid = grid
+        self.tile_cells = tile_cells
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Number of tile rows and columns."""
+        return -(-self.grid.rows // self.tile_cells), -(-self.grid.cols // self.tile_cells)
+
+    def _decay_time(self, now: Optional[float]) -> float:
+        """``now`` rounded down to the last decay step."""
+        now = time.time() if now is None else now
+        half_life = self.grid.decay_half_life
+        if not half_life:
+            return now
+        step = half_life / TILE_DECAY_STEPS
+        return math.floor(now / step) * step
+
+    def _cell_range(self, row: int, col: int) -> Tuple[int, int, int, int]:
+        size = self.tile_cells
+        r0, c0 = row * size, col * size
+        return r0, c0, min(r0 + size, self.grid.rows), min(c0 + size, self.grid.cols)
+
+    def _bounds(self, row: int, col: int) -> Optional[List[List[float]]]:
+        """[[south, west], [north, east]] of a tile in lat/lon, or None without a UTM zone."""
+        if not self.grid.zone:
+            return None
+        r0, c0, r1, c1 = self._cell_range(row, col)
+        resolution = self.grid.resolution
+        lats, lons = self.grid.local_to_latlon(
+            [self.grid.origin_e + c0 * resolution, self.grid.origin_e + c1 * resolution],
+            [self.grid.origin_n + r0 * resolution, self.grid.origin_n + r1 * resolution],
+        )
+        return [[float(lats[0]), float(lons[0])], [float(lats[1]), float(lons[1])]]
+
+    def _quantized(self, row: int, col: int, now: float) -> np.ndarray:
+        r0, c0, r1, c1 = self._cell_range(row, col)
+        min_e, min_n = self.grid.cell_center(r0, c0)
+        max_e, max_n = self.grid.cell_center(r1 - 1, c1 - 1)
+        probabilities = self.grid.region(float(min_e), float(min_n), float(max_e), float(max_n), now)
+        return np.round(probabilities * 255).astype(np.uint8)
+
+    @staticmethod
+    def _etag(cells: np.ndarray) -> str:
+        return f'"{zlib.crc32(cells.tobytes()):08x}"'
+
+    def index(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Grid metadata and the ETag of every tile with any known cell.
+
+        Tiles that are entirely unknown (probability 0.5) are left out. Each
+        entry carries the tile's lat/lon ``bounds`` when the grid has a UTM zone.
+        """
+        tiles = []
+        unknown = 128
+        now = self._decay_time(now)
+        tile_rows, tile_cols = self.shape
+        for row in range(tile_rows):
+            for col in range(tile_cols):
+                cells = self._quantized(row, col, now)
+                if (cells != unknown).any():
+                    tiles.append(
+                        {"row": row, "col": col, "etag": self._etag(cells), "bounds": self._bounds(row, col)}
+                    )
+        return {
+            "origin": [self.grid.origin_e, self.grid.origin_n],
+            "resolution": self.grid.resolution,
+            "zone": list(self.grid.zone) if self.grid.zone else None,
+            "cells": [self.grid.rows, self.grid.cols],
+            "tile_cells": self.tile_cells,
+            "tiles": tiles,
+        }
+
+    def tile(self, row: int, col: int, now: Optional[float] = None) -> Tuple[bytes, str, Tuple[int, int]]:
+        """
+        One tile as deflate-compressed uint8 probabilities (0-255), row 0 south.
+
+        Returns:
+            tuple: (compressed bytes, ETag, (rows, cols) of the tile)
+
+        Raises:
+            IndexError: If the tile is outside the grid
+        """
+        tile_rows, tile_cols = self.shape
+        if not (0 <= row < tile_rows and 0 <= col < tile_cols):
+            raise IndexError(f"tile ({row}, {col}) outside {tile_rows}x{tile_cols}")
+        cells = self._quantized(row, col, self._decay_time(now))
+        return zlib.compress(cells.tobytes(), 6), self._etag(cells), cells.shape
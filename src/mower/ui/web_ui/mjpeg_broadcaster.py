@@ -0,0 +1,282 @@
+"""
+Single-encoder MJPEG fan-out for ``/video_feed``.
+
+One encoder thread per camera turns frames into JPEG bytes and hands the
+same bytes to every viewer. Each viewer has a one-frame queue: a viewer
+that cannot keep up skips to the newest frame instead of slowing the
+encoder or the other viewers. The thread starts with the first viewer and
+exits when the last one leaves, so nothing is encoded while nobody watches.
+
+Frame rate, JPEG quality and resolution step down a ``STREAM_LADDER`` as
+CPU load and the number of viewers (upstream bandwidth) grow, and step
+back up when they fall, re-evaluated every ``adapt_interval`` seconds.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from mower.utilities.logger_config import LoggerConfigInfo, rate_limited
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+MULTIPART_BOUNDARY = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+
+
+@dataclass(frozen=True)
+class StreamProfile:
+    """How frames are encoded for the stream."""
+
+    fps: float
+    quality: int
+    scale: float = 1.0
+
+
+# (fps factor, quality offset, scale) per degradation level
+STREAM_LADDER = [
+    (1.0, 0, 1.0),
+    (0.66, -10, 1.0),
+    (0.5, -20, 0.75),
+    (0.33, -30, 0.5),
+]
+MIN_FPS = 2.0
+MIN_QUALITY = 40
+
+
+def cpu_load() -> float:
+    """One-minute load average per core (1.0 = all cores busy)."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+def choose_profile(base: StreamProfile, viewers: int, load: float) -> StreamProfile:
+    """
+    Profile for the current viewer count and CPU load.
+
+    Args:
+        base: Profile used with one viewer on an idle system
+        viewers: Connected viewers
+        load: Load per core, as returned by ``cpu_load``
+
+    Returns:
+        StreamProfile: ``base`` stepped down the ladder
+    """
+    level = 0
+    if load > 0.9:
+        level += 2
+    elif load > 0.7:
+        level += 1
+    if viewers > 2:
+        level += 1
+    fps_factor, quality_offset, scale = STREAM_LADDER[min(level, len(STREAM_LADDER) - 1)]
+    return StreamProfile(
+        fps=max(MIN_FPS, base.fps * fps_factor),
+        quality=max(MIN_QUALITY, base.quality + quality_offset),
+        scale=min(base.scale, scale),
+    )
+
+
+def encode_jpeg(frame: np.ndarray, profile: StreamProfile) -> Optional[bytes]:
+    """Encode a BGR frame at the profile's quality and scale."""
+    if profile.scale < 1.0:
+        height, width = frame.shape[:2]
+        size = (max(1, int(width * profile.scale)), max(1, int(height * profile.scale)))
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, int(profile.quality)])
+    return buffer.tobytes() if ok else None
+
+
+def raw_frame_source(get_frame: Callable[[], Optional[np.ndarray]]):
+    """
+    Adapt a camera that returns raw frames to a broadcaster source.
+
+    Args:
+        get_frame: Returns the newest BGR frame or None
+
+    Returns:
+        callable: ``source(after_sequence, timeout, profile)`` for ``MjpegBroadcaster``
+    """
+    sequence = 0
+
+    def source(after_sequence: int, timeout: float, profile: StreamProfile) -> Tuple[int, Optional[bytes]]:
+        nonlocal sequence
+        frame = get_frame()
+        if frame is None:
+            time.sleep(min(timeout, 0.1))
+            return after_sequence, None
+        sequence += 1
+        return sequence, encode_jpeg(frame, profile)
+
+    return source
+
+
+class MjpegViewer:
+    """One connected viewer: holds at most ``max_frames`` unsent frames."""
+
+    def __init__(self, max_frames: int = 1):
+        self._frames: Deque[bytes] = deque(maxlen=max_frames)
+        self._cond = threading.Condition()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    def put(self, jpeg: bytes):
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1  # viewer is behind: replace its oldest frame
+            self._frames.append(jpeg)
+            self._cond.notify()
+
+    def get(self, timeout: float = 1.0) -> Optional[bytes]:
+        """Next frame, or None after ``timeout`` or once closed."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frames or self.closed, timeout)
+            if not self._frames:
+                return None
+            self.sent += 1
+            return self._frames.popleft()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class MjpegBroadcaster:
+    """Encodes a camera's frames once and fans them out to all viewers."""
+
+    def __init__(
+        self,
+        source: Callable[[int, float, StreamProfile], Tuple[int, Optional[bytes]]],
+        base_profile: StreamProfile,
+        load: Callable[[], float] = cpu_load,
+        adapt_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            source: ``source(after_sequence, timeout, profile)`` waits for a
+                frame newer than ``after_sequence`` and returns
+                ``(sequence, JPEG bytes or None)`` encoded for ``profile``
+            base_profile: Profile with one viewer on an idle system
+            load: CPU load per core
+            adapt_interval: Seconds between profile re-evaluations
+            clock: Monotonic time source
+            sleep: Sleep used to pace the encoder thread
+        """
+        self.source = source
+        self.base_profile = base_profile
+        self.load = load
+        self.adapt_interval = adapt_interval
+        self.clock = clock
+        self.sleep = sleep
+
+        self.profile = base_profile
+        self._viewers: List[MjpegViewer] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._last_adapt = float("-inf")
+        self.frames_encoded = 0
+
+    @property
+    def viewer_count(self) -> int:
+        return len(self._viewers)
+
+    def subscribe(self, max_frames: int = 1) -> MjpegViewer:
+        """Add a viewer, starting the encoder thread if it is not running."""
+        viewer = MjpegViewer(max_frames)
+        with self._lock:
+            self._viewers.append(viewer)
+            self._last_adapt = float("-inf")  # re-evaluate for the new count
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mjpeg-encoder", daemon=True)
+                self._thread.start()
+        return viewer
+
+    def unsubscribe(self, viewer: MjpegViewer):
+        """Remove a viewer; the encoder thread exits after the last one."""
+        viewer.close()
+        with self._lock:
+            if viewer in self._viewers:
+                self._viewers.remove(viewer)
+                self._last_adapt = float("-inf")
+
+    def stream(self, viewer: MjpegViewer, wait: Optional[Callable[[Callable, float], Optional[bytes]]] = None):
+        """
+        Multipart chunks for one viewer; unsubscribes when the response closes.
+
+        Args:
+            viewer: Viewer returned by ``subscribe``
+            wait: ``wait(viewer.get, timeout)``; pass the server's blocking-call
+                helper so waiting does not stall an eventlet/gevent hub
+        """
+        try:
+            while not viewer.closed:
+                jpeg = wait(viewer.get, 1.0) if wait else viewer.get(1.0)
+                if jpeg is not None:
+                    yield MULTIPART_BOUNDARY + jpeg + b"\r\n"
+        finally:
+            self.unsubscribe(viewer)
+
+    def _adapt(self) -> StreamProfile:
+        now = self.clock()
+        if now - self._last_adapt >= self.adapt_interval:
+            self._last_adapt = now
+            profile = choose_profile(self.base_profile, self.viewer_count, self.load())
+            if profile != self.profile:
+                logger.info(
+                    "Video stream: %d viewer(s), %.0f fps, quality %d, scale %.2f",
+                    self.viewer_count,
+                    profile.fps,
+                    profile.quality,
+                    profile.scale,
+                )
+                self.profile = profile
+        return self.profile
+
+    def _run(self):
+        sequence = 0
+        while True:
+            with self._lock:
+                viewers = list(self._viewers)
+                if not viewers:
+                    self._thread = None
+                    return
+            profile = self._adapt()
+            started = self.clock()
+            try:
+                new_sequence, jpeg = self.source(sequence, 1.0, profile)
+            except Exception as e:
+                logger.error("Video source failed: %s", e, extra=rate_limited(10.0))
+                self.sleep(0.5)
+                continue
+            if jpeg is None or new_sequence == sequence:
+                continue
+            sequence = new_sequence
+            self.frames_encoded += 1
+            for viewer in viewers:
+                viewer.put(jpeg)
+            remaining = 1.0 / profile.fps - (self.clock() - started)
+            if remaining > 0:
+                self.sleep(remaining)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            viewers = list(self._viewers)
+        return {
+            "viewers": len(viewers),
+            "frames_encoded": self.frames_encoded,
+            "profile": {"fps": self.profile.fps, "quality": self.profile.quality, "scale": self.profile.scale},
+            "dropped": sum(viewer.dropped for viewer in viewers),
+        }
@@ -249,6 +249,9 @@ function setupSocketConnection() {
     }
   });
 
+  // Merge delta-encoded telemetry into the handlers below
+  setupTelemetry(socket);
+
   // Connection established
   socket.on("connect", function () {
     isConnected = true;
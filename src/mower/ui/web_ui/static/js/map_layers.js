@@ -0,0 +1,173 @@
+/**
+ * Clients for the compact map layers served by /api/map/<layer>
+ * (see map_payloads.py): decodes encoded polylines and keeps each layer up
+ * to date by asking only for the points appended since the last fetch, and
+ * keeps the obstacle tiles of /api/map/obstacles up to date by refetching
+ * only the tiles whose ETag changed.
+ */
+
+function decodePolyline(encoded, precision) {
+  const factor = Math.pow(10, precision === undefined ? 6 : precision);
+  const points = [];
+  let index = 0;
+  let lat = 0;
+  let lng = 0;
+
+  function nextValue() {
+    let result = 0;
+    let shift = 0;
+    let byte;
+    do {
+      byte = encoded.charCodeAt(index++) - 63;
+      result |= (byte & 0x1f) << shift;
+      shift += 5;
+    } while (byte >= 0x20);
+    return result & 1 ? ~(result >>> 1) : result >>> 1;
+  }
+
+  while (index < encoded.length) {
+    lat += nextValue();
+    lng += nextValue();
+    points.push([lat / factor, lng / factor]);
+  }
+  return points;
+}
+
+/**
+ * One map layer kept in sync with the server.
+ *
+ * @param {string} name - "path" or "trace"
+ * @param {function(Array)} onChange - Called with all [lat, lng] points
+ */
+function MapLayerClient(name, onChange) {
+  this.name = name;
+  this.onChange = onChange;
+  this.points = [];
+  this.generation = null;
+  this.version = 0;
+}
+
+MapLayerClient.prototype.refresh = function () {
+  const self = this;
+  let url = "/api/map/" + this.name;
+  if (this.generation) {
+    url += "?since=" + this.version + "&generation=" + this.generation;
+  }
+  // The browser revalidates with If-None-Match; unchanged layers answer 304
+  return fetch(url, { cache: "no-cache" })
+    .then(function (response) {
+      return response.ok ? response.json() : null;
+    })
+    .then(function (layer) {
+      if (!layer || !layer.success) {
+        return;
+      }
+      if (layer.generation === self.generation && layer.version === self.version) {
+        return;
+      }
+      const precision = parseInt(layer.encoding.replace("polyline", ""), 10);
+      const points = decodePolyline(layer.points, precision);
+      self.points = layer.since > 0 ? self.points.concat(points) : points;
+      self.generation = layer.generation;
+      self.version = layer.version;
+      self.onChange(self.points);
+    })
+    .catch(function (error) {
+      console.warn("Map layer " + self.name + " refresh failed:", error);
+    });
+};
+
+/**
+ * Obstacle grid tiles drawn as image overlays on a Leaflet map.
+ *
+ * @param {L.Map} map - Map to draw on
+ * @param {number} threshold - Occupancy probability (0-1) drawn as an obstacle
+ */
+function ObstacleTileClient(map, threshold) {
+  this.map = map;
+  this.threshold = Math.round((threshold === undefined ? 0.65 : threshold) * 255);
+  this.tiles = {}; // "row/col" -> {etag, overlay}
+}
+
+ObstacleTileClient.prototype.refresh = function () {
+  const self = this;
+  return fetch("/api/map/obstacles", { cache: "no-cache" })
+    .then(function (response) {
+      return response.ok ? response.json() : null;
+    })
+    .then(function (index) {
+      if (!index || !index.success) {
+        return;
+      }
+      const listed = {};
+      const updates = [];
+      index.tiles.forEach(function (tile) {
+        const key = tile.row + "/" + tile.col;
+        listed[key] = true;
+        const known = self.tiles[key];
+        if (tile.bounds && (!known || known.etag !== tile.etag)) {
+          updates.push(self._fetchTile(key, tile));
+        }
+      });
+      // Tiles that became entirely unknown drop out of the index
+      Object.keys(self.tiles).forEach(function (key) {
+        if (!listed[key]) {
+          self.map.removeLayer(self.tiles[key].overlay);
+          delete self.tiles[key];
+        }
+      });
+      return Promise.all(updates);
+    })
+    .catch(function (error) {
+      console.warn("Obstacle tile refresh failed:", error);
+    });
+};
+
+ObstacleTileClient.prototype._fetchTile = function (key, tile) {
+  const self = this;
+  // The browser inflates the deflate-encoded body and revalidates with If-None-Match
+  return fetch("/api/map/obstacles/" + key, { cache: "no-cache" }).then(function (response) {
+    if (!response.ok) {
+      return;
+    }
+    const shape = response.headers.get("X-Tile-Shape").split("x");
+    const etag = response.headers.get("ETag") || tile.etag;
+    return response.arrayBuffer().then(function (buffer) {
+      const url = self._render(new Uint8Array(buffer), parseInt(shape[0], 10), parseInt(shape[1], 10));
+      const known = self.tiles[key];
+      if (known) {
+        known.overlay.setUrl(url);
+        known.overlay.setBounds(L.latLngBounds(tile.bounds));
+        known.etag = etag;
+      } else {
+        const overlay = L.imageOverlay(url, tile.bounds, { opacity: 0.6 }).addTo(self.map);
+        self.tiles[key] = { etag: etag, overlay: overlay };
+      }
+    });
+  });
+};
+
+ObstacleTileClient.prototype._render = function (cells, rows, cols) {
+  const canvas = document.createElement("canvas");
+  canvas.width = cols;
+  canvas.height = rows;
+  const context = canvas.getContext("2d");
+  const image = context.createImageData(cols, rows);
+  for (let row = 0; row < rows; row++) {
+    // Tile row 0 is the southern edge; canvas row 0 is the top
+    const y = rows - 1 - row;
+    for (let col = 0; col < cols; col++) {
+      const probability = cells[row * cols + col];
+      if (probability < this.threshold) {
+        continue;
+      }
+      const offset = (y * cols + col) * 4;
+      image.data[offset] = 220;
+      image.data[offset + 1] = 40;
+      image.data[offset + 2] = 40;
+      image.data[offset + 3] = probability;
+    }
+  }
+  context.putImageData(image, 0, 0);
+  return canvas.toDataURL();
+};
@@ -0,0 +1,77 @@
+/**
+ * Client side of the delta-encoded telemetry stream (see telemetry_hub.py).
+ *
+ * Merges "telemetry" messages into the last full document per topic and
+ * passes the result to the socket's existing status_update, safety_status
+ * and sensor_data handlers, so pages keep handling full documents.
+ */
+
+const TELEMETRY_EVENTS = {
+  status: "status_update",
+  safety: "safety_status",
+  sensors: "sensor_data",
+};
+
+function applyTelemetryDelta(documentState, delta) {
+  const merged = Object.assign({}, documentState);
+  Object.keys(delta).forEach(function (key) {
+    const value = delta[key];
+    if (value === null) {
+      delete merged[key];
+    } else if (
+      typeof value === "object" &&
+      !Array.isArray(value) &&
+      merged[key] !== null &&
+      typeof merged[key] === "object" &&
+      !Array.isArray(merged[key])
+    ) {
+      merged[key] = applyTelemetryDelta(merged[key], value);
+    } else {
+      merged[key] = value;
+    }
+  });
+  return merged;
+}
+
+/**
+ * Start merging telemetry on a socket.
+ *
+ * @param {Socket} socket - Socket.IO client
+ * @param {Object} [topics] - Topic -> rate in Hz, e.g. {sensors: 10};
+ *   omitted topics are not sent. Without it the server defaults apply.
+ */
+function setupTelemetry(socket, topics) {
+  let state = {};
+  let seq = {};
+
+  function subscribe() {
+    state = {};
+    seq = {};
+    socket.emit("subscribe_telemetry", topics ? { topics: topics } : {});
+  }
+
+  socket.on("connect", subscribe);
+  socket.on("telemetry", function (message) {
+    const topic = message.topic;
+    if (message.key) {
+      state[topic] = message.data;
+    } else if (state[topic] === undefined || message.seq !== seq[topic] + 1) {
+      // Missed a message: resubscribing starts over with keyframes
+      subscribe();
+      return;
+    } else {
+      state[topic] = applyTelemetryDelta(state[topic], message.data);
+    }
+    seq[topic] = message.seq;
+
+    const event = TELEMETRY_EVENTS[topic];
+    if (event) {
+      socket.listeners(event).forEach(function (handler) {
+        handler(state[topic]);
+      });
+    }
+  });
+  if (socket.connected) {
+    subscribe();
+  }
+}
@@ -0,0 +1,306 @@
+"""
+Change-driven telemetry for Socket.IO clients.
+
+``TelemetryHub`` replaces the fixed 100 ms broadcast of full status,
+safety and sensor dicts. Each topic has a source callable and a maximum
+rate; each client subscribes to topics at its own rate (the map view needs
+sensors at a couple of Hz, the diagnostics page more). Sources are only
+read when some client is due, so with no clients connected nothing is read
+or sent.
+
+Every client gets its own ``telemetry`` stream::
+
+    {"topic": "sensors", "seq": 12, "key": false, "data": {"imu": {"heading": 91.5}}}
+
+``key`` messages carry the full document. The others carry only the
+leaves that changed since the last message to that client, with ``None``
+for removed keys (a None value and a missing key are treated alike).
+Numeric leaves count as changed once they move more than their deadband
+from the value last sent. Nothing is sent when nothing changed, and a keyframe follows every ``keyframe_interval`` seconds so a
+client that missed a message recovers. ``static/js/telemetry.js`` merges
+the stream and hands full documents to the existing ``status_update``,
+``safety_status`` and ``sensor_data`` handlers.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from mower.utilities.logger_config import LoggerConfigInfo, rate_limited
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+# Topic -> legacy Socket.IO event the client handlers listen to
+TOPIC_EVENTS = {"status": "status_update", "safety": "safety_status", "sensors": "sensor_data"}
+
+SENSOR_DEADBANDS = {
+    "imu.heading": 0.5,
+    "imu.roll": 0.5,
+    "imu.pitch": 0.5,
+    "tof.left": 1.0,
+    "tof.right": 1.0,
+    "tof.front": 1.0,
+    "power.voltage": 0.05,
+    "power.current": 0.05,
+    "power.power": 0.5,
+    "power.percentage": 0.5,
+    "environment.temperature": 0.1,
+    "environment.humidity": 0.5,
+    "environment.pressure": 0.5,
+    "gps.latitude": 1e-7,  # about 1 cm
+    "gps.longitude": 1e-7,
+    "gps.hdop": 0.1,
+}
+
+_MISSING = object()
+
+
+def _changed(old: Any, new: Any, deadband: float) -> bool:
+    if isinstance(new, bool) or isinstance(old, bool):
+        return old != new
+    if isinstance(new, (int, float)) and isinstance(old, (int, float)):
+        return abs(new - old) > deadband
+    return old != new
+
+
+def diff(old: Dict[str, Any], new: Dict[str, Any], deadbands: Dict[str, float], prefix: str = "") -> Dict[str, Any]:
+    """
+    Changes from ``old`` to ``new`` as a nested dict of the changed leaves.
+
+    Args:
+        old: Document last sent to the client
+        new: Current document
+        deadbands: Dotted leaf path -> smallest numeric change worth sending
+        prefix: Dotted path of ``old``/``new`` within the document
+
+    Returns:
+        dict: Changed leaves; removed keys map to None. Empty if nothing changed
+    """
+    delta = {}
+    for key, value in new.items():
+        path = f"{prefix}{key}"
+        previous = old.get(key, _MISSING)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff(previous, value, deadbands, path + ".")
+            if nested:
+                delta[key] = nested
+        elif previous is _MISSING:
+            if value is not None:  # None and absent are the same to the client
+                delta[key] = value
+        elif _changed(previous, value, deadbands.get(path, 0.0)):
+            delta[key] = value
+    for key in old.keys() - new.keys():
+        delta[key] = None
+    return delta
+
+
+def apply_delta(document: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge a delta into a copy of ``document`` (what the browser does)."""
+    merged = dict(document)
+    for key, value in delta.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = apply_delta(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+@dataclass
+class Topic:
+    """A telemetry document and where it comes from."""
+
+    name: str
+    source: Callable[[], Dict[str, Any]]
+    max_rate_hz: float
+    default_rate_hz: float
+    deadbands: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class _Subscription:
+    interval: float
+    next_due: float = 0.0
+    last_keyframe: float = float("-inf")
+    sent: Optional[Dict[str, Any]] = None  # document as the client last saw it
+    seq: int = 0
+
+
+class TelemetryHub:
+    """Per-client, delta-encoded telemetry publisher."""
+
+    def __init__(
+        self,
+        emit: Callable[[str, Dict[str, Any], str], Any],
+        keyframe_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        event_factory: Callable[[], Any] = threading.Event,
+    ):
+        """
+        Initialize the hub.
+
+        Args:
+            emit: ``emit(event, payload, sid)`` sends to one client
+            keyframe_interval: Seconds between full documents per client and topic
+            clock: Monotonic time source
+            event_factory: Creates the event ``wait_for_clients`` blocks on;
+                pass the Socket.IO server's ``create_event`` under eventlet/gevent
+        """
+        self.emit = emit
+        self.keyframe_interval = keyframe_interval
+        self.clock = clock
+        self.topics: Dict[str, Topic] = {}
+        self._clients: Dict[str, Dict[str, _Subscription]] = {}
+        self._lock = threading.Lock()
+        self._has_clients = event_factory()
+        self.stats = {"reads": 0, "keyframes": 0, "deltas": 0, "unchanged": 0}
+
+    def add_topic(
+        self,
+        name: str,
+        source: Callable[[], Dict[str, Any]],
+        max_rate_hz: float = 10.0,
+        default_rate_hz: Optional[float] = None,
+        deadbands: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Register a topic.
+
+        Args:
+            name: Topic name used in subscriptions and payloads
+            source: Returns the current document
+            max_rate_hz: Fastest rate a client may subscribe at
+            default_rate_hz: Rate for clients that did not choose one
+            deadbands: Dotted leaf path -> minimum numeric change to publish
+        """
+        self.topics[name] = Topic(name, source, max_rate_hz, default_rate_hz or max_rate_hz, deadbands or {})
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def connect(self, sid: str):
+        """Subscribe a new client to every topic at its default rate."""
+        self.subscribe(sid, {name: topic.default_rate_hz for name, topic in self.topics.items()})
+
+    def disconnect(self, sid: str):
+        with self._lock:
+            self._clients.pop(sid, None)
+            if not self._clients:
+                self._has_clients.clear()
+
+    def subscribe(self, sid: str, rates: Dict[str, float]):
+        """
+        Replace a client's subscriptions; each starts with a keyframe.
+
+        Args:
+            sid: Socket.IO session id
+            rates: Topic -> rate in Hz (capped at the topic's maximum); 0 or
+                unknown topics are ignored
+        """
+        now = self.clock()
+        subscriptions = {}
+        for name, rate in rates.items():
+            topic = self.topics.get(name)
+            try:
+                rate = min(float(rate), topic.max_rate_hz) if topic else 0.0
+            except (TypeError, ValueError):
+                rate = 0.0
+            if rate > 0:
+                subscriptions[name] = _Subscription(interval=1.0 / rate, next_due=now)
+        with self._lock:
+            self._clients[sid] = subscriptions
+            self._has_clients.set()
+
+    def wait_for_clients(self, timeout: Optional[float] = None) -> bool:
+        """Block until a client is connected; True if one is."""
+        return bool(self._has_clients.wait(timeout))
+
+    def poll(self) -> Optional[float]:
+        """
+        Publish whatever is due.
+
+        Returns:
+            float: Seconds until the next subscription is due, or None if no
+            client is connected
+        """
+        now = self.clock()
+        with self._lock:
+            due = [
+                (sid, name, sub)
+                for sid, subs in self._clients.items()
+                for name, sub in subs.items()
+                if sub.next_due <= now
+            ]
+        documents: Dict[str, Optional[Dict[str, Any]]] = {}
+        for sid, name, sub in due:
+            if name not in documents:
+                documents[name] = self._read(name)
+            document = documents[name]
+            # Keep the cadence without drifting; skip missed slots after a stall
+            sub.next_due = max(sub.next_due + sub.interval, now)
+            if document is not None:
+                self._publish(sid, name, sub, document, now)
+
+        with self._lock:
+            if not self._clients:
+                return None
+            next_due = min((sub.next_due for subs in self._clients.values() for sub in subs.values()), default=None)
+        if next_due is None:
+            return self.keyframe_interval  # connected but subscribed to nothing
+        return max(0.0, next_due - self.clock())
+
+    def _read(self, name: str) -> Optional[Dict[str, Any]]:
+        self.stats["reads"] += 1
+        try:
+            document = self.topics[name].source()
+        except Exception as e:
+            logger.error("Telemetry source %s failed: %s", name, e, extra=rate_limited(10.0))
+            return None
+        return document if isinstance(document, dict) else None
+
+    def _publish(self, sid: str, name: str, sub: _Subscription, document: Dict[str, Any], now: float):
+        if sub.sent is None or now - sub.last_keyframe >= self.keyframe_interval:
+            payload, key = document, True
+            sub.last_keyframe = now
+            self.stats["keyframes"] += 1
+        else:
+            payload, key = diff(sub.sent, document, self.topics[name].deadbands), False
+            if not payload:
+                self.stats["unchanged"] += 1
+                return
+            self.stats["deltas"] += 1
+            # Leaves inside a deadband stay at the value the client has
+            document = apply_delta(sub.sent, payload)
+        sub.sent = document
+        sub.seq += 1
+        try:
+            self.emit("telemetry", {"topic": name, "seq": sub.seq, "key": key, "data": payload}, sid)
+        except Exception as e:
+            logger.error("Telemetry emit to %s failed: %s", sid, e, extra=rate_limited(10.0))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "clients": self.client_count}
+
+
+def run_hub(hub: TelemetryHub, sleep: Callable[[float], Any], stop: Optional[Callable[[], bool]] = None):
+    """
+    Publish until ``stop()`` returns True, idling while no client is connected.
+
+    Args:
+        hub: Hub to drive
+        sleep: Cooperative sleep, e.g. ``socketio.sleep``
+        stop: Optional exit condition checked each cycle
+    """
+    while not (stop and stop()):
+        try:
+            delay = hub.poll()
+        except Exception as e:
+            logger.error("Telemetry poll failed: %s", e, exc_info=True, extra=rate_limited(10.0))
+            delay = 1.0
+        if delay is None:
+            hub.wait_for_clients(timeout=1.0)
+        else:
+            sleep(max(delay, 0.005))
@@ -4,13 +4,15 @@ Utilities package initialization.
 This package provides various utility modules for the autonomous mower.
 """
 
-from .logger_config import LoggerConfigInfo
+from .logger_config import LoggerConfigInfo, rate_limited, sampled
 from .resource_utils import cleanup_resources, load_config, save_config
 from .text_writer import CsvLogger, TextLogger
 from .utils import Utils
 
 __all__ = [
     "LoggerConfigInfo",
+    "rate_limited",
+    "sampled",
     "TextLogger",
     "CsvLogger",
     "Utils",
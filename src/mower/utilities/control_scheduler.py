@@ -0,0 +1,374 @@
+"""
+Fixed-rate, multi-rate scheduler for periodic control tasks.
+
+Each task has a period and runs against absolute monotonic-clock deadlines
+(``start + k * period``), so timing errors never accumulate the way they do
+with ``time.sleep(period)`` after the work. All tasks of one scheduler run on
+its thread in a deterministic order: earliest deadline first, then shorter
+period first, then registration order.
+
+For every task the scheduler records:
+
+- release jitter (how late the task started relative to its deadline) as a
+  histogram with fixed millisecond buckets, plus mean and maximum,
+- overruns, i.e. runs that finished after the task's next deadline, and the
+  number of deadlines skipped to get back on schedule (late deadlines are
+  dropped rather than run back to back),
+- wall-clock duration and CPU time (``time.thread_time``) per run.
+
+Loops that cannot become scheduler tasks (because they block on actuators,
+for example) can keep their own thread and pace it with ``FixedRate``, which
+uses the same deadline and statistics logic.
+
+Usage:
+    scheduler = ControlScheduler("control")
+    scheduler.add_task("safety", check_safety, rate_hz=50)
+    scheduler.add_task("gps", fuse_gps, rate_hz=5)
+    scheduler.start()
+    ...
+    scheduler.get_stats()
+    scheduler.stop()
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from mower.utilities.logger_config import LoggerConfigInfo
+
+logger = LoggerConfigInfo.get_logger(__name__)
+
+# Upper edges of the jitter histogram buckets in milliseconds; the last
+# bucket collects everything above the final edge.
+JITTER_BUCKETS_MS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+
+# Default rates for the main controller's control tasks, in Hz
+DEFAULT_CONTROL_RATES = {
+    "safety": 50.0,
+    "imu": 50.0,
+    "gps": 5.0,
+    "housekeeping": 1.0,
+}
+
+
+class TaskStats:
+    """Timing statistics for one periodic task or loop."""
+
+    def __init__(self, period: float):
+        self.period = period
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.errors = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.jitter_histogram = [0] * (len(JITTER_BUCKETS_MS) + 1)
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+        self.cpu_total = 0.0
+        self.started: Optional[float] = None
+
+    def record(self, jitter: float, duration: float, cpu: float, skipped: int = 0):
+        """
+        Record one run.
+
+        Args:
+            jitter: Start time minus deadline, in seconds
+            duration: Wall-clock run time in seconds
+            cpu: CPU time used by the run in seconds
+            skipped: Deadlines dropped because the run finished late
+        """
+        jitter = max(jitter, 0.0)
+        with self._lock:
+            self.runs += 1
+            self.jitter_histogram[bisect.bisect_left(JITTER_BUCKETS_MS, jitter * 1000)] += 1
+            self.jitter_total += jitter
+            self.jitter_max = max(self.jitter_max, jitter)
+            self.duration_total += duration
+            self.duration_max = max(self.duration_max, duration)
+            self.cpu_total += cpu
+            if skipped:
+                self.overruns += 1
+                self.skipped += skipped
+
+    def record_error(self):
+        """Count a run that raised."""
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        """
+        Summarise the statistics.
+
+        Args:
+            now: Current monotonic time, used for the CPU share
+
+        Returns:
+            dict: Rate, run counts, jitter (ms) with histogram, duration (ms)
+                  and CPU share in percent of one core
+        """
+        with self._lock:
+            runs = self.runs
+            elapsed = now - self.started if self.started is not None else 0.0
+            labels = [f"<={edge:g}ms" for edge in JITTER_BUCKETS_MS] + [f">{JITTER_BUCKETS_MS[-1]:g}ms"]
+            return {
+                "rate_hz": round(1.0 / self.period, 3),
+                "runs": runs,
+                "errors": self.errors,
+                "overruns": self.overruns,
+                "skipped": self.skipped,
+                "jitter_ms": {
+                    "mean": round(self.jitter_total / runs * 1000, 3) if runs else 0.0,
+                    "max": round(self.jitter_max * 1000, 3),
+                    "histogram": dict(zip(labels, self.jitter_histogram)),
+                },
+                "duration_ms": {
+                    "mean": round(self.duration_total / runs * 1000, 3) if runs else 0.0,
+                    "max": round(self.duration_max * 1000, 3),
+                },
+                "cpu_percent": round(self.cpu_total / elapsed * 100, 2) if elapsed > 0 else 0.0,
+            }
+
+
+def _next_deadline(deadline: float, period: float, now: float):
+    """
+    Following deadline after ``deadline``, dropping any that already passed.
+
+    Returns:
+        Tuple of (next deadline, number of deadlines skipped)
+    """
+    following = deadline + period
+    if following > now:
+        return following, 0
+    skipped = int((now - following) // period) + 1
+    return following + skipped * period, skipped
+
+
+class ScheduledTask:
+    """A function called periodically by a ``ControlScheduler``."""
+
+    def __init__(self, name: str, func: Callable[[], Any], rate_hz: float, order: int):
+        if rate_hz <= 0:
+            raise ValueError(f"Task '{name}' needs a positive rate, got {rate_hz}")
+        self.name = name
+        self.func = func
+        self.period = 1.0 / rate_hz
+        self.order = order
+        self.deadline: Optional[float] = None
+        self.consecutive_errors = 0
+        self.stats = TaskStats(self.period)
+
+    def sort_key(self):
+        return self.deadline, self.period, self.order
+
+
+class ControlScheduler:
+    """
+    Runs periodic tasks at fixed rates on one thread.
+
+    The clock is injectable so that simulations can drive the scheduler
+    from a virtual clock through ``run_pending``.
+    """
+
+    def __init__(self, name: str = "scheduler", clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the scheduler.
+
+        Args:
+            name: Name used for the thread and in logs
+            clock: Monotonic time source in seconds
+        """
+        self.name = name
+        self.clock = clock
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._order = 0
+
+    def add_task(self, name: str, func: Callable[[], Any], rate_hz: float) -> ScheduledTask:
+        """
+        Register a periodic task. Its first run is due immediately.
+
+        Args:
+            name: Unique task name
+            func: Called with no arguments once per period
+            rate_hz: Run frequency
+
+        Returns:
+            ScheduledTask: The registered task
+        """
+        with self._lock:
+            if name in self._tasks:
+                raise ValueError(f"Task '{name}' is already scheduled")
+            task = ScheduledTask(name, func, rate_hz, self._order)
+            self._order += 1
+            self._tasks[name] = task
+        logger.info("Scheduler '%s': added task '%s' at %.1f Hz", self.name, name, rate_hz)
+        return task
+
+    def remove_task(self, name: str) -> bool:
+        """Unregister a task; returns False if it was not scheduled."""
+        with self._lock:
+            return self._tasks.pop(name, None) is not None
+
+    @property
+    def tasks(self) -> List[str]:
+        with self._lock:
+            return list(self._tasks)
+
+    def run_pending(self, now: Optional[float] = None) -> float:
+        """
+        Run every task whose deadline has arrived.
+
+        Args:
+            now: Current time; read from the clock when omitted
+
+        Returns:
+            float: Seconds until the next deadline (0 if one is already due,
+                   inf if no tasks are scheduled)
+        """
+        if now is None:
+            now = self.clock()
+        with self._lock:
+            tasks = list(self._tasks.values())
+        for task in tasks:
+            if task.deadline is None:
+                task.deadline = now
+                task.stats.started = now
+
+        for task in sorted((t for t in tasks if t.deadline <= now), key=ScheduledTask.sort_key):
+            self._run_task(task)
+
+        if not tasks:
+            return float("inf")
+        return max(0.0, min(task.deadline for task in tasks) - self.clock())
+
+    def _run_task(self, task: ScheduledTask):
+        started = self.clock()
+        cpu_started = time.thread_time()
+        try:
+            task.func()
+            task.consecutive_errors = 0
+        except Exception as e:  # keep the other tasks on schedule
+            task.consecutive_errors += 1
+            task.stats.record_error()
+            if task.consecutive_errors == 1 or task.consecutive_errors % 100 == 0:
+                logger.error(
+                    "Scheduler '%s': task '%s' failed (%d in a row): %s",
+                    self.name,
+                    task.name,
+                    task.consecutive_errors,
+                    e,
+                    exc_info=task.consecutive_errors == 1,
+                )
+        finished = self.clock()
+        deadline = task.deadline
+        task.deadline, skipped = _next_deadline(deadline, task.period, finished)
+        task.stats.record(started - deadline, finished - started, time.thread_time() - cpu_started, skipped)
+
+    def run(self, stop_event: Optional[threading.Event] = None):
+        """
+        Run tasks on the calling thread until ``stop_event`` (or ``stop()``) is set.
+
+        Args:
+            stop_event: Extra event that ends the loop, e.g. the application's shutdown event
+        """
+        stop_event = stop_event or self._stop_event
+        while not stop_event.is_set() and not self._stop_event.is_set():
+            wait = self.run_pending()
+            if wait > 0:
+                stop_event.wait(min(wait, 1.0))
+
+    def start(self):
+        """Run the scheduler on its own daemon thread."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name=f"{self.name}-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Scheduler '%s' started with tasks: %s", self.name, ", ".join(self.tasks))
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the scheduler thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning("Scheduler '%s' did not stop within %.1fs", self.name, timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-task timing statistics keyed by task name."""
+        now = self.clock()
+        with self._lock:
+            tasks = list(self._tasks.values())
+        return {task.name: task.stats.snapshot(now) for task in tasks}
+
+
+class FixedRate:
+    """
+    Deadline-based pacing for a loop that keeps its own thread.
+
+    Replaces ``time.sleep(period)`` at the end of a loop body: ``sleep()``
+    waits until the next absolute deadline and records jitter, overruns and
+    per-iteration CPU time in ``stats``.
+    """
+
+    def __init__(self, rate_hz: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the pacer.
+
+        Args:
+            rate_hz: Loop frequency
+            clock: Monotonic time source in seconds
+        """
+        if rate_hz <= 0:
+            raise ValueError(f"rate_hz must be positive, got {rate_hz}")
+        self.period = 1.0 / rate_hz
+        self.clock = clock
+        self.stats = TaskStats(self.period)
+        self._deadline: Optional[float] = None
+        self._iteration_start = 0.0
+        self._cpu_start = 0.0
+
+    def sleep(self, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Wait for the next deadline.
+
+        Args:
+            stop_event: Event that cuts the wait short
+
+        Returns:
+            bool: False if ``stop_event`` was set while waiting
+        """
+        now = self.clock()
+        if self._deadline is None:
+            # First call: the schedule starts one period from now
+            self.stats.started = now
+            self._deadline = now + self.period
+        else:
+            deadline = self._deadline
+            self._deadline, skipped = _next_deadline(deadline, self.period, now)
+            self.stats.record(
+                self._iteration_start - deadline,
+                now - self._iteration_start,
+                time.thread_time() - self._cpu_start,
+                skipped,
+            )
+
+        wait = self._deadline - now
+        if wait > 0:
+            if stop_event is None:
+                time.sleep(wait)
+            elif stop_event.wait(wait):
+                return False
+        self._iteration_start = self.clock()
+        self._cpu_start = time.thread_time()
+        return True
@@ -3,13 +3,141 @@ Logger configuration module.
 
 This module provides a centralized configuration for logging across the
 autonomous mower application.
+
+Records are handed to a bounded queue on the calling thread and formatted
+and written by a single listener thread, so control loops never wait on the
+console or the SD card. When the queue is full, records are dropped and
+counted rather than blocking the caller.
+
+Hot loops can rate-limit or sample a call site through ``extra``::
+
+    logger.debug("Sensor data: %s", data, extra=rate_limited(5.0))
+    logger.info("Frame %d decoded", n, extra=sampled(100))
+
+Set ``LOG_FORMAT=json`` to write compact JSON lines (``mower.jsonl``)
+instead of the text log file.
 """
 
+import atexit
+import copy
+import json
 import logging
 import logging.handlers
+import multiprocessing.util
 import os
+import queue
+import threading
 from pathlib import Path
 import time
+from typing import Any, Dict, Optional, Tuple
+
+
+def rate_limited(seconds: float) -> Dict[str, Any]:
+    """``extra`` for a call site that should log at most once per ``seconds``."""
+    return {"rate_limit": seconds}
+
+
+def sampled(every: int) -> Dict[str, Any]:
+    """``extra`` for a call site that should log one record out of ``every``."""
+    return {"sample_every": every}
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-call-site rate limiting and sampling.
+
+    Only records carrying a ``rate_limit`` or ``sample_every`` attribute are
+    affected. The next record let through from a call site reports how many
+    were suppressed since the previous one.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        super().__init__()
+        self.clock = clock
+        self._lock = threading.Lock()
+        # (pathname, lineno) -> [last emitted time, calls since, suppressed since]
+        self._sites: Dict[Tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        interval = getattr(record, "rate_limit", None)
+        every = getattr(record, "sample_every", None)
+        if interval is None and every is None:
+            return True
+        key = (record.pathname, record.lineno)
+        now = self.clock()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [None, 0, 0]
+            site[1] += 1
+            allowed = True
+            if interval is not None and site[0] is not None and now - site[0] < interval:
+                allowed = False
+            if every is not None and (site[1] - 1) % every:
+                allowed = False
+            if not allowed:
+                site[2] += 1
+                return False
+            suppressed = site[2]
+            site[0] = now
+            site[2] = 0
+        record.suppressed = suppressed
+        if suppressed and isinstance(record.msg, str):
+            record.msg = f"{record.msg} [{suppressed} similar suppressed]"
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One compact JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "t": round(record.created, 3),
+            "lvl": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the calling thread.
+
+    Handler filters (the ``RateLimitFilter``) run before ``prepare``, so
+    suppressed records are dropped without ever being formatted. Records that
+    pass are prepared like the stock ``QueueHandler`` does: arguments are
+    merged into the message and the traceback is rendered on the calling
+    thread, so the listener never touches caller-owned objects. Line layout
+    is still left to the listener's formatters. Records that do not fit in
+    the queue are counted in ``dropped``.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
 
 class LoggerConfigInfo:
@@ -20,6 +148,9 @@ class LoggerConfigInfo:
     _instance = None
     _initialized = False
     _log_dir = os.getenv("MOWER_LOG_DIR", str(Path(__file__).resolve().parent.parent.parent / "logs"))
+    _queue_size = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _queue_handler: Optional[DeferredQueueHandler] = None
 
     @classmethod
     def configure_logging(cls) -> None:
@@ -60,21 +191,32 @@ class LoggerConfigInfo:
 
             # Create formatters
             detailed_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+            json_lines = os.getenv("LOG_FORMAT", "text").strip().lower() == "json"
 
             # Set up console handler first
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(detailed_formatter)
-            root_logger.addHandler(console_handler)
+            handlers = [console_handler]
 
             # Set up rotating file handler for main log if directory exists or was created
             if log_dir_path and log_dir_path.is_dir(): # Check again after attempting creation
-                main_log = log_dir_path / "mower.log"
+                main_log = log_dir_path / ("mower.jsonl" if json_lines else "mower.log")
                 file_handler = logging.handlers.RotatingFileHandler(
                     main_log, maxBytes=1024 * 1024, backupCount=5  # 1MB
                 )
-                file_handler.setFormatter(detailed_formatter)
-                root_logger.addHandler(file_handler)
-            else:
+                file_handler.setFormatter(JsonLinesFormatter() if json_lines else detailed_formatter)
+                handlers.append(file_handler)
+
+            # Console and file output happen on the listener thread
+            cls._queue_handler = DeferredQueueHandler(queue.Queue(cls._queue_size))
+            cls._queue_handler.addFilter(RateLimitFilter())
+            root_logger.addHandler(cls._queue_handler)
+            cls._listener = logging.handlers.QueueListener(
+                cls._queue_handler.queue, *handlers, respect_handler_level=True
+            )
+            cls._listener.start()
+            atexit.register(cls.shutdown)
+            if len(handlers) == 1:
                 root_logger.warning(f"Log directory not available. Logging to console only.")
 
             cls._initialized = True
@@ -89,6 +231,37 @@ class LoggerConfigInfo:
 
         cls._initialized = True # Mark as initialized even if only console logging is active
 
+    @classmethod
+    def shutdown(cls) -> None:
+        """Flush queued records and stop the listener thread."""
+        listener, cls._listener = cls._listener, None
+        if listener is not None:
+            listener.stop()
+
+    @classmethod
+    def _restart_in_child(cls) -> None:
+        """
+        Give a forked child its own queue and listener thread.
+
+        Only the forking thread survives ``fork``, so the inherited listener
+        is gone and records would pile up in a queue that nothing drains
+        (the web UI runs in a forked ``multiprocessing.Process``).
+        """
+        listener = cls._listener
+        if listener is None or cls._queue_handler is None:
+            return
+        cls._queue_handler.queue = queue.Queue(cls._queue_size)
+        cls._queue_handler.dropped = 0
+        cls._listener = logging.handlers.QueueListener(
+            cls._queue_handler.queue, *listener.handlers, respect_handler_level=True
+        )
+        cls._listener.start()
+
+    @classmethod
+    def get_dropped_count(cls) -> int:
+        """Records dropped because the log queue was full."""
+        return cls._queue_handler.dropped if cls._queue_handler else 0
+
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """
@@ -137,3 +310,13 @@ class LoggerConfigInfo:
                         logger_instance.error(f"Error deleting log file {file_path}: {e}")
         except OSError as e:
             logger_instance.error(f"Error listing log directory {log_directory} for cleanup: {e}")
+
+
+def _flush_at_process_exit(cls) -> None:
+    # multiprocessing children leave through os._exit, skipping atexit
+    multiprocessing.util.Finalize(None, cls.shutdown, exitpriority=0)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=LoggerConfigInfo._restart_in_child)
+multiprocessing.util.register_after_fork(LoggerConfigInfo, _flush_at_process_exit)
@@ -5,6 +5,8 @@ Test module for test_path_planner_benchmarks.py.
 import numpy as np
 import pytest
 
+from mower.navigation.coverage import boustrophedon_path
+from mower.navigation.path_metrics import path_metrics
 from mower.navigation.path_planner import LearningConfig, PathPlanner, PatternConfig, PatternType
 
 
@@ -87,6 +89,19 @@ def test_calculate_path_distance_benchmark(benchmark, path_planner):
     assert 0.0 <= result <= 1.0
 
 
+def test_path_metrics_benchmark(benchmark, pattern_config_fixture):
+    # A full sweep of an L-shaped yard, where a convex hull would overstate coverage
+    boundary = [(0, 0), (40, 0), (40, 10), (10, 10), (10, 40), (0, 40)]
+    path = boustrophedon_path(boundary, pattern_config_fixture.spacing)
+
+    # Use pytest - benchmark to measure performance
+    result = benchmark(path_metrics, path, boundary, pattern_config_fixture.spacing)
+
+    # Verify that the sweep covers the yard without counting the empty corner
+    assert 0.9 <= result.coverage <= 1.0
+    assert result.turn_count > 0
+
+
 def test_calculate_smoothness_benchmark(benchmark, path_planner):
     # Create test data
     state = "test_state"
@@ -7,7 +7,26 @@ from unittest.mock import MagicMock
 import pytest
 
 
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
 # Test fixtures
+@pytest.fixture
+def clock():
+    """A ``FakeClock`` starting at 100 s, for code that takes a ``clock`` callable."""
+    return FakeClock()
+
+
 @pytest.fixture
 def mock_gpio():
     sensor = MagicMock()
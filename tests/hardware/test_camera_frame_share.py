@@ -0,0 +1,211 @@
+"""
+Tests for the shared-memory camera frame pool.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+
+import cv2
+import numpy as np
+import pytest
+
+from mower.hardware.camera_frame_share import CameraFrameSharer, SharedFramePool
+
+
+def _pool_name():
+    return f"mower_frames_{uuid.uuid4().hex[:12]}"
+
+
+def _make_frame(value=0, shape=(48, 64, 3)):
+    frame = np.full(shape, value, dtype=np.uint8)
+    frame[0, 0] = (value + 1) % 256
+    return frame
+
+
+def _wait_in_child(name, queue):
+    reader = CameraFrameSharer(pool_name=name)
+    start = time.monotonic()
+    sequence = reader.wait_for_frame(after_sequence=1, timeout=5.0)
+    queue.put((sequence, time.monotonic() - start))
+    reader.cleanup()
+
+
+@pytest.fixture
+def sharers():
+    name = _pool_name()
+    writer = CameraFrameSharer(pool_name=name)
+    reader = CameraFrameSharer(pool_name=name)
+    yield writer, reader
+    reader.cleanup()
+    writer.cleanup()
+
+
+class TestSharedFramePool:
+    """Test cases for the raw frame pool."""
+
+    def test_read_before_write_returns_none(self):
+        pool = SharedFramePool(_pool_name(), create=True, slot_count=3, max_frame_bytes=64 * 48 * 3)
+        try:
+            assert pool.read_latest() is None
+            assert pool.latest_sequence == 0
+        finally:
+            pool.close()
+
+    def test_write_and_read_latest(self):
+        name = _pool_name()
+        writer = SharedFramePool(name, create=True, slot_count=3, max_frame_bytes=64 * 48 * 3)
+        reader = SharedFramePool(name)
+        try:
+            for value in range(5):
+                writer.write(_make_frame(value))
+            info, frame = reader.read_latest()
+            assert info.sequence == 5
+            assert info.shape == (48, 64, 3)
+            np.testing.assert_array_equal(frame, _make_frame(4))
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_process_latest_runs_on_shared_slot(self):
+        pool = SharedFramePool(_pool_name(), create=True, slot_count=3, max_frame_bytes=64 * 48 * 3)
+        try:
+            pool.write(_make_frame(7))
+            info, total = pool.process_latest(lambda view, info: int(view.sum()))
+            assert info.sequence == 1
+            assert total == int(_make_frame(7).sum())
+        finally:
+            pool.close()
+
+    def test_stale_frame_is_not_returned(self):
+        pool = SharedFramePool(_pool_name(), create=True, slot_count=3, max_frame_bytes=64 * 48 * 3)
+        try:
+            pool.write(_make_frame(1))
+            time.sleep(0.05)
+            assert pool.read_latest(max_age=0.01) is None
+            assert pool.read_latest(max_age=None) is not None
+        finally:
+            pool.close()
+
+    def test_oversized_frame_is_downscaled(self):
+        pool = SharedFramePool(_pool_name(), create=True, slot_count=3, max_frame_bytes=64 * 48 * 3)
+        try:
+            pool.write(_make_frame(3, shape=(96, 128, 3)))
+            info, frame = pool.read_latest()
+            assert frame.nbytes <= 64 * 48 * 3
+            assert info.shape == frame.shape
+        finally:
+            pool.close()
+
+    def test_writer_close_unlinks_segment(self):
+        name = _pool_name()
+        pool = SharedFramePool(name, create=True, slot_count=3, max_frame_bytes=1024)
+        pool.close()
+        with pytest.raises(FileNotFoundError):
+            SharedFramePool(name)
+
+
+class TestCameraFrameSharer:
+    """Test cases for the frame sharer used by the main and web processes."""
+
+    def test_read_without_writer_returns_none(self):
+        reader = CameraFrameSharer(pool_name=_pool_name())
+        try:
+            assert reader.read_raw_frame(timeout=0.05) is None
+            assert reader.read_frame(timeout=0.05) is None
+            assert not reader.is_frame_available()
+        finally:
+            reader.cleanup()
+
+    def test_raw_frame_round_trip(self, sharers):
+        writer, reader = sharers
+        frame = _make_frame(42)
+        assert writer.write_frame(frame)
+        sequence, shared = reader.read_raw_frame(timeout=1.0)
+        assert sequence == 1
+        np.testing.assert_array_equal(shared, frame)
+        assert reader.get_metadata()["shape"] == [48, 64, 3]
+
+    def test_jpeg_input_is_decoded(self, sharers):
+        writer, reader = sharers
+        _, buffer = cv2.imencode(".jpg", _make_frame(100))
+        assert writer.write_frame(buffer.tobytes())
+        _, shared = reader.read_raw_frame(timeout=1.0)
+        assert shared.shape == (48, 64, 3)
+
+    def test_jpeg_encoded_once_per_frame(self, sharers):
+        writer, reader = sharers
+        writer.write_frame(_make_frame(10))
+        first_seq, first = reader.read_jpeg(timeout=1.0)
+        second_seq, second = reader.read_jpeg(timeout=1.0)
+        assert first_seq == second_seq == 1
+        assert first is second
+        assert reader.jpeg_encode_count == 1
+
+        writer.write_frame(_make_frame(20))
+        sequence, _ = reader.read_jpeg(timeout=1.0, after_sequence=first_seq)
+        assert sequence == 2
+        assert reader.jpeg_encode_count == 2
+
+    def test_jpeg_quality_and_scale(self, sharers):
+        writer, reader = sharers
+        writer.write_frame(_make_frame(10))
+        _, full = reader.read_jpeg(timeout=1.0)
+        _, small = reader.read_jpeg(timeout=1.0, quality=50, scale=0.5)
+        assert reader.jpeg_encode_count == 2
+        decoded = cv2.imdecode(np.frombuffer(small, np.uint8), cv2.IMREAD_COLOR)
+        assert decoded.shape == (24, 32, 3)
+        assert len(small) < len(full)
+
+    def test_writer_never_encodes_jpeg(self, sharers):
+        writer, _ = sharers
+        for value in range(3):
+            writer.write_frame(_make_frame(value))
+        assert writer.jpeg_encode_count == 0
+
+    def test_wait_wakes_on_new_frame(self, sharers):
+        writer, reader = sharers
+        writer.write_frame(_make_frame(1))
+        assert reader.wait_for_frame(0, timeout=1.0) == 1
+
+        timer = threading.Timer(0.1, writer.write_frame, args=(_make_frame(2),))
+        timer.start()
+        start = time.monotonic()
+        sequence = reader.wait_for_frame(after_sequence=1, timeout=3.0)
+        timer.join()
+        assert sequence == 2
+        assert time.monotonic() - start < 1.0
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork start method")
+    def test_wait_wakes_across_processes(self, sharers):
+        writer, _ = sharers
+        writer.write_frame(_make_frame(1))
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_wait_in_child, args=(writer.pool_name, queue))
+        process.start()
+        time.sleep(0.3)
+        writer.write_frame(_make_frame(2))
+        sequence, elapsed = queue.get(timeout=5)
+        process.join(timeout=5)
+        assert sequence == 2
+        assert elapsed < 2.0
+
+    def test_reader_follows_restarted_writer(self, sharers):
+        writer, reader = sharers
+        for value in range(3):
+            writer.write_frame(_make_frame(value))
+        assert reader.read_raw_frame(timeout=1.0)[0] == 3
+
+        writer.cleanup()
+        restarted = CameraFrameSharer(pool_name=writer.pool_name)
+        try:
+            restarted.write_frame(_make_frame(99))
+            time.sleep(1.1)  # replacement checks are throttled to once per second
+            sequence, frame = reader.read_raw_frame(timeout=2.0, after_sequence=3)
+            assert sequence == 1
+            np.testing.assert_array_equal(frame, _make_frame(99))
+        finally:
+            restarted.cleanup()
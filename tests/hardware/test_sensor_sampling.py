@@ -0,0 +1,130 @@
+"""Test per-sensor sampling, the shared bus arbiter and the latest-value cache."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mower.error_handling.circuit_breaker import CircuitBreaker, CircuitState
+from mower.hardware.sensor_sampling import BusArbiter, LatestValueCache, SensorSampler
+
+
+class TestLatestValueCache:
+    """Test cases for the thread-safe reading cache."""
+
+    def test_update_and_age(self):
+        cache = LatestValueCache()
+        assert cache.get("imu") is None
+        cache.update("imu", {"heading": 90.0})
+        reading = cache.get("imu")
+        assert reading.value == {"heading": 90.0}
+        assert 0.0 <= reading.age < 1.0
+        assert set(cache.snapshot()) == {"imu"}
+        cache.clear()
+        assert cache.snapshot() == {}
+
+
+class TestBusArbiter:
+    """Test cases for serializing blocking bus reads."""
+
+    def test_calls_never_overlap(self):
+        arbiter = BusArbiter("test-bus")
+        active = []
+        overlap = threading.Event()
+
+        def read(value):
+            active.append(value)
+            if len(active) > 1:
+                overlap.set()
+            time.sleep(0.01)
+            active.remove(value)
+            return value
+
+        async def main():
+            return await asyncio.gather(*(arbiter.run(read, i, timeout=1.0) for i in range(5)))
+
+        try:
+            assert asyncio.run(main()) == list(range(5))
+        finally:
+            arbiter.shutdown()
+        assert not overlap.is_set()
+        assert arbiter.calls == 5
+
+    def test_timeout_is_counted(self):
+        arbiter = BusArbiter("test-bus")
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                asyncio.run(arbiter.run(time.sleep, 0.2, timeout=0.01))
+        finally:
+            arbiter.shutdown()
+        assert arbiter.timeouts == 1
+
+
+class TestSensorSampler:
+    """Test cases for rate, timeout and circuit breaker handling."""
+
+    def test_samples_at_configured_rate(self):
+        cache = LatestValueCache()
+        count = iter(range(1000))
+
+        async def read():
+            return next(count)
+
+        sampler = SensorSampler("tof", read, cache, rate_hz=50, timeout=0.5)
+
+        async def main():
+            task = asyncio.create_task(sampler.run())
+            await asyncio.sleep(0.2)
+            task.cancel()
+
+        asyncio.run(main())
+        assert 8 <= sampler.reads <= 12
+        assert cache.get("tof").value == sampler.reads - 1
+
+    def test_slow_read_times_out(self):
+        cache = LatestValueCache()
+
+        async def read():
+            await asyncio.sleep(1.0)
+
+        sampler = SensorSampler("power", read, cache, rate_hz=1, timeout=0.01)
+        assert asyncio.run(sampler.sample_once()) is False
+        assert sampler.errors == 1
+        assert sampler.last_error == "TimeoutError"
+        assert cache.get("power") is None
+
+    def test_breaker_opens_and_keeps_last_value(self):
+        cache = LatestValueCache()
+        calls = []
+
+        async def read():
+            calls.append(1)
+            if len(calls) > 1:
+                raise OSError("I2C read failed")
+            return 42
+
+        breaker = CircuitBreaker("test.sensor", failure_threshold=3, timeout=60.0)
+        sampler = SensorSampler("environment", read, cache, rate_hz=1, timeout=0.5, breaker=breaker)
+
+        async def main():
+            for _ in range(10):
+                await sampler.sample_once()
+
+        asyncio.run(main())
+        # One success, three failures to open the breaker, then no more bus traffic
+        assert len(calls) == 4
+        assert breaker.state == CircuitState.OPEN
+        status = sampler.status()
+        assert status["errors"] == 3
+        assert status["skipped"] == 6
+        assert status["breaker"] == "open"
+        assert status["timestamp"] == cache.get("environment").timestamp
+        assert cache.get("environment").value == 42
+
+    def test_invalid_rate(self):
+        async def read():
+            return None
+
+        with pytest.raises(ValueError):
+            SensorSampler("imu", read, LatestValueCache(), rate_hz=0, timeout=0.5)
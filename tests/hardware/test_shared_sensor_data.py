@@ -0,0 +1,263 @@
+"""
+Tests for the shared-memory sensor snapshot transport.
+"""
+
+import multiprocessing
+import os
+import uuid
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from mower.hardware import shared_sensor_data
+from mower.hardware.shared_sensor_data import (
+    SENSOR_SNAPSHOT_DTYPE,
+    SharedSensorDataManager,
+    decode_sensor_snapshot,
+    encode_sensor_snapshot,
+)
+from mower.ipc.shared_memory import SeqlockRingBuffer
+
+RECORD_DTYPE = np.dtype([("value", "<f8"), ("count", "<u4")])
+
+SAMPLE_SENSOR_DATA = {
+    "imu": {
+        "heading": 123.4,
+        "roll": 1.5,
+        "pitch": "N/A",
+        "acceleration": {"x": 0.1, "y": 0.2, "z": 9.8},
+        "calibration": {"system": 3, "gyro": 3, "accel": 3, "mag": 3},
+        "safety_status": {"is_safe": True, "status": "ok"},
+    },
+    "environment": {"temperature_c": 21.5, "humidity": 45.0, "pressure": 1012.0},
+    "tof": {"left": 350, "right": -1},
+    "power": {"channel_1": {"bus_voltage": 12.6, "current": 1.2}},
+    "gps": {"latitude": 39.1, "longitude": -84.5, "fix_quality": 4, "satellites": 12, "hdop": 0.8},
+}
+
+
+def _segment_name():
+    return f"mower_test_{uuid.uuid4().hex[:12]}"
+
+
+def _make_record(value, count):
+    record = np.zeros((), dtype=RECORD_DTYPE)
+    record["value"] = value
+    record["count"] = count
+    return record
+
+
+def _read_in_child(name, queue):
+    manager = SharedSensorDataManager(segment_name=name)
+    data = manager.read_sensor_data()
+    queue.put(None if data is None else data["tof"])
+    manager.close()
+
+
+class TestSeqlockRingBuffer:
+    """Test cases for the shared-memory ring buffer."""
+
+    def test_read_before_write_returns_none(self):
+        ring = SeqlockRingBuffer(_segment_name(), RECORD_DTYPE, capacity=4, create=True)
+        try:
+            assert ring.read_latest() is None
+            assert ring.write_sequence == 0
+        finally:
+            ring.close()
+
+    def test_reader_sees_latest_record(self):
+        name = _segment_name()
+        writer = SeqlockRingBuffer(name, RECORD_DTYPE, capacity=4, create=True)
+        reader = SeqlockRingBuffer(name, RECORD_DTYPE)
+        try:
+            for i in range(1, 4):
+                writer.write(_make_record(i * 1.5, i))
+            latest = reader.read_latest()
+            assert latest.sequence == 3
+            assert latest.record["value"] == pytest.approx(4.5)
+            assert latest.record["count"] == 3
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_read_since_reports_overwritten_records(self):
+        writer = SeqlockRingBuffer(_segment_name(), RECORD_DTYPE, capacity=4, create=True)
+        try:
+            for i in range(1, 11):
+                writer.write(_make_record(float(i), i))
+            reads, dropped = writer.read_since(2)
+            assert [r.sequence for r in reads] == [7, 8, 9, 10]
+            assert dropped == 4
+            assert writer.read_since(10) == ([], 0)
+        finally:
+            writer.close()
+
+    def test_attach_with_wrong_layout_fails(self):
+        name = _segment_name()
+        writer = SeqlockRingBuffer(name, RECORD_DTYPE, capacity=4, create=True)
+        try:
+            with pytest.raises(ValueError):
+                SeqlockRingBuffer(name, np.dtype([("other", "<f4")]))
+        finally:
+            writer.close()
+
+    def test_attach_missing_segment_raises(self):
+        with pytest.raises(FileNotFoundError):
+            SeqlockRingBuffer(_segment_name(), RECORD_DTYPE)
+
+    def test_writer_close_unlinks_segment(self):
+        name = _segment_name()
+        writer = SeqlockRingBuffer(name, RECORD_DTYPE, capacity=4, create=True)
+        writer.close()
+        with pytest.raises(FileNotFoundError):
+            SeqlockRingBuffer(name, RECORD_DTYPE)
+
+
+class TestSensorSnapshotEncoding:
+    """Test cases for the fixed binary snapshot layout."""
+
+    def test_round_trip_preserves_readings(self):
+        record = encode_sensor_snapshot(SAMPLE_SENSOR_DATA, timestamp=1000.0)
+        assert record.dtype == SENSOR_SNAPSHOT_DTYPE
+        data = decode_sensor_snapshot(record[()])
+
+        assert data["timestamp"] == 1000.0
+        assert data["imu"]["heading"] == pytest.approx(123.4)
+        assert data["imu"]["pitch"] == "N/A"
+        assert data["imu"]["acceleration"]["z"] == pytest.approx(9.8)
+        assert data["imu"]["calibration"]["system"] == 3
+        assert data["imu"]["safety_status"]["is_safe"] is True
+        assert data["environment"]["temperature"] == pytest.approx(21.5)
+        assert data["tof"] == {"left": 350.0, "right": -1.0}
+        assert data["power"]["channel_1"]["bus_voltage"] == pytest.approx(12.6)
+        assert data["power"]["voltage"] == "N/A"
+        assert data["gps"]["fix_quality"] == 4
+        assert data["gps"]["status"] == "valid"
+        assert data["gps"]["satellites"] == 12
+
+    def test_missing_sections_are_omitted(self):
+        data = decode_sensor_snapshot(encode_sensor_snapshot({"tof": {"left": 10, "right": 20}})[()])
+        assert "tof" in data
+        assert "power" not in data
+        assert "gps" not in data
+
+    def test_legacy_distance_key_maps_to_tof(self):
+        distance = {"front_left": 150, "front_right": 250, "left_working": True, "right_working": False}
+        data = decode_sensor_snapshot(encode_sensor_snapshot({"distance": distance})[()])
+        assert data["tof"]["left"] == 150.0
+        assert data["tof"]["right"] == 250.0
+        assert data["tof"]["working"] is False
+        assert data["tof"]["left_working"] is True
+        assert data["tof"]["right_working"] is False
+
+    def test_tof_flags_stay_separate(self):
+        tof = {"left": 10, "right": 20, "left_working": False, "right_working": True}
+        data = decode_sensor_snapshot(encode_sensor_snapshot({"tof": tof})[()])
+        assert data["tof"]["left_working"] is False
+        assert data["tof"]["right_working"] is True
+        assert data["tof"]["working"] is False
+
+        data = decode_sensor_snapshot(encode_sensor_snapshot({"tof": {"left": 10, "working": True}})[()])
+        assert data["tof"]["working"] is True
+        assert "left_working" not in data["tof"] and "right_working" not in data["tof"]
+
+    def test_calibration_components_are_kept(self):
+        imu = {"heading": 1.0, "calibration": {"system": 1, "gyro": 3, "mag": 0}}
+        data = decode_sensor_snapshot(encode_sensor_snapshot({"imu": imu})[()])
+        assert data["imu"]["calibration"] == {"system": 1, "gyro": 3, "mag": 0}
+
+        data = decode_sensor_snapshot(encode_sensor_snapshot({"imu": {"heading": 1.0}})[()])
+        assert data["imu"]["calibration"] == "N/A"
+
+    def test_dropped_fields_are_logged_once(self, monkeypatch):
+        logger = MagicMock()
+        monkeypatch.setattr(shared_sensor_data, "logger", logger)
+        monkeypatch.setattr(shared_sensor_data, "_reported_dropped_fields", set())
+        sensor_data = {
+            "imu": {"heading": 1.0, "temperature": 30.0, "safety_status": {"is_safe": True}},
+            "tof": {"left": 10, "right": 20, "working": True},
+            "lidar": {"range": 4.0},
+        }
+        for _ in range(3):
+            encode_sensor_snapshot(sensor_data)
+        logger.warning.assert_called_once()
+        message = logger.warning.call_args[0][0]
+        assert "imu.temperature" in message and "lidar" in message
+        assert "tof" not in message
+
+        encode_sensor_snapshot(SAMPLE_SENSOR_DATA)
+        logger.warning.assert_called_once()
+
+
+class TestSharedSensorDataManager:
+    """Test cases for SharedSensorDataManager over shared memory."""
+
+    def test_write_then_read(self, tmp_path):
+        name = _segment_name()
+        writer = SharedSensorDataManager(segment_name=name, mirror_path=tmp_path / "mirror.json")
+        reader = SharedSensorDataManager(segment_name=name)
+        try:
+            assert writer.write_sensor_data(SAMPLE_SENSOR_DATA)
+            data = reader.read_sensor_data()
+            assert data["imu"]["heading"] == pytest.approx(123.4)
+            assert reader.is_data_fresh()
+            assert not (tmp_path / "mirror.json").exists()
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_snapshot_sequence_tracks_staleness(self):
+        name = _segment_name()
+        writer = SharedSensorDataManager(segment_name=name)
+        reader = SharedSensorDataManager(segment_name=name)
+        try:
+            writer.write_sensor_data(SAMPLE_SENSOR_DATA)
+            first = reader.read_snapshot()
+            assert first.is_new and first.missed == 0
+
+            repeat = reader.read_snapshot()
+            assert repeat.sequence == first.sequence
+            assert not repeat.is_new
+            assert repeat.age >= first.age
+
+            for _ in range(3):
+                writer.write_sensor_data(SAMPLE_SENSOR_DATA)
+            latest = reader.read_snapshot()
+            assert latest.is_new
+            assert latest.missed == 2
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_read_without_writer_returns_none(self):
+        reader = SharedSensorDataManager(segment_name=_segment_name())
+        assert reader.read_sensor_data() is None
+        assert not reader.is_data_fresh()
+
+    def test_debug_mirror_is_opt_in(self, tmp_path):
+        mirror = tmp_path / "mirror.json"
+        writer = SharedSensorDataManager(segment_name=_segment_name(), debug_mirror=True, mirror_path=mirror)
+        try:
+            writer.write_sensor_data(SAMPLE_SENSOR_DATA)
+            assert mirror.exists()
+        finally:
+            writer.close()
+
+    @pytest.mark.skipif(os.name != "posix", reason="fork start method required")
+    def test_read_from_other_process(self):
+        name = _segment_name()
+        writer = SharedSensorDataManager(segment_name=name)
+        try:
+            writer.write_sensor_data({"tof": {"left": 111, "right": 222}})
+            ctx = multiprocessing.get_context("fork")
+            queue = ctx.Queue()
+            process = ctx.Process(target=_read_in_child, args=(name, queue))
+            process.start()
+            result = queue.get(timeout=10)
+            process.join(timeout=10)
+            assert result == {"left": 111.0, "right": 222.0}
+            # Reader exiting must not remove the writer's segment
+            assert writer.read_sensor_data()["tof"]["left"] == 111.0
+        finally:
+            writer.close()
@@ -0,0 +1,117 @@
+"""Test the VL53L0X continuous-ranging filter and background collection."""
+
+import time
+
+import pytest
+
+from mower.hardware.tof import RangeFilter, VL53L0XSensors
+
+
+class FakeRangeSensor:
+    """VL53L0X stand-in that yields a fixed sequence of samples."""
+
+    def __init__(self, samples, fail=False):
+        self.samples = list(samples)
+        self.fail = fail
+        self.reads = 0
+
+    @property
+    def data_ready(self):
+        return self.fail or bool(self.samples)
+
+    @property
+    def range(self):
+        self.reads += 1
+        if self.fail:
+            raise OSError("I2C read failed")
+        return self.samples.pop(0)
+
+    def stop_continuous(self):
+        pass
+
+    def start_continuous(self):
+        pass
+
+
+def _sensors(**fakes):
+    tof = VL53L0XSensors(simulate=True)
+    tof._sensors = dict(fakes)
+    tof.is_hardware_available = True
+    return tof
+
+
+def _wait_for(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+class TestRangeFilter:
+    """Test cases for the per-sensor median filter."""
+
+    def test_spike_is_rejected(self):
+        range_filter = RangeFilter(size=5)
+        for distance in (500, 505, 2000, 498, 502):
+            range_filter.add(distance)
+        value, age = range_filter.latest()
+        assert value == pytest.approx(501, abs=1)
+        assert age < 0.1
+        assert range_filter.outliers == 1
+        range_filter.add(3000)
+        assert range_filter.outliers == 2
+        assert range_filter.latest()[0] == pytest.approx(501, abs=3)
+
+    def test_mostly_invalid_reports_missing(self):
+        range_filter = RangeFilter(size=4)
+        range_filter.add(400, timestamp=time.monotonic() - 2.0)
+        for _ in range(3):
+            range_filter.add(8190)
+        value, age = range_filter.latest()
+        assert value == -1
+        assert age == pytest.approx(2.0, abs=0.1)
+
+    def test_empty_filter(self):
+        assert RangeFilter().latest() == (-1, float("inf"))
+
+
+class TestContinuousRanging:
+    """Test cases for background collection and the non-blocking accessors."""
+
+    def test_collects_in_background(self):
+        tof = _sensors(left=FakeRangeSensor([300] * 5), right=FakeRangeSensor([800] * 5))
+        tof.start_ranging(poll_interval=0.001)
+        try:
+            assert _wait_for(lambda: tof.get_range("right")[0] == 800)
+            assert _wait_for(lambda: tof.get_range("left")[0] == 300)
+            assert tof.get_distances() == {"left": 300, "right": 800}
+        finally:
+            tof.cleanup()
+        assert not tof.ranging
+
+    def test_failing_sensor_does_not_stall_others(self):
+        tof = _sensors(left=FakeRangeSensor([], fail=True), right=FakeRangeSensor([700] * 3))
+        tof.start_ranging(poll_interval=0.001)
+        try:
+            assert _wait_for(lambda: tof.get_range("right")[0] == 700)
+            started = time.perf_counter()
+            distances = tof.get_distances()
+            assert time.perf_counter() - started < 0.01
+        finally:
+            tof.stop_ranging()
+        assert distances == {"left": -1, "right": 700}
+
+    def test_stale_value_is_dropped(self):
+        tof = _sensors(left=FakeRangeSensor([450] * 3))
+        tof.max_age = 0.05
+        tof.start_ranging(poll_interval=0.001)
+        try:
+            assert _wait_for(lambda: tof.get_distances()["left"] == 450)
+            # No new samples arrive, so the value ages out
+            assert _wait_for(lambda: tof.get_distances()["left"] == -1)
+            assert tof.get_range("left")[0] == 450
+        finally:
+            tof.stop_ranging()
+
+    def test_unknown_sensor(self):
+        assert VL53L0XSensors(simulate=True).get_range("left") == (-1, float("inf"))
@@ -0,0 +1,276 @@
+"""
+Tests for the web UI to main controller command channel.
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from multiprocessing.connection import Client
+
+import pytest
+
+from mower.ipc.command_queue import CommandProcessor, CommandQueue
+
+
+def _socket_path():
+    return os.path.join(tempfile.gettempdir(), f"mower_cmd_{uuid.uuid4().hex[:12]}.sock")
+
+
+class RecordingHandler:
+    """Command handler that records calls and can block on request."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, command, params):
+        self.calls.append((command, params))
+        if command == "block":
+            self.release.wait(5.0)
+        if command == "fail":
+            raise RuntimeError("motor fault")
+        if command == "plain":
+            return 42
+        return {"success": True, "result": {"echo": params}}
+
+
+def _stale_socket(path):
+    """Leave a socket file behind with nobody listening, like a crashed controller."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.close()
+
+
+@pytest.fixture
+def channel():
+    path = _socket_path()
+    handler = RecordingHandler()
+    processor = CommandProcessor(handler, socket_path=path, max_pending=2)
+    processor.start()
+    client = CommandQueue(socket_path=path)
+    yield handler, processor, client
+    handler.release.set()
+    client.close()
+    processor.stop()
+
+
+class TestSocketCommandChannel:
+    """Test cases for the socket backend."""
+
+    def test_round_trip(self, channel):
+        handler, _, client = channel
+        response = client.send_command("manual_drive", {"speed": 0.5})
+        assert response["success"] is True
+        assert response["result"] == {"echo": {"speed": 0.5}}
+        assert handler.calls == [("manual_drive", {"speed": 0.5})]
+
+    def test_non_dict_result_is_wrapped(self, channel):
+        _, _, client = channel
+        assert client.send_command("plain") == {"success": True, "result": 42, "error": None, "message": None}
+
+    def test_handler_error_is_reported(self, channel):
+        _, _, client = channel
+        response = client.send_command("fail")
+        assert response["success"] is False
+        assert "motor fault" in response["error"]
+
+    def test_commands_execute_in_order(self, channel):
+        handler, _, client = channel
+        for index in range(20):
+            client.send_command("step", {"index": index})
+        assert [params["index"] for _, params in handler.calls] == list(range(20))
+
+    def test_client_timeout_discards_late_reply(self, channel):
+        handler, _, client = channel
+        handler.release.clear()
+        response = client.send_command("block", timeout=0.1)
+        assert "timeout" in response["error"].lower()
+        handler.release.set()
+
+        # The late reply to "block" must not be mistaken for this one
+        response = client.send_command("next", {"value": 1})
+        assert response["result"] == {"echo": {"value": 1}}
+
+    def test_expired_commands_are_skipped(self, channel):
+        handler, processor, client = channel
+        handler.release.clear()
+        other = CommandQueue(socket_path=client.socket_path)
+        try:
+            worker = threading.Thread(target=client.send_command, args=("block",))
+            worker.start()
+            time.sleep(0.1)
+            assert "timeout" in other.send_command("stale", timeout=0.1)["error"].lower()
+            handler.release.set()
+            worker.join()
+            assert other.send_command("fresh")["success"] is True
+        finally:
+            other.close()
+        assert [command for command, _ in handler.calls] == ["block", "fresh"]
+        assert processor.expired_count == 1
+
+    def test_command_held_past_timeout_is_never_sent(self, channel):
+        handler, _, client = channel
+        client._lock.acquire()
+        threading.Timer(0.3, client._lock.release).start()
+        response = client.send_command("late", timeout=0.2)
+        assert response["success"] is False
+        time.sleep(0.2)
+        assert handler.calls == []
+
+    def test_wait_for_channel_counts_against_deadline(self, channel):
+        handler, processor, client = channel
+        handler.release.clear()
+        other = CommandQueue(socket_path=client.socket_path)
+        try:
+            worker = threading.Thread(target=other.send_command, args=("block",))
+            worker.start()
+            time.sleep(0.05)
+            # Most of the command's lifetime is spent queued behind the client lock
+            client._lock.acquire()
+            threading.Timer(0.25, client._lock.release).start()
+            response = client.send_command("late", timeout=0.3)
+            assert "timeout" in response["error"].lower()
+            handler.release.set()
+            worker.join()
+            assert other.send_command("fresh")["success"] is True
+        finally:
+            other.close()
+        assert [command for command, _ in handler.calls] == ["block", "fresh"]
+        assert processor.expired_count == 1
+
+    def test_full_queue_rejects_immediately(self, channel):
+        handler, processor, client = channel
+        handler.release.clear()
+        clients = [CommandQueue(socket_path=client.socket_path) for _ in range(3)]
+        threads = [threading.Thread(target=c.send_command, args=("block",)) for c in clients]
+        try:
+            for thread in threads:
+                thread.start()
+                time.sleep(0.05)
+            start = time.monotonic()
+            response = client.send_command("overflow")
+            assert response.get("busy") is True
+            assert time.monotonic() - start < 1.0
+            assert processor.rejected_count == 1
+        finally:
+            handler.release.set()
+            for thread in threads:
+                thread.join()
+            for c in clients:
+                c.close()
+
+    def test_client_reconnects_after_processor_restart(self):
+        path = _socket_path()
+        handler = RecordingHandler()
+        client = CommandQueue(socket_path=path)
+        first = CommandProcessor(handler, socket_path=path)
+        first.start()
+        assert client.send_command("one")["success"] is True
+        first.stop()
+
+        second = CommandProcessor(handler, socket_path=path)
+        second.start()
+        try:
+            assert client.send_command("two")["success"] is True
+        finally:
+            client.close()
+            second.stop()
+
+    @pytest.mark.parametrize("timeout", [None, "soon", -1.0, True])
+    def test_invalid_timeout_is_rejected(self, channel, timeout):
+        handler, _, client = channel
+        conn = Client(client.socket_path, family="AF_UNIX")
+        try:
+            conn.send_bytes(json.dumps({"id": 7, "command": "drive", "timeout": timeout}).encode())
+            assert conn.poll(2.0)
+            reply = json.loads(conn.recv_bytes())
+            assert reply["id"] == 7 and reply["success"] is False
+            assert "timeout" in reply["error"].lower()
+            # The connection stays usable
+            conn.send_bytes(json.dumps({"id": 8, "command": "drive", "timeout": 1.0}).encode())
+            assert conn.poll(2.0)
+            assert json.loads(conn.recv_bytes())["success"] is True
+        finally:
+            conn.close()
+        assert handler.calls == [("drive", {})]
+
+    def test_processor_replaces_stale_socket(self):
+        path = _socket_path()
+        _stale_socket(path)
+        processor = CommandProcessor(RecordingHandler(), socket_path=path)
+        processor.start()
+        client = CommandQueue(socket_path=path)
+        try:
+            assert processor.backend == "socket"
+            assert client.send_command("status")["success"] is True
+        finally:
+            client.close()
+            processor.stop()
+
+    def test_second_processor_does_not_take_over(self, channel, tmp_path):
+        handler, _, client = channel
+        other_handler = RecordingHandler()
+        second = CommandProcessor(
+            other_handler, queue_file=str(tmp_path / "commands.json"), socket_path=client.socket_path
+        )
+        second.start()
+        try:
+            assert second.backend == "file"
+            assert client.send_command("status")["success"] is True
+        finally:
+            second.stop()
+        assert handler.calls == [("status", {})]
+        assert other_handler.calls == []
+
+    def test_stop_removes_socket(self, channel):
+        _, processor, client = channel
+        processor.stop()
+        assert not os.path.exists(client.socket_path)
+
+
+class TestFileCommandChannel:
+    """Test cases for the file fallback backend."""
+
+    def test_file_backend_round_trip(self, tmp_path):
+        queue_file = tmp_path / "commands.json"
+        handler = RecordingHandler()
+        processor = CommandProcessor(handler, queue_file=str(queue_file), backend="file")
+        processor.start()
+        try:
+            client = CommandQueue(queue_file=str(queue_file), backend="file")
+            response = client.send_command("blade_off", timeout=2.0)
+            assert response["success"] is True
+            assert handler.calls == [("blade_off", {})]
+        finally:
+            processor.stop()
+
+    def test_client_falls_back_when_no_socket(self, tmp_path):
+        queue_file = tmp_path / "commands.json"
+        handler = RecordingHandler()
+        processor = CommandProcessor(handler, queue_file=str(queue_file), backend="file")
+        processor.start()
+        try:
+            client = CommandQueue(queue_file=str(queue_file), socket_path=_socket_path())
+            assert client.send_command("status", timeout=2.0)["success"] is True
+        finally:
+            processor.stop()
+
+    def test_client_falls_back_on_stale_socket(self, tmp_path):
+        queue_file = tmp_path / "commands.json"
+        path = _socket_path()
+        _stale_socket(path)
+        handler = RecordingHandler()
+        processor = CommandProcessor(handler, queue_file=str(queue_file), backend="file")
+        processor.start()
+        try:
+            client = CommandQueue(queue_file=str(queue_file), socket_path=path)
+            assert client.send_command("status", timeout=2.0)["success"] is True
+            assert handler.calls == [("status", {})]
+        finally:
+            processor.stop()
+            os.unlink(path)
@@ -0,0 +1,74 @@
+"""
+Tests for the futex-backed cross-process event word.
+"""
+
+import ctypes
+import errno
+import threading
+import time
+
+import pytest
+
+from mower.ipc import shared_memory
+from mower.ipc.shared_memory import SharedWordEvent
+
+
+@pytest.fixture
+def buffer():
+    return memoryview(bytearray(64))
+
+
+def test_syscall_number_follows_userland_width():
+    assert shared_memory._futex_number_for("x86_64", 8) == 202
+    assert shared_memory._futex_number_for("aarch64", 8) == 98
+    # 32-bit Raspberry Pi OS on a 64-bit kernel
+    assert shared_memory._futex_number_for("aarch64", 4) == 240
+    assert shared_memory._futex_number_for("armv7l", 4) == 240
+    assert shared_memory._futex_number_for("riscv64", 8) is None
+
+
+def test_wakes_waiter(buffer):
+    event = SharedWordEvent(buffer, 8)
+    seen = event.value
+    threading.Timer(0.05, event.notify).start()
+    start = time.monotonic()
+    assert event.wait(seen, timeout=2.0)
+    assert time.monotonic() - start < 1.0
+    assert not event.wait(event.value, timeout=0.01)
+
+
+def test_unexpected_futex_error_falls_back_to_polling(buffer, monkeypatch):
+    calls = []
+
+    def failing_syscall(*args):
+        calls.append(args)
+        ctypes.set_errno(errno.ENOSYS)
+        return -1
+
+    monkeypatch.setattr(shared_memory, "_futex_syscall", failing_syscall)
+    monkeypatch.setattr(shared_memory, "_futex_number", 98)
+    event = SharedWordEvent(buffer, 8)
+    assert event.uses_futex
+
+    start = time.monotonic()
+    assert not event.wait(event.value, timeout=0.1)
+    assert time.monotonic() - start >= 0.1
+    # One failed call, then sleeps instead of spinning on the syscall
+    assert len(calls) == 1
+    assert not event.uses_futex and shared_memory._futex_syscall is None
+    assert not SharedWordEvent(buffer, 12).uses_futex
+
+    threading.Timer(0.05, event.notify).start()
+    assert event.wait(event.value, timeout=2.0)
+
+
+def test_expected_wait_errors_keep_futex(buffer, monkeypatch):
+    def timed_out(*args):
+        time.sleep(0.01)
+        ctypes.set_errno(errno.ETIMEDOUT)
+        return -1
+
+    monkeypatch.setattr(shared_memory, "_futex_syscall", timed_out)
+    event = SharedWordEvent(buffer, 8)
+    assert not event.wait(event.value, timeout=0.03)
+    assert event.uses_futex
@@ -0,0 +1,139 @@
+"""Test the vectorized boustrophedon coverage generator."""
+
+import time
+
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import LineString
+
+from mower.navigation.coverage import (
+    boustrophedon_cells,
+    boustrophedon_path,
+    coverage_area,
+    sweep_segments,
+)
+from mower.navigation.path_planner import PathPlanner, PatternConfig, PatternType
+
+SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10)]
+# U-shaped yard: a 4 m wide notch cut into the top of a 10 x 10 square
+U_SHAPE = [(0, 0), (10, 0), (10, 10), (7, 10), (7, 3), (3, 3), (3, 10), (0, 10)]
+ISLAND = [(4, 4), (6, 4), (6, 6), (4, 6)]
+
+
+def _passes(path):
+    """Pair a waypoint list into (start, end) passes."""
+    return np.asarray(path).reshape(-1, 2, 2)
+
+
+class TestSweepSegments:
+    """Test cases for clipping passes against the area."""
+
+    def test_square_passes(self):
+        segments, pass_index = sweep_segments(coverage_area(SQUARE), 1.0)
+        assert len(segments) == 10
+        assert pass_index.tolist() == list(range(10))
+        np.testing.assert_allclose(segments[:, :, 0], [[0, 10]] * 10)
+        np.testing.assert_allclose(segments[:, 0, 1], np.arange(0.5, 10, 1.0))
+
+    def test_concave_passes_split(self):
+        segments, pass_index = sweep_segments(coverage_area(U_SHAPE), 1.0)
+        upper = pass_index >= 3
+        # Every pass above the notch floor is cut into two 3 m pieces
+        assert np.bincount(pass_index[upper]).max() == 2
+        np.testing.assert_allclose(segments[upper, 1, 0] - segments[upper, 0, 0], 3.0)
+
+    def test_no_go_zone_is_excluded(self):
+        segments, _ = sweep_segments(coverage_area(SQUARE, [ISLAND]), 0.5)
+        lines = shapely.linestrings(segments)
+        zone = shapely.Polygon(ISLAND)
+        assert not shapely.intersects(lines, shapely.buffer(zone, -1e-6)).any()
+
+    def test_rotated_passes_follow_angle(self):
+        path = boustrophedon_path(SQUARE, 1.0, angle=90)
+        passes = _passes(path)
+        # Vertical passes: x is constant along each pass
+        np.testing.assert_allclose(passes[:, 0, 0], passes[:, 1, 0], atol=1e-9)
+
+    def test_invalid_spacing(self):
+        with pytest.raises(ValueError):
+            sweep_segments(coverage_area(SQUARE), 0)
+
+    def test_degenerate_boundary(self):
+        assert len(boustrophedon_path([(0, 0), (1, 1)], 1.0)) == 0
+        assert len(boustrophedon_path([(0, 0), (1, 1), (2, 2)], 1.0)) == 0
+
+
+class TestBoustrophedonPath:
+    """Test cases for cell decomposition and ordering."""
+
+    def test_u_shape_cells(self):
+        segments, pass_index = sweep_segments(coverage_area(U_SHAPE), 1.0)
+        cells = boustrophedon_cells(segments, pass_index)
+        assert len(np.unique(cells)) == 3
+        assert set(cells[pass_index < 3]) == {0}
+
+    def test_zigzag_alternates_direction(self):
+        passes = _passes(boustrophedon_path(SQUARE, 1.0))
+        direction = np.sign(passes[:, 1, 0] - passes[:, 0, 0])
+        assert (direction[:-1] == -direction[1:]).all()
+
+    def test_parallel_keeps_direction(self):
+        passes = _passes(boustrophedon_path(SQUARE, 1.0, alternate=False))
+        direction = np.sign(passes[:, 1, 0] - passes[:, 0, 0])
+        assert (direction == direction[0]).all()
+
+    def test_transitions_stay_inside_concave_yard(self):
+        area = coverage_area(U_SHAPE)
+        path = boustrophedon_path(U_SHAPE, 1.0)
+        passes = _passes(path)
+        # Within a cell the turn between passes never crosses the notch
+        transitions = [LineString([a[1], b[0]]) for a, b in zip(passes, passes[1:])]
+        inside = [area.buffer(1e-9).covers(line) for line in transitions]
+        # Only the single jump from the first arm to the second may leave the area
+        assert inside.count(False) <= 1
+
+    def test_covers_whole_area(self):
+        area = coverage_area(SQUARE, [ISLAND])
+        path = boustrophedon_path(SQUARE, 0.5, angle=30, no_go_zones=[ISLAND])
+        swath = shapely.union_all([LineString(p).buffer(0.25, cap_style="flat") for p in _passes(path)])
+        assert swath.intersection(area).area / area.area > 0.97
+
+    def test_starts_near_start_point(self):
+        path = boustrophedon_path(SQUARE, 1.0, start=(10, 10))
+        assert np.linalg.norm(path[0] - [10, 9.5]) < 1e-9
+
+    def test_large_property_is_fast(self):
+        boundary = [(0, 0), (2000, 0), (2000, 1500), (1000, 800), (0, 1500)]
+        boustrophedon_path(boundary, 0.3, angle=30)
+        started = time.perf_counter()
+        path = boustrophedon_path(boundary, 0.3, angle=30)
+        elapsed = time.perf_counter() - started
+        assert len(path) > 2 * 5000
+        assert elapsed < 0.5
+
+
+class TestPathPlannerSweeps:
+    """Test cases for the planner's parallel and zigzag generators."""
+
+    def _planner(self, pattern_type, **kwargs):
+        config = PatternConfig(
+            pattern_type=pattern_type,
+            spacing=1.0,
+            angle=0.0,
+            overlap=0.0,
+            start_point=(0.0, 0.0),
+            boundary_points=U_SHAPE,
+            **kwargs,
+        )
+        return PathPlanner(config)
+
+    def test_zigzag_uses_coverage_engine(self):
+        path = self._planner(PatternType.ZIGZAG)._generate_zigzag_path()
+        np.testing.assert_allclose(path, boustrophedon_path(U_SHAPE, 1.0, start=(0.0, 0.0)))
+
+    def test_parallel_respects_no_go_zones(self):
+        zone = [(0.5, 0.5), (2, 0.5), (2, 2), (0.5, 2)]
+        path = self._planner(PatternType.PARALLEL, no_go_zones=[zone])._generate_parallel_path()
+        lines = shapely.linestrings(_passes(path))
+        assert not shapely.intersects(lines, shapely.buffer(shapely.Polygon(zone), -1e-6)).any()
@@ -0,0 +1,114 @@
+"""Test the mowed-area coverage map."""
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from mower.navigation.coverage_map import CoverageMap
+from mower.navigation.path_planner import PathPlanner, PatternConfig, PatternType
+
+ORIGIN = (500000.0, 4000000.0)
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def coverage():
+    # 10 x 6 m yard with a 2 x 2 m flower bed, cut 0.4 m wide on 0.1 m cells
+    area = Polygon(
+        [(ORIGIN[0], ORIGIN[1]), (ORIGIN[0] + 10, ORIGIN[1]), (ORIGIN[0] + 10, ORIGIN[1] + 6), (ORIGIN[0], ORIGIN[1] + 6)],
+        [[(ORIGIN[0] + 4, ORIGIN[1] + 2), (ORIGIN[0] + 6, ORIGIN[1] + 2), (ORIGIN[0] + 6, ORIGIN[1] + 4), (ORIGIN[0] + 4, ORIGIN[1] + 4)]],
+    )
+    return CoverageMap(ORIGIN, (10.0, 6.0), cutting_width=0.4, zone=(17, "S"), area=area)
+
+
+def line(start, end, step=0.2):
+    count = int(np.ceil(np.hypot(end[0] - start[0], end[1] - start[1]) / step)) + 1
+    return list(zip(np.linspace(start[0], end[0], count), np.linspace(start[1], end[1], count)))
+
+
+def mow_stripes(coverage, top=4.5):
+    """Boustrophedon passes 0.3 m apart from the bottom of the yard up to ``top``."""
+    for k, y in enumerate(np.arange(0.15, top, 0.3)):
+        xs = (0.0, 10.0) if k % 2 == 0 else (10.0, 0.0)
+        drive(coverage, line((xs[0], y), (xs[1], y)), start=NOW + k * 100)
+
+
+def drive(coverage, points, blade_on=True, start=NOW, dt=0.2):
+    for i, (x, y) in enumerate(points):
+        coverage.update(ORIGIN[0] + x, ORIGIN[1] + y, blade_on, now=start + i * dt)
+
+
+class TestCoverageUpdates:
+    """Test cases for sweeping the blade across the raster."""
+
+    def test_swept_segment_width(self, coverage):
+        assert coverage.mowable_cells == 6000 - 400
+        drive(coverage, [(1.0, 1.0), (3.0, 1.0)])
+        # A 2 m pass with a 0.4 m blade plus its round ends
+        assert coverage.mowed_area_m2 == pytest.approx(2 * 0.4 + np.pi * 0.2**2, rel=0.15)
+        assert coverage.is_mowed(ORIGIN[0] + 2.0, ORIGIN[1] + 1.15)
+        assert not coverage.is_mowed(ORIGIN[0] + 2.0, ORIGIN[1] + 1.3)
+        assert coverage.coverage_fraction == pytest.approx(coverage.mowed_cells / 5600)
+
+    def test_overlap_counts_once_and_excludes_no_go(self, coverage):
+        drive(coverage, [(1.0, 1.0), (3.0, 1.0)])
+        first = coverage.mowed_cells
+        drive(coverage, [(1.0, 1.0), (3.0, 1.0)], start=NOW + 10)
+        assert coverage.mowed_cells == first
+        # Crossing the flower bed only counts cells outside it
+        drive(coverage, [(3.0, 3.0)], blade_on=False, start=NOW + 19)
+        drive(coverage, line((3.0, 3.0), (7.0, 3.0)), start=NOW + 20)
+        # 2 m outside the bed plus the round ends
+        assert coverage.mowed_cells - first == pytest.approx((2 * 0.4 + np.pi * 0.2**2) / 0.01, rel=0.15)
+
+    def test_blade_off_and_jumps_break_the_line(self, coverage):
+        drive(coverage, [(1.0, 1.0)])
+        drive(coverage, [(1.0, 3.0)], blade_on=False, start=NOW + 1)
+        drive(coverage, [(3.0, 1.0)], start=NOW + 2)
+        assert not coverage.is_mowed(ORIGIN[0] + 2.0, ORIGIN[1] + 1.0)
+        drive(coverage, [(8.0, 1.0)], start=NOW + 3)  # 5 m jump: a GPS glitch
+        assert not coverage.is_mowed(ORIGIN[0] + 5.0, ORIGIN[1] + 1.0)
+
+    def test_new_session_after_idle_gap(self, coverage):
+        drive(coverage, [(1.0, 1.0), (3.0, 1.0)])
+        session = coverage.session_id
+        drive(coverage, [(1.0, 5.0)], start=NOW + coverage.session_gap + 60)
+        assert coverage.session_id != session
+        assert not coverage.is_mowed(ORIGIN[0] + 2.0, ORIGIN[1] + 1.0)
+
+
+class TestCoverageQueries:
+    """Test cases for unmowed regions and snapshots."""
+
+    def test_unmowed_regions(self, coverage):
+        mow_stripes(coverage)  # everything but a strip along the top
+        regions = coverage.unmowed_regions(min_area_m2=0.5)
+        assert len(regions) == 1
+        min_e, min_n, max_e, max_n = regions[0].polygon.bounds
+        assert (min_e, max_e) == pytest.approx((ORIGIN[0], ORIGIN[0] + 10.0))
+        assert min_n - ORIGIN[1] == pytest.approx(4.5, abs=0.2)
+        assert regions[0].area_m2 == pytest.approx(10 * 1.5, rel=0.1)
+
+    def test_snapshot_round_trip(self, coverage, tmp_path):
+        drive(coverage, [(1.0, 1.0), (3.0, 1.0)])
+        path = coverage.save_snapshot(tmp_path)
+        assert path.name == f"{coverage.session_id}.npz"
+        assert coverage.save_snapshot(tmp_path) is None  # unchanged
+
+        resumed = CoverageMap(ORIGIN, (10.0, 6.0), cutting_width=0.4, zone=(17, "S"))
+        other = CoverageMap(ORIGIN, (12.0, 6.0), cutting_width=0.4)
+        assert not other.resume_latest(tmp_path)
+        assert resumed.resume_latest(tmp_path)
+        assert resumed.session_id == coverage.session_id
+        assert resumed.is_mowed(ORIGIN[0] + 2.0, ORIGIN[1] + 1.0)
+
+
+def test_touch_up_path_covers_unmowed_region(coverage):
+    mow_stripes(coverage)
+    config = PatternConfig(PatternType.PARALLEL, spacing=0.4, angle=0.0, overlap=0.1, start_point=(0, 0), boundary_points=[])
+    planner = PathPlanner(config, coverage_map=coverage)
+    waypoints = np.array(planner.plan_touch_up())
+    assert len(waypoints)
+    easting, northing = coverage.latlon_to_local(waypoints[:, 0], waypoints[:, 1])
+    assert northing.min() - ORIGIN[1] > 4.3
+    assert easting.max() - easting.min() > 9.0
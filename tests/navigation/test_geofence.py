@@ -0,0 +1,122 @@
+"""Test the shared geofence index."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from mower.navigation.geofence import (
+    Geofence,
+    get_geofence,
+    load_boundary,
+    load_no_go_zones,
+    prepared_polygon,
+    save_boundary,
+    save_no_go_zones,
+)
+
+# (lng, lat) square of 0.001 degrees with a no-go zone in the north-east quarter
+BOUNDARY = [(-84.001, 39.0), (-84.0, 39.0), (-84.0, 39.001), (-84.001, 39.001)]
+NO_GO = [(-84.0004, 39.0006), (-84.0001, 39.0006), (-84.0001, 39.0009), (-84.0004, 39.0009)]
+
+
+@pytest.fixture
+def geofence():
+    return Geofence(BOUNDARY, [NO_GO])
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+    # Make sure the change is visible even on filesystems with coarse mtimes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestGeofence:
+    """Test cases for containment checks."""
+
+    def test_scalar_checks(self, geofence):
+        assert geofence.contains(39.0002, -84.0008)
+        assert geofence.within_boundary(39.0007, -84.0002)
+        assert not geofence.contains(39.0007, -84.0002)  # inside the no-go zone
+        assert not geofence.contains(39.002, -84.0008)  # outside the boundary
+
+    def test_vectorized_matches_scalar(self, geofence):
+        rng = np.random.default_rng(4)
+        x = rng.uniform(-84.0012, -83.9998, 500)
+        y = rng.uniform(38.9998, 39.0012, 500)
+        mask = geofence.contains_xy(x, y)
+        assert mask.shape == (500,)
+        assert mask.tolist() == [geofence.contains(lat, lon) for lon, lat in zip(x, y)]
+        assert 0 < mask.sum() < 500
+
+    def test_without_boundary_everything_is_allowed_except_no_go(self):
+        geofence = Geofence([], [NO_GO])
+        assert not geofence.has_boundary
+        assert geofence.contains(10.0, 10.0)
+        assert not geofence.contains(39.0007, -84.0002)
+
+    def test_path_is_clear(self, geofence):
+        assert geofence.path_is_clear([(39.0001, -84.0009), (39.0001, -84.0001)])
+        assert not geofence.path_is_clear([(39.0007, -84.0009), (39.0007, -84.00005)])  # crosses no-go
+        assert not geofence.path_is_clear([(39.0005, -84.0005), (39.0015, -84.0005)])  # leaves the yard
+        assert len(geofence.no_go_zones_intersecting(geofence.no_go_zones[0])) == 1
+
+    def test_prepared_polygon_is_cached(self):
+        square = np.array([[0, 0], [10, 0], [10, 10], [0, 10]], dtype=float)
+        assert prepared_polygon(square) is prepared_polygon(square.tolist())
+
+
+class TestGeofenceFiles:
+    """Test cases for loading, saving and invalidation."""
+
+    def test_reads_all_boundary_layouts(self, tmp_path):
+        path = tmp_path / "user_polygon.json"
+        dict_points = [{"lat": lat, "lng": lng} for lng, lat in BOUNDARY]
+        layouts = [
+            dict_points,
+            {"boundary": [list(p) for p in BOUNDARY], "home": [39.0005, -84.0005]},
+            {"coordinates": [[list(p) for p in BOUNDARY]]},
+        ]
+        for layout in layouts:
+            path.write_text(json.dumps(layout))
+            assert load_boundary(path) == dict_points
+
+    def test_missing_files_give_empty_geofence(self, tmp_path):
+        geofence = get_geofence(tmp_path / "missing.json", tmp_path / "zones.json")
+        assert geofence.boundary_points == []
+        assert geofence.no_go_zones == []
+
+    def test_index_is_cached_until_files_change(self, tmp_path):
+        boundary_path, zones_path = tmp_path / "user_polygon.json", tmp_path / "no_go_zones.json"
+        _write(boundary_path, [{"lat": lat, "lng": lng} for lng, lat in BOUNDARY])
+        first = get_geofence(boundary_path, zones_path)
+        assert get_geofence(boundary_path, zones_path) is first
+
+        _write(zones_path, [[{"lat": lat, "lng": lng} for lng, lat in NO_GO]])
+        second = get_geofence(boundary_path, zones_path)
+        assert second is not first
+        assert not second.contains(39.0007, -84.0002)
+
+    def test_save_invalidates_and_preserves_other_keys(self, tmp_path):
+        boundary_path, zones_path = tmp_path / "user_polygon.json", tmp_path / "no_go_zones.json"
+        boundary_path.write_text(json.dumps({"boundary": [list(p) for p in BOUNDARY], "home": [1, 2]}))
+        before = get_geofence(boundary_path, zones_path)
+
+        triangle = [{"lat": 39.0, "lng": -84.0}, {"lat": 39.0, "lng": -83.9}, {"lat": 39.1, "lng": -83.9}]
+        save_boundary(triangle, path=boundary_path)
+        save_no_go_zones([[list(p) for p in NO_GO]], path=zones_path)
+
+        after = get_geofence(boundary_path, zones_path)
+        assert after is not before
+        assert len(after.boundary_points) == 3
+        assert json.loads(boundary_path.read_text())["home"] == [1, 2]
+        assert load_no_go_zones(zones_path) == [[{"lat": lat, "lng": lng} for lng, lat in NO_GO]]
+
+    def test_save_rejects_degenerate_polygons(self, tmp_path):
+        with pytest.raises(ValueError):
+            save_boundary([{"lat": 1, "lng": 2}], path=tmp_path / "b.json")
+        with pytest.raises(ValueError):
+            save_no_go_zones([[[0, 0], [1, 1]]], path=tmp_path / "z.json")
+        assert not (tmp_path / "b.json").exists()
@@ -0,0 +1,118 @@
+"""Test the incremental NMEA stream parser."""
+
+import operator
+import random
+from functools import reduce
+
+import pytest
+import utm
+
+from mower.navigation.gps import parse_gps_position
+from mower.navigation.nmea_stream import NmeaStreamParser, UtmProjector, nmea_checksum
+
+
+def _sentence(body: str) -> bytes:
+    return f"${body}*{reduce(operator.xor, body.encode(), 0):02X}\r\n".encode()
+
+
+def _nmea_angle(value: float, width: int) -> str:
+    degrees = int(abs(value))
+    return f"{degrees:0{width}d}{(abs(value) - degrees) * 60:010.7f}"
+
+
+def _epoch(second: float, lat: float, lon: float, quality: int = 4) -> bytes:
+    """One receiver epoch: GGA, RMC, GSA and a GSV the parser should skip."""
+    stamp = f"1200{second:05.2f}"
+    lat_s, ns = _nmea_angle(lat, 2), "N" if lat >= 0 else "S"
+    lon_s, ew = _nmea_angle(lon, 3), "E" if lon >= 0 else "W"
+    return b"".join(
+        [
+            _sentence(f"GNGGA,{stamp},{lat_s},{ns},{lon_s},{ew},{quality},14,0.7,250.1,M,-33.0,M,1.0,0000"),
+            _sentence(f"GNRMC,{stamp},A,{lat_s},{ns},{lon_s},{ew},0.5,90.0,161026,,,R"),
+            _sentence("GNGSA,A,3,01,03,06,09,12,17,19,22,,,,,1.2,0.7,0.9"),
+            _sentence("GPGSV,3,1,12,01,40,083,46,03,19,302,41,06,63,219,48,09,15,112,37"),
+        ]
+    )
+
+
+class TestChecksumAndProjection:
+    """Test cases for the byte checksum and cached UTM projection."""
+
+    def test_checksum_matches_bytewise_xor(self):
+        rng = random.Random(0)
+        for length in range(200):
+            body = bytes(rng.getrandbits(8) for _ in range(length))
+            assert nmea_checksum(body) == reduce(operator.xor, body, 0)
+
+    def test_projection_matches_utm(self):
+        rng = random.Random(1)
+        projector = UtmProjector()
+        for _ in range(500):
+            lat, lon = rng.uniform(-79.9, 83.9), rng.uniform(-180, 179.9)
+            easting, northing, number, letter = projector.from_latlon(lat, lon)
+            expected = utm.from_latlon(lat, lon)
+            assert (number, letter) == expected[2:]
+            assert (easting, northing) == pytest.approx(expected[:2], abs=1e-6)
+
+    def test_zone_is_cached(self):
+        projector = UtmProjector()
+        for step in range(100):
+            projector.from_latlon(39.0 + step * 1e-5, -84.1)
+        assert projector.zone_changes == 1
+        # Crossing the 84 W zone edge switches zones
+        assert projector.from_latlon(39.0, -83.9)[2] == 17 and projector.zone_changes == 2
+
+    def test_special_zone(self):
+        assert UtmProjector().from_latlon(60.0, 5.0)[2] == utm.from_latlon(60.0, 5.0)[2] == 32
+
+
+class TestNmeaStreamParser:
+    """Test cases for framing and parsing byte chunks."""
+
+    def test_10hz_stream_in_random_chunks(self):
+        stream = b"".join(_epoch(i / 10, 39.0 + i * 1e-7, -84.0) for i in range(600))
+        parser = NmeaStreamParser()
+        rng = random.Random(2)
+        offset = 0
+        while offset < len(stream):
+            size = rng.randint(1, 300)
+            parser.feed(stream[offset : offset + size])
+            offset += size
+        assert parser.stats["sentences"] == 2400
+        assert parser.stats["positions"] == 600  # one per epoch despite GGA + RMC
+        assert parser.stats["ignored"] == 600
+        assert parser.stats["checksum_errors"] == 0
+        assert parser.metadata == {"satellites": 8, "hdop": 0.7, "fix_quality": 4, "altitude": 250.1}
+
+        _, easting, northing, number, letter = parser.position
+        expected = utm.from_latlon(39.0 + 599e-7, -84.0)
+        assert (easting, northing) == pytest.approx(expected[:2], abs=0.01)
+        assert (number, letter) == expected[2:]
+
+    def test_matches_line_parser(self):
+        line = _epoch(0, -33.8688, 151.2093).split(b"\r\n")[0]
+        parser = NmeaStreamParser(clock=lambda: 5.0)
+        parser.feed(line + b"\r\n")
+        assert parser.position[0] == 5.0
+        assert parser.position[1:] == pytest.approx(parse_gps_position(line.decode()), abs=1e-6)
+
+    def test_callback_and_no_fix(self):
+        positions = []
+        parser = NmeaStreamParser(on_position=positions.append)
+        parser.feed(_epoch(0, 39.0, -84.0, quality=0).split(b"\r\n")[0] + b"\r\n")
+        assert positions == [] and parser.metadata is None
+        parser.feed(_epoch(1, 39.0, -84.0))
+        assert len(positions) == 1
+
+    def test_corruption_and_resync(self):
+        good = _epoch(0, 39.0, -84.0)
+        corrupted = good.replace(b"GNGGA,12", b"GNGGA,13", 1)
+        parser = NmeaStreamParser(max_sentence_length=128)
+        # Checksum error, a sentence cut off by the next '$', then line noise without newlines
+        parser.feed(corrupted + b"$GNGGA,1200" + good)
+        parser.feed(b"$" + b"x" * 300)
+        parser.feed(good)
+        assert parser.stats["checksum_errors"] == 1
+        assert parser.stats["overflows"] == 1
+        assert parser.stats["positions"] == 1  # the repeated epoch is not projected again
+        assert len(parser._buffer) == 0
@@ -0,0 +1,184 @@
+"""Test the log-odds occupancy grid."""
+
+import numpy as np
+import pytest
+
+from mower.navigation.occupancy_grid import (
+    LOG_ODDS_LIMIT,
+    OccupancyGrid,
+    camera_ray,
+)
+
+ORIGIN = (500000.0, 4000000.0)
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def grid():
+    return OccupancyGrid(ORIGIN, (20.0, 10.0), resolution=0.1)
+
+
+class TestOccupancyGridUpdates:
+    """Test cases for fusing observations."""
+
+    def test_unknown_and_off_grid_cells(self, grid):
+        assert grid.probability(ORIGIN[0] + 1, ORIGIN[1] + 1, now=NOW) == 0.5
+        assert grid.probability(ORIGIN[0] - 5, ORIGIN[1], now=NOW) == 0.5
+        assert (grid.rows, grid.cols) == (100, 200)
+
+    def test_repeated_hits_raise_probability(self, grid):
+        point = [(ORIGIN[0] + 3.05, ORIGIN[1] + 2.05)]
+        grid.mark_occupied(point, now=NOW)
+        first = grid.probability(*point[0], now=NOW)
+        grid.mark_occupied(point * 3, now=NOW)  # repeated points in one batch all count
+        assert 0.5 < first < grid.probability(*point[0], now=NOW)
+        assert grid.is_occupied(*point[0], now=NOW)
+
+    def test_log_odds_are_clamped(self, grid):
+        point = (ORIGIN[0] + 1, ORIGIN[1] + 1)
+        grid.mark_occupied([point] * 100, now=NOW)
+        assert grid.probability(*point, now=NOW) == pytest.approx(1 / (1 + np.exp(-LOG_ODDS_LIMIT)))
+
+    def test_ray_clears_path_and_marks_end(self, grid):
+        start = (ORIGIN[0] + 1.05, ORIGIN[1] + 5.05)
+        end = (ORIGIN[0] + 4.05, ORIGIN[1] + 5.05)
+        for _ in range(3):
+            grid.update_rays(start, [end], now=NOW)
+        along = np.linspace(start[0], end[0] - 0.2, 20)
+        assert (grid.probability(along, np.full(20, start[1]), now=NOW) < 0.5).all()
+        assert grid.is_occupied(*end, now=NOW)
+        # Cells beyond the hit are untouched
+        assert grid.probability(end[0] + 0.5, end[1], now=NOW) == 0.5
+
+    def test_max_range_ray_only_clears(self, grid):
+        grid.integrate_range(ORIGIN[0] + 5, ORIGIN[1] + 5, heading=90.0, distance=4.0, max_range=2.0, now=NOW)
+        assert grid.probability(ORIGIN[0] + 6.95, ORIGIN[1] + 5, now=NOW) < 0.5
+        assert grid.probability(ORIGIN[0] + 7.5, ORIGIN[1] + 5, now=NOW) == 0.5
+
+    def test_heading_convention(self, grid):
+        # Heading 0 is north and angles grow clockwise
+        x, y = ORIGIN[0] + 5.05, ORIGIN[1] + 2.05
+        grid.integrate_range(x, y, heading=0.0, distance=1.0, max_range=2.0, now=NOW)
+        grid.integrate_range(x, y, heading=0.0, distance=1.0, max_range=2.0, sensor_angle=90.0, now=NOW)
+        assert grid.is_occupied(x, y + 1.0, now=NOW)
+        assert grid.is_occupied(x + 1.0, y, now=NOW)
+        assert grid.probability(x - 1.0, y, now=NOW) == 0.5
+
+    def test_batch_of_rays(self, grid):
+        angles = np.linspace(0, np.pi, 50)
+        center = np.array([ORIGIN[0] + 10, ORIGIN[1] + 2])
+        ends = center + 3.0 * np.column_stack([np.cos(angles), np.sin(angles)])
+        grid.update_rays(center, ends, now=NOW)
+        assert grid.is_occupied(ends[:, 0], ends[:, 1], now=NOW).all()
+
+    def test_stale_evidence_decays(self):
+        grid = OccupancyGrid(ORIGIN, (5.0, 5.0), decay_half_life=60.0)
+        point = (ORIGIN[0] + 1, ORIGIN[1] + 1)
+        grid.mark_occupied([point] * 4, now=NOW)
+        fresh = grid.probability(*point, now=NOW)
+        later = grid.probability(*point, now=NOW + 600)
+        assert fresh > 0.9
+        assert 0.5 < later < 0.51
+        assert not grid.is_occupied(*point, now=NOW + 600)
+
+
+class TestCameraRay:
+    """Test cases for placing camera detections on the ground plane."""
+
+    CAMERA = dict(hfov_deg=60.0, vfov_deg=45.0, height_m=0.3, pitch_deg=15.0)
+
+    def test_box_on_the_optical_axis(self):
+        angle, distance = camera_ray([300, 100, 340, 240], (640, 480), **self.CAMERA)
+        assert angle == pytest.approx(0.0)
+        assert distance == pytest.approx(0.3 / np.tan(np.radians(15.0)))
+
+    def test_lower_and_right_boxes(self):
+        near = camera_ray([300, 300, 340, 400], (640, 480), **self.CAMERA)
+        right = camera_ray([500, 100, 600, 240], (640, 480), **self.CAMERA)
+        assert near[1] < 0.3 / np.tan(np.radians(15.0))
+        assert 0 < right[0] < 30.0
+
+    def test_box_above_horizon(self):
+        # The horizon is 15 degrees above the image center
+        assert camera_ray([300, 0, 340, 50], (640, 480), **self.CAMERA) is None
+
+    def test_detection_marks_grid(self, grid):
+        x, y = ORIGIN[0] + 5.05, ORIGIN[1] + 2.05
+        angle, distance = camera_ray([300, 100, 340, 240], (640, 480), **self.CAMERA)
+        grid.integrate_range(x, y, 0.0, distance, 5.0, sensor_angle=angle, now=NOW)
+        assert grid.is_occupied(x, y + distance, now=NOW)
+
+
+class TestOccupancyGridQueries:
+    """Test cases for region queries and persistence."""
+
+    def test_region_and_occupied_cells(self, grid):
+        points = [(ORIGIN[0] + 2.05, ORIGIN[1] + 2.05), (ORIGIN[0] + 15.05, ORIGIN[1] + 8.05)]
+        grid.mark_occupied(points * 2, now=NOW)
+
+        window = grid.region(ORIGIN[0] + 1, ORIGIN[1] + 1, ORIGIN[0] + 3, ORIGIN[1] + 3, now=NOW)
+        assert window.shape == (21, 21)
+        assert (window > 0.65).sum() == 1
+
+        cells = grid.occupied_cells(now=NOW)
+        np.testing.assert_allclose(sorted(cells.tolist()), points)
+        assert len(grid.occupied_cells((ORIGIN[0], ORIGIN[1], ORIGIN[0] + 5, ORIGIN[1] + 5), now=NOW)) == 1
+
+    def test_any_occupied_within(self, grid):
+        grid.mark_occupied([(ORIGIN[0] + 5.05, ORIGIN[1] + 5.05)] * 2, now=NOW)
+        assert grid.any_occupied_within(ORIGIN[0] + 5.5, ORIGIN[1] + 5.05, 0.6, now=NOW)
+        assert not grid.any_occupied_within(ORIGIN[0] + 6.0, ORIGIN[1] + 5.05, 0.6, now=NOW)
+
+    def test_latlon_round_trip(self):
+        boundary = [(39.0, -84.0), (39.0005, -84.0), (39.0005, -83.9995), (39.0, -83.9995)]
+        grid = OccupancyGrid.from_latlon_bounds(boundary, margin=2.0, resolution=0.5)
+        assert 40 < grid.cols * grid.resolution < 50
+        grid.mark_latlon([(39.00025, -83.99975)] * 2, now=NOW)
+        easting, northing = grid.latlon_to_local(39.00025, -83.99975)
+        assert grid.is_occupied(easting, northing, now=NOW)
+        lat, lon = grid.local_to_latlon(easting, northing)
+        assert (lat, lon) == pytest.approx((39.00025, -83.99975))
+
+    def test_memmap_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "grid.npy")
+        grid = OccupancyGrid(ORIGIN, (5.0, 5.0), path=path)
+        grid.mark_occupied([(ORIGIN[0] + 1, ORIGIN[1] + 1)] * 3, now=NOW)
+        grid.close()
+
+        reopened = OccupancyGrid(ORIGIN, (5.0, 5.0), path=path)
+        assert reopened.is_occupied(ORIGIN[0] + 1, ORIGIN[1] + 1, now=NOW)
+
+        # A different layout starts a fresh map instead of misreading the file
+        resized = OccupancyGrid(ORIGIN, (6.0, 5.0), path=path)
+        assert resized.probability(ORIGIN[0] + 1, ORIGIN[1] + 1, now=NOW) == 0.5
+
+    def test_read_only_view_of_another_writer(self, tmp_path):
+        path = str(tmp_path / "grid.npy")
+        writer = OccupancyGrid(ORIGIN, (5.3, 4.0), resolution=0.1, zone=(17, "S"), path=path)
+        reader = OccupancyGrid.open_read_only(path)
+        assert (reader.rows, reader.cols, reader.zone) == (writer.rows, writer.cols, (17, "S"))
+
+        writer.mark_occupied([(ORIGIN[0] + 1, ORIGIN[1] + 1)] * 3, now=NOW)
+        writer.flush()
+        assert reader.is_occupied(ORIGIN[0] + 1, ORIGIN[1] + 1, now=NOW)
+        with pytest.raises(ValueError):
+            reader.mark_occupied([(ORIGIN[0] + 2, ORIGIN[1] + 2)], now=NOW)
+        with pytest.raises(OSError):
+            OccupancyGrid.open_read_only(str(tmp_path / "missing.npy"))
+
+
+class TestPathPlannerGrid:
+    """Test cases for the planner's use of the occupancy grid."""
+
+    def test_obstacles_are_recorded_in_grid(self):
+        from mower.navigation.path_planner import PathPlanner, PatternConfig, PatternType
+
+        boundary = [(39.0, -84.0), (39.0005, -84.0), (39.0005, -83.9995), (39.0, -83.9995)]
+        grid = OccupancyGrid.from_latlon_bounds(boundary, resolution=0.25)
+        config = PatternConfig(PatternType.PARALLEL, 1.0, 0.0, 0.1, boundary[0], boundary)
+        planner = PathPlanner(config, occupancy_grid=grid)
+
+        assert not planner.is_position_blocked(39.00025, -83.99975)
+        planner.update_obstacle_map([(39.00025, -83.99975)] * 2)
+        assert planner.is_position_blocked(39.00025, -83.99975)
+        assert not planner.is_position_blocked(39.0001, -83.9999)
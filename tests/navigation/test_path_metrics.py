@@ -0,0 +1,83 @@
+"""Test the vectorized path metrics."""
+
+import math
+
+import numpy as np
+import pytest
+
+from mower.navigation.coverage import boustrophedon_path
+from mower.navigation.path_metrics import path_metrics, segment_lengths
+
+L_YARD = [(0, 0), (20, 0), (20, 5), (5, 5), (5, 20), (0, 20)]
+
+
+class TestPathMetrics:
+    """Test cases for length, turning and coverage figures."""
+
+    def test_length_and_turns(self):
+        path = [(0, 0), (10, 0), (10, 0), (10, 10), (0, 10), (0, 10.1)]
+        metrics = path_metrics(path)
+        assert metrics.length == pytest.approx(30.1)
+        np.testing.assert_allclose(segment_lengths(path), [10, 0, 10, 10, 0.1])
+        # The zero-length segment carries no heading: three corners remain
+        assert metrics.turn_count == 3
+        assert metrics.total_turning == pytest.approx(math.pi / 2 + math.pi / 2 + math.pi / 2)
+        assert metrics.smoothness == pytest.approx(0.5)
+
+    def test_straight_and_degenerate_paths(self):
+        assert path_metrics([(0, 0), (1, 1), (2, 2)]).smoothness == 1.0
+        assert path_metrics([(0, 0), (1, 0), (0, 0)]).smoothness == 0.0
+        empty = path_metrics([])
+        assert (empty.length, empty.turn_count, empty.coverage) == (0.0, 0, 0.0)
+        assert path_metrics([(1, 1)], L_YARD, width=0.5).swept_area == pytest.approx(math.pi * 0.0625, rel=0.02)
+
+    def test_concave_yard_coverage(self):
+        area = 20 * 5 + 5 * 15
+        # One pass along the long leg of the L covers its 1 m wide strip only
+        metrics = path_metrics([(0.5, 0.5), (19.5, 0.5)], L_YARD, width=1.0)
+        assert metrics.coverage == pytest.approx((19 + math.pi / 4) / area, rel=0.01)
+
+        # The diagonal is mostly over the empty corner, which is not credited
+        diagonal = path_metrics([(19, 4), (4, 19)], L_YARD, width=1.0)
+        assert diagonal.coverage < 0.25 * diagonal.swept_area / area
+
+        sweep = boustrophedon_path(L_YARD, 0.5)
+        full = path_metrics(sweep, L_YARD, width=0.5)
+        assert full.coverage > 0.97
+        assert full.overlap < 0.1
+
+    def test_overlap_and_no_go_zones(self):
+        back_and_forth = path_metrics([(0, 1), (10, 1), (0, 1)], width=1.0)
+        assert back_and_forth.overlap == pytest.approx(0.5, abs=0.02)
+
+        square = [(0, 0), (4, 0), (4, 4), (0, 4)]
+        zone = [(0, 2), (4, 2), (4, 4), (0, 4)]
+        metrics = path_metrics([(0, 1), (4, 1)], square, width=2.0, no_go_zones=[zone])
+        assert metrics.coverage == pytest.approx(1.0)
+
+
+class TestPlannerCoverage:
+    """Test cases for the planner's coverage figure."""
+
+    def _planner(self, boundary, spacing=0.5):
+        from mower.navigation.path_planner import PathPlanner, PatternConfig, PatternType
+
+        config = PatternConfig(PatternType.PARALLEL, spacing, 0.0, 0.1, boundary[0], boundary)
+        return PathPlanner(config)
+
+    def test_latlon_boundary_is_measured_in_meters(self):
+        # About 44 x 43 m around (39, -84)
+        boundary = [(39.0, -84.0), (39.0004, -84.0), (39.0004, -83.9995), (39.0, -83.9995)]
+        planner = self._planner(boundary)
+        # One 0.5 m pass across the yard covers about 1% of it, not all of it
+        west_to_east = [(39.0002, -84.0), (39.0002, -83.9995)]
+        assert 0.005 < planner._calculate_coverage(west_to_east) < 0.02
+
+        stripes = []
+        for k, lat in enumerate(np.arange(39.0, 39.0004, 0.0000045)):
+            stripes += [(lat, -84.0), (lat, -83.9995)][:: 1 if k % 2 == 0 else -1]
+        assert planner._calculate_coverage(stripes) > 0.95
+
+    def test_metric_boundary_is_used_as_is(self):
+        planner = self._planner([(0, 0), (10, 0), (10, 10), (0, 10)], spacing=1.0)
+        assert planner._calculate_coverage([(0, 5), (10, 5)]) == pytest.approx(0.1, rel=0.05)
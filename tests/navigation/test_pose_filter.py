@@ -0,0 +1,172 @@
+"""Test the pose EKF and its use by Localization."""
+
+import math
+
+import numpy as np
+import pytest
+import utm
+
+from mower.navigation.localization import Localization
+from mower.navigation.pose_filter import (
+    HEADING,
+    VELOCITY,
+    YAW_RATE,
+    PoseEKF,
+    compass_to_yaw,
+    imu_yaw_to_yaw,
+    wrap_angle,
+    yaw_to_compass,
+)
+
+ORIGIN = (500000.0, 4300000.0)
+
+
+def _drive(ekf, seconds, speed=0.5, yaw=0.3, gps_std=0.5, rate_hz=50, seed=0):
+    """Drive straight along ``yaw`` with 1 Hz GPS and IMU heading at ``rate_hz``; returns the true end point."""
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / rate_hz
+    x, y = ORIGIN
+    for step in range(int(seconds * rate_hz)):
+        x += speed * math.cos(yaw) * dt
+        y += speed * math.sin(yaw) * dt
+        ekf.predict(dt)
+        ekf.update_heading(yaw + rng.normal(0, 0.02))
+        ekf.update_yaw_rate(rng.normal(0, 0.01))
+        if step % rate_hz == 0:
+            ekf.update_gps(x + rng.normal(0, gps_std), y + rng.normal(0, gps_std), hdop=gps_std / 0.8, fix_quality=2)
+    return x, y
+
+
+class TestPoseEKF:
+    """Test cases for prediction and measurement fusion."""
+
+    def test_first_fix_initializes(self):
+        ekf = PoseEKF()
+        ekf.predict(0.1)
+        assert not ekf.initialized
+        assert ekf.update_gps(*ORIGIN, hdop=1.0, fix_quality=4)
+        assert ekf.x[0] == ORIGIN[0]
+        assert ekf.position_std == pytest.approx(0.02)
+
+    def test_tracks_straight_drive(self):
+        ekf = PoseEKF()
+        x, y = _drive(ekf, seconds=60)
+        assert math.hypot(ekf.x[0] - x, ekf.x[1] - y) < 0.5
+        assert ekf.x[VELOCITY] == pytest.approx(0.5, abs=0.1)
+        assert ekf.x[HEADING] == pytest.approx(0.3, abs=0.05)
+        assert ekf.position_std < 0.5
+
+    def test_hdop_weights_fixes(self):
+        moves = []
+        for hdop in (1.0, 10.0):
+            ekf = PoseEKF()
+            ekf.reset(*ORIGIN, position_std=1.0)
+            ekf.update_gps(ORIGIN[0] + 1.0, ORIGIN[1], hdop=hdop, fix_quality=1)
+            moves.append(ekf.x[0] - ORIGIN[0])
+        assert moves[0] > moves[1] > 0
+
+    def test_rejects_no_fix_and_outliers(self):
+        ekf = PoseEKF()
+        ekf.reset(*ORIGIN, position_std=0.1)
+        assert not ekf.update_gps(*ORIGIN, fix_quality=0)
+        assert not ekf.update_gps(ORIGIN[0] + 50, ORIGIN[1], hdop=1.0, fix_quality=4)
+        assert ekf.rejected_gps == 1
+        assert ekf.x[0] == ORIGIN[0]
+
+    def test_repeated_outliers_reanchor_position(self):
+        ekf = PoseEKF(max_gps_rejections=3)
+        ekf.reset(*ORIGIN, heading=0.3, position_std=0.1)
+        moved = (ORIGIN[0] + 50, ORIGIN[1])
+        assert not ekf.update_gps(*moved, hdop=1.0, fix_quality=4)
+        assert not ekf.update_gps(*moved, hdop=1.0, fix_quality=4)
+        assert ekf.update_gps(*moved, hdop=1.0, fix_quality=4)
+        assert (ekf.x[0], ekf.x[1]) == moved
+        assert ekf.x[HEADING] == pytest.approx(0.3)
+        assert ekf.rejected_gps == 3 and ekf.consecutive_rejected_gps == 0
+        # Back on track, the next fix passes the gate
+        assert ekf.update_gps(moved[0] + 0.01, moved[1], hdop=1.0, fix_quality=4)
+
+    def test_heading_innovation_wraps(self):
+        ekf = PoseEKF()
+        ekf.reset(*ORIGIN, heading=math.pi - 0.05)
+        ekf.update_heading(-math.pi + 0.05)
+        # Corrected across the +/-pi seam rather than swinging through zero
+        assert abs(wrap_angle(ekf.x[HEADING] - math.pi)) < 0.1
+
+    def test_steps_reuse_buffers(self):
+        ekf = PoseEKF()
+        ekf.reset(*ORIGIN)
+        state, covariance = ekf.x, ekf.P
+        _drive(ekf, seconds=2)
+        assert ekf.x is state and ekf.P is covariance
+        np.testing.assert_allclose(ekf.P, ekf.P.T)
+
+    def test_compass_conversion(self):
+        assert compass_to_yaw(0) == pytest.approx(math.pi / 2)
+        assert compass_to_yaw(90) == pytest.approx(0)
+        assert yaw_to_compass(compass_to_yaw(250.0)) == pytest.approx(250.0)
+        assert imu_yaw_to_yaw(90.0) == pytest.approx(math.pi / 2)
+        assert imu_yaw_to_yaw(350.0, offset_deg=20.0) == pytest.approx(math.radians(10.0))
+
+
+class TestLocalizationFusion:
+    """Test cases for Localization feeding the filter."""
+
+    @pytest.fixture
+    def localization(self):
+        localization = Localization()
+        localization.filter = PoseEKF()
+        localization.utm_zone = None
+        localization._last_fix_time = None
+        localization._last_propagate = None
+        localization.sensor_interface = None
+        return localization
+
+    def test_propagate_reads_the_shared_sensor_interface(self, localization):
+        class SharedInterface:
+            def get_sensor_data(self):
+                return {"imu": {"heading": 90.0, "gyroscope": {"z": 0.0}}}
+
+        shared = SharedInterface()
+        localization.set_sensor_interface(shared)
+        localization.propagate(now=0.0)
+        assert localization.get_sensor_interface() is shared
+        assert localization.position.heading == pytest.approx(0.0)
+
+    def test_gyro_rate_agrees_with_heading_series(self, localization):
+        easting, northing, zone_number, zone_letter = utm.from_latlon(39.0, -84.0)
+        localization._process_sensor_data((1.0, easting, northing, zone_number, zone_letter), {"fix_quality": 4})
+        rate = 0.2  # rad/s, counter-clockwise
+        dt = 0.02
+        for step in range(250):
+            t = step * dt
+            imu = {"heading": math.degrees(rate * t) % 360.0, "gyroscope": {"z": rate}}
+            localization._propagate({"imu": imu}, now=t)
+
+        ekf = localization.filter
+        assert ekf.x[YAW_RATE] == pytest.approx(rate, abs=0.01)
+        assert wrap_angle(ekf.x[HEADING] - rate * 249 * dt) == pytest.approx(0.0, abs=0.02)
+        # Turning left from east swings the compass heading towards north
+        assert localization.position.heading == pytest.approx(yaw_to_compass(rate * 249 * dt), abs=1.5)
+
+    def test_fuses_utm_fixes_and_imu(self, localization):
+        easting, northing, zone_number, zone_letter = utm.from_latlon(39.0, -84.0)
+        metadata = {"hdop": 0.8, "fix_quality": 4}
+        localization._process_sensor_data((1.0, easting, northing, zone_number, zone_letter), metadata)
+        for step in range(50):
+            # IMU yaw 0 points east: compass heading 90
+            localization._propagate({"imu": {"heading": 0.0, "gyroscope": {"z": 0.0}}}, now=step * 0.02)
+        lat, lon = localization._process_sensor_data((2.0, easting, northing, zone_number, zone_letter), metadata)
+
+        assert (lat, lon) == pytest.approx((39.0, -84.0), abs=1e-6)
+        assert localization.position.heading == pytest.approx(90.0, abs=1.0)
+        covariance = localization.get_position_covariance()
+        assert len(covariance) == 2 and covariance[0][0] < 0.01
+
+    def test_repeated_fix_is_not_fused_twice(self, localization):
+        easting, northing, zone_number, zone_letter = utm.from_latlon(39.0, -84.0)
+        fix = (1.0, easting, northing, zone_number, zone_letter)
+        localization._process_sensor_data(fix, {"hdop": 1.0, "fix_quality": 1})
+        before = localization.filter.position_std
+        localization._process_sensor_data(fix, {"hdop": 1.0, "fix_quality": 1})
+        assert localization.filter.position_std == before
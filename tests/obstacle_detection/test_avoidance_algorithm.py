@@ -586,3 +586,28 @@ class TestAvoidanceAlgorithm:
 
         # Verify that the function return ed True
         assert result is True
+
+    def test_tof_reading_is_fused_once(self):
+        """Test that each ToF reading enters the occupancy grid exactly once."""
+        avoidance_algorithm = AvoidanceAlgorithm(resource_manager=MagicMock(), pattern_planner=MagicMock())
+        avoidance_algorithm.occupancy_grid = MagicMock()
+        avoidance_algorithm._grid_pose = MagicMock(return_value=(1.0, 2.0, 90.0))
+        sensor_data = {
+            "tof": {"front_left": 80.0, "front_right": 120.0},
+            "status": {"tof": {"sampling": {"timestamp": 1000.0}}},
+        }
+        avoidance_algorithm.sensor_interface = MagicMock()
+        avoidance_algorithm.sensor_interface.get_sensor_data.return_value = sensor_data
+
+        # The avoidance loop only refreshes the flags
+        avoidance_algorithm._update_sensor_obstacle_status()
+        avoidance_algorithm.occupancy_grid.integrate_range.assert_not_called()
+
+        # The safety task fuses a reading once, however often it polls
+        avoidance_algorithm.poll_distance_sensors()
+        avoidance_algorithm.poll_distance_sensors()
+        assert avoidance_algorithm.occupancy_grid.integrate_range.call_count == 2
+
+        sensor_data["status"]["tof"]["sampling"]["timestamp"] = 1000.1
+        avoidance_algorithm.poll_distance_sensors()
+        assert avoidance_algorithm.occupancy_grid.integrate_range.call_count == 4
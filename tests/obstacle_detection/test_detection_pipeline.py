@@ -0,0 +1,171 @@
+"""Test the staged obstacle detection pipeline."""
+
+import itertools
+import threading
+import time
+
+import pytest
+
+from mower.obstacle_detection.pipeline import (
+    DropOldestQueue,
+    FramePacket,
+    PipelineStage,
+    StagePipeline,
+    StageStats,
+)
+
+
+def _wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestDropOldestQueue:
+    """Test cases for the bounded drop-oldest queue."""
+
+    def test_full_queue_drops_oldest(self):
+        queue = DropOldestQueue(2)
+        assert queue.put(1) is False
+        assert queue.put(2) is False
+        assert queue.put(3) is True
+        assert queue.dropped == 1
+        assert [queue.get(0), queue.get(0)] == [2, 3]
+
+    def test_get_times_out_when_empty(self):
+        queue = DropOldestQueue()
+        start = time.monotonic()
+        assert queue.get(timeout=0.05) is None
+        assert time.monotonic() - start >= 0.04
+
+    def test_get_wakes_on_put(self):
+        queue = DropOldestQueue()
+        threading.Timer(0.05, queue.put, args=("frame",)).start()
+        assert queue.get(timeout=2.0) == "frame"
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            DropOldestQueue(0)
+
+
+class TestStageStats:
+    """Test cases for rolling stage counters."""
+
+    def test_snapshot_figures(self):
+        stats = StageStats()
+        for i in range(11):
+            stats.record(i * 0.1, i * 0.1 + 0.02)
+        stats.record_error()
+        snapshot = stats.snapshot()
+        assert snapshot["processed"] == 11
+        assert snapshot["errors"] == 1
+        assert snapshot["fps"] == pytest.approx(10.0)
+        assert snapshot["latency_ms"] == pytest.approx(20.0)
+        assert snapshot["latency_max_ms"] == pytest.approx(20.0)
+
+    def test_empty_snapshot(self):
+        assert StageStats().snapshot()["fps"] == 0.0
+
+
+class TestStagePipeline:
+    """Test cases for running stages on their own threads."""
+
+    def _source(self, limit=None):
+        counter = itertools.count(1)
+
+        def capture():
+            sequence = next(counter)
+            if limit is not None and sequence > limit:
+                return None
+            time.sleep(0.002)
+            return FramePacket(sequence=sequence, capture_time=time.monotonic(), frame=sequence)
+
+        return capture
+
+    def test_first_stage_must_be_source(self):
+        with pytest.raises(ValueError):
+            StagePipeline("bad", [PipelineStage("work", lambda item: item)])
+
+    def test_slow_stage_sees_fresh_frames(self):
+        seen = []
+
+        def slow(packet):
+            time.sleep(0.05)
+            seen.append(packet.sequence)
+            return packet
+
+        pipeline = StagePipeline(
+            "test", [PipelineStage("capture", self._source(), source=True), PipelineStage("slow", slow)]
+        )
+
+        pipeline.start()
+        try:
+            assert _wait_until(lambda: len(seen) >= 4)
+        finally:
+            pipeline.stop()
+
+        assert not pipeline.running
+        # The slow stage skips the frames captured while it was busy
+        assert all(later - earlier > 1 for earlier, later in zip(seen, seen[1:]))
+        status = pipeline.get_status()
+        assert status["stages"]["slow"]["dropped"] > 0
+        assert status["stages"]["capture"]["processed"] > status["stages"]["slow"]["processed"]
+
+    def test_status_and_end_to_end_latency(self):
+        published = []
+
+        def publish(packet):
+            pipeline.record_end_to_end(packet)
+            published.append(packet.sequence)
+            return packet
+
+        pipeline = StagePipeline(
+            "test",
+            [
+                PipelineStage("capture", self._source(limit=5), source=True),
+                PipelineStage("double", lambda p: FramePacket(p.sequence, p.capture_time, p.frame * 2)),
+                PipelineStage("publish", publish),
+            ],
+            queue_size=8,
+        )
+        pipeline.start()
+        try:
+            assert _wait_until(lambda: len(published) == 5)
+            status = pipeline.get_status()
+        finally:
+            pipeline.stop()
+
+        assert published == [1, 2, 3, 4, 5]
+        assert status["running"] is True
+        assert set(status["stages"]) == {"capture", "double", "publish"}
+        assert status["stages"]["publish"]["queue_depth"] == 0
+        assert status["end_to_end"]["processed"] == 5
+        assert status["end_to_end"]["latency_ms"] > 0
+
+    def test_stage_errors_do_not_stop_pipeline(self):
+        published = []
+
+        def flaky(packet):
+            if packet.sequence % 2:
+                raise RuntimeError("bad frame")
+            return packet
+
+        pipeline = StagePipeline(
+            "test",
+            [
+                PipelineStage("capture", self._source(limit=6), source=True),
+                PipelineStage("flaky", flaky),
+                PipelineStage("publish", lambda p: published.append(p.sequence) or p),
+            ],
+            queue_size=8,
+        )
+        pipeline.start()
+        try:
+            assert _wait_until(lambda: len(published) == 3)
+            assert pipeline.get_status()["stages"]["flaky"]["errors"] == 3
+        finally:
+            pipeline.stop()
+        assert published == [2, 4, 6]
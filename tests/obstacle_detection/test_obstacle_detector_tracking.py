@@ -0,0 +1,54 @@
+"""Test that ObstacleDetector keeps its tracker updated on every frame."""
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from mower.obstacle_detection.obstacle_detector import ObstacleDetector
+from mower.obstacle_detection.pipeline import FramePacket
+
+
+def _person(x=100):
+    return {"class_name": "person", "confidence": 0.9, "box": [x, 100, x + 50, 200]}
+
+
+@pytest.fixture
+def detector():
+    with mock.patch("mower.obstacle_detection.obstacle_detector.get_hardware_registry"), mock.patch.object(
+        ObstacleDetector, "_initialize_yolov8", return_value=None
+    ):
+        detector = ObstacleDetector()
+    detector._frame_sharer = None
+    return detector
+
+
+def _track(detector, detections):
+    packet = FramePacket(1, 0.0, np.zeros((240, 320, 3), dtype=np.uint8), {"yolo": detections})
+    return detector._track_stage(packet)
+
+
+def test_pipeline_tracks_age_on_empty_frames(detector):
+    for x in (100, 102, 104):
+        _track(detector, [_person(x)])
+    assert len(detector.tracker) == 1
+
+    frames = detector.tracker.frame_count
+    for _ in range(detector.tracker.max_age + 1):
+        _track(detector, [])
+    assert detector.tracker.frame_count == frames + detector.tracker.max_age + 1
+    assert len(detector.tracker) == 0
+
+
+def test_direct_detection_tracks_age_on_empty_frames(detector):
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    detector.yolov8_detector = mock.Mock()
+    detector.yolov8_detector.detect.side_effect = lambda _: [_person()]
+    for _ in range(3):
+        objects = detector.detect_obstacles(frame)
+    assert objects[0]["track_id"] == 1
+
+    detector.yolov8_detector.detect.side_effect = lambda _: []
+    for _ in range(detector.tracker.max_age + 1):
+        detector.detect_obstacles(frame)
+    assert len(detector.tracker) == 0
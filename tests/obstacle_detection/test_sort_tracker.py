@@ -0,0 +1,123 @@
+"""Test SORT association and batched Kalman tracking."""
+
+import numpy as np
+import pytest
+
+from mower.obstacle_detection.sort import (
+    KalmanFilter,
+    Sort,
+    associate_detections_to_trackers,
+    iou_batch,
+    xywh_to_xyxy,
+    xyxy_to_xywh,
+)
+
+
+def _box(cx, cy, size=40, score=0.9):
+    half = size / 2
+    return [cx - half, cy - half, cx + half, cy + half, score]
+
+
+class TestAssociation:
+    """Test cases for IoU cost assignment."""
+
+    def test_iou_batch(self):
+        a = np.array([[0, 0, 10, 10], [0, 0, 0, 0]], dtype=float)
+        b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], dtype=float)
+        np.testing.assert_allclose(iou_batch(a, b), [[1.0, 1 / 3, 0.0], [0.0, 0.0, 0.0]])
+
+    def test_optimal_rather_than_greedy_assignment(self):
+        # Greedy matching would give detection 0 to track 0 (IoU 0.82) and
+        # leave detection 1 unmatched; the optimal assignment matches both.
+        trackers = np.array([[0, 0, 10, 10], [4, 0, 14, 10]], dtype=float)
+        detections = np.array([[1, 0, 11, 10], [-3, 0, 7, 10]], dtype=float)
+        matches, unmatched_dets, unmatched_trks = associate_detections_to_trackers(detections, trackers)
+        assert sorted(map(tuple, matches.tolist())) == [(0, 1), (1, 0)]
+        assert len(unmatched_dets) == 0 and len(unmatched_trks) == 0
+
+    def test_low_iou_is_not_matched(self):
+        trackers = np.array([[0, 0, 10, 10]], dtype=float)
+        detections = np.array([[9, 9, 19, 19]], dtype=float)
+        matches, unmatched_dets, unmatched_trks = associate_detections_to_trackers(detections, trackers)
+        assert matches.shape == (0, 2)
+        assert unmatched_dets.tolist() == [0] and unmatched_trks.tolist() == [0]
+
+    def test_box_conversions_round_trip(self):
+        boxes = np.array([[10, 20, 50, 100], [0, 0, 1, 1]], dtype=float)
+        np.testing.assert_allclose(xywh_to_xyxy(xyxy_to_xywh(boxes)), boxes)
+
+
+class TestKalmanFilter:
+    """Test cases for the batched Kalman filter."""
+
+    def test_batch_matches_individual_tracks(self):
+        kf = KalmanFilter()
+        rng = np.random.default_rng(2)
+        measurements = rng.uniform(20, 200, size=(5, 4))
+        mean, cov = kf.initiate(measurements)
+        mean, cov = kf.predict(mean, cov)
+        new_mean, new_cov = kf.update(mean, cov, measurements + 3)
+
+        for i in range(5):
+            m, c = kf.update(mean[i : i + 1], cov[i : i + 1], measurements[i : i + 1] + 3)
+            np.testing.assert_allclose(m[0], new_mean[i])
+            np.testing.assert_allclose(c[0], new_cov[i])
+        # Covariances stay symmetric
+        np.testing.assert_allclose(new_cov, new_cov.transpose(0, 2, 1), atol=1e-9)
+
+
+class TestSort:
+    """Test cases for the SORT tracker."""
+
+    def test_ids_are_stable_for_moving_objects(self):
+        tracker = Sort()
+        ids = []
+        for frame in range(10):
+            dets = np.array([_box(100 + 5 * frame, 100), _box(300, 200 - 4 * frame)])
+            tracker.update(dets)
+            ids.append(tuple(tracker.detection_track_ids))
+        assert set(ids) == {(1, 2)}
+        assert len(tracker) == 2
+
+    def test_ids_follow_detections_when_input_order_changes(self):
+        tracker = Sort()
+        a, b = _box(100, 100), _box(300, 300)
+        tracker.update(np.array([a, b]))
+        first = dict(zip(["a", "b"], tracker.detection_track_ids))
+        tracker.update(np.array([b, a]))
+        assert tracker.detection_track_ids.tolist() == [first["b"], first["a"]]
+
+    def test_confirmed_tracks_are_reported(self):
+        tracker = Sort(min_hits=3)
+        outputs = [tracker.update(np.array([_box(100, 100)])) for _ in range(5)]
+        assert all(len(out) == 1 for out in outputs)
+        np.testing.assert_allclose(outputs[-1][0, :4], _box(100, 100)[:4], atol=1e-6)
+        assert outputs[-1][0, 4] == 1
+
+    def test_lost_tracks_expire(self):
+        tracker = Sort(max_age=1)
+        tracker.update(np.array([_box(100, 100)]))
+        tracker.update(np.empty((0, 5)))
+        assert len(tracker) == 1
+        tracker.update(np.empty((0, 5)))
+        assert len(tracker) == 0
+
+        tracker.update(np.array([_box(100, 100)]))
+        assert tracker.detection_track_ids.tolist() == [2]
+
+    def test_velocity_estimate(self):
+        tracker = Sort()
+        for frame in range(15):
+            tracker.update(np.array([_box(100 + 6 * frame, 100)]))
+        vx, vy = tracker.velocity(1)
+        assert vx == pytest.approx(6, abs=1.0)
+        assert vy == pytest.approx(0, abs=1.0)
+        assert tracker.velocity(99) is None
+
+    def test_many_tracks(self):
+        tracker = Sort()
+        grid = [_box(x, y, size=20) for x in range(20, 1000, 50) for y in range(20, 500, 50)]
+        for frame in range(3):
+            tracker.update(np.array(grid) + [frame, 0, frame, 0, 0])
+        assert len(tracker) == len(grid)
+        assert tracker.detection_track_ids.tolist() == list(range(1, len(grid) + 1))
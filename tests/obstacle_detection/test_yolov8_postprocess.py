@@ -0,0 +1,137 @@
+"""Test vectorized YOLOv8 decoding and Non-Maximum Suppression."""
+
+import numpy as np
+import pytest
+
+from mower.obstacle_detection.yolov8_detector import (
+    DETECTION_DTYPE,
+    calculate_iou,
+    decode_yolov8_output,
+    nms_indices,
+    non_max_suppression,
+    non_max_suppression_array,
+)
+
+
+def _make_detections(rows):
+    detections = np.empty(len(rows), dtype=DETECTION_DTYPE)
+    for i, (x1, y1, x2, y2, confidence, class_id) in enumerate(rows):
+        detections[i] = (x1, y1, x2, y2, confidence, class_id)
+    return detections
+
+
+def _reference_nms(boxes, scores, iou_threshold):
+    """Straightforward pairwise NMS used as the ground truth."""
+    order = sorted(range(len(boxes)), key=lambda i: -scores[i])
+    keep = []
+    while order:
+        best = order.pop(0)
+        keep.append(best)
+        order = [i for i in order if calculate_iou(boxes[best], boxes[i]) < iou_threshold]
+    return keep
+
+
+class TestDecodeYolov8Output:
+    """Test cases for decoding raw output tensors."""
+
+    def test_decodes_anchor_major_layout(self):
+        output = np.zeros((100, 7), dtype=np.float32)
+        output[3] = [0.5, 0.5, 0.2, 0.4, 0.1, 0.1, 0.9]
+        detections = decode_yolov8_output(output, num_classes=3, conf_threshold=0.5, img_width=640, img_height=480)
+        assert detections.dtype == DETECTION_DTYPE
+        assert len(detections) == 1
+        det = detections[0]
+        assert (det["x1"], det["y1"], det["x2"], det["y2"]) == (256, 144, 384, 336)
+        assert det["class_id"] == 2
+        assert det["confidence"] == pytest.approx(0.9)
+
+    def test_feature_major_layout_matches_anchor_major(self):
+        rng = np.random.default_rng(1)
+        output = rng.random((200, 7)).astype(np.float32)
+        rows = decode_yolov8_output(output, 3, 0.5, 640, 640)
+        columns = decode_yolov8_output(np.ascontiguousarray(output.T), 3, 0.5, 640, 640)
+        np.testing.assert_array_equal(rows, columns)
+
+    def test_objectness_multiplies_class_score(self):
+        output = np.zeros((10, 8), dtype=np.float32)
+        output[0] = [0.5, 0.5, 0.2, 0.3, 0.8, 0.1, 0.1, 0.9]
+        output[1] = [0.5, 0.5, 0.2, 0.3, 0.3, 0.1, 0.1, 0.9]
+        detections = decode_yolov8_output(output, 3, 0.5, 640, 640)
+        assert len(detections) == 1
+        assert detections[0]["class_id"] == 2
+        assert detections[0]["confidence"] == pytest.approx(0.72)
+
+    def test_boxes_are_clamped_to_image(self):
+        output = np.zeros((4, 5), dtype=np.float32)
+        output[0] = [0.023, 0.983, 0.2, 0.2, 0.9]
+        det = decode_yolov8_output(output, 1, 0.5, 100, 100)[0]
+        assert (det["x1"], det["y1"], det["x2"], det["y2"]) == (0, 88, 12, 99)
+
+    def test_nothing_above_threshold(self):
+        output = np.full((8400, 84), 0.1, dtype=np.float32)
+        detections = decode_yolov8_output(output, 80, 0.5, 640, 640)
+        assert detections.shape == (0,)
+        assert len(non_max_suppression_array(detections)) == 0
+
+    def test_matches_row_by_row_decoding(self):
+        rng = np.random.default_rng(7)
+        output = (rng.random((500, 84)) ** 4).astype(np.float32)
+        detections = decode_yolov8_output(output, 80, 0.5, 640, 640)
+
+        expected = []
+        for row in output:
+            class_id = int(np.argmax(row[4:]))
+            confidence = row[4:][class_id]
+            if confidence < 0.5:
+                continue
+            cx, cy, w, h = row[:4]
+            box = (
+                max(0, int((cx - w / 2) * 640)),
+                max(0, int((cy - h / 2) * 640)),
+                min(639, int((cx + w / 2) * 640)),
+                min(639, int((cy + h / 2) * 640)),
+            )
+            expected.append(box + (class_id,))
+        actual = [(d["x1"], d["y1"], d["x2"], d["y2"], d["class_id"]) for d in detections]
+        assert actual == expected
+
+
+class TestNonMaxSuppression:
+    """Test cases for vectorized NMS."""
+
+    def test_matches_pairwise_reference(self):
+        rng = np.random.default_rng(3)
+        corners = rng.integers(0, 300, size=(150, 2))
+        sizes = rng.integers(5, 120, size=(150, 2))
+        boxes = np.hstack([corners, corners + sizes]).tolist()
+        scores = rng.random(150).tolist()
+        for threshold in (0.3, 0.5, 0.7):
+            assert nms_indices(np.array(boxes), np.array(scores), threshold).tolist() == _reference_nms(
+                boxes, scores, threshold
+            )
+
+    def test_class_aware_keeps_overlapping_classes(self):
+        detections = _make_detections(
+            [
+                (10, 10, 110, 110, 0.9, 0),
+                (12, 12, 112, 112, 0.8, 0),
+                (12, 12, 112, 112, 0.7, 1),
+            ]
+        )
+        kept = non_max_suppression_array(detections, iou_threshold=0.5)
+        assert kept["confidence"].tolist() == pytest.approx([0.9, 0.7])
+        assert kept["class_id"].tolist() == [0, 1]
+
+    def test_zero_area_boxes_do_not_divide_by_zero(self):
+        detections = _make_detections([(5, 5, 5, 5, 0.9, 0), (5, 5, 5, 5, 0.8, 0)])
+        assert len(non_max_suppression_array(detections)) == 2
+
+    def test_dict_api_is_preserved(self):
+        detections = [
+            {"class_name": "person", "confidence": 0.6, "box": [0, 0, 100, 100], "type": "yolov8"},
+            {"class_name": "dog", "confidence": 0.9, "box": [5, 5, 100, 100], "type": "yolov8"},
+            {"class_name": "cat", "confidence": 0.5, "box": [300, 300, 350, 350], "type": "yolov8"},
+        ]
+        kept = non_max_suppression(detections, iou_threshold=0.5)
+        assert [d["class_name"] for d in kept] == ["dog", "cat"]
+        assert non_max_suppression([]) == []
@@ -0,0 +1,159 @@
+"""Test letterbox preprocessing and box de-letterboxing for YOLOv8 inputs."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mower.obstacle_detection.yolov8_detector import (
+    DETECTION_DTYPE,
+    LetterboxPreprocessor,
+    YOLOv8TFLiteDetector,
+)
+
+
+class FakeInterpreter:
+    """Minimal TFLite interpreter stand-in exposing its input buffer like tensor()."""
+
+    def __init__(self, input_shape, input_dtype, output):
+        self.input = np.zeros(input_shape, dtype=input_dtype)
+        self.output = output
+        self.set_tensor_calls = 0
+
+    def tensor(self, index):
+        return lambda: self.input
+
+    def set_tensor(self, index, value):
+        self.set_tensor_calls += 1
+        self.input[...] = value
+
+    def invoke(self):
+        pass
+
+    def get_tensor(self, index):
+        return self.output
+
+
+class NoViewInterpreter(FakeInterpreter):
+    """Interpreter that cannot expose its input buffer."""
+
+    tensor = None
+
+
+def _frame(height=720, width=1280):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+class TestLetterboxPreprocessor:
+    """Test cases for the preallocated letterbox engine."""
+
+    def test_wide_frame_is_padded_top_and_bottom(self):
+        preprocessor = LetterboxPreprocessor(640, 640)
+        tensor, transform = preprocessor.preprocess(_frame())
+        assert tensor.shape == (1, 640, 640, 3)
+        assert tensor.dtype == np.uint8
+        assert (transform.scale, transform.pad_x, transform.pad_y) == (0.5, 0, 140)
+        assert (tensor[0, :140] == 114).all()
+        assert (tensor[0, 500:] == 114).all()
+
+    def test_bgr_is_converted_to_rgb(self):
+        frame = np.zeros((64, 64, 3), dtype=np.uint8)
+        frame[..., 0] = 255  # pure blue in BGR
+        tensor, _ = LetterboxPreprocessor(32, 32).preprocess(frame)
+        np.testing.assert_array_equal(tensor[0, 16, 16], [0, 0, 255])
+
+    def test_pil_rgb_matches_bgr_array(self):
+        frame = _frame(240, 320)
+        preprocessor = LetterboxPreprocessor(160, 160)
+        from_array = preprocessor.preprocess(frame)[0].copy()
+        from_pil = preprocessor.preprocess(Image.fromarray(np.ascontiguousarray(frame[..., ::-1])))[0]
+        np.testing.assert_array_equal(from_array, from_pil)
+
+    def test_grayscale_and_bgra_inputs(self):
+        preprocessor = LetterboxPreprocessor(96, 96)
+        gray = np.full((48, 96), 200, dtype=np.uint8)
+        bgra = np.dstack([_frame(48, 96), np.full((48, 96), 255, dtype=np.uint8)])
+        assert preprocessor.preprocess(gray)[0][0, 48, 48].tolist() == [200, 200, 200]
+        assert preprocessor.preprocess(bgra)[0].shape == (1, 96, 96, 3)
+
+    def test_float_input_is_normalized(self):
+        preprocessor = LetterboxPreprocessor(64, 64, input_dtype=np.float32)
+        tensor, _ = preprocessor.preprocess(np.full((64, 64, 3), 255, dtype=np.uint8))
+        assert tensor.dtype == np.float32
+        assert tensor.max() == pytest.approx(1.0)
+        assert not preprocessor.uint8_fast_path
+
+    def test_int8_quantized_input_uses_zero_point(self):
+        preprocessor = LetterboxPreprocessor(32, 32, input_dtype=np.int8, quantization=(1 / 255, -128))
+        tensor, _ = preprocessor.preprocess(np.zeros((32, 32, 3), dtype=np.uint8))
+        assert tensor.dtype == np.int8
+        assert (tensor == -128).all()
+
+    def test_uint8_quantized_input_uses_lut(self):
+        preprocessor = LetterboxPreprocessor(32, 32, quantization=(0.0078125, 128))
+        assert not preprocessor.uint8_fast_path
+        frame = np.zeros((32, 32, 3), dtype=np.uint8)
+        frame[:, 16:] = 100
+        tensor, _ = preprocessor.preprocess(frame)
+        assert tensor.dtype == np.uint8
+        assert (tensor[0, :, :16] == 128).all()
+        assert (tensor[0, :, 16:] == 178).all()  # round(100 / 255 / 0.0078125) + 128
+
+    def test_buffers_are_reused(self):
+        preprocessor = LetterboxPreprocessor(320, 320)
+        first, _ = preprocessor.preprocess(_frame())
+        second, _ = preprocessor.preprocess(_frame())
+        assert first is second
+
+    def test_uint8_fast_path_writes_into_interpreter_buffer(self):
+        interpreter = FakeInterpreter((1, 320, 320, 3), np.uint8, None)
+        preprocessor = LetterboxPreprocessor(320, 320, quantization=(1 / 255, 0))
+        assert preprocessor.uint8_fast_path
+        transform = preprocessor.load_into(interpreter, 0, _frame())
+        assert interpreter.set_tensor_calls == 0
+        assert transform.pad_y == 70
+        assert (interpreter.input[0, :70] == 114).all()
+        assert interpreter.input[0, 70:250].std() > 0
+
+    def test_falls_back_to_set_tensor(self):
+        interpreter = NoViewInterpreter((1, 320, 320, 3), np.float32, None)
+        LetterboxPreprocessor(320, 320, input_dtype=np.float32).load_into(interpreter, 0, _frame())
+        assert interpreter.set_tensor_calls == 1
+        assert interpreter.input.max() <= 1.0
+
+
+class TestDeletterbox:
+    """Test cases for mapping boxes back to source image coordinates."""
+
+    def test_boxes_map_back_to_source(self):
+        _, transform = LetterboxPreprocessor(640, 640).preprocess(_frame())
+        detections = np.zeros(1, dtype=DETECTION_DTYPE)
+        detections[0] = (100, 190, 200, 290, 0.9, 1)
+        mapped = transform.to_source(detections)[0]
+        assert (mapped["x1"], mapped["y1"], mapped["x2"], mapped["y2"]) == (200, 100, 400, 300)
+        assert detections[0]["x1"] == 100  # input left untouched
+
+    def test_boxes_in_padding_are_clamped(self):
+        _, transform = LetterboxPreprocessor(640, 640).preprocess(_frame())
+        detections = np.zeros(1, dtype=DETECTION_DTYPE)
+        detections[0] = (0, 0, 639, 639, 0.9, 0)
+        mapped = transform.to_source(detections)[0]
+        assert (mapped["x1"], mapped["y1"], mapped["x2"], mapped["y2"]) == (0, 0, 1278, 719)
+
+    def test_detect_returns_source_coordinates(self, tmp_path):
+        output = np.zeros((1, 7, 100), dtype=np.float32)
+        # Box centred in the model input, 100x100 model pixels
+        output[0, :, 0] = [0.5, 0.5, 100 / 640, 100 / 640, 0.1, 0.9, 0.1]
+        detector = YOLOv8TFLiteDetector(str(tmp_path / "missing.tflite"), str(tmp_path / "missing.txt"))
+        detector.labels = ["person", "dog", "car"]
+        detector.interpreter = FakeInterpreter((1, 640, 640, 3), np.uint8, output)
+        detector.input_details = [{"index": 0, "dtype": np.uint8}]
+        detector.output_details = [{"index": 1}]
+        detector.input_width = detector.input_height = 640
+        detector.has_detect_output = True
+        detector.preprocessor = LetterboxPreprocessor(640, 640)
+
+        detections = detector.detect(_frame())
+        assert len(detections) == 1
+        assert detections[0]["class_name"] == "dog"
+        assert detections[0]["box"] == [540, 260, 740, 460]
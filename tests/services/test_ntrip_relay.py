@@ -0,0 +1,177 @@
+"""Test the NTRIP correction relay against a local TCP caster."""
+
+import asyncio
+import threading
+
+import pytest
+
+from mower.services.ntrip_relay import NtripConfig, NtripRelay, RtcmFramer, crc24q, rtcm_message_type
+
+GGA = b"$GNGGA,120000.00,3900.0000000,N,08400.0000000,W,4,14,0.7,250.1,M,-33.0,M,1.0,0000*5B"
+
+
+def _frame(message_type: int, payload_size: int = 20) -> bytes:
+    payload = bytes([message_type >> 4, (message_type & 0x0F) << 4]) + bytes(range(payload_size - 2))
+    body = bytes([0xD3, payload_size >> 8, payload_size & 0xFF]) + payload
+    return body + crc24q(body).to_bytes(3, "big")
+
+
+class LocalCaster:
+    """Minimal NTRIP v1 caster: checks the mountpoint, then plays frames to each client."""
+
+    def __init__(self, frames, reply=b"ICY 200 OK\r\n", close_after=False):
+        self.frames = frames
+        self.reply = reply
+        self.close_after = close_after
+        self.requests = []
+        self.gga = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._client, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _client(self, reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        self.requests.append(request)
+        writer.write(self.reply)
+        if b" 200" not in self.reply:
+            writer.close()
+            return
+        # Chunk boundaries that split frames
+        stream = b"".join(self.frames)
+        for offset in range(0, len(stream), 7):
+            writer.write(stream[offset : offset + 7])
+            await writer.drain()
+        try:
+            self.gga.append(await asyncio.wait_for(reader.readline(), 1.0))
+        except asyncio.TimeoutError:
+            pass
+        if self.close_after:
+            writer.close()
+            return
+        await reader.read()  # hold the connection until the client leaves
+        writer.close()
+
+
+def _relay(caster, written, **kwargs):
+    config = NtripConfig(host="127.0.0.1", port=caster.port, mountpoint="MOUNT", username="user", password="pass")
+    kwargs.setdefault("reconnect_min", 0.01)
+    return NtripRelay(config, written.append, lambda: GGA, **kwargs)
+
+
+async def _until(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class TestRtcmFramer:
+    """Test cases for RTCM3 framing."""
+
+    def test_frames_across_chunks_and_noise(self):
+        frames = [_frame(1005), _frame(1077, 200), _frame(1230, 8)]
+        stream = b"\x00\xd3junk" + b"".join(frames)
+        framer = RtcmFramer()
+        out = []
+        for offset in range(0, len(stream), 5):
+            out += framer.feed(stream[offset : offset + 5])
+        assert out == frames
+        assert [rtcm_message_type(frame) for frame in out] == [1005, 1077, 1230]
+
+    def test_bad_crc_is_skipped(self):
+        bad = bytearray(_frame(1005))
+        bad[10] ^= 0xFF
+        framer = RtcmFramer()
+        assert framer.feed(bytes(bad) + _frame(1074)) == [_frame(1074)]
+        assert framer.crc_errors >= 1
+
+
+class TestNtripRelay:
+    """Test cases for the asyncio relay."""
+
+    @pytest.mark.asyncio
+    async def test_relays_frames_and_sends_gga(self):
+        frames = [_frame(1005), _frame(1077, 120), _frame(1087, 90)]
+        written = []
+        async with LocalCaster(frames) as caster:
+            relay = _relay(caster, written)
+            task = asyncio.create_task(relay.run())
+            await _until(lambda: sum(map(len, written)) == sum(map(len, frames)) and caster.gga)
+            relay.stop()
+            await asyncio.wait_for(task, 2.0)
+
+        assert b"".join(written) == b"".join(frames)
+        assert caster.gga == [GGA + b"\r\n"]
+        assert b"GET /MOUNT" in caster.requests[0] and b"Authorization: Basic dXNlcjpwYXNz" in caster.requests[0]
+        status = relay.get_status()
+        assert status["rtcm_messages"] == 3 and status["message_types"] == [1005, 1077, 1087]
+        assert not status["connected"]
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self):
+        written = []
+        async with LocalCaster([_frame(1005)], close_after=True) as caster:
+            relay = _relay(caster, written)
+            task = asyncio.create_task(relay.run())
+            await _until(lambda: relay.stats["connects"] >= 3)
+            relay.stop()
+            await asyncio.wait_for(task, 2.0)
+        assert relay.stats["connection_errors"] >= 2
+        assert len(written) >= 3
+
+    @pytest.mark.asyncio
+    async def test_rejected_login_backs_off(self):
+        async with LocalCaster([], reply=b"HTTP/1.1 401 Unauthorized\r\n\r\n") as caster:
+            relay = _relay(caster, [], reconnect_min=0.05, reconnect_max=0.2)
+            task = asyncio.create_task(relay.run())
+            await _until(lambda: relay.stats["connection_errors"] >= 3)
+            relay.stop()
+            await asyncio.wait_for(task, 2.0)
+        assert relay.stats["connects"] == 0
+        assert "401" in relay.stats["last_error"]
+        # Delays double: three failures take at least 0.05 + 0.1 (less jitter)
+        assert len(caster.requests) < 10
+
+    @pytest.mark.asyncio
+    async def test_slow_receiver_drops_oldest(self):
+        frames = [_frame(1077, 50) for _ in range(40)]
+        release = threading.Event()
+        written = []
+
+        def slow_write(data):
+            release.wait(2.0)
+            written.append(data)
+            return len(data)
+
+        async with LocalCaster(frames) as caster:
+            relay = _relay(caster, [], max_pending=8)
+            relay.write = slow_write
+            task = asyncio.create_task(relay.run())
+            await _until(lambda: relay.stats["rtcm_messages"] == 40)
+            assert len(relay._pending) <= 8
+            release.set()
+            await _until(lambda: not relay._pending)
+            relay.stop()
+            await asyncio.wait_for(task, 2.0)
+        assert relay.stats["dropped_messages"] > 0
+        assert sum(map(len, written)) < sum(map(len, frames))
+
+    def test_config_from_env(self, monkeypatch):
+        monkeypatch.setenv("NTRIP_URL", "NTRIP_url")
+        monkeypatch.setenv("NTRIP_MOUNTPOINT", "NTRIP_mountpoint")
+        assert NtripConfig.from_env() is None
+        monkeypatch.setenv("NTRIP_URL", "caster.example.org")
+        monkeypatch.setenv("NTRIP_MOUNTPOINT", "RTCM3")
+        monkeypatch.setenv("NTRIP_PORT", "2102")
+        config = NtripConfig.from_env()
+        assert (config.host, config.port, config.mountpoint) == ("caster.example.org", 2102, "RTCM3")
@@ -0,0 +1,71 @@
+"""Test the headless fixed-step simulation runner."""
+
+import pytest
+
+from mower.navigation.coverage import boustrophedon_path
+from mower.simulation.headless import HeadlessSimulation, VirtualClock, WaypointFollower
+from mower.simulation.world_model import Vector2D
+
+YARD = [(1, 1), (11, 1), (11, 9), (1, 9)]
+
+
+def _mission(seed, obstacle=None):
+    sim = HeadlessSimulation(seed=seed, start=(1.0, 1.0))
+    if obstacle is not None:
+        sim.world.add_obstacle(Vector2D(*obstacle), 0.4)
+    follower = WaypointFollower(sim, boustrophedon_path(YARD, 1.0, start=(1.0, 1.0)))
+    sim.add_controller("follow", follower, rate_hz=20)
+    result = sim.run(duration=1800, until=lambda: follower.done)
+    return sim, follower, result
+
+
+class TestHeadlessSimulation:
+    """Test cases for virtual-time stepping and determinism."""
+
+    def test_coverage_mission_runs_faster_than_real_time(self):
+        sim, follower, result = _mission(seed=1)
+        assert follower.done
+        assert result["sim_time_s"] > 60
+        assert result["realtime_factor"] > 20
+        # Eight 10 m passes plus the turns between them
+        assert 80 < sim.distance_driven < 100
+
+    def test_same_seed_is_deterministic(self):
+        first, _, _ = _mission(seed=5, obstacle=(6, 5))
+        second, _, _ = _mission(seed=5, obstacle=(6, 5))
+        assert first.world.get_robot_state() == second.world.get_robot_state()
+        assert first.sensor_data() == second.sensor_data()
+
+    def test_seed_changes_sensor_noise(self):
+        first = HeadlessSimulation(seed=1)
+        second = HeadlessSimulation(seed=2)
+        first.run(max_steps=5)
+        second.run(max_steps=5)
+        assert first.imu.state["acceleration"] != second.imu.state["acceleration"]
+
+    def test_sensors_follow_virtual_clock(self):
+        sim = HeadlessSimulation(dt=0.01)
+        readings = []
+        sim.add_controller("probe", lambda: readings.append(sim.gps.state["position"]), rate_hz=100)
+        sim.run(duration=3.0)
+        # The GPS updates at 1 Hz of simulated time: one new timestamp per second
+        timestamps = {position[0] for position in readings if position is not None}
+        assert len(timestamps) == 3
+        assert sim.clock() == pytest.approx(3.0)
+
+    def test_controllers_run_at_their_rate(self):
+        sim = HeadlessSimulation(dt=0.02)
+        calls = []
+        sim.add_controller("slow", lambda: calls.append(sim.clock()), rate_hz=5)
+        sim.run(duration=2.0)
+        assert len(calls) == 10
+        assert calls[1] - calls[0] == pytest.approx(0.2)
+
+    def test_run_needs_a_limit(self):
+        with pytest.raises(ValueError):
+            HeadlessSimulation().run()
+
+    def test_virtual_clock(self):
+        clock = VirtualClock(10.0)
+        clock.advance(0.5)
+        assert clock() == 10.5
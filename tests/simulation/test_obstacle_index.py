@@ -0,0 +1,122 @@
+"""Test batched ray casting and collision resolution in the simulated world."""
+
+import math
+import time
+
+import numpy as np
+import pytest
+
+from mower.simulation.obstacle_index import ObstacleIndex
+from mower.simulation.world_model import Vector2D, VirtualWorld
+
+
+def _reference_cast(centers, radii, origin, direction, max_range):
+    """Per-obstacle loop the index replaces."""
+    direction = direction / np.linalg.norm(direction)
+    best, hit = max_range, -1
+    for i, (center, radius) in enumerate(zip(centers, radii)):
+        to_center = center - origin
+        projection = to_center @ direction
+        if projection <= 0:
+            continue
+        perpendicular = np.linalg.norm(to_center - direction * projection)
+        if perpendicular > radius:
+            continue
+        distance = projection - math.sqrt(radius**2 - perpendicular**2)
+        if distance < best:
+            best, hit = distance, i
+    return best, hit
+
+
+def _random_yard(count, size=100.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, size, (count, 2)), rng.uniform(0.1, 1.5, count)
+
+
+class TestRayCasting:
+    """Test cases for ObstacleIndex.cast_rays."""
+
+    @pytest.mark.parametrize("max_range", [2.0, 15.0, float("inf")])
+    def test_matches_reference_loop(self, max_range):
+        centers, radii = _random_yard(300)
+        index = ObstacleIndex(centers, radii)
+        rng = np.random.default_rng(1)
+        origins = rng.uniform(0, 100, (200, 2))
+        angles = rng.uniform(0, 2 * np.pi, 200)
+        directions = np.column_stack((np.cos(angles), np.sin(angles)))
+
+        distances, hits = index.cast_rays(origins, directions, max_range)
+        for origin, direction, distance, hit in zip(origins, directions, distances, hits):
+            expected, expected_hit = _reference_cast(centers, radii, origin, direction, max_range)
+            assert distance == pytest.approx(expected)
+            assert hit == expected_hit
+
+    def test_grid_finds_corner_clips(self):
+        # A ray that only grazes a small obstacle near a cell corner
+        index = ObstacleIndex([[1.02, 0.98]], [0.05], cell_size=1.0)
+        distances, hits = index.cast_rays([[0.0, 0.0]], [[1.0, 1.0]], max_range=3.0)
+        assert hits[0] == 0
+        assert distances[0] == pytest.approx(math.hypot(1.0, 1.0) - 0.05, abs=0.02)
+
+    def test_empty_index(self):
+        distances, hits = ObstacleIndex(np.empty((0, 2)), np.empty(0)).cast_rays([[0, 0]], [[1, 0]], 5.0)
+        assert distances.tolist() == [5.0]
+        assert hits.tolist() == [-1]
+
+    def test_many_rays_in_large_yard_are_fast(self):
+        centers, radii = _random_yard(5000, size=200.0)
+        index = ObstacleIndex(centers, radii)
+        rng = np.random.default_rng(2)
+        origins = rng.uniform(0, 200, (1000, 2))
+        directions = rng.normal(size=(1000, 2))
+        index.cast_rays(origins, directions, 2.0)
+        started = time.perf_counter()
+        index.cast_rays(origins, directions, 2.0)
+        assert time.perf_counter() - started < 0.05
+
+
+class TestCollisions:
+    """Test cases for pushing points out of obstacles."""
+
+    def test_points_are_pushed_to_edge(self):
+        index = ObstacleIndex([[0.0, 0.0], [5.0, 0.0]], [1.0, 1.0])
+        points, normals, collided = index.resolve_collisions([[0.5, 0.0], [3.0, 3.0], [5.0, -0.2]], clearance=0.1)
+        assert collided.tolist() == [True, False, True]
+        np.testing.assert_allclose(points[0], [1.1, 0.0])
+        np.testing.assert_allclose(points[1], [3.0, 3.0])
+        np.testing.assert_allclose(points[2], [5.0, -1.1])
+        np.testing.assert_allclose(normals[2], [0.0, -1.0])
+
+    def test_overlapping_obstacles(self):
+        index = ObstacleIndex([[0.0, 0.0], [1.5, 0.0]], [1.0, 1.0])
+        points, _, collided = index.resolve_collisions([[0.9, 0.3]])
+        assert collided[0]
+        distances = np.linalg.norm(index.centers - points[0], axis=1)
+        assert (distances >= index.radii).all()
+
+
+class TestVirtualWorldQueries:
+    """Test cases for the world's obstacle queries built on the index."""
+
+    def test_nearest_obstacle_returns_object(self):
+        world = VirtualWorld()
+        world.add_obstacle(Vector2D(5, 0), 1.0, obstacle_type="rock")
+        world.add_obstacle(Vector2D(9, 0), 1.0, obstacle_type="tree")
+        distance, obstacle = world.get_distance_to_nearest_obstacle(Vector2D(0, 0), Vector2D(1, 0), 20.0)
+        assert distance == pytest.approx(4.0)
+        assert obstacle.obstacle_type == "rock"
+
+        world.clear_obstacles()
+        world.add_obstacle(Vector2D(0, 7), 1.0, obstacle_type="tree")
+        assert world.get_distance_to_nearest_obstacle(Vector2D(0, 0), Vector2D(1, 0), 20.0) == (20.0, None)
+        assert [o.obstacle_type for o in world.get_obstacles_in_range(Vector2D(0, 0), 6.5)] == ["tree"]
+
+    def test_robot_is_pushed_out_and_stopped(self):
+        world = VirtualWorld()
+        world.add_obstacle(Vector2D(1.0, 0.0), 0.5)
+        world.set_robot_position(Vector2D(0.0, 0.0), heading=0.0)
+        world.set_robot_motor_speeds(1.0, 1.0)
+        world.update(dt=0.8)
+        state = world.get_robot_state()
+        assert state["position"][0] == pytest.approx(0.49)
+        assert state["velocity"][0] == pytest.approx(0.0)
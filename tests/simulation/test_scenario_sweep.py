@@ -0,0 +1,97 @@
+"""Test the Monte-Carlo scenario sweep."""
+
+import numpy as np
+import pytest
+from shapely.geometry import Point, Polygon
+
+from mower.simulation.scenario_sweep import (
+    RESULT_COLUMNS,
+    coverage_percent,
+    generate_scenario,
+    load_results,
+    run_scenario,
+    run_sweep,
+    save_results,
+    summarize,
+)
+
+
+def _small(seed, **kwargs):
+    return generate_scenario(seed, yard_radius=(2.5, 3.0), obstacle_count=(1, 3), spacing=0.5, **kwargs)
+
+
+class TestScenarios:
+    """Test cases for scenario generation and single runs."""
+
+    def test_generation_is_reproducible(self):
+        assert generate_scenario(3) == generate_scenario(3)
+        assert generate_scenario(3) != generate_scenario(4)
+
+    def test_obstacles_lie_inside_yard(self):
+        for seed in range(10):
+            scenario = generate_scenario(seed)
+            yard = Polygon(scenario.boundary)
+            assert len(scenario.known) == len(scenario.obstacles)
+            assert all(yard.contains(Point(x, y).buffer(r)) for x, y, r in scenario.obstacles)
+
+    def test_run_reports_every_metric(self):
+        result = run_scenario(_small(3))
+        assert set(result) == set(RESULT_COLUMNS)
+        assert result["completed"]
+        assert 50 < result["coverage_pct"] <= 100
+        assert result["distance_m"] > 0
+
+    def test_unknown_obstacles_need_avoidance(self):
+        # Known obstacles are planned around; unknown ones are found by driving into range
+        known = run_scenario(_small(3, known_fraction=1.0))
+        unknown = run_scenario(_small(3, known_fraction=0.0))
+        assert known["completed"] and unknown["completed"]
+        assert known["collisions"] == 0
+        assert unknown["collisions"] + unknown["avoidances"] > 0
+
+
+class TestCoverage:
+    """Test cases for the coverage raster."""
+
+    def test_full_sweep_of_square(self):
+        square = [(0, 0), (4, 0), (4, 4), (0, 4)]
+        rows = [np.column_stack((np.linspace(0, 4, 200), np.full(200, y))) for y in np.arange(0.25, 4, 0.5)]
+        assert coverage_percent(np.concatenate(rows), square, [], width=0.5) > 99
+
+    def test_half_sweep_of_square(self):
+        square = [(0, 0), (4, 0), (4, 4), (0, 4)]
+        rows = [np.column_stack((np.linspace(0, 4, 200), np.full(200, y))) for y in np.arange(0.25, 2, 0.5)]
+        assert coverage_percent(np.concatenate(rows), square, [], width=0.5) == pytest.approx(50, abs=2)
+
+
+class TestSweep:
+    """Test cases for running sweeps and storing results."""
+
+    def test_parallel_matches_serial(self):
+        scenarios = [_small(seed) for seed in range(3)]
+        serial = run_sweep(scenarios, workers=1)
+        parallel = run_sweep(scenarios, workers=2)
+        for column in RESULT_COLUMNS:
+            if column != "wall_time_s":
+                np.testing.assert_array_equal(serial[column], parallel[column])
+
+    def test_results_round_trip(self, tmp_path):
+        columns = {column: np.arange(4, dtype=float) for column in RESULT_COLUMNS}
+        path = str(tmp_path / "results.npz")
+        save_results(path, columns, label="test", scenarios=[_small(0)])
+        loaded = load_results(path)
+        np.testing.assert_array_equal(loaded["coverage_pct"], columns["coverage_pct"])
+        with np.load(path) as archive:
+            assert str(archive["label"]) == "test"
+
+        csv_path = tmp_path / "results.csv"
+        save_results(str(csv_path), columns)
+        lines = csv_path.read_text().splitlines()
+        assert lines[0].split(",") == list(RESULT_COLUMNS)
+        assert len(lines) == 5
+
+    def test_summary(self):
+        summary = summarize({"seed": np.arange(5), "coverage_pct": np.array([80.0, 85, 90, 95, 100])})
+        assert summary["coverage_pct"]["mean"] == 90
+        assert summary["coverage_pct"]["p50"] == 90
+        assert "seed" not in summary
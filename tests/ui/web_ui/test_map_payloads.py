@@ -0,0 +1,125 @@
+"""Test polyline map layers and occupancy tiles."""
+
+import zlib
+
+import numpy as np
+import pytest
+
+from mower.navigation.occupancy_grid import OccupancyGrid
+from mower.ui.web_ui.map_payloads import ObstacleTiles, PolylineLayer, decode_polyline, encode_polyline
+
+
+def _track(count, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 1e-5, size=(count, 2))
+    return np.array([39.0, -84.0]) + steps.cumsum(axis=0)
+
+
+class TestPolyline:
+    """Test cases for polyline encoding."""
+
+    def test_reference_example(self):
+        points = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+        assert encode_polyline(points, precision=5) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+    def test_round_trip_and_size(self):
+        points = _track(2000)
+        encoded = encode_polyline(points)
+        np.testing.assert_allclose(decode_polyline(encoded), points, atol=5e-7)
+        assert len(encoded) < len(str(points.tolist())) / 5
+
+    def test_empty(self):
+        assert encode_polyline([]) == ""
+        assert decode_polyline("").shape == (0, 2)
+
+
+class TestPolylineLayer:
+    """Test cases for versioned, incremental layers."""
+
+    def test_append_since_version(self):
+        layer = PolylineLayer("trace")
+        points = _track(10)
+        for point in points[:6]:
+            layer.append(tuple(point))
+        first = layer.payload()
+        assert first["version"] == 6 and first["since"] == 0
+
+        for point in points[6:]:
+            layer.append(tuple(point))
+        update = layer.payload(since=6, generation=first["generation"])
+        assert update["since"] == 6 and update["version"] == 10
+        merged = np.vstack([decode_polyline(first["points"]), decode_polyline(update["points"])])
+        np.testing.assert_allclose(merged, points, atol=5e-7)
+
+    def test_replace_extension_keeps_generation(self):
+        layer = PolylineLayer("path")
+        points = [tuple(p) for p in _track(8)]
+        layer.replace(points[:5])
+        generation, etag = layer.generation, layer.etag()
+        assert not layer.replace(points[:5])
+        assert layer.etag() == etag
+
+        assert layer.replace(points)
+        assert layer.generation == generation and layer.version == 8
+
+        # A different path starts a new generation; stale clients get everything
+        assert layer.replace(points[::-1])
+        assert layer.generation != generation
+        payload = layer.payload(since=8, generation=generation)
+        assert payload["since"] == 0 and len(decode_polyline(payload["points"])) == 8
+
+    def test_min_spacing(self):
+        layer = PolylineLayer("trace")
+        assert layer.append((39.0, -84.0), min_spacing_deg=2e-6)
+        assert not layer.append((39.000001, -84.0), min_spacing_deg=2e-6)
+        assert layer.append((39.00001, -84.0), min_spacing_deg=2e-6)
+
+
+class TestObstacleTiles:
+    """Test cases for occupancy grid tiles."""
+
+    def test_index_lists_only_known_tiles(self):
+        grid = OccupancyGrid((500000.0, 4300000.0), (20.0, 10.0), resolution=0.1, decay_half_life=None)
+        tiles = ObstacleTiles(grid, tile_cells=64)
+        assert tiles.shape == (2, 4)
+        assert tiles.index()["tiles"] == []
+
+        grid.mark_occupied([(500015.0, 4300008.0)])
+        index = tiles.index()
+        assert [(t["row"], t["col"]) for t in index["tiles"]] == [(1, 2)]
+
+        data, etag, shape = tiles.tile(1, 2)
+        assert etag == index["tiles"][0]["etag"]
+        assert shape == (36, 64)  # last row of tiles is partial
+        cells = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(shape)
+        assert cells[80 - 64, 150 - 128] > 128
+        assert (cells == 128).sum() == cells.size - 1
+
+    def test_out_of_range_tile(self):
+        grid = OccupancyGrid((0.0, 0.0), (5.0, 5.0), resolution=0.1)
+        with pytest.raises(IndexError):
+            ObstacleTiles(grid).tile(3, 0)
+
+    def test_etag_changes_only_on_update_or_decay_step(self):
+        grid = OccupancyGrid(
+            (500000.0, 4300000.0), (10.0, 10.0), resolution=0.1, zone=(17, "S"), decay_half_life=600.0
+        )
+        tiles = ObstacleTiles(grid, tile_cells=64)
+        grid.mark_occupied([(500001.0, 4300001.0)], now=1200.0)
+
+        # Decay steps are half-life / TILE_DECAY_STEPS = 60 s apart
+        etag = tiles.tile(0, 0, now=1200.0)[1]
+        assert tiles.tile(0, 0, now=1230.0)[1] == etag
+        assert tiles.index(now=1259.0)["tiles"][0]["etag"] == etag
+        assert tiles.tile(0, 0, now=1261.0)[1] != etag
+
+        grid.mark_occupied([(500002.0, 4300002.0)], now=1210.0)
+        assert tiles.tile(0, 0, now=1230.0)[1] != etag
+
+    def test_index_tile_bounds(self):
+        grid = OccupancyGrid((500000.0, 4300000.0), (10.0, 10.0), resolution=0.1, zone=(17, "S"))
+        grid.mark_occupied([(500001.0, 4300001.0)])
+        (south, west), (north, east) = ObstacleTiles(grid, tile_cells=64).index()["tiles"][0]["bounds"]
+        assert south < north and west < east
+        lat, lon = grid.local_to_latlon(500003.2, 4300003.2)
+        assert south < lat < north and west < lon < east
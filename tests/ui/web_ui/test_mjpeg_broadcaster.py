@@ -0,0 +1,133 @@
+"""Test the single-encoder MJPEG broadcaster."""
+
+import threading
+import time
+
+import numpy as np
+
+from mower.ui.web_ui.mjpeg_broadcaster import (
+    MjpegBroadcaster,
+    MjpegViewer,
+    StreamProfile,
+    choose_profile,
+    encode_jpeg,
+    raw_frame_source,
+)
+
+BASE = StreamProfile(fps=30, quality=90)
+
+
+class CountingSource:
+    """Source producing a new frame per call and counting encodes."""
+
+    def __init__(self):
+        self.calls = 0
+        self.profiles = []
+
+    def __call__(self, after_sequence, timeout, profile):
+        self.calls += 1
+        self.profiles.append(profile)
+        time.sleep(0.002)
+        return after_sequence + 1, b"jpeg-%d" % (after_sequence + 1)
+
+
+def _wait(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class TestProfiles:
+    """Test cases for adapting the stream profile."""
+
+    def test_ladder(self):
+        assert choose_profile(BASE, 1, 0.1) == BASE
+        assert choose_profile(BASE, 3, 0.1) == StreamProfile(fps=19.8, quality=80)
+        assert choose_profile(BASE, 1, 0.95) == StreamProfile(fps=15, quality=70, scale=0.75)
+        worst = choose_profile(StreamProfile(fps=4, quality=50), 5, 2.0)
+        assert worst == StreamProfile(fps=2.0, quality=40, scale=0.5)
+
+    def test_encode_scales(self):
+        import cv2
+
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        jpeg = encode_jpeg(frame, StreamProfile(fps=10, quality=70, scale=0.5))
+        decoded = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+        assert decoded.shape == (60, 80, 3)
+
+
+class TestViewer:
+    """Test cases for the per-viewer drop-if-slow queue."""
+
+    def test_keeps_newest(self):
+        viewer = MjpegViewer()
+        for i in range(5):
+            viewer.put(b"%d" % i)
+        assert viewer.get(0) == b"4"
+        assert viewer.dropped == 4
+        assert viewer.get(0) is None
+
+    def test_close_wakes_reader(self):
+        viewer = MjpegViewer()
+        threading.Timer(0.05, viewer.close).start()
+        assert viewer.get(2.0) is None and viewer.closed
+
+
+class TestBroadcaster:
+    """Test cases for fan-out and encoder lifetime."""
+
+    def test_one_encode_per_frame_for_all_viewers(self):
+        source = CountingSource()
+        broadcaster = MjpegBroadcaster(source, StreamProfile(fps=200, quality=80), load=lambda: 0.0)
+        viewers = [broadcaster.subscribe() for _ in range(3)]
+        received = [[] for _ in viewers]
+        for _ in range(5):
+            for viewer, frames in zip(viewers, received):
+                frames.append(viewer.get(1.0))
+        for viewer in viewers:
+            broadcaster.unsubscribe(viewer)
+        _wait(lambda: broadcaster._thread is None)
+
+        # Every viewer sees frames from the same encodes, newest first when behind
+        encoded = source.calls
+        assert broadcaster.frames_encoded == encoded
+        assert all(frame is not None for frames in received for frame in frames)
+        assert len({frame for frames in received for frame in frames}) <= encoded
+        assert max(int(frame.split(b"-")[1]) for frames in received for frame in frames) <= encoded
+
+    def test_idle_without_viewers(self):
+        source = CountingSource()
+        broadcaster = MjpegBroadcaster(source, StreamProfile(fps=200, quality=80), load=lambda: 0.0)
+        viewer = broadcaster.subscribe()
+        assert viewer.get(1.0) is not None
+        broadcaster.unsubscribe(viewer)
+        _wait(lambda: broadcaster._thread is None)
+        calls = source.calls
+        time.sleep(0.05)
+        assert source.calls == calls
+
+        # A new viewer restarts the encoder
+        viewer = broadcaster.subscribe()
+        assert viewer.get(1.0) is not None
+        broadcaster.unsubscribe(viewer)
+
+    def test_stream_adapts_to_load(self):
+        source = CountingSource()
+        load = [0.0]
+        broadcaster = MjpegBroadcaster(source, StreamProfile(fps=200, quality=80), load=lambda: load[0], adapt_interval=0)
+        viewer = broadcaster.subscribe()
+        chunks = broadcaster.stream(viewer)
+        assert next(chunks).startswith(b"--frame\r\nContent-Type: image/jpeg\r\n\r\njpeg-")
+        load[0] = 0.95
+        _wait(lambda: source.profiles[-1].quality == 60)
+        assert source.profiles[-1].scale == 0.75
+        chunks.close()  # client went away
+        assert broadcaster.viewer_count == 0
+
+    def test_raw_frame_source(self):
+        frames = iter([None, np.zeros((8, 8, 3), dtype=np.uint8)])
+        source = raw_frame_source(lambda: next(frames))
+        assert source(0, 0.01, BASE) == (0, None)
+        sequence, jpeg = source(0, 0.01, BASE)
+        assert sequence == 1 and jpeg.startswith(b"\xff\xd8")
@@ -0,0 +1,61 @@
+"""Test that the web process serves the obstacle grid persisted by the main process."""
+
+import zlib
+
+import numpy as np
+import pytest
+
+import mower.ui.web_ui.app as web_app
+from mower.navigation.occupancy_grid import OccupancyGrid
+
+ORIGIN = (500000.0, 4300000.0)
+
+
+class StubMower:
+    """Resource manager stand-in like the web process's dummy: no occupancy grid in reach."""
+
+    def get_path_planner(self):
+        return None
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def grid_path(tmp_path, monkeypatch):
+    path = tmp_path / "obstacle_grid.npy"
+    monkeypatch.setattr(web_app, "OBSTACLE_GRID_PATH", path)
+    return path
+
+
+@pytest.fixture
+def client(grid_path):
+    app, _ = web_app.create_app(StubMower())
+    return app.test_client()
+
+
+def test_no_grid_file(client):
+    assert client.get("/api/map/obstacles").get_json() == {"success": True, "tiles": []}
+
+
+def test_serves_populated_grid_file(grid_path, client):
+    writer = OccupancyGrid(ORIGIN, (20.0, 10.0), resolution=0.1, zone=(17, "S"), path=str(grid_path))
+    writer.mark_occupied([(ORIGIN[0] + 15.0, ORIGIN[1] + 8.0)] * 2)
+    writer.flush()
+
+    index = client.get("/api/map/obstacles").get_json()
+    assert index["success"] and index["cells"] == [100, 200] and index["zone"] == [17, "S"]
+    assert [(t["row"], t["col"]) for t in index["tiles"]] == [(1, 2)]
+
+    response = client.get("/api/map/obstacles/1/2")
+    assert response.status_code == 200
+    rows, cols = map(int, response.headers["X-Tile-Shape"].split("x"))
+    cells = np.frombuffer(zlib.decompress(response.data), dtype=np.uint8).reshape(rows, cols)
+    assert cells[80 - 64, 150 - 128] > 200
+
+    # Later flushes by the writer show up without reopening
+    writer.mark_occupied([(ORIGIN[0] + 1.0, ORIGIN[1] + 1.0)] * 2)
+    writer.flush()
+    index = client.get("/api/map/obstacles").get_json()
+    assert [(t["row"], t["col"]) for t in index["tiles"]] == [(0, 0), (1, 2)]
+    writer.close()
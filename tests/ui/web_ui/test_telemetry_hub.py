@@ -0,0 +1,137 @@
+"""Test the delta-encoded telemetry hub."""
+
+from mower.ui.web_ui.telemetry_hub import TelemetryHub, apply_delta, diff, run_hub
+
+
+class Source:
+    """Topic source returning a mutable document and counting reads."""
+
+    def __init__(self, document):
+        self.document = document
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        return {key: dict(value) if isinstance(value, dict) else value for key, value in self.document.items()}
+
+
+def _hub(clock, keyframe_interval=5.0):
+    sent = []
+    hub = TelemetryHub(lambda event, payload, sid: sent.append((sid, payload)), keyframe_interval, clock)
+    return hub, sent
+
+
+class TestDiff:
+    """Test cases for delta encoding."""
+
+    def test_deadbands_and_removals(self):
+        old = {"imu": {"heading": 90.0, "roll": 1.0}, "tof": {"left": 50.0}, "mode": "IDLE"}
+        new = {"imu": {"heading": 90.3, "roll": 2.0}, "mode": "MOWING", "gps": {"status": "valid"}}
+        delta = diff(old, new, {"imu.heading": 0.5, "imu.roll": 0.5})
+        assert delta == {"imu": {"roll": 2.0}, "mode": "MOWING", "gps": {"status": "valid"}, "tof": None}
+        assert apply_delta(old, delta) == {
+            "imu": {"heading": 90.0, "roll": 2.0},
+            "mode": "MOWING",
+            "gps": {"status": "valid"},
+        }
+
+    def test_bools_and_none(self):
+        assert diff({"stop": False}, {"stop": True}, {"stop": 5.0}) == {"stop": True}
+        assert diff({}, {"error": None}, {}) == {}
+        assert diff({"a": 1}, {"a": 1}, {}) == {}
+
+
+class TestTelemetryHub:
+    """Test cases for subscriptions, keyframes and idling."""
+
+    def test_idle_without_clients(self, clock):
+        hub, sent = _hub(clock)
+        source = Source({"x": 1})
+        hub.add_topic("sensors", source)
+        assert hub.poll() is None
+        assert source.reads == 0 and sent == []
+        assert not hub.wait_for_clients(timeout=0)
+
+    def test_keyframe_then_deltas_only_on_change(self, clock):
+        hub, sent = _hub(clock)
+        source = Source({"imu": {"heading": 10.0}, "power": {"voltage": 12.6}})
+        hub.add_topic("sensors", source, max_rate_hz=10, deadbands={"imu.heading": 0.5})
+        hub.connect("a")
+
+        hub.poll()
+        assert sent[-1][1] == {"topic": "sensors", "seq": 1, "key": True, "data": source.document}
+
+        # Inside the deadband: read, but nothing sent
+        source.document["imu"]["heading"] = 10.3
+        clock.advance(0.1)
+        hub.poll()
+        assert len(sent) == 1 and hub.stats["unchanged"] == 1
+
+        # Drift accumulates against the value last sent
+        source.document["imu"]["heading"] = 10.6
+        clock.advance(0.1)
+        hub.poll()
+        assert sent[-1][1] == {"topic": "sensors", "seq": 2, "key": False, "data": {"imu": {"heading": 10.6}}}
+
+        clock.advance(5.0)
+        hub.poll()
+        assert sent[-1][1]["key"] is True and sent[-1][1]["seq"] == 3
+
+    def test_per_client_rates(self, clock):
+        hub, sent = _hub(clock)
+        source = Source({"n": 0})
+        hub.add_topic("sensors", source, max_rate_hz=10)
+        hub.add_topic("status", Source({"state": "IDLE"}), max_rate_hz=2)
+        hub.subscribe("map", {"sensors": 2})
+        hub.subscribe("diag", {"sensors": 50, "status": 1, "bogus": 5})
+
+        for step in range(100):  # one second in 10 ms steps
+            source.document["n"] = step
+            hub.poll()
+            clock.advance(0.01)
+
+        by_client = {}
+        for sid, payload in sent:
+            by_client.setdefault((sid, payload["topic"]), []).append(payload)
+        assert len(by_client[("map", "sensors")]) == 2
+        assert len(by_client[("diag", "sensors")]) == 10  # capped at the topic's 10 Hz
+        assert len(by_client[("diag", "status")]) == 1
+        assert ("map", "status") not in by_client
+        # Both clients are served from one read per due slot
+        assert source.reads == 10
+
+    def test_disconnect_stops_publishing(self, clock):
+        hub, sent = _hub(clock)
+        hub.add_topic("safety", Source({"is_safe": True}))
+        hub.connect("a")
+        assert hub.wait_for_clients(timeout=0)
+        hub.poll()
+        hub.disconnect("a")
+        clock.advance(1.0)
+        assert hub.poll() is None
+        assert len(sent) == 1
+
+    def test_failing_source_is_skipped(self, clock):
+        hub, sent = _hub(clock)
+
+        def broken():
+            raise RuntimeError("sensor offline")
+
+        hub.add_topic("sensors", broken)
+        hub.connect("a")
+        assert hub.poll() is not None
+        assert sent == []
+
+    def test_run_hub_sleeps_until_next_due(self, clock):
+        hub, sent = _hub(clock)
+        hub.add_topic("sensors", Source({"n": 1}), max_rate_hz=4)
+        hub.connect("a")
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock.advance(seconds)
+
+        run_hub(hub, sleep, stop=lambda: len(sleeps) >= 3)
+        assert sleeps == [0.25, 0.25, 0.25]
+        assert len(sent) == 1  # unchanged document after the keyframe
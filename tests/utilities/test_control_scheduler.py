@@ -0,0 +1,130 @@
+"""Test the fixed-rate control scheduler."""
+
+import threading
+import time
+
+import pytest
+
+from mower.utilities.control_scheduler import ControlScheduler, FixedRate, TaskStats
+
+
+class TestControlScheduler:
+    """Test cases for deadline scheduling with a virtual clock."""
+
+    def test_multi_rate_counts(self, clock):
+        scheduler = ControlScheduler("test", clock=clock)
+        calls = {"fast": 0, "slow": 0}
+        scheduler.add_task("fast", lambda: calls.__setitem__("fast", calls["fast"] + 1), rate_hz=50)
+        scheduler.add_task("slow", lambda: calls.__setitem__("slow", calls["slow"] + 1), rate_hz=5)
+
+        for _ in range(100):  # one second in 10 ms steps
+            scheduler.run_pending()
+            clock.advance(0.01)
+
+        assert calls == {"fast": 50, "slow": 5}
+        stats = scheduler.get_stats()
+        assert stats["fast"]["overruns"] == 0
+        assert stats["fast"]["jitter_ms"]["max"] == 0.0
+
+    def test_deadlines_do_not_drift(self, clock):
+        clock.now = 0.0
+        scheduler = ControlScheduler("test", clock=clock)
+        started = []
+        scheduler.add_task("task", lambda: started.append(clock.now), rate_hz=10)
+
+        # Wake up 30 ms late every time; deadlines stay on the 100 ms grid
+        while clock.now < 1.0:
+            wait = scheduler.run_pending()
+            clock.advance(wait + 0.03)
+
+        assert started[:4] == pytest.approx([0.0, 0.13, 0.23, 0.33])
+        stats = scheduler.get_stats()["task"]
+        assert stats["jitter_ms"]["max"] == pytest.approx(30.0)
+        assert stats["jitter_ms"]["histogram"]["<=50ms"] == stats["runs"] - 1
+
+    def test_overrun_skips_missed_deadlines(self, clock):
+        clock.now = 0.0
+        scheduler = ControlScheduler("test", clock=clock)
+        scheduler.add_task("slow", lambda: clock.advance(0.35), rate_hz=10)
+
+        scheduler.run_pending()
+        stats = scheduler.get_stats()["slow"]
+        assert stats["overruns"] == 1
+        assert stats["skipped"] == 3
+        # Next deadline is the first grid point after the run finished
+        assert scheduler.run_pending() == pytest.approx(0.05)
+
+    def test_same_deadline_runs_faster_task_first(self, clock):
+        scheduler = ControlScheduler("test", clock=clock)
+        order = []
+        scheduler.add_task("housekeeping", lambda: order.append("housekeeping"), rate_hz=1)
+        scheduler.add_task("safety", lambda: order.append("safety"), rate_hz=50)
+        scheduler.run_pending()
+        assert order == ["safety", "housekeeping"]
+
+    def test_errors_are_counted_and_isolated(self, clock):
+        scheduler = ControlScheduler("test", clock=clock)
+        calls = []
+
+        def broken():
+            raise RuntimeError("sensor offline")
+
+        scheduler.add_task("broken", broken, rate_hz=10)
+        scheduler.add_task("healthy", lambda: calls.append(1), rate_hz=10)
+        for _ in range(3):
+            scheduler.run_pending()
+            clock.advance(0.1)
+
+        stats = scheduler.get_stats()
+        assert stats["broken"]["errors"] == 3
+        assert len(calls) == 3
+
+    def test_task_registration(self):
+        scheduler = ControlScheduler("test")
+        scheduler.add_task("a", lambda: None, rate_hz=1)
+        with pytest.raises(ValueError):
+            scheduler.add_task("a", lambda: None, rate_hz=1)
+        with pytest.raises(ValueError):
+            scheduler.add_task("b", lambda: None, rate_hz=0)
+        assert scheduler.remove_task("a") is True
+        assert scheduler.remove_task("a") is False
+        assert scheduler.run_pending() == float("inf")
+
+    def test_thread_runs_until_stopped(self):
+        scheduler = ControlScheduler("test")
+        ticks = threading.Semaphore(0)
+        scheduler.add_task("tick", ticks.release, rate_hz=100)
+        scheduler.start()
+        try:
+            assert all(ticks.acquire(timeout=1.0) for _ in range(5))
+            assert scheduler.running
+        finally:
+            scheduler.stop()
+        assert not scheduler.running
+        assert scheduler.get_stats()["tick"]["runs"] >= 5
+
+
+class TestFixedRate:
+    """Test cases for pacing a free-running loop."""
+
+    def test_paced_loop_records_stats(self):
+        rate = FixedRate(100)
+        started = time.monotonic()
+        for _ in range(10):
+            rate.sleep()
+        elapsed = time.monotonic() - started
+        assert elapsed == pytest.approx(0.1, abs=0.05)
+        assert rate.stats.runs == 9
+
+    def test_stop_event_interrupts_sleep(self):
+        rate = FixedRate(0.5)
+        stop = threading.Event()
+        rate.sleep(stop)
+        stop.set()
+        assert rate.sleep(stop) is False
+
+    def test_cpu_share(self):
+        stats = TaskStats(period=0.1)
+        stats.started = 0.0
+        stats.record(jitter=0.0, duration=0.05, cpu=0.05)
+        assert stats.snapshot(now=1.0)["cpu_percent"] == pytest.approx(5.0)
@@ -0,0 +1,141 @@
+"""Test the queued logging pipeline, rate limiting and the JSON-lines sink."""
+
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import sys
+
+import pytest
+
+from mower.utilities.logger_config import (
+    DeferredQueueHandler,
+    JsonLinesFormatter,
+    LoggerConfigInfo,
+    RateLimitFilter,
+    rate_limited,
+    sampled,
+)
+
+
+def _record(msg, *args, line=10, **extra):
+    record = logging.LogRecord("mower.test", logging.INFO, "/src/mod.py", line, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestRateLimitFilter:
+    """Test cases for per-call-site rate limiting and sampling."""
+
+    def test_unmarked_records_pass(self, clock):
+        log_filter = RateLimitFilter(clock=clock)
+        assert all(log_filter.filter(_record("hello")) for _ in range(10))
+
+    def test_rate_limit_per_call_site(self, clock):
+        log_filter = RateLimitFilter(clock=clock)
+        passed = [log_filter.filter(_record("data %s", i, **rate_limited(1.0))) for i in range(5)]
+        assert passed == [True, False, False, False, False]
+        # Another call site has its own budget
+        assert log_filter.filter(_record("other", line=20, **rate_limited(1.0)))
+
+        clock.now += 1.5
+        record = _record("data %s", 9, **rate_limited(1.0))
+        assert log_filter.filter(record)
+        assert record.getMessage() == "data 9 [4 similar suppressed]"
+
+    def test_sampling(self, clock):
+        log_filter = RateLimitFilter(clock=clock)
+        passed = [log_filter.filter(_record("frame", **sampled(3))) for _ in range(7)]
+        assert passed == [True, False, False, True, False, False, True]
+
+
+class TestQueuePipeline:
+    """Test cases for the deferred queue handler and JSON formatter."""
+
+    def test_arguments_are_merged_on_the_calling_thread(self):
+        handler = DeferredQueueHandler(queue.Queue(10))
+        payload = ["before"]
+        handler.handle(_record("value %s", payload))
+        payload[0] = "after"
+        record = handler.queue.get_nowait()
+        assert record.getMessage() == "value ['before']"
+        assert record.args is None
+
+    def test_suppressed_records_are_never_formatted(self, clock):
+        handler = DeferredQueueHandler(queue.Queue(10))
+        handler.addFilter(RateLimitFilter(clock=clock))
+        calls = []
+
+        class Payload:
+            def __str__(self):
+                calls.append(1)
+                return "payload"
+
+        for _ in range(5):
+            handler.handle(_record("value %s", Payload(), **rate_limited(1.0)))
+        assert calls == [1]
+        assert handler.queue.qsize() == 1
+
+    def test_traceback_is_rendered_on_the_calling_thread(self):
+        handler = DeferredQueueHandler(queue.Queue(10))
+        try:
+            raise RuntimeError("motor fault")
+        except RuntimeError:
+            record = _record("failed")
+            record.exc_info = sys.exc_info()
+        handler.handle(record)
+        prepared = handler.queue.get_nowait()
+        assert prepared.exc_info is None
+        assert "RuntimeError: motor fault" in prepared.exc_text
+        assert "motor fault" in json.loads(JsonLinesFormatter().format(prepared))["exc"]
+        assert logging.Formatter().format(prepared).endswith("RuntimeError: motor fault")
+
+    def test_full_queue_drops_without_blocking(self):
+        handler = DeferredQueueHandler(queue.Queue(2))
+        for i in range(5):
+            handler.handle(_record("n %d", i))
+        assert handler.dropped == 3
+        assert handler.queue.qsize() == 2
+
+    def test_json_lines(self):
+        line = JsonLinesFormatter().format(_record("speed %.1f", 1.25))
+        assert "\n" not in line and " " not in line.replace("speed 1.2", "")
+        entry = json.loads(line)
+        assert entry["lvl"] == "INFO" and entry["name"] == "mower.test"
+        assert entry["msg"] == "speed 1.2"
+
+
+def _log_in_child():
+    logging.getLogger("mower.forktest").info("from child")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs fork")
+def test_forked_child_gets_its_own_listener(tmp_path, monkeypatch):
+    log_file = tmp_path / "fork.log"
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter("%(process)d %(message)s"))
+    handler = DeferredQueueHandler(queue.Queue(100))
+    listener = logging.handlers.QueueListener(handler.queue, file_handler, respect_handler_level=True)
+    listener.start()
+    monkeypatch.setattr(LoggerConfigInfo, "_queue_handler", handler)
+    monkeypatch.setattr(LoggerConfigInfo, "_listener", listener)
+
+    logger = logging.getLogger("mower.forktest")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    monkeypatch.setattr(logger, "propagate", False)
+    try:
+        logger.info("from parent")
+        child = multiprocessing.get_context("fork").Process(target=_log_in_child)
+        child.start()
+        child.join(10)
+        assert child.exitcode == 0
+    finally:
+        logger.removeHandler(handler)
+        listener.stop()
+        file_handler.close()
+
+    lines = log_file.read_text().splitlines()
+    assert {line.split(" ", 1)[1] for line in lines} == {"from parent", "from child"}
+    assert len({line.split(" ", 1)[0] for line in lines}) == 2